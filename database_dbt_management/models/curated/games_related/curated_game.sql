@@ -16,6 +16,9 @@
         TEAM_HOME_KEY / TEAM_AWAY_KEY: 1-n relationship with team
     Filter:
         adjusted_game is already filtered with games to process
+        (the games changed since last load, or all the games of the gameday with action)
+    Join:
+        same model (this): to number the landed games with the games of their gamedays already in
     Materialization:
         incremental to avoid removing old games already in
 */
@@ -50,16 +53,43 @@ with adjusted_game as (
     FROM
         {{ref('adjusted_game')}} game
 ),
+--only the games changed since last load are landed: the other games of their gamedays, already in, are numbered with them
+gameday_game as (
+    SELECT
+        game_adj.GAME_KEY,
+        game_adj.SEASON_KEY,
+        game_adj.GAMEDAY_KEY,
+        game_adj.GAME_SOURCE_ID,
+        1 AS IS_LANDED
+    FROM
+        adjusted_game game_adj
+{% if is_incremental() %}
+    UNION ALL
+    SELECT
+        this.GAME_KEY,
+        this.SEASON_KEY,
+        this.GAMEDAY_KEY,
+        this.GAME_SOURCE_ID,
+        0 AS IS_LANDED
+    FROM
+        {{this}} this
+    WHERE
+        this.GAMEDAY_KEY IN (SELECT game_adj2.GAMEDAY_KEY FROM adjusted_game game_adj2)
+    AND
+        this.GAME_KEY NOT IN (SELECT game_adj3.GAME_KEY FROM adjusted_game game_adj3)
+{% endif %}
+),
 --We calculate the game number, which will be the game id for message: 
 --either we take it from landing_game_modification if exists, or on the sorted game_source_id
 ranked_games AS (
     SELECT
         game_adj.GAME_KEY,
+        game_adj.IS_LANDED,
         COALESCE(modif.GAME_FORUM_ID,ROW_NUMBER() OVER (
             PARTITION BY game_adj.GAMEDAY_KEY 
             ORDER BY game_adj.GAME_SOURCE_ID ASC)) AS GAME_MESSAGE_SHORT
     FROM 
-        adjusted_game game_adj
+        gameday_game game_adj
     LEFT JOIN
         {{ref('curated_season')}} season
         ON game_adj.SEASON_KEY = season.SEASON_KEY
@@ -95,6 +125,7 @@ final_game as (
     LEFT JOIN
         ranked_games 
         ON ranked_games.GAME_KEY = adj_game.GAME_KEY
+        AND ranked_games.IS_LANDED = 1
 )
 SELECT
     final_game.GAME_KEY,
@@ -13,8 +13,10 @@
         - to get old date and time on same gamedays (same number of gamedays)
         - to change old gameday with action (only one)
         curated_season: foreign key for landing_output_need
+        curated_game: to get the games of the gamedays processed which were not landed, as unchanged since last load
     Filter:
         adjusted_game is filtered with games to process
+        (the games changed since last load, or all the games of the gameday with action)
         landing_output_need contains only the gameday to process
     Materialization:
         incremental to avoid removing old gamedays already in
@@ -43,6 +45,48 @@ with adjusted_game as (
     FROM
         {{ref('adjusted_game')}} game
 ),
+-- only the games changed since last load are landed: we get the other games of their gamedays from curated_game, already in
+gameday_game as (
+    SELECT
+        game_adj.SEASON_KEY,
+        game_adj.COMPETITION_KEY,
+        game_adj.COMPETITION_SOURCE_ID,
+        game_adj.GAMEDAY_KEY,
+        game_adj.GAMEDAY,
+        game_adj.GAMEDAY_MESSAGE,
+        game_adj.DATE_GAME_LOCAL,
+        game_adj.TIME_GAME_LOCAL,
+        game_adj.DATE_GAME_UTC,
+        game_adj.TIME_GAME_UTC,
+        game_adj.SCORE_HOME,
+        game_adj.SCORE_AWAY,
+        game_adj.TOTAL_SCORE
+    FROM
+        adjusted_game game_adj
+    UNION ALL
+    SELECT
+        gameday_adj.SEASON_KEY,
+        gameday_adj.COMPETITION_KEY,
+        gameday_adj.COMPETITION_SOURCE_ID,
+        gameday_adj.GAMEDAY_KEY,
+        gameday_adj.GAMEDAY,
+        gameday_adj.GAMEDAY_MESSAGE,
+        game.DATE_GAME_LOCAL,
+        game.TIME_GAME_LOCAL,
+        game.DATE_GAME_UTC,
+        game.TIME_GAME_UTC,
+        game.SCORE_HOME,
+        game.SCORE_AWAY,
+        game.SCORE_HOME + game.SCORE_AWAY AS TOTAL_SCORE
+    FROM
+        {{ref('curated_game')}} game
+    JOIN
+        (SELECT DISTINCT SEASON_KEY, COMPETITION_KEY, COMPETITION_SOURCE_ID, GAMEDAY_KEY, GAMEDAY, GAMEDAY_MESSAGE 
+         FROM adjusted_game) gameday_adj
+        ON game.GAMEDAY_KEY = gameday_adj.GAMEDAY_KEY
+    WHERE
+        game.GAME_KEY NOT IN (SELECT landed.GAME_KEY FROM {{ref('adjusted_game')}} landed)
+),
 -- we add 4 types of rank in order to select min and max at next cte
 adjusted_game_sorted as (
     SELECT
@@ -81,7 +125,7 @@ adjusted_game_sorted as (
                          CAST (game_adj.TIME_GAME_LOCAL AS TIME) DESC
             ) AS RANK_BY_DATETIME_DESC
     FROM
-        adjusted_game game_adj
+        gameday_game game_adj
 ),
 -- we select min (rank = 1 when asc) and max (rank = 1 when desc) 
 -- to calculate begin and end date and time, and is (partially) played
@@ -1,7 +1,8 @@
 '''
     This module is a utility module for all other modules. 
-    It defines decorators for all program functions to manage errors and retries
+    It defines decorators for all program functions (and coroutines) to manage errors and retries
 '''
+import asyncio
 import functools
 import inspect
 import logging
@@ -58,19 +59,32 @@ def exit_program(log_filter=None, execute_final_function: Literal[0, 1] = 1):
             execute_final_function (0/1): If 1 (defaullt), will call the function execute_finally_on_error
     '''
     def decorator(func):
+        def exit_on_error(e, args, kwargs):
+            bound_args = inspect.signature(func).bind(*args, **kwargs)
+            bound_args.apply_defaults()
+            filtered_args = log_filter(bound_args.arguments) if log_filter else bound_args.arguments
+
+            logging.exception(f"Failed for `{func.__name__}` with args: {filtered_args} - Error: {e}")
+            if execute_final_function == 1:
+                execute_finally_on_error()
+            sys_exit(1)
+
+        #coroutines are awaited, so that the error is caught when it runs on the event loop
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                try:
+                    return await func(*args, **kwargs)
+                except Exception as e:
+                    exit_on_error(e, args, kwargs)
+            return async_wrapper
+
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
             try:
                 return func(*args, **kwargs)
             except Exception as e:
-                bound_args = inspect.signature(func).bind(*args, **kwargs)
-                bound_args.apply_defaults()
-                filtered_args = log_filter(bound_args.arguments) if log_filter else bound_args.arguments
-
-                logging.exception(f"Failed for `{func.__name__}` with args: {filtered_args} - Error: {e}")
-                if execute_final_function == 1:
-                    execute_finally_on_error()
-                sys_exit(1)
+                exit_on_error(e, args, kwargs)
         return wrapper
     return decorator
 
@@ -85,6 +99,29 @@ def retry_function(log_filter=None,max_attempts = 3,delay_secs = 5):
             Decorated function with retry mechanism.
     '''
     def decorator(func):
+        #coroutines wait between attempts without blocking the event loop
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                attempt = 1
+                bound_args = inspect.signature(func).bind(*args, **kwargs)
+                bound_args.apply_defaults()
+                filtered_args = log_filter(bound_args.arguments) if log_filter else bound_args.arguments
+
+                while attempt <= max_attempts:
+                    try:
+                        return await func(*args, **kwargs)
+                    except Exception:
+                        if attempt == max_attempts:
+                            logging.error(f"Last attempt failed for `{func.__name__}` with args: {filtered_args}")
+                            raise
+                        else:
+                            logging.error(f"Attempt {attempt}/{max_attempts} failed for `{func.__name__}` with args: {filtered_args}\
+                                          Retrying in few seconds.")
+                            await asyncio.sleep(delay_secs)
+                            attempt += 1
+            return async_wrapper
+
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
             attempt = 1
@@ -119,6 +156,19 @@ def raise_issue_to_caller(log_filter=None):
             callable: The decorated function
     '''
     def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                bound_args = inspect.signature(func).bind(*args, **kwargs)
+                bound_args.apply_defaults()
+                filtered_args = log_filter(bound_args.arguments) if log_filter else bound_args.arguments
+                try:
+                    return await func(*args, **kwargs)
+                except Exception:
+                    logging.error(f"Failed for `{func.__name__}` with args: {filtered_args}")
+                    raise
+            return async_wrapper
+
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
             bound_args = inspect.signature(func).bind(*args, **kwargs)
@@ -0,0 +1,233 @@
+'''
+    This module is a utility module for all other modules.
+    It defines the shared HTTP transport to external websites (forums, LNB, ImgBB) with:
+    - one keep-alive session per host, and a limit of requests running at the same time on it
+    - a token bucket per host limiting the rate of requests sent from the event loop (crawls)
+    - compressed responses (gzip, and brotli if it can be decoded)
+    - explicit connect / read timeouts
+    - DNS resolutions cached for some time, on the connections of these sessions only
+'''
+import asyncio
+import socket
+import threading
+import time
+import weakref
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NameResolutionError, NewConnectionError
+from urllib3.util import connection as urllib3_connection
+
+from .config_variables import config_global_variables as var
+
+#we only ask for brotli if the response can be decoded
+try:
+    import brotli # noqa: F401
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    ACCEPT_ENCODING = "gzip, deflate"
+
+hosts_sessions = {}
+hosts_semaphores = {}
+hosts_lock = threading.Lock()
+hosts_buckets = {}
+#asyncio semaphores belong to one event loop, so they are kept per loop
+loops_hosts_semaphores = weakref.WeakKeyDictionary()
+dns_cache = {}
+dns_cache_lock = threading.Lock()
+urllib3_create_connection = urllib3_connection.create_connection
+
+def resolve_host(host: str, port: int) -> list[str]:
+
+    '''
+        Gets the ip addresses of a host, from the cache if resolved recently
+        Args:
+            host (str): the host name
+            port (int): the port of the connection
+        Returns:
+            The list of ip addresses of the host
+    '''
+    now = time.monotonic()
+    with dns_cache_lock:
+        cached = dns_cache.get((host, port))
+    if cached is not None and cached[0] > now:
+        return cached[1]
+
+    lst_ip_addresses = list(dict.fromkeys(info[4][0] for info in socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM)))
+    with dns_cache_lock:
+        dns_cache[(host, port)] = (now + var.HTTP_DNS_CACHE_TTL_SECS, lst_ip_addresses)
+    return lst_ip_addresses
+
+def create_connection_cached_dns(address: tuple, *args, **kwargs) -> socket.socket:
+
+    '''
+        Opens a socket like urllib3 does, but on the cached ip addresses of the host
+        Args:
+            address (tuple): the host and port of the connection
+            args / kwargs: the other arguments of urllib3 create_connection (timeout, ...)
+        Returns:
+            The connected socket
+        Raises:
+            The error of the last ip address tried if none can be connected
+    '''
+    host, port = address
+    last_error = None
+    for ip_address in resolve_host(host.strip("[]"), port):
+        try:
+            return urllib3_create_connection((ip_address, port), *args, **kwargs)
+        except OSError as e:
+            last_error = e
+    #we resolve again on next connection, the host might have moved
+    with dns_cache_lock:
+        dns_cache.pop((host.strip("[]"), port), None)
+    raise last_error if last_error else OSError(f"No ip address found for {host}")
+
+class CachedDnsConnectionMixin:
+
+    '''
+        Opens the socket of an urllib3 connection on the cached ip addresses of its host
+        The certificate is still checked on the host name, only the resolution is cached
+    '''
+    def _new_conn(self) -> socket.socket:
+
+        '''
+            Opens the socket of the connection
+            Returns:
+                The connected socket
+            Raises:
+                The same errors as urllib3 HTTPConnection._new_conn, so the retries of requests are unchanged
+        '''
+        try:
+            return create_connection_cached_dns((self._dns_host, self.port), self.timeout,
+                                                source_address=self.source_address, socket_options=self.socket_options)
+        except socket.gaierror as e:
+            raise NameResolutionError(self.host, self, e) from e
+        except socket.timeout as e:
+            raise ConnectTimeoutError(self, f"Connection to {self.host} timed out. (connect timeout={self.timeout})") from e
+        except OSError as e:
+            raise NewConnectionError(self, f"Failed to establish a new connection: {e}") from e
+
+class CachedDnsHTTPConnection(CachedDnsConnectionMixin, HTTPConnection):
+    pass
+
+class CachedDnsHTTPSConnection(CachedDnsConnectionMixin, HTTPSConnection):
+    pass
+
+class CachedDnsHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = CachedDnsHTTPConnection
+
+class CachedDnsHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = CachedDnsHTTPSConnection
+
+class CachedDnsHTTPAdapter(HTTPAdapter):
+
+    '''
+        Adapter of the shared sessions, whose connections use the DNS cache
+        Other clients (Snowflake, Dropbox, ...) keep the resolution of urllib3
+    '''
+    def init_poolmanager(self, *args, **kwargs) -> None:
+
+        '''
+            Creates the pool manager of the adapter, with connection pools using the DNS cache
+            Args:
+                args / kwargs: the arguments of requests HTTPAdapter init_poolmanager
+        '''
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {"http": CachedDnsHTTPConnectionPool, "https": CachedDnsHTTPSConnectionPool}
+
+def get_host_transport(host: str) -> tuple[requests.Session, threading.BoundedSemaphore]:
+
+    '''
+        Gets the session and the semaphore of a host, creating them on first call
+        Args:
+            host (str): the host name
+        Returns:
+            - the keep-alive session of the host
+            - the semaphore limiting the requests running at the same time on the host
+    '''
+    with hosts_lock:
+        if host not in hosts_sessions:
+            session = requests.Session()
+            adapter = CachedDnsHTTPAdapter(pool_connections=1, pool_maxsize=var.HTTP_MAX_CONCURRENT_REQUESTS_PER_HOST)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+            hosts_sessions[host] = session
+            hosts_semaphores[host] = threading.BoundedSemaphore(var.HTTP_MAX_CONCURRENT_REQUESTS_PER_HOST)
+        return hosts_sessions[host], hosts_semaphores[host]
+
+def send_request(method: str, url: str, **kwargs) -> requests.Response:
+
+    '''
+        Sends a request through the session of its host, waiting if too many requests are already running on it
+        Args:
+            method (str): the HTTP method (GET, POST, ...)
+            url (str): the url of the request
+            kwargs: the arguments of requests (data, json, files, headers, verify, ...)
+        Returns:
+            The response, already read
+        Raises:
+            The requests error if the request fails or its status is an error
+    '''
+    session, semaphore = get_host_transport(urlsplit(url).netloc)
+    kwargs.setdefault("timeout", (var.HTTP_CONNECT_TIMEOUT_SECS, var.HTTP_READ_TIMEOUT_SECS))
+    with semaphore:
+        response = session.request(method, url, **kwargs)
+        #we read the body while holding the semaphore, so the connection goes back to the pool
+        _ = response.content
+    response.raise_for_status()
+    return response
+
+def reserve_request_slot(host: str) -> float:
+
+    '''
+        Takes a token from the bucket of a host, the bucket being refilled at the rate allowed up to the burst allowed
+        When the bucket is empty, the token is taken in advance: the request has to wait for it
+        Args:
+            host (str): the host name
+        Returns:
+            The number of seconds to wait before sending the request (float)
+    '''
+    now = time.monotonic()
+    with hosts_lock:
+        tokens, last_refill = hosts_buckets.get(host, (var.HTTP_REQUESTS_BURST_PER_HOST, now))
+        tokens = min(var.HTTP_REQUESTS_BURST_PER_HOST, tokens + (now - last_refill) * var.HTTP_REQUESTS_PER_SECOND_PER_HOST) - 1
+        hosts_buckets[host] = (tokens, now)
+    return max(0.0, -tokens / var.HTTP_REQUESTS_PER_SECOND_PER_HOST)
+
+def get_host_async_semaphore(host: str) -> asyncio.Semaphore:
+
+    '''
+        Gets the semaphore of a host for the running event loop, creating it on first call
+        Args:
+            host (str): the host name
+        Returns:
+            The semaphore limiting the requests running at the same time on the host from the event loop
+    '''
+    hosts_async_semaphores = loops_hosts_semaphores.setdefault(asyncio.get_running_loop(), {})
+    if host not in hosts_async_semaphores:
+        hosts_async_semaphores[host] = asyncio.Semaphore(var.HTTP_MAX_CONCURRENT_REQUESTS_PER_HOST)
+    return hosts_async_semaphores[host]
+
+async def send_request_async(method: str, url: str, **kwargs) -> requests.Response:
+
+    '''
+        Sends a request from the event loop, once the host has a slot free and a token in its bucket
+        The request itself runs in a worker thread through the session of its host, so the event loop keeps scheduling the other ones
+        Args:
+            method (str): the HTTP method (GET, POST, ...)
+            url (str): the url of the request
+            kwargs: the arguments of requests (data, json, files, headers, verify, ...)
+        Returns:
+            The response, already read
+        Raises:
+            The requests error if the request fails or its status is an error
+    '''
+    host = urlsplit(url).netloc
+    #only the requests allowed to run take a worker thread, the other ones wait on the event loop
+    async with get_host_async_semaphore(host):
+        await asyncio.sleep(reserve_request_slot(host))
+        return await asyncio.to_thread(send_request, method, url, **kwargs)
@@ -42,6 +42,81 @@ TIME_MESSAGE_WAIT = 90
 GAME_EXTRACTION_WAIT_TIME = 30
 SNOWFLAKE_LOGIN_WAIT_TIME = 30
 
+# Following is output captures parameters
+# If 1, all tables of a calculated message are stacked into one composite capture, uploaded once on ImgBB
+IS_CAPTURE_COMPOSITE = 0
+CAPTURE_COMPOSITE_MARGIN = 40
+
+# Following is game calendars extraction parameters
+# The calendar asked for a task covers the whole months from these days before to these days after the task (tasks reading games run up to 10 weeks before them)
+GAME_CALENDAR_WINDOW_DAYS_BEFORE_TASK = 45
+GAME_CALENDAR_WINDOW_DAYS_AFTER_TASK = 80
+# Calendars are cached for these minutes if games are to come, for these hours if all games are complete (also for next runs, in game_calendar_cache)
+GAME_CALENDAR_CACHE_TTL_MINUTES = 15
+GAME_CALENDAR_CACHE_TTL_HOURS_COMPLETE = 168
+# Maximum number of competitions extracted at the same time (their requests still share the limit per host of the HTTP transport)
+GAME_EXTRACTION_MAX_WORKERS = 4
+
+# Following is game results watcher parameters
+# The watcher watches the next task if it is a CALCULATE task due within these hours, for at most these minutes (the scheduled run calculates after)
+# The watcher shares the concurrency group of main runs (every 10 minutes): it must end before the next main run is scheduled, or this one is delayed
+# and can be cancelled by the next run queued. A longer watch is done by the next watcher runs
+GAME_WATCHER_HORIZON_HOURS = 6
+GAME_WATCHER_MAX_DURATION_MINUTES = 4
+# A game is expected to end these minutes after its start: until then its result is polled every GAME_WATCHER_POLL_MAX_SECS at most, then every GAME_WATCHER_POLL_MIN_SECS
+GAME_WATCHER_GAME_DURATION_MINUTES = 120
+GAME_WATCHER_POLL_MIN_SECS = 60
+GAME_WATCHER_POLL_MAX_SECS = 900
+
+# Following is forum messages posting parameters
+# Seconds between two messages posted by the account on a forum (phpBB flood interval), guessed first then learned from the flood error pages
+# Each flood error adds FORUM_FLOOD_INTERVAL_STEP_SECS to the time the post was rejected at, posts are then sent FORUM_FLOOD_MARGIN_SECS past the interval
+FORUM_FLOOD_INTERVAL_SECS = 15
+FORUM_FLOOD_INTERVAL_STEP_SECS = 5
+FORUM_FLOOD_MARGIN_SECS = 1
+# Part of the error shown by BI when a message is posted before the flood interval
+BI_FLOOD_ERROR_STRING = "si rapidement"
+# If 1, messages are not posted nor edited on forums: message_posting_report lists the posts and edits which would be done
+IS_POSTING_DRY_RUN = 0
+
+# Following is forum messages crawling parameters
+# Number of messages crawled again before the page stored in message_topic_state, in case messages have been deleted
+MESSAGE_CRAWL_LOOKBACK_MESSAGES = 30
+# Maximum number of pages of a topic fetched concurrently ahead
+MESSAGE_CRAWL_PREFETCH_PAGES = 20
+# Maximum number of processes parsing the pages of topics during the crawls, limited to the cores (below 2 = parsed in worker threads of the crawl)
+MESSAGE_PARSING_PROCESSES = 4
+# Pages of message_page_cache not used since this number of days are removed.
+# Increase the parser version when the parsing rules of messages change, so that cached pages are parsed again
+MESSAGE_PAGE_CACHE_RETENTION_DAYS = 30
+MESSAGE_PAGE_CACHE_PARSER_VERSION = 1
+# If 1, a topic already crawled is not crawled again if its Atom feed lists all messages created since the time range begins: only the pages of messages listed are extracted.
+# The feed only lists the last messages created, so older messages edited are missed until the next run
+IS_MESSAGE_FEED_DETECTION = 0
+# If 1, checks don't crawl topics without message posted since the time range begins, using the Atom feed of active topics of the forum.
+# Messages edited in those topics are missed, so these checks don't modify message_check_ts
+IS_TOPIC_SKIP_ON_CHECK = 0
+
+# Following is HTTP transport parameters (forums, LNB, ImgBB)
+# Maximum number of requests running at the same time on a host, which is also the size of its keep-alive pool
+HTTP_MAX_CONCURRENT_REQUESTS_PER_HOST = 4
+# Rate of requests sent per host by the crawls, and number of requests sent at once before it applies (token bucket)
+HTTP_REQUESTS_PER_SECOND_PER_HOST = 5
+HTTP_REQUESTS_BURST_PER_HOST = 10
+HTTP_CONNECT_TIMEOUT_SECS = 10
+HTTP_READ_TIMEOUT_SECS = 60
+HTTP_DNS_CACHE_TTL_SECS = 300
+
+# Following is snowflake landing load parameters
+# The files of the landing tables are put at once on a path of the user stage per run, with SNOWFLAKE_PUT_PARALLEL threads, then copied per table
+SNOWFLAKE_LANDING_STAGE_PATH = "@~/predict_landing"
+SNOWFLAKE_PUT_PARALLEL = 8
+# The landing tables of SNOWFLAKE_INSERT_MAX_ROWS rows or less are inserted with bound parameters instead, without stage
+SNOWFLAKE_INSERT_MAX_ROWS = 100
+# The files staged are put as they are (CSV, gzipped by the put) or converted to PARQUET, loaded by column name
+SNOWFLAKE_LANDING_FILE_FORMAT = "CSV"
+LANDING_FILE_FORMAT_EXTENSION_MAP = {"CSV": "csv", "PARQUET": "parquet"}
+
 # Following is python maps:
 DOWNLOAD_INITIAL_MAP_PER_CALLER = {
     "main": "INITIAL_MAIN",
@@ -77,7 +77,7 @@ def snowflake_execute(sr_snowflake_account: pd.Series, query: str, db_placeholde
             params (list): list of parameters to personalize the query with
         Returns:
             - if the query is a select query then return the dataframe related 
-            - if the query is a show query then return a list
+            - if the query is a show, put or copy query then return a list (of files put or copied, for put and copy)
             - else return None
         Raises:
             Retry 3 times and exits the program if error executing or parsing the query (with decorators)
@@ -107,8 +107,8 @@ def snowflake_execute(sr_snowflake_account: pd.Series, query: str, db_placeholde
         if query_root.key.upper() == "SELECT":
             df = snowCursor.fetch_pandas_all()
             return df
-        #If it is a show query we return the associated list
-        if query_root.key.upper() == "SHOW":
+        #If it is a show query (or a put or copy query, reporting each file) we return the associated list
+        if query_root.key.upper() in ("SHOW", "PUT", "COPY"):
             lst = snowCursor.fetchall()
             return lst
 
@@ -137,4 +137,70 @@ def snowflake_execute_script(sr_snowflake_account: pd.Series, script: str, db_pl
     else:
         database = sr_snowflake_account['DATABASE_TEST']
     script_personalized = script.replace(db_placeholder,database)
-    snowconnect.execute_string(script_personalized)
\ No newline at end of file
+    snowconnect.execute_string(script_personalized)
+
+@config_decorators.exit_program(log_filter=lambda args: {k: args[k] for k in ('query','num_statements') })
+@config_decorators.retry_function(log_filter=lambda args: {k: args[k] for k in ('query','num_statements') })
+def snowflake_execute_multi_statement(sr_snowflake_account: pd.Series, query: str, db_placeholder: str, num_statements: int):
+
+    """
+        The purpose of this function is to:
+        - personalize a snowflake request made of several queries
+        - run them in one round trip, a transaction opened in the request being rolled back if one query fails
+        Args:
+            sr_snowflake_account (series - one row) : Contains the snowflake account parameter to run a query
+            query (str): The queries we want to run, separated by ;
+            db_placeholder (str): to replace constant in the query string
+            num_statements (int): the number of queries in the request
+        Raises:
+            Retry 3 times and exits the program if error executing one of the queries (with decorators)
+    """
+    
+    #We connect to Snowflake
+    snowconnect = snowflake_connect(sr_snowflake_account)
+    
+    #We personalized #DATABASE# and run the queries
+    if os.getenv("IS_TESTRUN") == '0':
+        database = sr_snowflake_account['DATABASE_PROD']
+    else:
+        database = sr_snowflake_account['DATABASE_TEST']
+    with snowconnect.cursor() as snowCursor:
+        try:
+            snowCursor.execute(query.replace(db_placeholder,database), num_statements=num_statements)
+            #the error of a query after the first one is only raised when reaching its result
+            while snowCursor.nextset():
+                pass
+        except Exception:
+            snowconnect.rollback()
+            raise
+
+@config_decorators.exit_program(log_filter=lambda args: {k: args[k] for k in ('query',) })
+@config_decorators.retry_function(log_filter=lambda args: {k: args[k] for k in ('query',) })
+def snowflake_executemany(sr_snowflake_account: pd.Series, query: str, db_placeholder: str, lst_params: list[Sequence[Any]]) -> int:
+
+    """
+        The purpose of this function is to:
+        - personalize a snowflake insert query with bound parameters
+        - run it for all rows of parameters, the connector batching them in one insert
+        Args:
+            sr_snowflake_account (series - one row) : Contains the snowflake account parameter to run a query
+            query (str): The insert query we want to run, with %s bound parameters
+            db_placeholder (str): to replace constant in the query string
+            lst_params (list): list of rows of parameters, one per row to insert
+        Returns:
+            The number of rows inserted (int)
+        Raises:
+            Retry 3 times and exits the program if error executing the query (with decorators)
+    """
+    
+    #We connect to Snowflake
+    snowconnect = snowflake_connect(sr_snowflake_account)
+    
+    #We personalized #DATABASE# and run the query
+    if os.getenv("IS_TESTRUN") == '0':
+        database = sr_snowflake_account['DATABASE_PROD']
+    else:
+        database = sr_snowflake_account['DATABASE_TEST']
+    with snowconnect.cursor() as snowCursor:
+        snowCursor.executemany(query.replace(db_placeholder,database), lst_params)
+        return snowCursor.rowcount
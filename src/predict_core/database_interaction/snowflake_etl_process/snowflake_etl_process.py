@@ -6,7 +6,11 @@ submitting query either directly from python or using dbt
 
 import logging
 import os
+import shutil
 import subprocess
+import tempfile
+import time
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Literal, Tuple
 import pandas as pd
@@ -15,15 +19,20 @@ from ...config import config_decorators
 from ...config.config_multithread import multithread_run
 from ...config.config_variables import config_global_variables as var
 from . import sql_queries as sql
-from ...files_manipulation.local_files_manipulation.files_manipulation import create_csv
-from ..snowflake_connection_execution import snowflake_execute
+from ...files_manipulation.local_files_manipulation.files_manipulation import create_csv, get_declared_columns
+from ..snowflake_connection_execution import snowflake_execute, snowflake_execute_multi_statement, snowflake_executemany
 
 logging.getLogger("snowflake.connector").setLevel(logging.WARNING)
 logging.getLogger("sqlglot").setLevel(logging.ERROR)
 logging.basicConfig(level=logging.INFO)
+#the declared types written as such in parquet files, the other ones are written as text
+parquet_dtype_map = {'int64': 'Int64', 'int': 'Int64', 'float64': 'Float64'}
+snowflake_load_report_columns = ['TABLE_NAME', 'LOAD_PATH', 'FILE_NAME', 'FILE_SIZE', 'PUT_STATUS', 'PUT_SECS',
+                                 'LOAD_STATUS', 'ROWS_LOADED', 'ERRORS_SEEN', 'FIRST_ERROR', 'LOAD_SECS']
 
-@config_decorators.exit_program(log_filter=lambda args: {k: args[k] for k in ('called_by','message_action','game_action','calculation_needed')})
-def get_list_tables_to_update(called_by: str, df_paths: pd.DataFrame, message_action: str | None = None, game_action: str | None = None, calculation_needed: int | None = None) -> Tuple[list[str], list[str]]:
+@config_decorators.exit_program(log_filter=lambda args: {k: args[k] for k in ('called_by','message_action','game_action','calculation_needed','is_game_to_load')})
+def get_list_tables_to_update(called_by: str, df_paths: pd.DataFrame, message_action: str | None = None, game_action: str | None = None, calculation_needed: int | None = None,
+                              is_game_to_load: bool = True) -> Tuple[list[str], list[str]]:
 
     """
         Gets the list of tables which need to be updated on Snowflake:
@@ -35,6 +44,7 @@ def get_list_tables_to_update(called_by: str, df_paths: pd.DataFrame, message_ac
             message_action (str) : from output_need file - the list depends on it if provided
             game_action (str): from output_need file - the list depends on it if provided
             calculation_needed (int): from output_need file - the list depends on it if provided
+            is_game_to_load (bool): if False, no game changed since last load: landing_game keeps its last load
         Returns:
             lst_python_tables: the list of snowflake tables which need to be run by python
             lst_dbt_tables: the list of snowflake tables which need to be run by dbt
@@ -78,6 +88,9 @@ def get_list_tables_to_update(called_by: str, df_paths: pd.DataFrame, message_ac
     if called_by == var.CALLER["MAIN"]:
         #We add the landing table corresponding to output_need file
         lst_python_tables.extend(['landing_output_need'])
+        #the games are not landed again when none changed since last load
+        if not is_game_to_load:
+            lst_python_tables = [table for table in lst_python_tables if table != 'landing_game']
 
     # We remove possibles duplicates
     lst_python_tables = list(set(lst_python_tables))
@@ -91,53 +104,34 @@ def get_list_tables_to_update(called_by: str, df_paths: pd.DataFrame, message_ac
     logging.info("SNOWFLAKE -> LISTING TABLES TO UPDATE [END]")
     return lst_python_tables,lst_dbt_tables
 
-@config_decorators.exit_program(log_filter=lambda args: {k: args[k] for k in ('table_metadata',)})
-def delete_table_data(sr_snowflake_account: pd.Series, schema: str, table_metadata: list):
+@config_decorators.exit_program(log_filter=lambda args: {k: args[k] for k in ('lst_tables',)})
+def delete_tables_data_from_python(sr_snowflake_account: pd.Series, lst_tables: list[str]):
 
     """
-        Deletes all data from a snowflake table and its stage
+        Deletes all data from the snowflake landing tables, and the landing stage path, in one request:
+        - the tables are truncated in one transaction, so all of them or none are emptied
+        - the tables not loaded by the run are emptied too: dbt models (incremental) must not read their last load again
+        - the files left on the landing stage path by failed runs are removed with a pattern
         Args:
             sr_snowflake_account (series - one row) : Contains the snowflake account parameter to run a query
-            schema (str): The name of the schema on which we delete
-            table_metadata (list): the list returned by snowflake when "showing" the table
+            lst_tables (list): the names of the tables to empty, starting with their schema
         Raises:
             Exits the program if error running the function (using decorator)
     """
 
-    table_name = table_metadata[1]   # Name is in the 2nd column when showing from snowflake
-        
-    #for each table, we delete data
-    q_delete_data = sql.DELETE_DATA_QUERY.replace(sql.SCHEMA,schema).replace(sql.TABLE_NAME,table_name)
-    snowflake_execute(sr_snowflake_account,q_delete_data,sql.DATABASE)
+    logging.info(f"SNOWFLAKE {lst_tables} -> DELETING DATA [START]")
+    lst_delete_queries = []
+    for table_name in lst_tables:
+        #We get the schema at the beginning of the table_name
+        schema = table_name.split('_')[0]
+        lst_delete_queries.append(sql.DELETE_DATA_QUERY.replace(sql.SCHEMA,schema).replace(sql.TABLE_NAME,table_name))
 
-    #for each table stage @%, we delete files
-    q_remove_from_stage = sql.REMOVE_FROM_STAGE_QUERY.replace(sql.SCHEMA,schema).replace(sql.TABLE_NAME,table_name)
-    snowflake_execute(sr_snowflake_account,q_remove_from_stage,sql.DATABASE)
-    logging.info(f"SNOWFLAKE {table_name.upper()} -> DATA DELETED")
+    #stages are not transactional, the files left by failed runs are removed once the tables are emptied
+    q_remove_from_stage = sql.REMOVE_FROM_STAGE_QUERY.replace("#STAGE_PATH#", var.SNOWFLAKE_LANDING_STAGE_PATH)
+    lst_queries = [sql.BEGIN_TRANSACTION_QUERY, *lst_delete_queries, sql.COMMIT_TRANSACTION_QUERY, q_remove_from_stage]
+    snowflake_execute_multi_statement(sr_snowflake_account, "".join(lst_queries), sql.DATABASE, len(lst_queries))
 
-@config_decorators.exit_program(log_filter=lambda args: {})
-def delete_tables_data_from_python(sr_snowflake_account: pd.Series, schema: str):
-
-    """
-        Deletes all data from a snowflake schema objects (tables and stages)
-        Args:
-            sr_snowflake_account (series - one row) : Contains the snowflake account parameter to run a query
-            schema (str): The name of the schema on which we delete
-        Raises:
-            Exits the program if error running the function (using decorator)
-    """
-
-    logging.info(f"SNOWFLAKE {schema} -> DELETING DATA [START]")
-    
-    #we list all tables in the schema
-    q_list_tables = sql.LIST_TABLES_QUERY.replace(sql.SCHEMA,schema)
-    lst_tables = snowflake_execute(sr_snowflake_account,q_list_tables,sql.DATABASE)
-
-    # We parallelize the data deletion of those tables and their stages
-    table_args = [(sr_snowflake_account,schema,table_metadata) for table_metadata in lst_tables]
-    multithread_run(delete_table_data, table_args)
-
-    logging.info(f"SNOWFLAKE {schema} -> DELETING DATA [DONE]")
+    logging.info(f"SNOWFLAKE {lst_tables} -> DELETING DATA [DONE]")
 
 @config_decorators.exit_program(log_filter=lambda args: {k: args[k] for k in ('table_name','is_encapsulated')})
 def create_table_file(sr_snowflake_account: pd.Series, table_name: str, is_encapsulated: Literal[0, 1]):
@@ -161,55 +155,227 @@ def create_table_file(sr_snowflake_account: pd.Series, table_name: str, is_encap
     #we create the csv file
     create_csv(os.path.join(var.TMPD,table_name)+'.csv',df,is_encapsulated)    
 
-@config_decorators.exit_program(log_filter=lambda args: {k: args[k] for k in ('called_by','local_folder')})
-def update_snowflake_from_python(called_by: str, sr_snowflake_account: pd.Series, table_name: str, df_paths: pd.DataFrame, local_folder: str):
+def get_null_values(is_encapsulated: Literal[0, 1]) -> list[str]:
+
+    """
+        Gets the values of a landing file loaded as null, like the csv file format of the copy does
+        Args:
+            is_encapsulated (0/1): If the file is encapsulated (") - 0=no, 1=yes
+        Returns:
+            The list of values loaded as null (empty field and NULL_IF values)
+    """
+    return ['', 'NULL'] if is_encapsulated == 1 else ['', '\\N']
+
+@config_decorators.exit_program(log_filter=lambda args: {k: args[k] for k in ('parquet_file_path','file_name','is_encapsulated')})
+def create_parquet(df_table: pd.DataFrame, parquet_file_path: str, file_name: str, is_encapsulated: Literal[0, 1]):
+
+    """
+        Writes a landing table to a parquet file, with the types declared for its file (in file_check.json) and its null values as null
+        Args:
+            df_table (dataframe): The table, as its landing file is created
+            parquet_file_path (str): The path of the parquet file to create
+            file_name (str): The name of the landing file, without extension, to get its declared types
+            is_encapsulated (0/1): If the landing file is encapsulated (") - 0=no, 1=yes
+        Raises:
+            Exits the program if error running the function, or if a value does not have its declared type (using decorator)
+    """
+    declared_columns = get_declared_columns(file_name + '.csv')
+    #the values loaded as null from the csv file are null in the parquet file
+    df_table = df_table.mask(df_table.astype('string').isin(get_null_values(is_encapsulated)))
+    #columns not declared are kept as text, like the csv file: snowflake casts them to the column types
+    df_parquet = pd.DataFrame({column: pd.to_numeric(df_table[column]).astype(parquet_dtype_map[declared_columns[column]])
+                               if declared_columns.get(column) in parquet_dtype_map else df_table[column].astype('string')
+                               for column in df_table.columns})
+    df_parquet.to_parquet(parquet_file_path, index=False)
+
+@config_decorators.exit_program(log_filter=lambda args: {k: args[k] for k in ('called_by','table_name','stage_path','file_format')})
+def copy_table_from_stage(called_by: str, sr_snowflake_account: pd.Series, table_name: str, df_paths: pd.DataFrame, stage_path: str,
+                          file_format: Literal['CSV', 'PARQUET'] = 'CSV') -> list[dict]:
 
     """
         The purpose of this function is to:
-        -  update a snowflake table and its stage from a python script using an input file
-            * when called by main or init_compet, the input file created by python have the name of the table, minus "landing_"
-            * when called by init_snowflake, the input file has the same name, as we downloaded the table file directly from dropbox
+        -  update a snowflake table from its file put on the stage path of the run, the file being removed once loaded
         -  create a csv file of the updated table (only when called by main or init_compet, we already have it when called by init_snowflake)
         Args:
             called_by (str): The entry point function calling this function
             sr_snowflake_account (series - one row) : Contains the snowflake account parameter to run a query
             table_name (str): The name of the table we update
             df_paths (dataframe): the paths of files, to know if files are encapsulated
-            local_folder (str): The local folder containing the file used to fill the table
+            stage_path (str): The stage path where the files of the run are put
+            file_format (CSV/PARQUET): The format of the file put, a parquet file being loaded by column name
+        Returns:
+            The report of the files copied (list of dict), with their status, rows loaded, errors and duration
         Raises:
-            Exits the program if error running the function (using decorator)
+            Exits the program if error running the function, or if the file is not found or not loaded (using decorator)
     """
-    logging.info(f"SNOWFLAKE {table_name} -> UPDATING FROM PYTHON [START]")
     #we get schema and file related info
     schema = table_name.split('_')[0]
+    is_encapsulated = df_paths.loc[df_paths['NAME'] == table_name, 'IS_ENCAPSULATED'].iloc[0]
 
-    #if called by main or init_compet, the input file have the same name than the table minus the first part "landing_"
-    if called_by in (var.CALLER["MAIN"],var.CALLER["COMPET"]):
-        file_name = '_'.join(table_name.split('_')[1:])
-    #if not, the input file is the same name
-    elif called_by == var.CALLER["SNOWFLAKE"]:
-        file_name = table_name
+    #a parquet file has its null values already and is loaded by column name, there is no csv option
+    if file_format == 'PARQUET':
+        q_insert_data = sql.INSERT_DATA_PARQUET_QUERY.replace(sql.SCHEMA,schema).replace(sql.TABLE_NAME,table_name).replace("#STAGE_PATH#",stage_path)
+    else:
+        q_insert_data = sql.INSERT_DATA_QUERY.replace(sql.SCHEMA,schema).replace(sql.TABLE_NAME,table_name).replace("#STAGE_PATH#",stage_path)
+        if (is_encapsulated == 1):
+            q_insert_data = q_insert_data.replace("#ISENCLOSED#", 
+                                              "FIELD_OPTIONALLY_ENCLOSED_BY=\'\"\' NULL_IF = (\'\', \'NULL\')")
+        else:
+            q_insert_data = q_insert_data.replace("#ISENCLOSED#", "")
+
+    time_start = time.perf_counter()
+    lst_files_copied = snowflake_execute(sr_snowflake_account,q_insert_data,sql.DATABASE)
+    copy_secs = time.perf_counter() - time_start
+
+    #snowflake reports each file copied: file, status, rows parsed, rows loaded, error limit, errors seen, first error...
+    #if no file matches, it reports only one column, saying no file has been processed
+    if not lst_files_copied or len(lst_files_copied[0]) < 7:
+        raise ValueError(f"No file of {table_name} found on {stage_path}")
+    report = [{'TABLE_NAME': table_name, 'LOAD_PATH': 'STAGE', 'FILE_NAME': Path(file[0]).name, 'LOAD_STATUS': file[1], 'ROWS_LOADED': file[3],
+               'ERRORS_SEEN': file[5], 'FIRST_ERROR': file[6], 'LOAD_SECS': round(copy_secs, 3)} for file in lst_files_copied]
+    if any(file['LOAD_STATUS'] != 'LOADED' for file in report):
+        raise ValueError(f"File of {table_name} not loaded: {report}")
+    logging.info(f"SNOWFLAKE {table_name} -> {sum(file['ROWS_LOADED'] for file in report)} ROWS COPIED IN {copy_secs:.2f} SECS")
 
-    #we get info about the file
-    file_path = os.path.join(local_folder,file_name+'.csv')
-    file_path_abs = Path(file_path).resolve()
+    #if called by main or init_compet, we need to create the file from the table
+    if called_by in [var.CALLER["MAIN"],var.CALLER["COMPET"]]:
+        create_table_file(sr_snowflake_account, table_name, is_encapsulated)
+    return report
+
+@config_decorators.exit_program(log_filter=lambda args: {k: args[k] for k in ('called_by','table_name')})
+def insert_table_rows(called_by: str, sr_snowflake_account: pd.Series, table_name: str, df_paths: pd.DataFrame, df_table: pd.DataFrame) -> list[dict]:
+
+    """
+        The purpose of this function is to:
+        -  update a snowflake table of a few rows by inserting them with bound parameters, without putting its file on a stage
+        -  create a csv file of the updated table (only when called by main or init_compet, we already have it when called by init_snowflake)
+        Args:
+            called_by (str): The entry point function calling this function
+            sr_snowflake_account (series - one row) : Contains the snowflake account parameter to run a query
+            table_name (str): The name of the table we update
+            df_paths (dataframe): the paths of files, to know if files are encapsulated
+            df_table (dataframe): The rows of the file of the table, read as text
+        Returns:
+            The report of the rows inserted (list of dict), with their number and duration
+        Raises:
+            Exits the program if error running the function, or if not all rows are inserted (using decorator)
+    """
+    #we get schema and file related info
+    schema = table_name.split('_')[0]
     is_encapsulated = df_paths.loc[df_paths['NAME'] == table_name, 'IS_ENCAPSULATED'].iloc[0]
 
-    #we update stage and table
-    q_insert_data = sql.INSERT_DATA_QUERY.replace(sql.SCHEMA,schema).replace(sql.TABLE_NAME,table_name)
-    if (is_encapsulated == 1):
-         q_insert_data = q_insert_data.replace("#ISENCLOSED#", 
-                                           "FIELD_OPTIONALLY_ENCLOSED_BY=\'\"\' NULL_IF = (\'\', \'NULL\')")
-    else:
-         q_insert_data = q_insert_data.replace("#ISENCLOSED#", "")
+    #like the copy of the file, empty fields and NULL_IF values are inserted as null
+    lst_null_values = get_null_values(is_encapsulated)
+    lst_rows = [tuple(None if value in lst_null_values else value for value in row) for row in df_table.itertuples(index=False, name=None)]
+
+    time_start = time.perf_counter()
+    rows_loaded = 0
+    if len(lst_rows) > 0:
+        q_insert_rows = sql.INSERT_ROWS_QUERY.replace(sql.SCHEMA,schema).replace(sql.TABLE_NAME,table_name) \
+            .replace("#BINDS#", ", ".join(["%s"] * df_table.shape[1]))
+        rows_loaded = snowflake_executemany(sr_snowflake_account,q_insert_rows,sql.DATABASE,lst_rows)
+    insert_secs = time.perf_counter() - time_start
+
+    if rows_loaded != len(lst_rows):
+        raise ValueError(f"{rows_loaded} rows of {table_name} inserted instead of {len(lst_rows)}")
+    logging.info(f"SNOWFLAKE {table_name} -> {rows_loaded} ROWS INSERTED IN {insert_secs:.2f} SECS")
 
-    q_put_to_stage = sql.PUT_TO_STAGE_QUERY.replace("#FILE_PATH_ABS#",str(file_path_abs)).replace(sql.SCHEMA,schema).replace(sql.TABLE_NAME,table_name)
-    snowflake_execute(sr_snowflake_account,q_put_to_stage,sql.DATABASE)
-    snowflake_execute(sr_snowflake_account,q_insert_data,sql.DATABASE)
     #if called by main or init_compet, we need to create the file from the table
     if called_by in [var.CALLER["MAIN"],var.CALLER["COMPET"]]:
         create_table_file(sr_snowflake_account, table_name, is_encapsulated)
-    logging.info(f"SNOWFLAKE {table_name} -> UPDATING FROM PYTHON [DONE]")
+    return [{'TABLE_NAME': table_name, 'LOAD_PATH': 'INSERT', 'FILE_NAME': table_name+'.csv', 'LOAD_STATUS': 'LOADED', 'ROWS_LOADED': rows_loaded,
+             'ERRORS_SEEN': 0, 'FIRST_ERROR': None, 'LOAD_SECS': round(insert_secs, 3)}]
+
+@config_decorators.exit_program(log_filter=lambda args: {k: args[k] for k in ('called_by','lst_tables','local_folder')})
+def update_snowflake_from_python(called_by: str, sr_snowflake_account: pd.Series, lst_tables: list[str], df_paths: pd.DataFrame, local_folder: str,
+                                 files_data_dict: dict | None = None) -> pd.DataFrame:
+
+    """
+        The purpose of this function is to:
+        -  read the input files of the snowflake tables
+            * when called by main or init_compet, the input file created by python have the name of the table, minus "landing_"
+            * when called by init_snowflake, the input file has the same name, as we downloaded the table file directly from dropbox
+        -  insert the rows of the tables of SNOWFLAKE_INSERT_MAX_ROWS rows or less (see insert_table_rows)
+        -  put the files of the other tables at once, on a stage path of the run, and update each table from its file put (see copy_table_from_stage)
+            * the files are put as csv, or as parquet according to SNOWFLAKE_LANDING_FILE_FORMAT: 
+              written from the dataframe the landing file was created from, if in files_data_dict, otherwise from the file
+        -  store the report of the load (path and duration of the load of each table) in the snowflake_load_report file
+        Args:
+            called_by (str): The entry point function calling this function
+            sr_snowflake_account (series - one row) : Contains the snowflake account parameter to run a query
+            lst_tables (list): The names of the tables we update
+            df_paths (dataframe): the paths of files, to know if files are encapsulated
+            local_folder (str): The local folder containing the files used to fill the tables
+            files_data_dict (dict): The dataframes of the run (df_<file name>), as their files were created
+        Returns:
+            The dataframe of the load report, one row per file
+        Raises:
+            Exits the program if error running the function (using decorator)
+    """
+    logging.info(f"SNOWFLAKE {lst_tables} -> UPDATING FROM PYTHON [START]")
+    stage_path = f"{var.SNOWFLAKE_LANDING_STAGE_PATH}/{datetime.now(timezone.utc).strftime('%Y%m%d%H%M%S%f')}"
+    file_format = var.SNOWFLAKE_LANDING_FILE_FORMAT
+    file_extension = var.LANDING_FILE_FORMAT_EXTENSION_MAP[file_format]
+
+    insert_args, copy_args = [], []
+    lst_files_put, put_secs = [], None
+    #the files staged are named as their table in a folder of their own, so that they are put at once and copied with a pattern
+    with tempfile.TemporaryDirectory(prefix="predict_landing_") as staging_folder:
+        for table_name in lst_tables:
+            #if called by main or init_compet, the input file have the same name than the table minus the first part "landing_"
+            if called_by in (var.CALLER["MAIN"],var.CALLER["COMPET"]):
+                file_name = '_'.join(table_name.split('_')[1:])
+            #if not, the input file is the same name
+            elif called_by == var.CALLER["SNOWFLAKE"]:
+                file_name = table_name
+
+            #reading one row more than the threshold is enough to know if the table is inserted, without reading big files
+            df_table = pd.read_csv(os.path.join(local_folder,file_name+'.csv'), dtype=str, keep_default_na=False, nrows=var.SNOWFLAKE_INSERT_MAX_ROWS + 1)
+            if len(df_table) <= var.SNOWFLAKE_INSERT_MAX_ROWS:
+                insert_args.append((called_by, sr_snowflake_account, table_name, df_paths, df_table))
+            else:
+                staged_file_path = os.path.join(staging_folder,table_name+'.'+file_extension)
+                if file_format == 'PARQUET':
+                    is_encapsulated = df_paths.loc[df_paths['NAME'] == table_name, 'IS_ENCAPSULATED'].iloc[0]
+                    df_landing = (files_data_dict or {}).get(f'df_{file_name}')
+                    if df_landing is None:
+                        df_landing = pd.read_csv(os.path.join(local_folder,file_name+'.csv'), dtype=str, keep_default_na=False)
+                    create_parquet(df_landing, staged_file_path, file_name, is_encapsulated)
+                else:
+                    shutil.copyfile(os.path.join(local_folder,file_name+'.csv'), staged_file_path)
+                copy_args.append((called_by, sr_snowflake_account, table_name, df_paths, stage_path, file_format))
+
+        if len(copy_args) > 0:
+            q_put_to_stage = sql.PUT_TO_STAGE_QUERY.replace("#FOLDER_PATH_ABS#",Path(staging_folder).resolve().as_posix()) \
+                .replace("#STAGE_PATH#",stage_path).replace("#PARALLEL#",str(var.SNOWFLAKE_PUT_PARALLEL)).replace("#FILE_EXTENSION#",file_extension)
+            time_start = time.perf_counter()
+            lst_files_put = snowflake_execute(sr_snowflake_account,q_put_to_stage,sql.DATABASE)
+            put_secs = time.perf_counter() - time_start
+            logging.info(f"SNOWFLAKE -> {len(lst_files_put)} FILES PUT ON {stage_path} IN {put_secs:.2f} SECS")
+
+    #the latency of each path is measured from the start of its first request to the end of its last one
+    time_start = time.perf_counter()
+    lst_reports = multithread_run(insert_table_rows, insert_args)
+    if len(insert_args) > 0:
+        logging.info(f"SNOWFLAKE -> {len(insert_args)} TABLES INSERTED IN {time.perf_counter() - time_start:.2f} SECS")
+    time_start = time.perf_counter()
+    lst_reports += multithread_run(copy_table_from_stage, copy_args)
+    if len(copy_args) > 0:
+        logging.info(f"SNOWFLAKE -> {len(copy_args)} TABLES STAGED IN {put_secs + time.perf_counter() - time_start:.2f} SECS")
+
+    #snowflake reports each file put: source, target, source size, target size, source compression, target compression, status...
+    df_files_put = pd.DataFrame([{'FILE_NAME': file[1], 'FILE_SIZE': file[3], 'PUT_STATUS': file[6]} for file in lst_files_put],
+                                columns=['FILE_NAME', 'FILE_SIZE', 'PUT_STATUS'])
+    df_snowflake_load_report = pd.DataFrame([file for report in lst_reports for file in report],
+                                            columns=['TABLE_NAME', 'LOAD_PATH', 'FILE_NAME', 'LOAD_STATUS', 'ROWS_LOADED', 'ERRORS_SEEN', 'FIRST_ERROR', 'LOAD_SECS'])
+    df_snowflake_load_report = df_snowflake_load_report.merge(df_files_put, on='FILE_NAME', how='left').sort_values('TABLE_NAME').reset_index(drop=True)
+    #the duration of the put is the one of all files staged, the tables inserted have no put
+    df_snowflake_load_report['PUT_SECS'] = df_snowflake_load_report['LOAD_PATH'].map({'STAGE': round(put_secs, 3) if put_secs is not None else None})
+    df_snowflake_load_report = df_snowflake_load_report[snowflake_load_report_columns]
+    create_csv(os.path.join(var.TMPF,'snowflake_load_report.csv'),df_snowflake_load_report)
+
+    logging.info(f"SNOWFLAKE {lst_tables} -> UPDATING FROM PYTHON [DONE]")
+    return df_snowflake_load_report
 
 @config_decorators.exit_program(log_filter=lambda args: {k: args[k] for k in ('called_by','lst_dbt_tables')})
 def update_snowflake_from_dbt(called_by: str, sr_snowflake_account: pd.Series, df_paths: pd.DataFrame,  lst_dbt_tables: list[str] | None = None):
@@ -289,7 +455,8 @@ def update_snowflake(called_by: str, context_dict: dict, local_folder: str):
         message_action = context_dict['sr_output_need']['MESSAGE_ACTION']
         game_action = context_dict['sr_output_need']['GAME_ACTION']
         calculation_needed = (context_dict['sr_output_need']['IS_TO_CALCULATE'] + context_dict['sr_output_need']['IS_TO_DELETE'] + context_dict['sr_output_need']['IS_TO_RECALCULATE'] > 0)
-        lst_python_tables,lst_dbt_tables = get_list_tables_to_update(called_by,df_paths,message_action,game_action,calculation_needed)
+        is_game_to_load = context_dict.get('is_game_to_load', True)
+        lst_python_tables,lst_dbt_tables = get_list_tables_to_update(called_by,df_paths,message_action,game_action,calculation_needed,is_game_to_load)
     elif called_by == var.CALLER["COMPET"]:
         lst_python_tables,lst_dbt_tables = get_list_tables_to_update(called_by,df_paths)
     
@@ -299,24 +466,19 @@ def update_snowflake(called_by: str, context_dict: dict, local_folder: str):
         
         if len(lst_python_tables) != 0:
             
-            table_args = [(called_by, 
-                        sr_snowflake_account,
-                        table_name,
-                        df_paths,
-                        local_folder) for table_name in lst_python_tables]
-            multithread_run(update_snowflake_from_python, table_args)
+            # we empty all the landing tables, the ones not loaded by the run included:
+            # dbt builds the ancestors of the tables to update, which may read any landing table
+            lst_landing_tables = df_paths.loc[df_paths['NAME'].str.startswith('landing_'), 'NAME'].tolist()
+            delete_tables_data_from_python(sr_snowflake_account, lst_landing_tables)
+            update_snowflake_from_python(called_by, sr_snowflake_account, lst_python_tables, df_paths, local_folder, context_dict)
         
         if len(lst_dbt_tables) != 0:
             update_snowflake_from_dbt(called_by, sr_snowflake_account, df_paths, lst_dbt_tables) 
         
     # in this case we do it from python with the list of downloaded table files
     elif called_by == var.CALLER["SNOWFLAKE"]:
-        file_args = [(called_by, 
-                sr_snowflake_account,
-                Path(file).stem,
-                df_paths,
-                local_folder) for file in os.listdir(local_folder)]
-        multithread_run(update_snowflake_from_python, file_args)
+        lst_tables = [Path(file).stem for file in os.listdir(local_folder)]
+        update_snowflake_from_python(called_by, sr_snowflake_account, lst_tables, df_paths, local_folder)
 
         # no direct tables to update from dbt as we just copied all data from the files into the related tables
         # we call dbt to create seeds and views
@@ -53,19 +53,22 @@ GAMEDAY_END_DETAILS_QUERY = f"""
         AND GAMEDAY = %s;
 """
 
+#Queries to open and close a transaction, for the queries run in one request - used in snowflake_actions module
+BEGIN_TRANSACTION_QUERY = """
+    BEGIN TRANSACTION;
+"""
+COMMIT_TRANSACTION_QUERY = """
+    COMMIT;
+"""
+
 #Query to delete data from a snowflake table - used in snowflake_actions module
 DELETE_DATA_QUERY = f"""
     TRUNCATE TABLE {DATABASE}.{SCHEMA}.{TABLE_NAME};
 """
 
-#Query to delete files from a snowflake stage - used in snowflake_actions module
-REMOVE_FROM_STAGE_QUERY = f"""
-    REMOVE @{DATABASE}.{SCHEMA}.%{TABLE_NAME};
-"""
-
-#Query to list table in a snowflake schema - used in snowflake_actions module
-LIST_TABLES_QUERY = f"""
-    SHOW TABLES IN {DATABASE}.{SCHEMA};
+#Query to delete the csv and parquet files left on the landing stage path by failed runs - used in snowflake_actions module
+REMOVE_FROM_STAGE_QUERY = """
+    REMOVE '#STAGE_PATH#/' PATTERN = '.*[.](csv([.]gz)?|parquet)';
 """
 
 #Query to select data from a snowflake table - used in snowflake_actions module
@@ -73,14 +76,33 @@ SELECT_TABLE_QUERY = f"""
     SELECT * FROM {DATABASE}.{SCHEMA}.{TABLE_NAME};
 """
 
-#Query to put a file in a snowflake stage - used in snowflake_actions module
-PUT_TO_STAGE_QUERY = f"""
-    PUT file://#FILE_PATH_ABS# @{DATABASE}.{SCHEMA}.%{TABLE_NAME};
+#Query to put all files of a local folder with an extension at once in a snowflake stage path - used in snowflake_actions module
+PUT_TO_STAGE_QUERY = """
+    PUT 'file://#FOLDER_PATH_ABS#/*.#FILE_EXTENSION#' '#STAGE_PATH#/' PARALLEL = #PARALLEL# AUTO_COMPRESS = TRUE;
 """
 
-#Query to copy data from a snowflake stage to a table - used in snowflake_actions module
+#Query to copy data from the file of a table in a snowflake stage path to the table, removing the file once loaded - used in snowflake_actions module
 INSERT_DATA_QUERY = f"""
     COPY INTO {DATABASE}.{SCHEMA}.{TABLE_NAME}
-    FROM @{DATABASE}.{SCHEMA}.%{TABLE_NAME}
-    FILE_FORMAT = (TYPE = 'CSV' SKIP_HEADER=1 #ISENCLOSED#);
+    FROM '#STAGE_PATH#/'
+    PATTERN = '.*/{TABLE_NAME}[.]csv[.]gz'
+    FILE_FORMAT = (TYPE = 'CSV' SKIP_HEADER=1 #ISENCLOSED#)
+    PURGE = TRUE
+    ON_ERROR = ABORT_STATEMENT;
+"""
+
+#Query to copy data from the parquet file of a table in a snowflake stage path to the table, by column name, removing the file once loaded - used in snowflake_actions module
+INSERT_DATA_PARQUET_QUERY = f"""
+    COPY INTO {DATABASE}.{SCHEMA}.{TABLE_NAME}
+    FROM '#STAGE_PATH#/'
+    PATTERN = '.*/{TABLE_NAME}[.]parquet'
+    FILE_FORMAT = (TYPE = 'PARQUET')
+    MATCH_BY_COLUMN_NAME = CASE_INSENSITIVE
+    PURGE = TRUE
+    ON_ERROR = ABORT_STATEMENT;
+"""
+
+#Query to insert rows in a snowflake table with bound parameters, without stage - used in snowflake_actions module
+INSERT_ROWS_QUERY = f"""
+    INSERT INTO {DATABASE}.{SCHEMA}.{TABLE_NAME} VALUES (#BINDS#);
 """
\ No newline at end of file
@@ -49,8 +49,7 @@ def competition_integration():
                                 df_paths=context_dict['df_paths'], 
                                 filtering_category = var.GAME_FILTERING_CATEGORY))
 
-    # We update tables in snowflake, by first removing everything on the landing (first) layer
-    snowflake_etl_process.delete_tables_data_from_python(context_dict['sr_snowflake_account_connect'], schema=var.LANDING_DATABASE_SCHEMA)
+    # We update tables in snowflake, emptying first the landing (first) layer tables loaded
     snowflake_etl_process.update_snowflake(called_by,context_dict,var.TMPF)
 
     # The new added games may have change the calendar of run, we update its file    
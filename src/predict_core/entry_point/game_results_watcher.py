@@ -0,0 +1,73 @@
+'''
+This module is an entry point of the program, it runs the game_results_watcher function
+to calculate a gameday as soon as its last result is final, instead of waiting for its scheduled CALCULATE task
+'''
+import logging
+import pandas as pd
+
+from ..config import config_decorators
+from ..config.config_multithread import multithread_run
+from ..config.config_variables import config_global_variables as var
+from ..config.config_variables import config_environment_variables as env
+from ..files_manipulation.external_files_interaction import dropbox_files_interaction as dropbox
+from ..files_manipulation.local_files_manipulation import local_environment_manipulation
+from ..files_manipulation.local_files_manipulation.specific_files_operations import specific_files_operations
+from ..games_details_extraction import games_results_watcher
+from ..tasks_management import tasks_calendar_management
+from . import main
+
+logging.basicConfig(level=logging.INFO)
+WATCHER_FILES = ["snowflake_account_connect", "task_done", "competition", "gameday_modification"]
+
+@config_decorators.exit_program(log_filter=lambda args: {})
+def game_results_watcher():
+
+    '''
+        This entry point function can be called directly by the user or GitHub action
+        Its purpose is to run the next CALCULATE task as soon as the results of its gameday are final
+        It:
+        - downloads the files needed to find the task locally from DropBox, without modifying any file
+        - watches the results of the gameday of the next task, if it is a CALCULATE task due soon
+        - runs main for this task once all results are final, else lets the scheduled run calculate it
+    '''
+    logging.info("WATCHER -> START")
+    called_by = var.CALLER["MAIN"]
+    env.check_environment_variable(called_by)
+    context_dict = {}
+
+    local_environment_manipulation.create_local_folder()
+    context_dict.update(specific_files_operations.get_paths_file_details())
+    download_args = [(file_name, var.TMPF, context_dict['df_paths']) for file_name in WATCHER_FILES]
+    results = multithread_run(dropbox.get_locally, download_args)
+    context_dict.update({k: v for r in results for k, v in r.items()})
+
+    ts_now_utc = pd.Timestamp.now(tz="UTC").tz_localize(None)
+    df_calendar = tasks_calendar_management.get_calendar(context_dict['sr_snowflake_account_connect'])
+    sr_task = games_results_watcher.get_task_to_watch(df_calendar, context_dict['df_task_done'], ts_now_utc)
+    local_environment_manipulation.destroy_local_folder()
+    if sr_task is None:
+        logging.info("WATCHER -> NO CALCULATE TASK TO WATCH - END")
+        return
+
+    df_competition = context_dict['df_competition']
+    competition_source = df_competition[(df_competition['SEASON_ID'] == sr_task['SEASON_ID']) &
+                                        (df_competition['COMPETITION_SOURCE_ID'] == sr_task['COMPETITION_SOURCE_ID'])].iloc[0]['COMPETITION_SOURCE']
+    # like games extraction, the games of a gameday modified are the ones listed in gameday_modification
+    df_gameday_modification = context_dict['df_gameday_modification']
+    sr_games_to_watch = df_gameday_modification[(df_gameday_modification['SEASON_ID'] == sr_task['SEASON_ID']) &
+                                                (df_gameday_modification['GAMEDAY_MODIFIED'] == sr_task['GAMEDAY'])]['GAME_SOURCE_ID']
+
+    ts_deadline_utc = min(sr_task['TS_TASK_UTC'], ts_now_utc + pd.Timedelta(minutes=var.GAME_WATCHER_MAX_DURATION_MINUTES))
+    is_final = games_results_watcher.watch_gameday_results(competition_source, sr_task['COMPETITION_SOURCE_ID'], sr_task['GAMEDAY'],
+                                                           sr_games_to_watch, sr_task['TS_TASK_UTC'], ts_deadline_utc)
+    if not is_final:
+        logging.info("WATCHER -> RESULTS NOT FINAL - THE SCHEDULED RUN WILL CALCULATE - END")
+        return
+
+    #the task is run now, as if it was its time: it is then done and not run again at its scheduled time
+    logging.info(f"WATCHER -> RUNNING {sr_task['TASK_RUN']} {sr_task['SEASON_ID']} / {sr_task['GAMEDAY']} BEFORE ITS TIME {sr_task['TS_TASK_UTC']}")
+    main.main(str_current_run_time_utc = sr_task['TS_TASK_UTC'].strftime("%Y-%m-%d %H:%M:%S.000"))
+    logging.info("WATCHER -> END")
+
+if __name__ == "__main__":
+    game_results_watcher()
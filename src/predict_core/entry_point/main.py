@@ -16,8 +16,12 @@ from ..files_manipulation.local_files_manipulation.specific_files_operations.spe
 from ..tasks_management import output_need_calculation
 from ..tasks_management import tasks_calendar_management
 from ..games_details_extraction import games_details_extraction
+from ..games_details_extraction import games_calendar_cache
+from ..games_details_extraction import games_loading_diff
 from ..forums_interaction import messages_details_extraction
 from ..forums_interaction import messages_posting_process
+from ..forums_interaction import forums_sessions_management
+from ..forums_interaction import messages_posting_ledger
 from ..database_interaction.snowflake_etl_process import snowflake_etl_process
 
 logging.basicConfig(level=logging.INFO)
@@ -35,7 +39,20 @@ def process_games(context_dict: dict) -> dict:
             Exits the program if error running the function (using decorator)
     '''
 
+    #the calendars of competitions fetched by previous runs are reused while valid
+    games_calendar_cache.open_games_calendar_cache(context_dict['df_game_calendar_cache'])
     context_dict['df_game'] = games_details_extraction.extract_games_from_need(context_dict['sr_output_need'],context_dict['df_competition'],context_dict['df_gameday_modification'])
+    context_dict['df_game_calendar_cache'] = games_calendar_cache.close_games_calendar_cache()
+
+    #the games are loaded only if one changed since last load, or if the task has an action on their gameday
+    context_dict['dict_game_change'] = games_loading_diff.diff_games(context_dict['df_game'], context_dict['df_game_loaded_snapshot'])
+    context_dict['is_game_to_load'] = games_loading_diff.is_game_load_needed(context_dict['dict_game_change'], context_dict['sr_output_need'])
+    if context_dict['is_game_to_load']:
+        #only the games changed are landed, unless the task has an action on their gameday
+        context_dict['df_game'] = games_loading_diff.filter_games_to_load(context_dict['df_game'], context_dict['df_game_loaded_snapshot'], context_dict['sr_output_need'])
+        context_dict['df_game_loaded_snapshot'] = games_loading_diff.update_game_loaded_snapshot(context_dict['df_game'], context_dict['df_game_loaded_snapshot'])
+    else:
+        logging.info("GAME -> NO GAME CHANGED SINCE LAST LOAD - NOT LOADED")
     
     # we filter game files, to get only inputs related to those games   
     context_dict.update(files_manipulation.filter_data(files_data_dict = context_dict, df_paths=context_dict['df_paths'], filtering_category = var.GAME_FILTERING_CATEGORY))
@@ -55,9 +72,11 @@ def process_messages(context_dict: dict) -> dict:
         '''
 
         # We want to extract messages from the forum and download the input files related                     
-        context_dict['df_message_check'],context_dict['extraction_time_utc']= \
+        context_dict['df_message_check'],context_dict['extraction_time_utc'],context_dict['df_message_topic_state'],context_dict['df_message_page_cache']= \
             messages_details_extraction.extract_messages(context_dict['sr_snowflake_account_connect'],
-                                                         context_dict['sr_output_need'])            
+                                                         context_dict['sr_output_need'],
+                                                         context_dict['df_message_topic_state'],
+                                                         context_dict['df_message_page_cache'])            
 
         # we filter messages files, to get only inputs related to those messages   
         context_dict.update(files_manipulation.filter_data(files_data_dict = context_dict, 
@@ -83,9 +102,12 @@ def process_messages(context_dict: dict) -> dict:
             files_manipulation.create_csv(os.path.join(var.TMPF,'message.csv'),context_dict['df_message'],
                                           var.MESSAGE_FILE_ENCAPSULATED) 
 
-            # We modify message_check_ts with extraction time
-            context_dict['df_message_check_ts'].loc[context_dict['df_message_check_ts']['SEASON_ID']\
-                             == context_dict['sr_output_need']['SEASON_ID'], 'LAST_CHECK_TS_UTC'] = context_dict['extraction_time_utc'] 
+            # We modify message_check_ts with extraction time, unless topics were skipped: their edited messages must be extracted again by next task
+            if messages_details_extraction.is_topic_skip_applied(context_dict['sr_output_need']):
+                logging.info("MESSAGE -> TOPICS SKIPPED - CHECK TIME NOT MODIFIED")
+            else:
+                context_dict['df_message_check_ts'].loc[context_dict['df_message_check_ts']['SEASON_ID']\
+                                 == context_dict['sr_output_need']['SEASON_ID'], 'LAST_CHECK_TS_UTC'] = context_dict['extraction_time_utc'] 
             files_manipulation.create_csv(os.path.join(var.TMPF,'message_check_ts.csv'),context_dict['df_message_check_ts']) 
 
         return context_dict
@@ -123,7 +145,7 @@ def display_check_string(context_dict: dict) -> str:
         return check_string
 
 @config_decorators.exit_program(log_filter=lambda args: {})
-def main():
+def main(str_current_run_time_utc: str | None = None):
     
     '''
     
@@ -136,6 +158,8 @@ def main():
         - generate the output need
         - updates snowflake database according to the output need
         - post message on forums
+        Args:
+            str_current_run_time_utc (str): if given, the tasks of this time are run instead of the ones of the next run time (game results watcher)
         
     '''
 
@@ -146,7 +170,7 @@ def main():
 
     #We create the environment to work with dropbox and local files, and download initial files we will need for process
     dropbox.initiate_folder()
-    context_dict.update(local_environment_manipulation.initiate_local_environment(called_by))
+    context_dict.update(local_environment_manipulation.initiate_local_environment(called_by, str_current_run_time_utc))
     
     #We create the output_need file - The next algorithm of run depends on its values
     context_dict['sr_output_need'] = output_need_calculation.generate_output_need(context_dict)
@@ -160,12 +184,11 @@ def main():
     if ( context_dict['sr_output_need']['MESSAGE_ACTION'] in (var.MESSAGE_ACTION_MAP["RUN"],var.MESSAGE_ACTION_MAP["CHECK"])):
         context_dict = process_messages(context_dict)
     
-    #if either messages or games are running
+    #if either messages or games are running - games unchanged since last load are not loaded again
     if ( context_dict['sr_output_need']['MESSAGE_ACTION'] in (var.MESSAGE_ACTION_MAP["RUN"],var.MESSAGE_ACTION_MAP["CHECK"]) 
-        or context_dict['sr_output_need']['GAME_ACTION'] == var.GAME_ACTION_MAP["RUN"]):
+        or (context_dict['sr_output_need']['GAME_ACTION'] == var.GAME_ACTION_MAP["RUN"] and context_dict['is_game_to_load'])):
         
-        # We update tables in snowflake
-        snowflake_etl_process.delete_tables_data_from_python(context_dict['sr_snowflake_account_connect'],"LANDING")
+        # We update tables in snowflake, emptying first the landing tables loaded
         snowflake_etl_process.update_snowflake(called_by,context_dict, var.TMPF)
     
     # The new added games or just ran task may have change the calendar of run
@@ -178,7 +201,12 @@ def main():
         posting_args = [(df_topics.iloc[i].to_dict(), 
                          output_param_dict[f"MESSAGE_{df_topics.iloc[i]['FORUM_COUNTRY']}_{df_topics.iloc[i]['FORUM_SOURCE']}"])
             for i in range(len(df_topics))]   
+        #the topics of a forum share its session, logged in once (or restored with the cookies of previous runs)
+        forums_sessions_management.open_forums_sessions(context_dict['df_forum_session'])
+        messages_posting_ledger.open_posting_ledger(context_dict['df_message_posting_ledger'])
         multithread_run(messages_posting_process.post_message, posting_args)
+        context_dict['df_forum_session'] = forums_sessions_management.close_forums_sessions()
+        context_dict['df_message_posting_ledger'] = messages_posting_ledger.close_posting_ledger()
     
     local_environment_manipulation.terminate_local_environment(called_by,context_dict)
     
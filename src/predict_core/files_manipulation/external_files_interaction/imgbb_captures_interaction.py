@@ -3,9 +3,9 @@
     It pushes capture on the website, and get the url
 '''
 import os
-import requests
 
 from ...config import config_decorators
+from ...config import config_http_transport
 
 @config_decorators.exit_program(log_filter=lambda args: dict(args))
 @config_decorators.retry_function(log_filter=lambda args: dict(args))
@@ -31,7 +31,7 @@ def push_capture_online(image_path: str) -> str:
         files = {
             "image": file,
         }
-        response = requests.post(url, data=payload, files=files)
+        response = config_http_transport.send_request("POST", url, data=payload, files=files)
         
     image_url = response.json()['data']['url']
     return image_url
\ No newline at end of file
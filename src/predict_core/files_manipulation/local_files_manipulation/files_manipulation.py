@@ -1,7 +1,10 @@
 '''
     The purpose of this module is to interact with files by
      - creating and terminating local folders which will store them temporarily
+     - compressing the texts stored in csv files (pages and calendars cached)
 '''
+import base64
+import gzip
 import logging
 import os
 import pandas as pd
@@ -12,6 +15,7 @@ import csv
 import yaml
 from matplotlib.figure import Figure
 import networkx as nx
+from PIL import Image
 
 from ...config import config_decorators
 from ...config.config_variables import config_global_variables as var
@@ -35,6 +39,17 @@ def read_json(local_file_path: str) -> list :
         lst = json.load(file)
     return lst
 
+def get_declared_columns(filename: str) -> dict:
+
+    """
+        Gets the columns declared for a file in file_check.json, with their type
+        Args:
+            filename (str): The name of the file, with its extension
+        Returns:
+            The types of the columns declared (dict), empty if the file has none
+    """
+    return read_json(Path(__file__).resolve().parent / "file_check.json")["schemas"].get(filename, {}).get("columns", {}) # NOSONAR
+
 @config_decorators.exit_program(log_filter=lambda args: dict(args))
 def read_and_check_csv(local_file_path: str, is_encapsulated: Literal[0, 1] = 0) -> pd.DataFrame:
     """
@@ -54,12 +69,16 @@ def read_and_check_csv(local_file_path: str, is_encapsulated: Literal[0, 1] = 0)
         df = pd.read_csv(local_file_path,header=0)
 
     filename = Path(local_file_path).name
-    expected_columns = read_json(Path(__file__).resolve().parent / "file_check.json")["schemas"].get(filename, {}).get("columns", {}) # NOSONAR
+    expected_columns = get_declared_columns(filename)
     actual_columns = df.columns.tolist()
     missing = [col for col in expected_columns if col not in actual_columns]
     if missing:
         raise ValueError(f"Columns missing in {filename}: {missing}")
 
+    #a file with headers only (like a state file never filled) is read as object columns: it gets the declared types
+    if df.empty:
+        df = df.astype(expected_columns)
+
     type_mismatches = []
     for col, expected_type in expected_columns.items():
         actual_type = str(df[col].dtype)
@@ -112,7 +131,7 @@ def read_and_check_yml_as_serie(local_file_path: str) -> pd.Series:
         series = pd.Series(content)
 
     filename = Path(local_file_path).name
-    expected_columns = read_json(Path(__file__).resolve().parent / "file_check.json")["schemas"].get(filename, {}).get("columns", {}) # NOSONAR
+    expected_columns = get_declared_columns(filename)
     actual_columns = series.index.tolist()
     missing = [col for col in expected_columns if col not in actual_columns]
     if missing:
@@ -211,6 +230,64 @@ def create_jpg(local_file_path: str, fig: Figure):
     fig.tight_layout()
     fig.savefig(local_file_path, facecolor=fig.get_facecolor(), format='jpg', dpi=150, bbox_inches='tight')
 
+@config_decorators.exit_program(log_filter=lambda args: {k: args[k] for k in ('local_file_path','lst_local_file_paths') })
+def create_composite_jpg(local_file_path: str, lst_local_file_paths: list[str], margin: int = 0):
+
+    """
+        Creates a jpg file stacking vertically several jpg files, each one centered on a white background
+        Args:
+            local_file_path (str) : The local path of the composite file
+            lst_local_file_paths (list) : The local paths of the jpg files to stack, from top to bottom
+            margin (int) : The number of white pixels between two stacked files
+        Raises:
+            Exits the program if error running the function (using decorator)
+    """
+    if len(lst_local_file_paths) == 0:
+        raise ValueError("No jpg file to stack in the composite file")
+
+    images = [Image.open(path).convert('RGB') for path in lst_local_file_paths]
+    width = max(image.width for image in images)
+    height = sum(image.height for image in images) + margin * (len(images) - 1)
+
+    composite = Image.new('RGB', (width, height), 'white')
+    top = 0
+    for image in images:
+        composite.paste(image, ((width - image.width) // 2, top))
+        top += image.height + margin
+        image.close()
+
+    composite.save(local_file_path, format='JPEG', quality=90)
+
+@config_decorators.raise_issue_to_caller(log_filter=lambda args: {})
+def compress_text(text: str) -> str:
+
+    """
+        Compresses a text with gzip, to store it in a csv file
+        Args:
+            text (str): the text to compress
+        Returns:
+            the compressed text, encoded in base64 (str)
+        Raises:
+            Raise the issue to the caller if exception
+    """
+
+    return base64.b64encode(gzip.compress(text.encode('utf-8'), mtime=0)).decode('ascii')
+
+@config_decorators.raise_issue_to_caller(log_filter=lambda args: {})
+def decompress_text(compressed_text: str) -> str:
+
+    """
+        Decompresses a text compressed by compress_text
+        Args:
+            compressed_text (str): the compressed text, encoded in base64
+        Returns:
+            the text (str)
+        Raises:
+            Raise the issue to the caller if exception
+    """
+
+    return gzip.decompress(base64.b64decode(compressed_text)).decode('utf-8')
+
 @config_decorators.exit_program(log_filter=lambda args: {k: args[k] for k in ('filtering_category',) })
 def filter_data(files_data_dict: dict, df_paths: pd.DataFrame, filtering_category: str) -> dict:
 
@@ -42,7 +42,7 @@ def destroy_local_folder():
     logging.info("FILE -> TMP FOLDER DESTROYED") 
 
 @config_decorators.exit_program(log_filter=lambda args: dict(args))
-def initiate_local_environment(called_by: str) -> dict:
+def initiate_local_environment(called_by: str, str_current_run_time_utc: str | None = None) -> dict:
 
     """
         The purpose of this function is to:
@@ -52,6 +52,7 @@ def initiate_local_environment(called_by: str) -> dict:
         - personnalize yml dbt files
         Args:
             called_by (str): the name of the function calling this function, will define precisely the flag
+            str_current_run_time_utc (str): if given, the run time to run and log instead of the next run time of the previous run (game results watcher)
         Returns:
             dictionary containing all python objects (dataframe, string) associated with files downloaded from dropbox
         Raises:
@@ -85,9 +86,11 @@ def initiate_local_environment(called_by: str) -> dict:
     context_dict.update({k: v for r in results for k, v in r.items()})
     # we copy next_run time to current_run time if called by main 
     # (the only "exe" function using the value):
-    # it was the next one of the previous run
+    # it was the next one of the previous run, unless the run time to run is given
     if called_by == var.CALLER["MAIN"]:
-        context_dict['str_current_run_time_utc'] = context_dict['str_next_run_time_utc']
+        if str_current_run_time_utc is None:
+            str_current_run_time_utc = context_dict['str_next_run_time_utc']
+        context_dict['str_current_run_time_utc'] = str_current_run_time_utc
     # We then modify and upload back the run type file to log run info on DropBox
         context_dict['df_run_type'] = specific_files_operations.modify_run_type_file(context_dict['df_run_type'],
                                             called_by, 
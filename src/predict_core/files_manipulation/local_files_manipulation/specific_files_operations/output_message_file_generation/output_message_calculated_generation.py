@@ -561,6 +561,20 @@ def get_parameters_df_management(param_dict: dict, sr_gameday_output_calculate:
     '''
 
     param_df_dict = {}
+
+    #in composite mode, all tables are stacked into one capture: its url goes to #IMGDETAIL# only, the other images are blanked
+    if var.IS_CAPTURE_COMPOSITE == 1:
+        lst_df = [param_dict['SCORES_GAMEDAY_DF'], param_dict['SCORES_DETAILED_DF'], param_dict['SCORES_GLOBAL_DF']]
+        if param_dict['IS_FOR_RANK'] == 1:
+            lst_df.append(param_dict['RANK_PREDICTCHAMP_DF'])
+        url = output.manage_df_composite(lst_df, country, forum, "table_composite", sr_gameday_output_calculate, translations_dict)
+
+        param_df_dict['SCORES_DETAILED_DF_URL_'+country+'_'+forum] = url
+        param_df_dict['SCORES_GLOBAL_DF_URL_'+country+'_'+forum] = ''
+        param_df_dict['SCORES_GAMEDAY_DF_URL_'+country+'_'+forum] = ''
+        param_df_dict['RANK_PREDICTCHAMP_DF_URL_'+country+'_'+forum] = '' if param_dict['IS_FOR_RANK'] == 1 else None
+        return param_df_dict
+
     param_df_dict['SCORES_DETAILED_DF_URL_'+country+'_'+forum] = output.manage_df(param_dict['SCORES_DETAILED_DF'], country, forum, "table_score_details", sr_gameday_output_calculate, translations_dict)
     param_df_dict['SCORES_GLOBAL_DF_URL_'+country+'_'+forum] = output.manage_df(param_dict['SCORES_GLOBAL_DF'], country, forum, "table_global_scores", sr_gameday_output_calculate, translations_dict)
     param_df_dict['SCORES_GAMEDAY_DF_URL_'+country+'_'+forum] = output.manage_df(param_dict['SCORES_GAMEDAY_DF'], country, forum, "table_gameday_scores", sr_gameday_output_calculate, translations_dict)
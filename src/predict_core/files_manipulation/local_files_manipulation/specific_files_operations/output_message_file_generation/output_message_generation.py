@@ -357,6 +357,43 @@ def manage_df(df: pd.DataFrame, country: str, forum: str, capture_name: str, sr_
 
     return url
 
+@config_decorators.exit_program(log_filter=lambda args: {k: args[k] for k in ('country','forum','capture_name', 'sr_gameday_output')})
+def manage_df_composite(lst_df: list[pd.DataFrame], country: str, forum: str, capture_name: str, sr_gameday_output: pd.Series,translations_dict: dict) -> str:
+
+    '''
+        Manage several dataframes for the output display, within one picture:
+        - translate headers for a given country and forum
+        - capture each of them into a picture
+        - stack all pictures into one composite picture
+        - send it online (only once)
+        Inputs:
+            lst_df (list of dataframes): the dataframes we capture, from top to bottom
+            country(str): the given country
+            forum(str): the given forum
+            capture_name (str): the short name of the composite capture
+            sr_gameday_output (serie - one row): used to calculate the full name of the captures
+
+        Returns:
+            the url of the composite capture online (str)
+        Raises:
+            Exits the program if error running the function (using decorator)
+    '''
+    lst_local_paths = []
+    for i, df in enumerate(lst_df):
+        df = translate_df_headers(df, country, forum, translations_dict)
+        part_capture_name = define_filename(f"{capture_name}_part{i+1}", sr_gameday_output, 'jpg', country, forum)
+        if df.columns.nlevels == 1:
+            capture_df_oneheader(df, part_capture_name)
+        else:
+            capture_scores_detailed(df, part_capture_name)
+        lst_local_paths.append(os.path.join(var.TMPF, part_capture_name))
+
+    local_path = os.path.join(var.TMPF, define_filename(capture_name, sr_gameday_output, 'jpg', country, forum))
+    files_manipulation.create_composite_jpg(local_path, lst_local_paths, var.CAPTURE_COMPOSITE_MARGIN)
+    url = push_capture_online(local_path)
+
+    return url
+
 @config_decorators.exit_program(log_filter=lambda args: {})
 def generate_output_message(context_dict: dict):
 
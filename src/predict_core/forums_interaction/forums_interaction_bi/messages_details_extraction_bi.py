@@ -2,17 +2,32 @@
     The purpose of this module is to extract messages details coming from the BI forum 
 ''' 
 from datetime import datetime
+from functools import lru_cache
+import re
 import pandas as pd
-from bs4 import BeautifulSoup as bs
+from lxml import etree
+from lxml import html as lxml_html
 from typing import Tuple
 
 from ...config import config_decorators
 
+FRENCH_TO_ENGLISH_DATE = {
+    "janv.": "Jan", "févr.": "Feb", "mars": "Mar", "avr.": "Apr", "mai": "May", "juin": "Jun",
+    "juil.": "Jul", "août": "Aug", "sept.": "Sep", "oct.": "Oct", "nov.": "Nov", "déc.": "Dec",
+    "lun.": "Mon",  "mar.": "Tue", "mer.": "Wed", "jeu.": "Thu", "ven.": "Fri", "sam.": "Sat", "dim.": "Sun"
+}
+#one regex for all translations, longest first so "mars" and "mar." can't be mixed up
+FRENCH_TO_ENGLISH_DATE_REGEX = re.compile("|".join(re.escape(french) for french in sorted(FRENCH_TO_ENGLISH_DATE, key=len, reverse=True)))
+FORUM_TIME_FORMAT = "%a %d %b %Y %H:%M"
+ATOM_NAMESPACE = {"atom": "http://www.w3.org/2005/Atom"}
+
 @config_decorators.raise_issue_to_caller(log_filter=lambda args: {})
+@lru_cache(maxsize=4096)
 def translate_french_special_date_to_english(date_string: str) -> str:
 
     """
         Transforms a French forum special date type to english
+        Many messages share the same date string (same minute), so results are cached
         Args:
             date_string (string) : The string corresponding to the forum special french date
         Returns:
@@ -21,200 +36,263 @@ def translate_french_special_date_to_english(date_string: str) -> str:
             Raise the issue to the caller if exception
     """
 
-    french_to_english = {
-    "janv.": "Jan", "févr.": "Feb", "mars": "Mar", "avr.": "Apr", "mai": "May", "juin": "Jun",
-    "juil.": "Jul", "août": "Aug", "sept.": "Sep", "oct.": "Oct", "nov.": "Nov", "déc.": "Dec",
-    "lun.": "Mon",  "mar.": "Tue", "mer.": "Wed", "jeu.": "Thu", "ven.": "Fri", "sam.": "Sat", "dim.": "Sun"
-    }
-    for french, english in french_to_english.items():
-        date_string = date_string.replace(french, english)
-    return date_string
+    return FRENCH_TO_ENGLISH_DATE_REGEX.sub(lambda match: FRENCH_TO_ENGLISH_DATE[match.group(0)], date_string)
 
 @config_decorators.raise_issue_to_caller(log_filter=lambda args: {})
-def transform_forum_time_to_datetime(date_string: str) -> datetime:
+def transform_forum_times_to_datetime(date_strings: list[str | None]) -> list[datetime | None]:
 
     """
-        Transforms a forum date type into a datetime
+        Transforms all french forum dates of a page into datetimes
+        Each distinct date is translated once (cached) then all of them are parsed at once
         Args:
-            date_string (string) : The string corresponding to the forum date translated in english
+            date_strings (list) : The strings corresponding to the forum special french dates, or None
         Returns:
-            the datetime corresponding to the string
+            list of None (if no date) or the datetime corresponding to the string
         Raises:
             Raise the issue to the caller if exception
     """
-    
-    input_format = "%a %d %b %Y %H:%M"
-    # Parse the input date string
-    parsed_date = datetime.strptime(date_string, input_format)
-    return parsed_date
+
+    #French forum date: Lun. 01 Fev 2025 9:08:00 -> Return date: 2025-02-01 09:08:00
+    distinct_dates = list(dict.fromkeys(date for date in date_strings if date is not None))
+    parsed_dates = pd.to_datetime([translate_french_special_date_to_english(date) for date in distinct_dates], format=FORUM_TIME_FORMAT)
+    datetimes = dict(zip(distinct_dates, parsed_dates.to_pydatetime()))
+    return [datetimes[date] if date is not None else None for date in date_strings]
 
 @config_decorators.raise_issue_to_caller(log_filter=lambda args: {})
-def get_users_bi(soup: bs) -> list[str]:
+def get_pagination_bi(messagetext: str) -> Tuple[int | None, int | None]:
 
     """
-        Gets the list of users who posted from the forum HTML page
+        Gets the total number of messages of the topic and the number of messages per page, shown on top of each page
         Args:
-            soup (BeautifulSoup) : The beautiful soup string to parse
+            messagetext (string) : The HTML list of messages
         Returns:
-            list of string which represent user names
+            the total number of messages and the number of messages per page, None for both if not shown (one page topic)
         Raises:
             Raise the issue to the caller if exception
     """
 
-    #We parse using BeautifulSoup
-    users = [
-        a_tag.text.strip()
-        for span in soup.find_all('span', class_='responsive-hide')
-        if (a_tag := span.find('a', class_='username'))
-    ]
-    return users
+    #We search with regex rather than parsing the whole page again
+    #Pagination block: <div class="pagination"> 285 messages ... data-per-page="15"
+    total_match = re.search(r'<div class="pagination">\s*(\d+) messages?', messagetext)
+    per_page_match = re.search(r'data-per-page="(\d+)"', messagetext)
+    if total_match is None or per_page_match is None:
+        return None, None
+    return int(total_match.group(1)), int(per_page_match.group(1))
 
 @config_decorators.raise_issue_to_caller(log_filter=lambda args: {})
-def get_ids_bi(soup: bs) -> list[str]:
+def get_posts_fragment_bi(messagetext: str) -> str:
 
     """
-        Gets the list of message ids: it is unique for each message
+        Gets the part of the page containing the messages, without the header and footer changing on each visit (current time, session, ...)
         Args:
-            soup (BeautifulSoup) : The beautiful soup string to parse
+            messagetext (string) : The HTML list of messages
         Returns:
-            list of string id of messages
+            the HTML from the first message to the bottom action bar (or the end of the page), the whole page if no message
         Raises:
             Raise the issue to the caller if exception
-    """    
+    """
 
-    #We parse using BeautifulSoup
-    ids = [
-        int(id_tag.get('id').replace('profile', ''))
-        for id_tag in soup.find_all('dl', class_='postprofile') 
-        if id_tag.get('id') and isinstance(id_tag.get('id'), str)
-    ]
-    return ids
+    first_post_match = re.search(r'<div id="p\d+" class="post', messagetext)
+    if first_post_match is None:
+        return messagetext
+    end = messagetext.find('<div class="action-bar bar-bottom">', first_post_match.start())
+    return messagetext[first_post_match.start(): end if end != -1 else len(messagetext)]
 
 @config_decorators.raise_issue_to_caller(log_filter=lambda args: {})
-def get_creationtimes_bi(soup: bs) -> list[datetime]:
+def get_topic_feed_url_bi(forum_url: str, topic_number: int) -> str:
 
     """
-        Gets the list of messages creation time
+        Gets the url of the Atom feed of a topic (phpBB 3.1+)
         Args:
-            soup (BeautifulSoup) : The beautiful soup string to parse
+            forum_url (str): the url of the forum
+            topic_number (int): the number of the topic
         Returns:
-            list of timestamp representing the creation time
+            the url of the feed (str)
         Raises:
             Raise the issue to the caller if exception
-    """    
-    #We parse using BeautifulSoup and transform the french forum special date to timestamp
-    #French forum date: Lun. 01 Fev 2025 9:08:00 -> Return date: 2025-02-01 09:08:00
-    creationtimes = [
-            transform_forum_time_to_datetime(
-                translate_french_special_date_to_english(
-                    time_tag.get_text(strip=True)
-                )
-            )
-            for time_tag in soup.find_all("time")
-        ]
-    return creationtimes
+    """
+
+    return f"{forum_url}/app.php/feed/topic/{topic_number}"
 
 @config_decorators.raise_issue_to_caller(log_filter=lambda args: {})
-def get_contents_outerblockquote_bi(soup) -> list[str]:
+def get_active_topics_feed_url_bi(forum_url: str) -> str:
 
     """
-        Gets the content of all messages, with their outer blockquote if any
+        Gets the url of the Atom feed of active topics of the forum (phpBB 3.1+)
         Args:
-            soup (BeautifulSoup) : The beautiful soup string to parse
+            forum_url (str): the url of the forum
         Returns:
-            list of string with the content of messages shorten on one line, possibly with outer blockquotes
+            the url of the feed (str)
         Raises:
             Raise the issue to the caller if exception
-    """  
+    """
 
-    #we remove tags except outer blockquote ones
-    def keep_only_outer_blockquote_tags(html):
+    return f"{forum_url}/app.php/feed/topics_active"
 
-        intern_soup = bs(html, 'html.parser')
-        # Find all blockquotes nested inside other blockquotes and unwrap them
-        for nested in intern_soup.select('blockquote blockquote'):
-            nested.unwrap()  # Remove only the tag, keep content
+@config_decorators.raise_issue_to_caller(log_filter=lambda args: {})
+def get_feed_entries_bi(feedtext: bytes, id_regex: str) -> list[dict]:
 
-        # Now replace the remaining blockquotes with placeholders
-        for bq in intern_soup.find_all('blockquote'):
-            bq.insert_before('___BLOCKQUOTE_START___')
-            bq.insert_after('___BLOCKQUOTE_END___')
-            bq.unwrap()
+    """
+        Gets the entries of an Atom feed, with the id found in their url and their times
+        Args:
+            feedtext (bytes) : The XML of the feed
+            id_regex (str) : The regex finding the id (first group) in the url of the entry
+        Returns:
+            list of dict with ID, PUBLISHED and UPDATED (equal to PUBLISHED if missing) as strings, one per entry
+        Raises:
+            Raise the issue to the caller if exception (not a feed, entry without id or times)
+    """
 
-        text = intern_soup.get_text()
+    root = etree.fromstring(feedtext)
+    if root.tag != f"{{{ATOM_NAMESPACE['atom']}}}feed":
+        raise ValueError(f"Not an Atom feed: {root.tag}")
 
-        # Restore blockquote tags only for the outer ones
-        text = text.replace('___BLOCKQUOTE_START___', '<blockquote>')
-        text = text.replace('___BLOCKQUOTE_END___', '</blockquote>')
+    entries = []
+    for entry in root.iterfind("atom:entry", ATOM_NAMESPACE):
+        id_match = re.search(id_regex, entry.findtext("atom:id", "", ATOM_NAMESPACE))
+        published = entry.findtext("atom:published", None, ATOM_NAMESPACE)
+        updated = entry.findtext("atom:updated", published, ATOM_NAMESPACE)
+        if id_match is None or published is None:
+            raise ValueError("An entry of the feed has no id or time")
+        entries.append({'ID': int(id_match.group(1)), 'PUBLISHED': published, 'UPDATED': updated})
+    return entries
 
-        return text
+@config_decorators.raise_issue_to_caller(log_filter=lambda args: {})
+def get_feed_posts_bi(feedtext: bytes) -> pd.DataFrame:
 
-    # Now apply the transformation
-    contents = [
-        keep_only_outer_blockquote_tags(str(div))
-        for div in soup.find_all('div', class_='content')
-    ]
-    #For a better messages readibility on the database we replace all "new line" to have the message content in one line
-    contents = [c.replace('\n', ' ;;;;; ') for c in contents]
+    """
+        Gets the messages listed by the Atom feed of a topic (the last ones created)
+        Args:
+            feedtext (bytes) : The XML of the feed
+        Returns:
+            the dataframe of messages with MESSAGE_FORUM_ID, PUBLISHED_UTC (creation) and UPDATED_UTC (last edition or creation), one row per message
+        Raises:
+            Raise the issue to the caller if exception (not a feed, message without id or times)
+    """
 
-    return contents
+    #each entry id is the url of the message: .../viewtopic.php?p=38618#p38618
+    entries = get_feed_entries_bi(feedtext, r"[?&]p=(\d+)")
+    df_feed = pd.DataFrame(entries, columns=['ID','PUBLISHED','UPDATED'])
+    return pd.DataFrame({
+        'MESSAGE_FORUM_ID': df_feed['ID'].astype('int64'),
+        'PUBLISHED_UTC': pd.to_datetime(df_feed['PUBLISHED'], utc=True).dt.tz_localize(None),
+        'UPDATED_UTC': pd.to_datetime(df_feed['UPDATED'], utc=True).dt.tz_localize(None)
+    })
 
 @config_decorators.raise_issue_to_caller(log_filter=lambda args: {})
-def get_editiontimes_bi(soup: bs) -> list[datetime | None]:
+def get_feed_topics_bi(feedtext: bytes) -> pd.DataFrame:
 
     """
-        Gets the edition time of all messages if they exist (messages edited)
+        Gets the topics listed by the Atom feed of active topics (the ones with the last messages posted)
         Args:
-            soup (BeautifulSoup) : The beautiful soup string to parse
+            feedtext (bytes) : The XML of the feed
         Returns:
-            list of None (if not edited) or timestamp corresponding to the edition time
+            the dataframe of topics with TOPIC_NUMBER and LAST_POST_UTC (creation of its last message), one row per topic
+        Raises:
+            Raise the issue to the caller if exception (not a feed, topic without id or times)
+    """
+
+    #each entry id is the url of the last message of the topic: .../viewtopic.php?t=108506&p=38650#p38650
+    entries = get_feed_entries_bi(feedtext, r"[?&]t=(\d+)")
+    df_feed = pd.DataFrame(entries, columns=['ID','PUBLISHED','UPDATED'])
+    return pd.DataFrame({
+        'TOPIC_NUMBER': df_feed['ID'].astype('int64'),
+        'LAST_POST_UTC': pd.to_datetime(df_feed['UPDATED'], utc=True).dt.tz_localize(None)
+    })
+
+@config_decorators.raise_issue_to_caller(log_filter=lambda args: {})
+def get_text_outerblockquote_bi(element: lxml_html.HtmlElement, is_in_blockquote: bool = False) -> str:
+
+    """
+        Gets the text of a lxml element, keeping only its outer blockquote tags
+        Args:
+            element (lxml element) : The element to get the text from
+            is_in_blockquote (bool) : If the element is already inside a blockquote
+        Returns:
+            the text of the element, possibly with outer blockquotes
         Raises:
             Raise the issue to the caller if exception
     """
-    
-    #We parse using BeautifulSoup
-    # Find all messages
-    messages = soup.find_all("div", class_="postbody")
-    
-    result = []
-
-    # Iterate over all messages and extract the cleaned edition string
-    for message in messages:
-        # Search for the notice containing "Modifié en dernier par"
-        notice = message.find("div", class_="notice")
-        if notice:
-            # Extract the edition string text
-            text = notice.get_text(strip=True)
-            # Find the part of the text starting with "Modifié en dernier par"
-            if "Modifié en dernier par" in text:
-                raw_date = text.split("Modifié en dernier par")[1].strip()
-                # Clean the string to remove the username and extra details
-                parts = raw_date.split("le ")
-                if len(parts) > 1:
-                    result.append(parts[1].split(",")[0].strip())
-                else:
-                    result.append(None)
+
+    #like BeautifulSoup get_text, we keep texts of tags (not comments) and texts following them
+    parts = [element.text or '']
+    for child in element:
+        if isinstance(child.tag, str):
+            if child.tag == 'blockquote' and not is_in_blockquote:
+                parts.extend(['<blockquote>', get_text_outerblockquote_bi(child, True), '</blockquote>'])
             else:
-                result.append(None)
-        else:
-            result.append(None)
-            
-    #We transform special type french forum dates into a timestamp
-    #French forum date: Lun. 01 Fev 2025 9:08:00 -> Return date: 2025-02-01 09:08:00
-    result_en = [translate_french_special_date_to_english(res) if res is not None else None for res in result]
-    result_date = [transform_forum_time_to_datetime(res) if res is not None else None for res in result_en]
-    
-    return result_date
+                parts.append(get_text_outerblockquote_bi(child, is_in_blockquote))
+        parts.append(child.tail or '')
+    return ''.join(parts)
+
+@config_decorators.raise_issue_to_caller(log_filter=lambda args: {})
+def get_posts_bi(messagetext: str) -> list[dict]:
+
+    """
+        Gets details of all messages from the forum HTML page, in one pass over the posts
+        The content keeps its outer blockquotes only, and the edition time is None if the message was never edited
+        Args:
+            messagetext (string) : The HTML list of messages
+        Returns:
+            list of data dictionary (one per message) with user, id, creation time, content and edition time
+        Raises:
+            Raise the issue to the caller if exception (for example, if a detail is missing for a message)
+    """
+
+    if not messagetext.strip():
+        return []
+
+    #we get details of each post while walking once through the page: each detail found belongs to the last post met.
+    #each post begins with a div having the class post and an id "p" + message id
+    posts = []
+    for element in lxml_html.fromstring(messagetext).iter(tag=etree.Element):
+        classes = (element.get('class') or '').split()
+        if element.tag == 'div' and 'post' in classes and (element.get('id') or '').startswith('p'):
+            posts.append({'USER': None, 'MESSAGE_FORUM_ID': None, 'CREATION_TIME_LOCAL': None, 'EDITION_TIME_LOCAL': None, 'MESSAGE_CONTENT': None})
+            post_edition_notice = None
+        elif not posts:
+            continue
+        elif element.tag == 'dl' and 'postprofile' in classes and posts[-1]['MESSAGE_FORUM_ID'] is None:
+            posts[-1]['MESSAGE_FORUM_ID'] = int(element.get('id').replace('profile', ''))
+        elif element.tag == 'a' and 'username' in classes and posts[-1]['USER'] is None \
+            and any('responsive-hide' in (parent.get('class') or '').split() for parent in element.iterancestors('span')):
+            posts[-1]['USER'] = element.text_content().strip()
+        elif element.tag == 'time' and posts[-1]['CREATION_TIME_LOCAL'] is None:
+            posts[-1]['CREATION_TIME_LOCAL'] = ''.join(text.strip() for text in element.itertext(tag=etree.Element))
+        elif element.tag == 'div' and 'content' in classes and posts[-1]['MESSAGE_CONTENT'] is None:
+            #For a better messages readibility on the database we replace all "new line" to have the message content in one line
+            posts[-1]['MESSAGE_CONTENT'] = get_text_outerblockquote_bi(element).replace('\n', ' ;;;;; ')
+        elif element.tag == 'div' and 'notice' in classes and post_edition_notice is None \
+            and any('postbody' in (parent.get('class') or '').split() for parent in element.iterancestors('div')):
+            #the edition time is found in the first notice "Modifié en dernier par <user> le <date>, modifié x fois"
+            post_edition_notice = ''.join(text.strip() for text in element.itertext(tag=etree.Element))
+            if "Modifié en dernier par" in post_edition_notice:
+                parts = post_edition_notice.split("Modifié en dernier par")[1].strip().split("le ")
+                if len(parts) > 1:
+                    posts[-1]['EDITION_TIME_LOCAL'] = parts[1].split(",")[0].strip()
+
+    #if a detail is missing for a post, we raise an error to the caller
+    for post in posts:
+        if None in (post['USER'], post['MESSAGE_FORUM_ID'], post['CREATION_TIME_LOCAL'], post['MESSAGE_CONTENT']):
+            raise ValueError(f"A problem was noticed extracting message {post['MESSAGE_FORUM_ID']}")
+
+    #We transform special type french forum dates of the page into timestamps, all at once
+    creation_times = transform_forum_times_to_datetime([post['CREATION_TIME_LOCAL'] for post in posts])
+    edition_times = transform_forum_times_to_datetime([post['EDITION_TIME_LOCAL'] for post in posts])
+    for post, creation_time, edition_time in zip(posts, creation_times, edition_times):
+        post['CREATION_TIME_LOCAL'] = creation_time
+        post['EDITION_TIME_LOCAL'] = edition_time
+    return posts
 
 @config_decorators.raise_issue_to_caller(log_filter=lambda args: {})
-def get_messages_details_bi(messagetext: str, topic_row: Tuple, start: int) -> pd.DataFrame:
+def get_messages_details_bi(messagetext: str, topic_row: Tuple, start: int | None) -> pd.DataFrame:
 
     """
         Gets details from all messages
         Args:
             messagetext (string) : The HTML list of messages
             topic_row (series): information about the topic
-            start (int): for logging purpose
+            start (int): for logging purpose - None if the offset of the page is not known
         Returns:
             the dataframe corresponding to the details extracted (one row per message)
         Raises:
@@ -224,26 +302,14 @@ def get_messages_details_bi(messagetext: str, topic_row: Tuple, start: int) -> p
     #we calculate for logging purpose
     log_print = f"{topic_row.FORUM_SOURCE} / {topic_row.TOPIC_NUMBER} / {start}"
 
-    #We get the details
-    soup = bs(messagetext, "html.parser")
-    users = get_users_bi(soup)
-    ids = get_ids_bi(soup)
-    creation_times_local = get_creationtimes_bi(soup)
-    contents = get_contents_outerblockquote_bi(soup)
-    edition_times_local = get_editiontimes_bi(soup)
-
-    #if not all list are same size we raise an error to the exit_program decorator
-    if len({len(users), len(ids), len(creation_times_local), len(contents), len(edition_times_local)}) != 1:
-        raise ValueError(f"A problem was noticed extracting messages. {log_print}")
-
-    df_messages_infos = pd.DataFrame({
-        'FORUM_SOURCE': topic_row.FORUM_SOURCE,
-        'TOPIC_NUMBER': topic_row.TOPIC_NUMBER,
-        'USER': users,
-        'MESSAGE_FORUM_ID': ids,
-        'CREATION_TIME_LOCAL': creation_times_local,
-        'EDITION_TIME_LOCAL': edition_times_local,
-        'MESSAGE_CONTENT': contents
-    })
+    #We get the details, one record per message
+    try:
+        posts = get_posts_bi(messagetext)
+    except ValueError as e:
+        raise ValueError(f"A problem was noticed extracting messages. {log_print}") from e
+
+    df_messages_infos = pd.DataFrame(posts, columns=['USER','MESSAGE_FORUM_ID','CREATION_TIME_LOCAL','EDITION_TIME_LOCAL','MESSAGE_CONTENT'])
+    df_messages_infos.insert(0, 'TOPIC_NUMBER', topic_row.TOPIC_NUMBER)
+    df_messages_infos.insert(0, 'FORUM_SOURCE', topic_row.FORUM_SOURCE)
 
-    return df_messages_infos
\ No newline at end of file
+    return df_messages_infos
@@ -5,6 +5,7 @@
 
 import logging
 import os
+import re
 import time
 from datetime import datetime
 from typing import Literal, Tuple
@@ -15,6 +16,8 @@ from bs4 import BeautifulSoup as bs
 
 from ...config import config_decorators
 from ...config.config_variables import config_global_variables as var
+from .. import forums_sessions_management
+from .. import messages_posting_ledger
 
 logging.basicConfig(level=logging.INFO)
 
@@ -87,34 +90,59 @@ def login_to_bi(session: requests.Session, login_url: str) -> Tuple[Literal[0, 1
     
     return login_post_successful, login_payload['sid']
 
+def get_posted_message_id_bi(page_text: str) -> int | None:
+
+    '''
+        Gets the id of the message posted or edited, from the link to it on the page of success
+        Inputs:
+            page_text (str): the page of success
+        Returns:
+            the id of the message (int) - None if the page has no link to a message
+    '''
+    message_link = re.search(r'viewtopic\.php\?[^"\'<>]*?\bp=(\d+)', page_text)
+    return int(message_link.group(1)) if message_link else None
+
 @config_decorators.exit_program(log_filter=lambda args: {k: args[k] for k in ('is_to_edit',) })
-def post_to_bi(message_content: str, session: requests.Session, post_url: str, sid: str, is_to_edit: Literal[0,1]):
+def post_to_bi(message_content: str, forum_session: dict, post_url: str, is_to_edit: Literal[0,1]) -> Tuple[bool, int | None]:
 
     '''
         Attempt to post to the BI forum (while already logged in)
         Inputs:
             message_content (str): message to post
-            session (requests.Session): the session while logged in
+            forum_session (dict): the session of the forum, while logged in - marked as logged out if the page shows it expired
             post_url (str): the url of the post page
-            sid (str): session id of the logging
             is_to_edit (0/1): if 1 it will go through the edit script, else the post one
         Returns:
             - a boolean (0/1) telling the sucess of the post
+            - the id of the message posted or edited, given by the page of success - None if not found
         Raises:
             Exit the porgram with issue with the function (using decorator)
     '''
 
+    session = forum_session['SESSION']
+    sid = forum_session['SID']
+    
+    post_get = session.get(post_url, verify=False) # NOSONAR
+    if 'Déconnexion' not in post_get.text:
+        #the session expired: the next try logs in again, unless another task already did
+        with forum_session['LOCK']:
+            if forum_session['SID'] == sid:
+                forum_session['IS_LOGGED_IN'] = False
+        return False, None
+    #a session restored with its cookies gets its session id from the forum, on its first page
+    if not sid:
+        with forum_session['LOCK']:
+            forum_session['SID'] = forum_session['SID'] or forums_sessions_management.get_session_sid(session)
+            sid = forum_session['SID']
     post_payload = {
         'sid' : sid,
         'message': message_content,
         'post': 'Envoyer'
     }
-    
-    post_get = session.get(post_url, verify=False) # NOSONAR
-    post_get_successful = ('Déconnexion' in post_get.text and 'form_token' in post_get.text)
+    post_get_successful = ('form_token' in post_get.text)
 
     if not post_get_successful:
-        return False
+        return False, None
 
     html_parser = "html.parser"
     soup = bs(post_get.text, html_parser)
@@ -135,13 +163,18 @@ def post_to_bi(message_content: str, session: requests.Session, post_url: str, s
                 "topic_cur_post_id": soup.find("input", {"name": "topic_cur_post_id"})["value"]
             })
     except (KeyError, TypeError, AttributeError) :
-        return False
+        return False, None
     
     post_post  = session.post(post_url, data=post_payload, verify=False) # NOSONAR
     soup = bs(post_post.text, html_parser)
-    post_post_successful = (soup.find("p", class_="error") is None)
+    post_error = soup.find("p", class_="error")
+    post_post_successful = (post_error is None)
+    if post_post_successful and is_to_edit == 0:
+        forums_sessions_management.record_post(forum_session)
+    elif not post_post_successful and var.BI_FLOOD_ERROR_STRING in post_error.text:
+        forums_sessions_management.record_flood_error(forum_session)
 
-    return post_post_successful    
+    return post_post_successful, get_posted_message_id_bi(post_post.text) if post_post_successful else None
 
 @config_decorators.exit_program(log_filter=lambda args: {k: args[k] for k in ('topic_row','is_to_edit')})
 @config_decorators.retry_function(log_filter=lambda args: {k: args[k] for k in ('topic_row','is_to_edit')})
@@ -157,6 +190,11 @@ def login_and_post_message_bi(topic_row: pd.Series, message_content: str, is_to_
             If it didn't work to post/edit, we'll retry 3 times then exit program
     '''
     
+    #We don't send edits already online, nor anything on dry runs
+    message_forum_id = topic_row['MESSAGE_NUMBER_TO_EDIT'] if is_to_edit == 1 else None
+    if not messages_posting_ledger.is_to_post(topic_row['FORUM_SOURCE'], topic_row['TOPIC_NUMBER'], message_forum_id, message_content):
+        return
+
     forum_url = os.getenv('BI_URL')
     time_max = var.TIME_MESSAGE_WAIT
     if is_to_edit == 1:
@@ -169,27 +207,38 @@ def login_and_post_message_bi(topic_row: pd.Series, message_content: str, is_to_
     login_url = forum_url +'/ucp.php?mode=login'
 
     post_successful = False
+    forum_session = forums_sessions_management.get_forum_session(topic_row['FORUM_SOURCE'])
 
-    #We will try continuously to post for a specific period
     begin_time = time.time()
     time_at_expiration = begin_time + time_max
     while ((not post_successful) and (time.time() < time_at_expiration)):
-        with requests.Session() as session:
-            #We try to login
-            login_successful, sid = login_to_bi(session,login_url)
-            
-            if login_successful:
-                # we try to post
-                post_successful = post_to_bi(message_content, session, post_url, sid, is_to_edit)
-            
-            if not (login_successful and post_successful):
-                #if it didn't work we wait one second and retry
-                time.sleep(1)
+        #We login only if the session of the forum is not
+        with forum_session['LOCK']:
+            if not forum_session['IS_LOGGED_IN']:
+                forum_session['IS_LOGGED_IN'], forum_session['SID'] = login_to_bi(forum_session['SESSION'], login_url)
+            login_successful = forum_session['IS_LOGGED_IN']
+
+        if login_successful:
+            # we try to post, the topics of the forum one at a time, past the flood interval (edits are not controlled by it)
+            # the time waiting for the turn of this topic is not taken from the period to try
+            wait_begin_time = time.time()
+            with forum_session['POST_LOCK']:
+                if is_to_edit == 0:
+                    forums_sessions_management.wait_flood_interval(forum_session)
+                time_at_expiration += time.time() - wait_begin_time
+                post_successful, posted_message_id = post_to_bi(message_content, forum_session, post_url, is_to_edit)
+
+        if not (login_successful and post_successful):
+            #if it didn't work we wait one second and retry
+            time.sleep(1)
+        else:
+            #the id of a new message is given by the page of success, else it is resolved when the message is first asked to be edited
+            messages_posting_ledger.record_posted_content(topic_row['FORUM_SOURCE'], topic_row['TOPIC_NUMBER'], 
+                                                          message_forum_id if is_to_edit == 1 else posted_message_id, message_content)
+            if is_to_edit == 1:
+                logging.info(f"MESSAGES -> EDITING WITH NEW OUTPUT ON BI / TOPIC {topic_row['TOPIC_NUMBER']} / MESSAGE {topic_row['MESSAGE_NUMBER_TO_EDIT']} [DONE] ")
             else:
-                if is_to_edit == 1:
-                    logging.info(f"MESSAGES -> EDITING WITH NEW OUTPUT ON BI / TOPIC {topic_row['TOPIC_NUMBER']} / MESSAGE {topic_row['MESSAGE_NUMBER_TO_EDIT']} [DONE] ")
-                else:
-                    logging.info(f"MESSAGES -> POSTING OUTPUT ON BI / TOPIC {topic_row['TOPIC_NUMBER']} [DONE] ")
+                logging.info(f"MESSAGES -> POSTING OUTPUT ON BI / TOPIC {topic_row['TOPIC_NUMBER']} [DONE] ")
 
     if (not post_successful):
         raise ValueError(f"BI / TOPIC {topic_row['TOPIC_NUMBER']} NOT POSTED -> Time expiration")
@@ -0,0 +1,184 @@
+'''
+    The purpose of this module is to share the sessions of forums between the posting tasks of a run:
+    - one session per forum, logged in once and used by all topics of the forum
+    - the persistent cookies of the sessions (like the autologin one) stored between runs, encrypted
+    - the scheduling of posts: one at a time per forum account, spaced past the flood interval of the forum
+'''
+
+import logging
+import os
+import threading
+import time
+import pandas as pd
+import requests
+from cryptography.fernet import Fernet, InvalidToken
+
+from ..config import config_decorators
+from ..config.config_variables import config_global_variables as var
+from ..files_manipulation.local_files_manipulation.files_manipulation import create_csv
+
+logging.basicConfig(level=logging.INFO)
+
+forums_sessions = {}
+forums_sessions_lock = threading.Lock()
+forum_session_columns = ['FORUM_SOURCE', 'COOKIE_NAME', 'COOKIE_VALUE_ENCRYPTED', 'COOKIE_DOMAIN', 'COOKIE_PATH', 'COOKIE_EXPIRES']
+
+def get_cookies_cipher() -> Fernet | None:
+
+    '''
+        Gets the cipher of the cookies stored between runs, from the key in FORUM_SESSION_KEY environment variable
+        Returns:
+            The cipher (Fernet) - None if no key is given: cookies are then not stored
+    '''
+    key = os.getenv('FORUM_SESSION_KEY')
+    return Fernet(key) if key else None
+
+def is_session_id_cookie(cookie_name: str) -> bool:
+
+    '''
+        Tells if a cookie holds the session id: phpBB cookies are named <prefix>_sid, <prefix>_k (autologin) and <prefix>_u
+        Args:
+            cookie_name (str): the name of the cookie
+        Returns:
+            True if the cookie holds the session id
+    '''
+    return cookie_name.endswith("_sid")
+
+def get_session_sid(session: requests.Session) -> str:
+
+    '''
+        Gets the session id given by the forum to a session, from its cookies
+        Args:
+            session (requests.Session): the session
+        Returns:
+            The session id (str) - empty if the forum didn't give any
+    '''
+    return next((cookie.value for cookie in session.cookies if is_session_id_cookie(cookie.name)), "")
+
+def create_forum_session(df_forum_cookies: pd.DataFrame | None = None) -> dict:
+
+    '''
+        Creates the session of a forum, with the cookies stored by previous runs
+        Cookies that can't be decrypted (no key, or another key) are not restored
+        Args:
+            df_forum_cookies (dataframe): the cookies of the forum stored by previous runs, if any
+        Returns:
+            The forum session (dict):
+            - SESSION: the requests session
+            - SID: the session id of the logging - empty for a session restored with its cookies, until the forum gives it one
+            - IS_LOGGED_IN: if the session is believed logged in, a session restored with its cookies is until a page shows the opposite
+            - LOCK: the lock the posting tasks take to log in the session
+            - POST_LOCK: the lock the posting tasks take to post, one at a time
+            - FLOOD_INTERVAL_SECS: the flood interval of the forum, learned from the flood errors
+            - LAST_POST_TIME: the time of the last message posted during the run (0 = none)
+    '''
+    session = requests.Session()
+    cipher = get_cookies_cipher()
+    now = time.time()
+    for row in (df_forum_cookies.itertuples(index=False) if df_forum_cookies is not None and cipher is not None else []):
+        #the session id is not restored, the forum gives a new one from the autologin cookie
+        if row.COOKIE_EXPIRES > now and not is_session_id_cookie(row.COOKIE_NAME):
+            try:
+                cookie_value = cipher.decrypt(row.COOKIE_VALUE_ENCRYPTED.encode()).decode()
+            except InvalidToken:
+                logging.info(f"FORUMS -> COOKIE {row.COOKIE_NAME} NOT RESTORED - ENCRYPTED WITH ANOTHER KEY")
+                continue
+            session.cookies.set(row.COOKIE_NAME, cookie_value, domain=row.COOKIE_DOMAIN, path=row.COOKIE_PATH, expires=int(row.COOKIE_EXPIRES))
+
+    return {'SESSION': session, 'SID': "", 'IS_LOGGED_IN': len(session.cookies) > 0, 'LOCK': threading.Lock(),
+            'POST_LOCK': threading.Lock(), 'FLOOD_INTERVAL_SECS': var.FORUM_FLOOD_INTERVAL_SECS, 'LAST_POST_TIME': 0.0}
+
+@config_decorators.exit_program(log_filter=lambda args: {})
+def open_forums_sessions(df_forum_session: pd.DataFrame):
+
+    '''
+        Creates the session of each forum having cookies stored by previous runs
+        Other forums get a new session on first use
+        Args:
+            df_forum_session (dataframe): the cookies stored by previous runs
+        Raises:
+            Exits the program if error running the function (using decorator)
+    '''
+    with forums_sessions_lock:
+        for forum_source, df_forum_cookies in df_forum_session.groupby('FORUM_SOURCE'):
+            forums_sessions[forum_source] = create_forum_session(df_forum_cookies)
+    logging.info(f"FORUMS -> SESSIONS RESTORED FOR {sorted(forums_sessions)}")
+
+def get_forum_session(forum_source: str) -> dict:
+
+    '''
+        Gets the session of a forum, shared by all posting tasks of the run, creating it on first call
+        Args:
+            forum_source (str): the forum
+        Returns:
+            The forum session (dict) - see create_forum_session
+    '''
+    with forums_sessions_lock:
+        if forum_source not in forums_sessions:
+            forums_sessions[forum_source] = create_forum_session()
+        return forums_sessions[forum_source]
+
+def wait_flood_interval(forum_session: dict):
+
+    '''
+        Waits until a message can be posted on the forum, just past the flood interval since the last one
+        Must be called while holding the POST_LOCK of the session
+        Args:
+            forum_session (dict): the session of the forum - see create_forum_session
+    '''
+    time_to_wait = forum_session['LAST_POST_TIME'] + forum_session['FLOOD_INTERVAL_SECS'] + var.FORUM_FLOOD_MARGIN_SECS - time.time()
+    if time_to_wait > 0:
+        time.sleep(time_to_wait)
+
+def record_post(forum_session: dict):
+
+    '''
+        Records a message posted on the forum, the flood interval starting again
+        Args:
+            forum_session (dict): the session of the forum - see create_forum_session
+    '''
+    forum_session['LAST_POST_TIME'] = time.time()
+
+def record_flood_error(forum_session: dict):
+
+    '''
+        Learns from a message rejected by the flood control of the forum: the flood interval is longer than the time since the last message
+        Args:
+            forum_session (dict): the session of the forum - see create_forum_session
+    '''
+    now = time.time()
+    if forum_session['LAST_POST_TIME'] == 0:
+        #the last message of the account was posted before the run: we can only wait the interval from now
+        forum_session['LAST_POST_TIME'] = now
+    else:
+        forum_session['FLOOD_INTERVAL_SECS'] = max(forum_session['FLOOD_INTERVAL_SECS'], now - forum_session['LAST_POST_TIME']) + var.FORUM_FLOOD_INTERVAL_STEP_SECS
+    logging.info(f"FORUMS -> FLOOD ERROR - NEXT MESSAGE {forum_session['FLOOD_INTERVAL_SECS']:.0f} SECS AFTER THE LAST ONE")
+
+@config_decorators.exit_program(log_filter=lambda args: {})
+def close_forums_sessions() -> pd.DataFrame:
+
+    '''
+        Stores the persistent cookies of the sessions for next runs, encrypted, in the forum_session file, then closes the sessions
+        Without key in FORUM_SESSION_KEY environment variable, no cookie is stored: next runs log in again
+        Returns:
+            The dataframe of the cookies stored
+        Raises:
+            Exits the program if error running the function (using decorator)
+    '''
+    cipher = get_cookies_cipher()
+    with forums_sessions_lock:
+        now = time.time()
+        #session cookies (without expiry) are not valid on next runs, and the session id is given again by the forum
+        lst_cookies = [(forum_source, cookie.name, cipher.encrypt(cookie.value.encode()).decode(), cookie.domain, cookie.path, int(cookie.expires))
+                       for forum_source, forum_session in forums_sessions.items()
+                       for cookie in forum_session['SESSION'].cookies
+                       if cipher is not None and cookie.expires is not None and cookie.expires > now and not is_session_id_cookie(cookie.name)]
+        for forum_session in forums_sessions.values():
+            forum_session['SESSION'].close()
+        forums_sessions.clear()
+
+    if cipher is None:
+        logging.info("FORUMS -> NO KEY IN FORUM_SESSION_KEY - COOKIES NOT STORED")
+    df_forum_session = pd.DataFrame(lst_cookies, columns=forum_session_columns)
+    create_csv(os.path.join(var.TMPF, 'forum_session.csv'), df_forum_session)
+    return df_forum_session
@@ -1,46 +1,401 @@
 ''' 
     The purpose of this module is to interact with forums website by:
     - getting the scope of topics: messages we want to extract
-    - then extract the messages, and their details
+    - then extract the messages, and their details: the pages of all topics are fetched on one event loop
+      under the rate limit of the forum host, and parsed meanwhile in a pool of processes
     - and / or post messages calculated by the program
 '''
 
+import asyncio
+import hashlib
 import logging
+import multiprocessing
 import warnings
 import os
-import ssl
-import urllib.request as urllib
+from concurrent.futures import Executor, ProcessPoolExecutor
+from io import StringIO
 from typing import Tuple
 
+import numpy as np
 import pandas as pd
 import pytz
 
 from ..config import config_decorators
+from ..config import config_http_transport
 from ..config.config_variables import config_global_variables as var
-from ..config.config_multithread import multithread_run
-from ..files_manipulation.local_files_manipulation.files_manipulation import create_csv
+from ..files_manipulation.local_files_manipulation.files_manipulation import create_csv, compress_text, decompress_text
 from ..database_interaction.snowflake_connection_execution import snowflake_execute
 from ..database_interaction.snowflake_etl_process import sql_queries as sql
-from .forums_interaction_bi.messages_details_extraction_bi import get_messages_details_bi
+from .forums_interaction_bi.messages_details_extraction_bi import get_messages_details_bi, get_pagination_bi, get_posts_fragment_bi, \
+                                                                get_feed_posts_bi, get_topic_feed_url_bi, get_feed_topics_bi, get_active_topics_feed_url_bi
 
 logging.basicConfig(level=logging.INFO)
 warnings.filterwarnings("ignore")
 messages_info_functions = {
     "BI": get_messages_details_bi
 }
+pagination_info_functions = {
+    "BI": get_pagination_bi
+}
+posts_fragment_functions = {
+    "BI": get_posts_fragment_bi
+}
+feed_info_functions = {
+    "BI": get_feed_posts_bi
+}
+feed_url_functions = {
+    "BI": get_topic_feed_url_bi
+}
+active_topics_info_functions = {
+    "BI": get_feed_topics_bi
+}
+active_topics_url_functions = {
+    "BI": get_active_topics_feed_url_bi
+}
+#the types of messages extracted: repeated values are stored once
+messages_dtypes = {
+    'FORUM_SOURCE': 'category', 'TOPIC_NUMBER': 'category', 'USER': 'category', 'MESSAGE_FORUM_ID': 'int64',
+    'CREATION_TIME_LOCAL': 'datetime64[ns]', 'EDITION_TIME_LOCAL': 'datetime64[ns]', 'MESSAGE_CONTENT': 'object'
+}
+
+def create_messages_columns() -> dict:
+
+    """
+        Creates empty buffers of messages, one per column, where messages of pages are appended during the crawls
+        Returns:
+            data dictionary with an empty list of arrays for each column of messages
+    """
+
+    return {col: [] for col in messages_dtypes}
+
+def append_messages_columns(messages_columns: dict, df: pd.DataFrame):
+
+    """
+        Appends the messages of a page to the buffers of messages
+        Args:
+            messages_columns (dict): the buffers of messages, updated with the messages
+            df (dataframe): the messages of a page
+    """
+
+    for col, chunks in messages_columns.items():
+        chunks.append(df[col].to_numpy())
+
+@config_decorators.raise_issue_to_caller(log_filter=lambda args: {})
+def build_messages_dataframe(messages_columns: dict) -> pd.DataFrame:
+
+    """
+        Builds the dataframe of messages from the buffers of messages, at once
+        Args:
+            messages_columns (dict): the buffers of messages
+        Returns:
+            the dataframe of messages, with compact types (categories, integers and timestamps)
+        Raises:
+            Raise the issue to the caller if exception
+    """
+
+    df = pd.DataFrame({col: np.concatenate(chunks) if chunks else np.array([], dtype=object) for col, chunks in messages_columns.items()})
+    return df.astype(messages_dtypes)
+
+def get_topic_page_url(forum_url: str, topic_row: Tuple, start: int) -> str:
+
+    """
+        Gets the url of the page of a topic beginning at a given message
+        Args:
+            forum_url (str): the url of the forum
+            topic_row (tuple) : Contains basic info about the topic
+            start (int): the offset of the first message of the page
+        Returns:
+            the url of the page (str)
+    """
+
+    return f"{forum_url}/viewtopic.php?t={topic_row.TOPIC_NUMBER}&start={start}"
+
+@config_decorators.raise_issue_to_caller(log_filter=lambda args: {k: args[k] for k in ('topic_row','start')})
+async def fetch_topic_page(topic_row: Tuple, forum_url: str, start: int, page_cache: dict | None = None) -> Tuple[str, pd.DataFrame | None]:
+
+    """
+        Gets the HTML page of a topic beginning at a given message
+        If the page is in the page cache, the request is conditional, and the messages parsed last time are reused if the page hasn't changed
+        Args:
+            topic_row (tuple) : Contains basic info about the topic
+            forum_url (str): the url of the forum
+            start (int): the offset of the first message of the page
+            page_cache (dict): the pages already downloaded per url, updated with this page - if None, no cache
+        Returns:
+            - the HTML page (str)
+            - dataframe: the messages parsed last time if the page hasn't changed, None otherwise
+        Raises:
+            Raise the issue to the caller if exception
+    """
+
+    page_url = get_topic_page_url(forum_url, topic_row, start)
+    cached_page = page_cache.get(page_url) if page_cache is not None else None
+
+    #we ask the forum to send the page only if modified, when it gave validators last time
+    headers = {}
+    if cached_page is not None and pd.notna(cached_page['ETAG']):
+        headers['If-None-Match'] = cached_page['ETAG']
+    if cached_page is not None and pd.notna(cached_page['LAST_MODIFIED']):
+        headers['If-Modified-Since'] = cached_page['LAST_MODIFIED']
+    # we overwrite security for extracting from the website
+    response = await config_http_transport.send_request_async("GET", page_url, headers=headers, verify=False) # NOSONAR # Disabled SSL verification for legacy forum with invalid certification
+
+    if response.status_code == 304 and cached_page is not None:
+        messagetext = decompress_text(cached_page['PAGE_HTML_GZIP'])
+        content_hash = cached_page['CONTENT_HASH']
+    else:
+        messagetext = response.content.decode('utf-8')
+        if page_cache is None:
+            return messagetext, None
+        #we hash only the messages, the rest of the page changes on each visit
+        posts_fragment = posts_fragment_functions.get(topic_row.FORUM_SOURCE)(messagetext)
+        content_hash = hashlib.sha256(posts_fragment.encode('utf-8')).hexdigest()
+
+    #the messages parsed last time are reused only if the page and the parsing rules haven't changed
+    is_unchanged = cached_page is not None and cached_page['CONTENT_HASH'] == content_hash \
+                   and cached_page['PARSER_VERSION'] == var.MESSAGE_PAGE_CACHE_PARSER_VERSION \
+                   and pd.notna(cached_page['PAGE_RECORDS_GZIP'])
+    page_cache[page_url] = {
+        'URL': page_url,
+        'ETAG': response.headers.get('ETag', cached_page['ETAG'] if response.status_code == 304 else None),
+        'LAST_MODIFIED': response.headers.get('Last-Modified', cached_page['LAST_MODIFIED'] if response.status_code == 304 else None),
+        'CONTENT_HASH': content_hash,
+        'PARSER_VERSION': var.MESSAGE_PAGE_CACHE_PARSER_VERSION,
+        'PAGE_HTML_GZIP': cached_page['PAGE_HTML_GZIP'] if response.status_code == 304 else compress_text(messagetext),
+        'PAGE_RECORDS_GZIP': cached_page['PAGE_RECORDS_GZIP'] if is_unchanged else None,
+        'LAST_USED_TS_UTC': pd.Timestamp.utcnow().tz_localize(None).strftime("%Y-%m-%d %H:%M:%S")
+    }
+    if not is_unchanged:
+        return messagetext, None
+    logging.info(f"MESSAGE -> FORUM {topic_row.FORUM_SOURCE} / TOPIC {topic_row.TOPIC_NUMBER} / MESSAGES {start+1} -> X UNCHANGED, REUSING PARSED MESSAGES")
+    return messagetext, pd.read_json(StringIO(decompress_text(cached_page['PAGE_RECORDS_GZIP'])), orient='table')
+
+def parse_messages_page_columns(messagetext: str, sr_topic: pd.Series, start: int) -> dict:
+
+    """
+        Gets all messages of a HTML page as columns, in a process of the parsing pool
+        Args:
+            messagetext (str): the HTML page
+            sr_topic (series - one row): Contains basic info about the topic
+            start (int): the offset of the first message of the page - None if not known
+        Returns:
+            data dictionary with the array of values of each column of messages
+    """
+
+    df = messages_info_functions.get(sr_topic['FORUM_SOURCE'])(messagetext, sr_topic, start)
+    #arrays are sent back to the event loop much faster than a dataframe
+    return {col: df[col].to_numpy() for col in df.columns}
+
+@config_decorators.raise_issue_to_caller(log_filter=lambda args: {k: args[k] for k in ('topic_row','start','message_id')})
+async def parse_messages_page(messagetext: str, topic_row: Tuple, start: int | None, parsing_executor: Executor | None = None,
+                              message_id: int | None = None) -> pd.DataFrame:
+
+    """
+        Gets all messages of a HTML page, parsed in the parsing pool if any, or else in a worker thread
+        Args:
+            messagetext (str): the HTML page
+            topic_row (tuple) : Contains basic info about the topic
+            start (int): the offset of the first message of the page - None if the page is asked from one of its messages
+            parsing_executor (executor): the pool of processes parsing the pages - if None, parsed in a worker thread
+            message_id (int): the id of the message the page is asked from, if any
+        Returns:
+            the dataframe of messages of the page
+        Raises:
+            Raise the issue to the caller if exception
+    """
+
+    if parsing_executor is None:
+        return await asyncio.to_thread(messages_info_functions.get(topic_row.FORUM_SOURCE), messagetext, topic_row, start)
+    #the row of topic is sent as a series, rows of itertuples can't be sent to another process
+    columns = await asyncio.get_running_loop().run_in_executor(parsing_executor, parse_messages_page_columns,
+                                                                messagetext, pd.Series(topic_row._asdict()), start)
+    return pd.DataFrame(columns)
+
+@config_decorators.raise_issue_to_caller(log_filter=lambda args: {k: args[k] for k in ('topic_row','start')})
+async def fetch_and_parse_topic_page(topic_row: Tuple, forum_url: str, start: int, page_cache: dict | None = None, 
+                                     parsing_executor: Executor | None = None) -> Tuple[str, pd.DataFrame]:
+
+    """
+        Gets the HTML page of a topic beginning at a given message, and its messages
+        Args:
+            topic_row (tuple) : Contains basic info about the topic
+            forum_url (str): the url of the forum
+            start (int): the offset of the first message of the page
+            page_cache (dict): the pages already downloaded per url, updated with this page and its messages - if None, no cache
+            parsing_executor (executor): the pool of processes parsing the pages - if None, parsed in a worker thread
+        Returns:
+            - the HTML page (str)
+            - dataframe: the messages of the page
+        Raises:
+            Raise the issue to the caller if exception
+    """
+
+    messagetext, df = await fetch_topic_page(topic_row, forum_url, start, page_cache)
+    #we get all messages from the page, unless parsed last time on the same page
+    if df is None:
+        df = await parse_messages_page(messagetext, topic_row, start, parsing_executor)
+        page_url = get_topic_page_url(forum_url, topic_row, start)
+        if page_cache is not None and page_url in page_cache:
+            page_cache[page_url]['PAGE_RECORDS_GZIP'] = compress_text(df.to_json(orient='table', index=False, date_unit='s'))
+    return messagetext, df
+
+@config_decorators.raise_issue_to_caller(log_filter=lambda args: {k: args[k] for k in ('topic_row','lst_start')})
+async def prefetch_topic_pages(topic_row: Tuple, forum_url: str, lst_start: list[int], page_cache: dict | None = None, 
+                               parsing_executor: Executor | None = None) -> dict:
+
+    """
+        Gets concurrently several HTML pages of a topic and their messages, each page being parsed as soon as fetched
+        Args:
+            topic_row (tuple) : Contains basic info about the topic
+            forum_url (str): the url of the forum
+            lst_start (list): the offsets of the first message of each page
+            page_cache (dict): the pages already downloaded per url, updated with these pages - if None, no cache
+            parsing_executor (executor): the pool of processes parsing the pages - if None, parsed in worker threads
+        Returns:
+            data dictionary with the HTML page (str) and its messages (dataframe), for each offset
+        Raises:
+            Raise the issue to the caller if exception
+    """
+
+    logging.info(f"MESSAGE -> PREFETCHING FORUM {topic_row.FORUM_SOURCE} / TOPIC {topic_row.TOPIC_NUMBER} / {len(lst_start)} PAGES FROM MESSAGE {lst_start[0]+1}")
+    #the pages wait on the event loop for their turn on the forum host, and come back in the order of the offsets
+    results = await asyncio.gather(*(fetch_and_parse_topic_page(topic_row, forum_url, start, page_cache, parsing_executor) for start in lst_start))
+    return dict(zip(lst_start, results))
+
+@config_decorators.raise_issue_to_caller(log_filter=lambda args: {})
+def filter_messages_in_time_range(df: pd.DataFrame, ts_message_extract_min_local: str, ts_message_extract_max_local: str) -> pd.DataFrame:
+
+    """
+        Keeps the messages created (and not edited) or edited in the time range
+        Args:
+            df (dataframe): the messages of a page
+            ts_message_extract_min_local (str): the min of the range of time, in the local time of the topic
+            ts_message_extract_max_local (str): the max of the range of time, in the local time of the topic
+        Returns:
+            the dataframe of messages in the time range
+        Raises:
+            Raise the issue to the caller if exception
+    """
+
+    # Filter on timestamp range (either creation date with none edition or edition date)
+    creation_with_edition_none = df['CREATION_TIME_LOCAL'].between(ts_message_extract_min_local, ts_message_extract_max_local) & df['EDITION_TIME_LOCAL'].isna()
+    edition = df['EDITION_TIME_LOCAL'].between(ts_message_extract_min_local, ts_message_extract_max_local)
+    return df[creation_with_edition_none | edition]
+
+@config_decorators.raise_issue_to_caller(log_filter=lambda args: {k: args[k] for k in ('topic_row',)})
+async def get_changed_message_ids_from_feed(topic_row: Tuple, forum_url: str, ts_message_extract_min_utc: pd.Timestamp) -> list[int] | None:
+
+    """
+        Gets the messages created or edited since a time from the Atom feed of the topic, without crawling its pages
+        Args:
+            topic_row (tuple) : Contains basic info about the topic
+            forum_url (str): the url of the forum
+            ts_message_extract_min_utc (timestamp utc): the min of the range of time for messages extraction
+        Returns:
+            the sorted ids of messages created or edited since the time, 
+            or None if the forum has no feed, if the feed is unavailable or if it doesn't go back to the time
+        Raises:
+            Raise the issue to the caller if exception
+    """
+
+    get_feed_url = feed_url_functions.get(topic_row.FORUM_SOURCE)
+    if get_feed_url is None:
+        return None
+    try:
+        response = await config_http_transport.send_request_async("GET", get_feed_url(forum_url, topic_row.TOPIC_NUMBER), verify=False) # NOSONAR # Disabled SSL verification for legacy forum with invalid certification
+        df_feed = feed_info_functions.get(topic_row.FORUM_SOURCE)(response.content)
+    except Exception as e:
+        logging.info(f"MESSAGE -> FEED UNAVAILABLE FORUM {topic_row.FORUM_SOURCE} / TOPIC {topic_row.TOPIC_NUMBER}: {e}")
+        return None
+
+    #the feed lists the last messages created only: some new messages might be missing if its oldest one is in the time range
+    if df_feed.empty or df_feed['PUBLISHED_UTC'].min() >= ts_message_extract_min_utc:
+        logging.info(f"MESSAGE -> FEED TOO SHORT FORUM {topic_row.FORUM_SOURCE} / TOPIC {topic_row.TOPIC_NUMBER}")
+        return None
+    return sorted(df_feed.loc[df_feed['UPDATED_UTC'] >= ts_message_extract_min_utc, 'MESSAGE_FORUM_ID'].tolist())
+
+@config_decorators.raise_issue_to_caller(log_filter=lambda args: {k: args[k] for k in ('topic_row','message_id')})
+async def fetch_message_page(topic_row: Tuple, forum_url: str, message_id: int) -> str:
+
+    """
+        Gets the HTML page of a topic containing a given message
+        Args:
+            topic_row (tuple) : Contains basic info about the topic
+            forum_url (str): the url of the forum
+            message_id (int): the id of the message on the forum
+        Returns:
+            the HTML page (str)
+        Raises:
+            Raise the issue to the caller if exception
+    """
+
+    # we overwrite security for extracting from the website
+    response = await config_http_transport.send_request_async("GET", f"{forum_url}/viewtopic.php?p={message_id}", verify=False) # NOSONAR # Disabled SSL verification for legacy forum with invalid certification
+    return response.content.decode('utf-8')
+
+@config_decorators.raise_issue_to_caller(log_filter=lambda args: {k: args[k] for k in ('topic_row','lst_changed_ids')})
+async def extract_changed_messages_from_topic(topic_row: Tuple, forum_url: str, lst_changed_ids: list[int], ts_message_extract_min_local: str, 
+                                        ts_message_extract_max_local: str, sr_topic_state: pd.Series, 
+                                        parsing_executor: Executor | None = None) -> Tuple[dict, dict]:
+
+    """
+        Gets the messages in the time range from the pages containing the messages created or edited, only
+        Args:
+            topic_row (tuple) : Contains basic info about the topic
+            forum_url (str): the url of the forum
+            lst_changed_ids (list): the ids of messages created or edited since the min of the time range
+            ts_message_extract_min_local (str): the min of the range of time, in the local time of the topic
+            ts_message_extract_max_local (str): the max of the range of time, in the local time of the topic
+            sr_topic_state (series - one row): the state of the previous crawl of the topic
+            parsing_executor (executor): the pool of processes parsing the pages - if None, parsed in a worker thread
+        Returns:
+            - dict: the buffers of messages in the time range from this topic
+            - dict: the state of the topic crawl, with the highest message id seen updated
+        Raises:
+            Raise the issue to the caller if exception
+    """
+
+    seen_message_ids = set()
+    messages_columns = create_messages_columns()
+    for message_id in lst_changed_ids:
+        #one page shows several changed messages
+        if message_id in seen_message_ids:
+            continue
+        logging.info(f"MESSAGE -> EXTRACTING FORUM {topic_row.FORUM_SOURCE} / TOPIC {topic_row.TOPIC_NUMBER} / PAGE OF MESSAGE {message_id}")
+        messagetext = await fetch_message_page(topic_row, forum_url, message_id)
+        df = await parse_messages_page(messagetext, topic_row, None, parsing_executor, message_id=message_id)
+        seen_message_ids.update(df['MESSAGE_FORUM_ID'])
+        df_filtered = filter_messages_in_time_range(df, ts_message_extract_min_local, ts_message_extract_max_local)
+        if not df_filtered.empty:
+            append_messages_columns(messages_columns, df_filtered)
+
+    #the pages where the crawl can resume are still valid
+    topic_state = {col: sr_topic_state[col] for col in ['FORUM_SOURCE', 'TOPIC_NUMBER', 'WINDOW_MIN_TS_UTC', 'WINDOW_PAGE_START',
+                                                         'WINDOW_MESSAGE_FORUM_ID', 'LAST_PAGE_START', 'LAST_MESSAGE_FORUM_ID']}
+    if seen_message_ids:
+        topic_state['LAST_MESSAGE_FORUM_ID'] = max(int(topic_state['LAST_MESSAGE_FORUM_ID']), max(seen_message_ids))
+
+    return messages_columns, topic_state
 
 @config_decorators.exit_program(log_filter=lambda args: {k: args[k] for k in ('topic_row',)})
 @config_decorators.retry_function(log_filter=lambda args: {k: args[k] for k in ('topic_row',)})
-def extract_messages_from_topic(topic_row: Tuple,ts_message_extract_min_utc: pd.Timestamp,ts_message_extract_max_utc: pd.Timestamp) -> pd.DataFrame | None:
+async def crawl_topic(topic_row: Tuple,ts_message_extract_min_utc: pd.Timestamp,ts_message_extract_max_utc: pd.Timestamp, sr_topic_state: pd.Series | None = None, 
+                      page_cache: dict | None = None, parsing_executor: Executor | None = None) -> Tuple[dict, dict]:
         
     """
-        Gets all messages in the time range of a topic
+        Gets all messages in the time range of a topic, on the event loop
+        If the topic state of a previous crawl covers the time range, only the pages of messages created or edited listed by the topic feed are extracted
+        (the whole topic is crawled if the feed can't be used), or without feed detection the crawl resumes from its page (minus a look-back window)
         Args:
             topic_row (tuple) : Contains basic info about the topic
             ts_message_extract_min_utc (timestamp utc): the min of the range of time for messages extraction
             ts_message_extract_max_utc (timestamp utc): the max of the range of time for messages extraction
+            sr_topic_state (series - one row): the state of the previous crawl of the topic, if any
+            page_cache (dict): the pages already downloaded per url, updated with the pages of the topic - if None, no cache
+            parsing_executor (executor): the pool of processes parsing the pages - if None, parsed in worker threads
         Returns:
-            dataframe: contains all message in the time range from this topic, or None if there are no topics
+            - dict: the buffers of messages in the time range from this topic
+            - dict: the new state of the topic crawl
         Raises:
             Retry 3 times and exits the program if error with url extraction (using retry decorator)
     """
@@ -53,52 +408,201 @@ def extract_messages_from_topic(topic_row: Tuple,ts_message_extract_min_utc: pd.
     #Initial parameters
     forum_url = os.getenv(topic_row.FORUM_SOURCE + '_URL')
     start = 0
+    window_message_id = None
+    #we resume from the previous crawl only if it was looking for messages from an older (or same) time
+    if sr_topic_state is not None and pd.to_datetime(sr_topic_state['WINDOW_MIN_TS_UTC'], errors='coerce') <= ts_message_extract_min_utc:
+        start = max(0, int(sr_topic_state['WINDOW_PAGE_START']) - var.MESSAGE_CRAWL_LOOKBACK_MESSAGES)
+        window_message_id = int(sr_topic_state['WINDOW_MESSAGE_FORUM_ID'])
+        #if the feed of the topic covers the time range, we only extract the pages of messages created or edited
+        if var.IS_MESSAGE_FEED_DETECTION == 1:
+            lst_changed_ids = await get_changed_message_ids_from_feed(topic_row, forum_url, ts_message_extract_min_utc)
+            if lst_changed_ids is not None:
+                logging.info(f"MESSAGE -> FEED FORUM {topic_row.FORUM_SOURCE} / TOPIC {topic_row.TOPIC_NUMBER}: {len(lst_changed_ids)} MESSAGES CREATED OR EDITED")
+                return await extract_changed_messages_from_topic(topic_row, forum_url, lst_changed_ids, ts_message_extract_min_local,
+                                                                 ts_message_extract_max_local, sr_topic_state, parsing_executor)
+            #the feed can't tell which messages changed: we crawl the whole topic rather than miss edits before the resumed page
+            start = 0
+            window_message_id = None
+            logging.info(f"MESSAGE -> FEED NOT USABLE FORUM {topic_row.FORUM_SOURCE} / TOPIC {topic_row.TOPIC_NUMBER}, CRAWLING FROM MESSAGE 1")
+        else:
+            logging.info(f"MESSAGE -> RESUMING FORUM {topic_row.FORUM_SOURCE} / TOPIC {topic_row.TOPIC_NUMBER} FROM MESSAGE {start+1}")
     seen_message_ids = set()
-    topic_messages = []
-    # we overwrite security for extracting from the website
-    ssl_context = ssl._create_unverified_context() # NOSONAR # Disabled SSL verification for legacy forum with invalid certification
-    
+    last_page_message_id = None
+    #the messages are appended to buffers, the dataframe is built once at the end of the extraction
+    messages_columns = create_messages_columns()
+    #pages fetched ahead, known from the pagination of the topic
+    total_messages = None
+    prefetched_pages = {}
+    topic_state = {'FORUM_SOURCE': topic_row.FORUM_SOURCE, 'TOPIC_NUMBER': topic_row.TOPIC_NUMBER,
+                   'WINDOW_MIN_TS_UTC': ts_message_extract_min_utc, 'WINDOW_PAGE_START': None, 'WINDOW_MESSAGE_FORUM_ID': None,
+                   'LAST_PAGE_START': None, 'LAST_MESSAGE_FORUM_ID': None}
+
     while True:
-        #we extract from the website page
-        page_url = f"{forum_url}/viewtopic.php?t={topic_row.TOPIC_NUMBER}&start={start}"
+        #we extract from the website page, unless it has already been prefetched
         logging.info(f"MESSAGE -> EXTRACTING FORUM {topic_row.FORUM_SOURCE} / TOPIC {topic_row.TOPIC_NUMBER} / MESSAGES {start+1} -> X [START] ")
-        response = urllib.urlopen(page_url, context=ssl_context)
-        messagetext = response.read()
-        messagetext = messagetext.decode('utf-8') 
-        #we get all messages from the page
-        get_messages_infos = messages_info_functions.get(topic_row.FORUM_SOURCE)
-        df = get_messages_infos(messagetext, topic_row, start)
+        page = prefetched_pages.pop(start, None)
+        messagetext, df = page if page is not None else await fetch_and_parse_topic_page(topic_row, forum_url, start, page_cache, parsing_executor)
         current_ids = set(df['MESSAGE_FORUM_ID'])
+
+        #if the first resumed page is after the one stored (messages deleted beyond the look-back window) we restart from the beginning
+        if window_message_id is not None and not seen_message_ids and current_ids and min(current_ids) > window_message_id:
+            logging.info(f"MESSAGE -> RESUMING TOPIC {topic_row.TOPIC_NUMBER} TOO FAR, RESTARTING FROM MESSAGE 1")
+            start = 0
+            window_message_id = None
+            total_messages = None
+            prefetched_pages = {}
+            continue
+
         #if we already saw messages we stop here
         if current_ids.intersection(seen_message_ids):
             logging.info(f"MESSAGE -> BREAKING TOPIC {topic_row.TOPIC_NUMBER}")
             break
         #else we add those new message of the list of seen messages
         seen_message_ids.update(current_ids)
+
+        #we keep the first page having messages created in the time range, and the last page, for the next crawl
+        if topic_state['WINDOW_PAGE_START'] is None and (df['CREATION_TIME_LOCAL'] >= ts_message_extract_min_local).any():
+            topic_state['WINDOW_PAGE_START'] = start
+            topic_state['WINDOW_MESSAGE_FORUM_ID'] = min(current_ids)
+        if current_ids:
+            topic_state['LAST_PAGE_START'] = start
+            topic_state['LAST_MESSAGE_FORUM_ID'] = max(seen_message_ids)
+            last_page_message_id = min(current_ids)
         start += len(df)
 
-        # Filter on timestamp range (either creation date with none edition or edition date)
-        creation_with_edition_none = df['CREATION_TIME_LOCAL'].between(ts_message_extract_min_local, ts_message_extract_max_local) & df['EDITION_TIME_LOCAL'].isna()
-        edition = df['EDITION_TIME_LOCAL'].between(ts_message_extract_min_local, ts_message_extract_max_local)
-        df_filtered = df[creation_with_edition_none | edition]
+        #on the first page, we get the pagination to know the offsets of next pages
+        if total_messages is None:
+            total_messages, messages_per_page = pagination_info_functions.get(topic_row.FORUM_SOURCE)(messagetext)
+        #prefetched pages are not usable anymore if pages don't begin where expected (messages posted or deleted meanwhile)
+        if start not in prefetched_pages:
+            prefetched_pages = {}
+        #we prefetch concurrently the next pages known, they will be processed in order with same stop rules.
+        #after the last known page, we continue one page after another, as before
+        if not prefetched_pages and total_messages is not None and start < total_messages:
+            lst_start = list(range(start, total_messages, messages_per_page))[:var.MESSAGE_CRAWL_PREFETCH_PAGES]
+            prefetched_pages = await prefetch_topic_pages(topic_row, forum_url, lst_start, page_cache, parsing_executor)
+
+        df_filtered = filter_messages_in_time_range(df, ts_message_extract_min_local, ts_message_extract_max_local)
 
         if not df_filtered.empty:
-            topic_messages.append(df_filtered)
+            append_messages_columns(messages_columns, df_filtered)
         
         logging.info(f"MESSAGE -> EXTRACTING FORUM {topic_row.FORUM_SOURCE} / TOPIC {topic_row.TOPIC_NUMBER} / MESSAGES X -> {start} [DONE] ")
-    return pd.concat(topic_messages, ignore_index=True) if topic_messages else None
+
+    #if no message has been created in the time range yet, the next crawl can resume from the last page
+    if topic_state['WINDOW_PAGE_START'] is None:
+        topic_state['WINDOW_PAGE_START'] = topic_state['LAST_PAGE_START']
+        topic_state['WINDOW_MESSAGE_FORUM_ID'] = last_page_message_id
+
+    return messages_columns, topic_state
+
+def extract_messages_from_topic(topic_row: Tuple,ts_message_extract_min_utc: pd.Timestamp,ts_message_extract_max_utc: pd.Timestamp, sr_topic_state: pd.Series | None = None, page_cache: dict | None = None) -> Tuple[pd.DataFrame | None, dict]:
+
+    """
+        Gets all messages in the time range of a topic, running its crawl on its own event loop (pages parsed in worker threads)
+        Args:
+            topic_row (tuple) : Contains basic info about the topic
+            ts_message_extract_min_utc (timestamp utc): the min of the range of time for messages extraction
+            ts_message_extract_max_utc (timestamp utc): the max of the range of time for messages extraction
+            sr_topic_state (series - one row): the state of the previous crawl of the topic, if any
+            page_cache (dict): the pages already downloaded per url, updated with the pages of the topic - if None, no cache
+        Returns:
+            - dataframe: contains all message in the time range from this topic, or None if there are no topics
+            - dict: the new state of the topic crawl
+        Raises:
+            Retry 3 times and exits the program if error with url extraction (using retry decorator of crawl_topic)
+    """
+
+    messages_columns, topic_state = asyncio.run(crawl_topic(topic_row, ts_message_extract_min_utc, ts_message_extract_max_utc, sr_topic_state, page_cache))
+    return (build_messages_dataframe(messages_columns) if messages_columns['MESSAGE_FORUM_ID'] else None), topic_state
+
+async def crawl_topics(messages_args: list[tuple]) -> list[Tuple[dict, dict]]:
+
+    """
+        Gets all messages in the time range of several topics, their crawls sharing the event loop and the pool of processes parsing the pages
+        Args:
+            messages_args (list): the arguments of crawl_topic for each topic
+        Returns:
+            the buffers of messages and the new state of the crawl of each topic, in the order of the topics (list)
+    """
+
+    #a pool of processes is worth its start (each process imports the program) only if it parses on several cores
+    nb_parsing_processes = min(var.MESSAGE_PARSING_PROCESSES, os.cpu_count() or 1)
+    if nb_parsing_processes < 2:
+        return list(await asyncio.gather(*(crawl_topic(*args) for args in messages_args)))
+    #processes are spawned (not forked) as the event loop already runs threads
+    with ProcessPoolExecutor(max_workers=nb_parsing_processes, mp_context=multiprocessing.get_context('spawn')) as parsing_executor:
+        return list(await asyncio.gather(*(crawl_topic(*args, parsing_executor=parsing_executor) for args in messages_args)))
+
+@config_decorators.raise_issue_to_caller(log_filter=lambda args: {})
+def filter_active_topics(topics_scope_id: pd.DataFrame, ts_message_extract_min_utc: pd.Timestamp) -> pd.DataFrame:
+
+    """
+        Removes the topics without message posted since a time, using the Atom feed of active topics of each forum (one request per forum)
+        Topics of a forum are all kept if the forum has no feed function, if the feed is unavailable, 
+        and topics not listed by the feed are kept if it doesn't go back to the time
+        Args:
+            topics_scope_id (dataframe): contains all topics to extract
+            ts_message_extract_min_utc (timestamp utc): the min of the range of time for messages extraction
+        Returns:
+            dataframe: the topics with messages posted since the time, or unknown
+        Raises:
+            Raise the issue to the caller if exception
+    """
+
+    is_active = pd.Series(True, index=topics_scope_id.index)
+    for forum_source in topics_scope_id['FORUM_SOURCE'].unique():
+        get_feed_url = active_topics_url_functions.get(forum_source)
+        if get_feed_url is None:
+            continue
+        try:
+            response = config_http_transport.send_request("GET", get_feed_url(os.getenv(forum_source + '_URL')), verify=False) # NOSONAR # Disabled SSL verification for legacy forum with invalid certification
+            df_feed_topics = active_topics_info_functions.get(forum_source)(response.content)
+        except Exception as e:
+            logging.info(f"MESSAGE -> ACTIVE TOPICS FEED UNAVAILABLE FORUM {forum_source}: {e}")
+            continue
+        if df_feed_topics.empty:
+            continue
+
+        #the feed lists the topics with the last messages posted: the ones not listed have older messages only if it goes back to the time
+        is_feed_covering = df_feed_topics['LAST_POST_UTC'].min() < ts_message_extract_min_utc
+        is_forum = topics_scope_id['FORUM_SOURCE'] == forum_source
+        last_posts_utc = topics_scope_id.loc[is_forum, 'TOPIC_NUMBER'].astype(int).map(df_feed_topics.groupby('TOPIC_NUMBER')['LAST_POST_UTC'].max())
+        is_active.loc[is_forum] = ((last_posts_utc >= ts_message_extract_min_utc) | (last_posts_utc.isna() & (not is_feed_covering))).to_numpy(dtype=bool)
+
+    logging.info(f"MESSAGE -> {int((~is_active).sum())} TOPICS WITHOUT NEW MESSAGE SKIPPED")
+    return topics_scope_id[is_active].reset_index(drop=True)
+
+@config_decorators.raise_issue_to_caller(log_filter=lambda args: {})
+def is_topic_skip_applied(sr_output_need: pd.Series) -> bool:
+
+    """
+        Tells if the topics without new message are skipped by the extraction of messages of the task
+        Args:
+            sr_output_need (series - one row): the output need of the task
+        Returns:
+            True on checks if IS_TOPIC_SKIP_ON_CHECK is 1, False otherwise
+        Raises:
+            Raise the issue to the caller if exception
+    """
+
+    return bool(sr_output_need['MESSAGE_ACTION'] == var.MESSAGE_ACTION_MAP['CHECK'] and var.IS_TOPIC_SKIP_ON_CHECK == 1)
 
 @config_decorators.exit_program(log_filter=lambda args: {})
-def extract_messages(sr_snowflake_account: pd.Series, sr_output_need: pd.Series) -> Tuple[pd.DataFrame, pd.Timestamp]:
+def extract_messages(sr_snowflake_account: pd.Series, sr_output_need: pd.Series, df_message_topic_state: pd.DataFrame, df_message_page_cache: pd.DataFrame) -> Tuple[pd.DataFrame, pd.Timestamp, pd.DataFrame, pd.DataFrame]:
 
     """
         Gets all messages we need to extract from the list of topics and time range
         Args:
             sr_snowflake_account (series - one row) : Contains snowflake parameters to run the query
             sr_output_need (series - one row): the output need file to get the range minimum of extraction
+            df_message_topic_state (dataframe): the state of previous crawls per topic, to resume them
+            df_message_page_cache (dataframe): the pages downloaded by previous crawls, to revalidate them
         Returns:
             - dataframe: contains all messages needed
             - datetime of extraction of messages
+            - dataframe: the state of crawls per topic, updated
+            - dataframe: the pages downloaded, updated and without the ones not used for a long time
         Raises:
             Exits the program if error running the function (using decorator)
     """
@@ -109,26 +613,53 @@ def extract_messages(sr_snowflake_account: pd.Series, sr_output_need: pd.Series)
     topics_scope_id = get_list_topics_from_need(sr_snowflake_account, sr_output_need) 
     ts_message_extract_min_utc,ts_message_extract_max_utc = get_extraction_time_range(sr_snowflake_account, sr_output_need) 
     
-    df_messages = pd.DataFrame(columns=['FORUM_SOURCE','TOPIC_NUMBER','USER',
-                                            'MESSAGE_FORUM_ID','CREATION_TIME_LOCAL',
-                                            'EDITION_TIME_LOCAL','MESSAGE_CONTENT'])
+    messages_columns = create_messages_columns()
 
     # if the min >= max then we don't need to extract messages, there won't be any
     if ts_message_extract_min_utc >= ts_message_extract_max_utc:
         logging.info("MESSAGE -> no need to extract messages")
     else:
-        # We parallelize the extraction of each topic    
-        messages_args = [(row,ts_message_extract_min_utc,ts_message_extract_max_utc) 
+        # on checks, we can skip topics without new messages: their edited messages are then missed, so the check time is not moved (see main)
+        if is_topic_skip_applied(sr_output_need):
+            topics_scope_id = filter_active_topics(topics_scope_id, ts_message_extract_min_utc)
+
+        # we get the state of the previous crawl of each topic, if any
+        # on runs, topics are crawled from their first page: edits of messages before the page resumed would be missed otherwise
+        topics_state = {} if sr_output_need['MESSAGE_ACTION'] == var.MESSAGE_ACTION_MAP['RUN'] else \
+                       {(row.FORUM_SOURCE, int(row.TOPIC_NUMBER)): row for _, row in df_message_topic_state.dropna(subset=['WINDOW_PAGE_START']).iterrows()}
+
+        # we share the pages downloaded by previous crawls between all topics, each one updating its own pages
+        page_cache = {row['URL']: row.to_dict() for _, row in df_message_page_cache.iterrows()}
+
+        # We crawl all topics on one event loop, their pages being fetched under the rate limit of each forum host
+        messages_args = [(row,ts_message_extract_min_utc,ts_message_extract_max_utc,topics_state.get((row.FORUM_SOURCE, int(row.TOPIC_NUMBER))),page_cache)
                     for row in topics_scope_id.itertuples(index=False)]
-        results = multithread_run(extract_messages_from_topic, messages_args)
-        messages_extracted = [r for r in results if r is not None]
+        results = asyncio.run(crawl_topics(messages_args))
+        for topic_messages_columns, _ in results:
+            for col, chunks in topic_messages_columns.items():
+                messages_columns[col].extend(chunks)
+
+        # we replace the state of crawled topics, keeping the other ones
+        df_crawled_state = pd.DataFrame([state for _, state in results if state['WINDOW_PAGE_START'] is not None], columns=df_message_topic_state.columns)
+        crawled_topics = set(zip(df_crawled_state['FORUM_SOURCE'], df_crawled_state['TOPIC_NUMBER'].astype(int)))
+        is_not_crawled = [(forum, int(topic)) not in crawled_topics 
+                          for forum, topic in zip(df_message_topic_state['FORUM_SOURCE'], df_message_topic_state['TOPIC_NUMBER'])]
+        #(no topic might have been crawled, if all skipped)
+        if not df_crawled_state.empty:
+            df_message_topic_state = pd.concat([df_message_topic_state[is_not_crawled], df_crawled_state], ignore_index=True)
 
-        if len(messages_extracted) > 0:
-            df_messages = pd.concat(messages_extracted, ignore_index=True)
+        # we keep the pages used recently only, so that the cache doesn't grow forever
+        df_message_page_cache = pd.DataFrame(list(page_cache.values()), columns=df_message_page_cache.columns)
+        ts_cache_min_utc = pd.Timestamp.utcnow().tz_localize(None) - pd.Timedelta(days=var.MESSAGE_PAGE_CACHE_RETENTION_DAYS)
+        df_message_page_cache = df_message_page_cache[pd.to_datetime(df_message_page_cache['LAST_USED_TS_UTC']) >= ts_cache_min_utc].reset_index(drop=True)
 
+    # we build the dataframe of messages of all topics at once
+    df_messages = build_messages_dataframe(messages_columns)
     create_csv(os.path.join(var.TMPF, 'message_check.csv'), df_messages, var.MESSAGE_FILE_ENCAPSULATED)
+    create_csv(os.path.join(var.TMPF, 'message_topic_state.csv'), df_message_topic_state)
+    create_csv(os.path.join(var.TMPF, 'message_page_cache.csv'), df_message_page_cache)
     logging.info("MESSAGE -> EXTRACTING MESSAGE [DONE]")
-    return df_messages, ts_message_extract_max_utc
+    return df_messages, ts_message_extract_max_utc, df_message_topic_state, df_message_page_cache
 
 @config_decorators.exit_program(log_filter=lambda args: {})
 def get_list_topics_from_need(sr_snowflake_account: pd.Series,sr_output_need: pd.Series) -> pd.DataFrame:
@@ -0,0 +1,121 @@
+'''
+    The purpose of this module is to keep the ledger of messages posted by the program on forums:
+    - the hash of the content of each message posted or edited, so that a message already online with the same content is not edited again
+    - the report of posts and edits the program would do, when posting is a dry run
+'''
+
+import hashlib
+import logging
+import os
+import threading
+from datetime import datetime, timezone
+import pandas as pd
+
+from ..config import config_decorators
+from ..config.config_variables import config_global_variables as var
+from ..files_manipulation.local_files_manipulation.files_manipulation import create_csv
+
+logging.basicConfig(level=logging.INFO)
+
+posting_ledger = {}
+#one row per message and content, the calls being retried if the post fails
+posting_report = {}
+posting_ledger_lock = threading.Lock()
+posting_ledger_columns = ['FORUM_SOURCE', 'TOPIC_NUMBER', 'MESSAGE_FORUM_ID', 'CONTENT_HASH', 'POSTED_TS_UTC']
+#the id of a message posted without its id known: it is the first message of the topic asked to be edited after it
+MESSAGE_FORUM_ID_UNKNOWN = 0
+posting_report_columns = ['FORUM_SOURCE', 'TOPIC_NUMBER', 'MESSAGE_FORUM_ID', 'ACTION', 'CONTENT_HASH']
+
+def hash_message_content(message_content: str) -> str:
+
+    '''
+        Gets the hash of the content of a message
+        Args:
+            message_content (str): the message
+        Returns:
+            The sha256 hash of the message (str)
+    '''
+    return hashlib.sha256(message_content.encode('utf-8')).hexdigest()
+
+@config_decorators.exit_program(log_filter=lambda args: {})
+def open_posting_ledger(df_message_posting_ledger: pd.DataFrame):
+
+    '''
+        Loads the ledger of messages posted or edited by previous runs, and starts the report of the run
+        Args:
+            df_message_posting_ledger (dataframe): the ledger stored by previous runs
+        Raises:
+            Exits the program if error running the function (using decorator)
+    '''
+    with posting_ledger_lock:
+        posting_ledger.clear()
+        posting_report.clear()
+        for row in df_message_posting_ledger.itertuples(index=False):
+            posting_ledger[(row.FORUM_SOURCE, int(row.TOPIC_NUMBER), int(row.MESSAGE_FORUM_ID))] = (row.CONTENT_HASH, row.POSTED_TS_UTC)
+
+def is_to_post(forum_source: str, topic_number: int, message_forum_id: int | None, message_content: str) -> bool:
+
+    '''
+        Tells if a message must be sent to the forum, and adds it to the report of the run (once, if asked again for a retry)
+        Edits are not sent if the ledger has the same content for the message, and nothing is sent on dry runs (IS_POSTING_DRY_RUN)
+        A message of the topic posted without its id known gets the id of the message to edit
+        Args:
+            forum_source (str): the forum
+            topic_number (int): the topic
+            message_forum_id (int): the message to edit, None for a new message
+            message_content (str): the message
+        Returns:
+            True if the message must be sent (bool)
+    '''
+    content_hash = hash_message_content(message_content)
+    with posting_ledger_lock:
+        if message_forum_id is None:
+            action = "POST"
+        else:
+            ledger_row = posting_ledger.get((forum_source, int(topic_number), int(message_forum_id)))
+            if ledger_row is None and (forum_source, int(topic_number), MESSAGE_FORUM_ID_UNKNOWN) in posting_ledger:
+                ledger_row = posting_ledger.pop((forum_source, int(topic_number), MESSAGE_FORUM_ID_UNKNOWN))
+                posting_ledger[(forum_source, int(topic_number), int(message_forum_id))] = ledger_row
+            action = "SKIP" if ledger_row is not None and ledger_row[0] == content_hash else "EDIT"
+        report_key = (forum_source, int(topic_number), "" if message_forum_id is None else int(message_forum_id), content_hash)
+        posting_report[report_key] = report_key[:3] + (action, content_hash)
+
+    if action == "SKIP":
+        logging.info(f"MESSAGES -> {forum_source} / TOPIC {topic_number} / MESSAGE {message_forum_id} ALREADY ONLINE WITH THIS CONTENT - NOT EDITED")
+    return action != "SKIP" and var.IS_POSTING_DRY_RUN == 0
+
+def record_posted_content(forum_source: str, topic_number: int, message_forum_id: int | None, message_content: str):
+
+    '''
+        Records in the ledger the content of a message posted or edited on the forum
+        Args:
+            forum_source (str): the forum
+            topic_number (int): the topic
+            message_forum_id (int): the message posted or edited - None if the id of the message posted is not known
+            message_content (str): the message
+    '''
+    message_forum_id = MESSAGE_FORUM_ID_UNKNOWN if message_forum_id is None else int(message_forum_id)
+    with posting_ledger_lock:
+        posting_ledger[(forum_source, int(topic_number), message_forum_id)] = (hash_message_content(message_content),
+                                                                              datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S"))
+
+@config_decorators.exit_program(log_filter=lambda args: {})
+def close_posting_ledger() -> pd.DataFrame:
+
+    '''
+        Stores the ledger for next runs, in the message_posting_ledger file
+        On dry runs, the report of posts and edits which would have been done is stored in the message_posting_report file
+        Returns:
+            The dataframe of the ledger stored
+        Raises:
+            Exits the program if error running the function (using decorator)
+    '''
+    with posting_ledger_lock:
+        df_message_posting_ledger = pd.DataFrame([key + value for key, value in posting_ledger.items()], columns=posting_ledger_columns)
+        df_message_posting_report = pd.DataFrame(list(posting_report.values()), columns=posting_report_columns)
+
+    create_csv(os.path.join(var.TMPF, 'message_posting_ledger.csv'), df_message_posting_ledger)
+    if var.IS_POSTING_DRY_RUN == 1:
+        create_csv(os.path.join(var.TMPF, 'message_posting_report.csv'), df_message_posting_report)
+        logging.info(f"MESSAGES -> DRY RUN - POSTS AND EDITS WHICH WOULD BE DONE:\n{df_message_posting_report[df_message_posting_report['ACTION'] != 'SKIP'].to_string(index=False)}")
+    return df_message_posting_ledger
@@ -0,0 +1,93 @@
+'''
+    The purpose of this module is to cache the calendars of competitions fetched from game websites, per competition and date window:
+    - calendars with games to come (or in progress) are reused for some minutes, by the repeated calls of a run
+    - calendars with all games complete are reused for some days, by the next runs too (stored in the game_calendar_cache file)
+'''
+
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+import pandas as pd
+
+from ..config import config_decorators
+from ..config.config_variables import config_global_variables as var
+from ..files_manipulation.local_files_manipulation.files_manipulation import create_csv
+from ..files_manipulation.local_files_manipulation.files_manipulation import compress_text, decompress_text
+
+logging.basicConfig(level=logging.INFO)
+
+games_calendar_cache = {}
+games_calendar_cache_lock = threading.Lock()
+game_calendar_cache_columns = ['COMPETITION_SOURCE', 'COMPETITION_SOURCE_ID', 'START_DATE', 'END_DATE', 'CALENDAR_GZIP', 'EXPIRY_TS_UTC']
+
+@config_decorators.exit_program(log_filter=lambda args: {})
+def open_games_calendar_cache(df_game_calendar_cache: pd.DataFrame):
+
+    '''
+        Loads the calendars cached by previous runs, not expired
+        Args:
+            df_game_calendar_cache (dataframe): the calendars cached by previous runs
+        Raises:
+            Exits the program if error running the function (using decorator)
+    '''
+    now = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+    with games_calendar_cache_lock:
+        for row in df_game_calendar_cache[df_game_calendar_cache['EXPIRY_TS_UTC'] > now].itertuples(index=False):
+            games_calendar_cache[(row.COMPETITION_SOURCE, str(row.COMPETITION_SOURCE_ID), row.START_DATE, row.END_DATE)] = (row.CALENDAR_GZIP, row.EXPIRY_TS_UTC)
+
+def get_calendar(competition_source: str, competition_source_id: int, start_date: str, end_date: str) -> list | None:
+
+    '''
+        Gets a calendar from the cache, if not expired
+        Args:
+            competition_source (str): the game website
+            competition_source_id (int): the id of the competition on the website
+            start_date / end_date (str): the date window of the calendar (YYYY-MM-DD)
+        Returns:
+            The calendar as given by the website (list), None if not cached
+    '''
+    now = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+    with games_calendar_cache_lock:
+        cached = games_calendar_cache.get((competition_source, str(competition_source_id), start_date, end_date))
+    if cached is None or cached[1] <= now:
+        return None
+    logging.info(f"GAME -> COMPETITION {competition_source} - {competition_source_id} FROM {start_date} TO {end_date} - CALENDAR CACHED")
+    return json.loads(decompress_text(cached[0]))
+
+def put_calendar(competition_source: str, competition_source_id: int, start_date: str, end_date: str, calendar: list, is_complete: bool):
+
+    '''
+        Caches a calendar, for some days if all its games are complete, else for some minutes
+        Args:
+            competition_source (str): the game website
+            competition_source_id (int): the id of the competition on the website
+            start_date / end_date (str): the date window of the calendar (YYYY-MM-DD)
+            calendar (list): the calendar as given by the website
+            is_complete (bool): if all games of the calendar are complete
+    '''
+    ttl = timedelta(hours=var.GAME_CALENDAR_CACHE_TTL_HOURS_COMPLETE) if is_complete else timedelta(minutes=var.GAME_CALENDAR_CACHE_TTL_MINUTES)
+    expiry = (datetime.now(timezone.utc) + ttl).strftime("%Y-%m-%d %H:%M:%S")
+    with games_calendar_cache_lock:
+        games_calendar_cache[(competition_source, str(competition_source_id), start_date, end_date)] = (compress_text(json.dumps(calendar)), expiry)
+
+@config_decorators.exit_program(log_filter=lambda args: {})
+def close_games_calendar_cache() -> pd.DataFrame:
+
+    '''
+        Stores the calendars cached for next runs, in the game_calendar_cache file
+        Calendars expiring within the run (games to come) are not worth storing
+        Returns:
+            The dataframe of the calendars stored
+        Raises:
+            Exits the program if error running the function (using decorator)
+    '''
+    ts_min = (datetime.now(timezone.utc) + timedelta(minutes=var.GAME_CALENDAR_CACHE_TTL_MINUTES)).strftime("%Y-%m-%d %H:%M:%S")
+    with games_calendar_cache_lock:
+        df_game_calendar_cache = pd.DataFrame([key + value for key, value in games_calendar_cache.items() if value[1] > ts_min],
+                                              columns=game_calendar_cache_columns)
+        games_calendar_cache.clear()
+
+    create_csv(os.path.join(var.TMPF, 'game_calendar_cache.csv'), df_game_calendar_cache)
+    return df_game_calendar_cache
@@ -6,29 +6,61 @@
 
 import logging
 import os
+import time
 import pandas as pd
 
 from ..config import config_decorators
+from ..config.config_multithread import multithread_run
 from ..config.config_variables import config_global_variables as var
 from ..files_manipulation.local_files_manipulation.files_manipulation import create_csv
-from .games_details_extraction_lnb.games_details_extraction_lnb import get_game_details_lnb
+from .games_details_extraction_lnb.games_details_extraction_lnb import get_game_details_lnb, fetch_game_details_lnb
 
 logging.basicConfig(level=logging.INFO)
 game_info_functions = {
     "LNB": get_game_details_lnb
 }
+#same extraction, raising the issue instead of exiting the program, so that one competition failing doesn't stop the other ones
+game_fetch_functions = {
+    "LNB": fetch_game_details_lnb
+}
+
+def extract_games_of_competition(position: int, compet_row: tuple) -> tuple[int, pd.DataFrame | None, float, str | None]:
+
+    """
+        Gets all games of one competition, reporting its duration and its error instead of exiting, so that other competitions go on
+        Args:
+            position (int): the position of the competition in the list, to assemble the games in the same order
+            compet_row (namedtuple): the competition from input files
+        Returns:
+            - the position of the competition
+            - the dataframe of its games (with its competition id and season id), None if failed
+            - the duration of the extraction (secs)
+            - the error if failed, else None
+    """
+    start_time = time.perf_counter()
+    try:
+        fetch_game_details = game_fetch_functions.get(compet_row.COMPETITION_SOURCE)
+        df_game_details = fetch_game_details(competition_source_id = compet_row.COMPETITION_SOURCE_ID)
+        df_game_details['COMPETITION_SOURCE'] = compet_row.COMPETITION_SOURCE
+        df_game_details['COMPETITION_ID'] = compet_row.COMPETITION_ID
+        df_game_details['SEASON_ID'] = compet_row.SEASON_ID
+        return position, df_game_details, time.perf_counter() - start_time, None
+    #we only stop once all competitions are done
+    except Exception as e:
+        return position, None, time.perf_counter() - start_time, repr(e)
 
 @config_decorators.exit_program(log_filter=lambda args: {k: args[k] for k in ('df_competition',)})
 def extract_games_from_competition(df_competition: pd.DataFrame) -> pd.DataFrame:
     
     """
         Gets all games from list of competition while called by entry point function competition_integration
+        Competitions are extracted at the same time (up to GAME_EXTRACTION_MAX_WORKERS), then their games assembled in the order of the list
         Args:
             df_competition (dataframe): the list of competition from input files
         Returns:
             dataframe: contains all games (with their competition ids an season ids)     
         Raises:
-            Exits the program if error running the function (using decorator)
+            Exits the program if error running the function (using decorator), after all competitions are extracted
     """
     logging.info("GAME -> GETTING GAMES [START]")
     
@@ -36,16 +68,22 @@ def extract_games_from_competition(df_competition: pd.DataFrame) -> pd.DataFrame
                'GAMEDAY', 'DATE_GAME_UTC', 'TIME_GAME_UTC', 'DATE_GAME_LOCAL', 'TIME_GAME_LOCAL',
                'TEAM_HOME', 'SCORE_HOME', 'TEAM_AWAY', 'SCORE_AWAY', 'GAME_SOURCE_ID'])
     
-    for compet_row in df_competition.itertuples(index=False):
-        source = compet_row.COMPETITION_SOURCE
-        get_game_details = game_info_functions.get(source)
-        df_game_details = get_game_details(competition_source_id = compet_row.COMPETITION_SOURCE_ID)
-        df_game_details['COMPETITION_SOURCE'] = compet_row.COMPETITION_SOURCE
-        df_game_details['COMPETITION_ID'] = compet_row.COMPETITION_ID
-        df_game_details['SEASON_ID'] = compet_row.SEASON_ID
-        df_game = pd.concat([df_game, df_game_details], ignore_index=True)
-        logging.info(f"GAME -> COMPETITION {compet_row.COMPETITION_SOURCE} - {compet_row.COMPETITION_SOURCE_ID} extracted")
+    compet_args = [(position, compet_row) for position, compet_row in enumerate(df_competition.itertuples(index=False))]
+    results = sorted(multithread_run(extract_games_of_competition, compet_args, var.GAME_EXTRACTION_MAX_WORKERS), key=lambda result: result[0])
 
+    lst_failed = []
+    for position, df_game_details, duration_secs, error in results:
+        compet_row = compet_args[position][1]
+        if error is None:
+            logging.info(f"GAME -> COMPETITION {compet_row.COMPETITION_SOURCE} - {compet_row.COMPETITION_SOURCE_ID} extracted in {duration_secs:.2f} secs")
+        else:
+            logging.error(f"GAME -> COMPETITION {compet_row.COMPETITION_SOURCE} - {compet_row.COMPETITION_SOURCE_ID} FAILED after {duration_secs:.2f} secs - {error}")
+            lst_failed.append(f"{compet_row.COMPETITION_SOURCE} - {compet_row.COMPETITION_SOURCE_ID}")
+    if lst_failed:
+        raise RuntimeError(f"Games extraction failed for competitions {lst_failed}")
+
+    #we assemble all competitions at once, in the order of the list
+    df_game = pd.concat([df_game] + [df_game_details for _, df_game_details, _, _ in results], ignore_index=True)
     create_csv(os.path.join(var.TMPF,'game.csv'),df_game,var.GAME_ENCAPSULATED) 
 
     logging.info("GAME -> GETTING GAMES [END]")
@@ -80,12 +118,15 @@ def extract_games_from_need(sr_output_need: pd.Series,df_competition: pd.DataFra
 
     # If there is no gameday modified, we keep the gameday from need
     get_game_details = game_info_functions.get(competition_source)
+    # we only ask for the games around the time of the task
     if len(sr_games_to_extract) == 0:
         df_game = get_game_details(competition_source_id = sr_output_need['COMPETITION_SOURCE_ID'],
-                                   gameday = sr_output_need['GAMEDAY'])
+                                   gameday = sr_output_need['GAMEDAY'],
+                                   ts_task_utc = sr_output_need['TS_TASK_UTC'])
     else:
         df_game = get_game_details(competition_source_id = sr_output_need['COMPETITION_SOURCE_ID'],
-                                   sr_games_to_extract = sr_games_to_extract)
+                                   sr_games_to_extract = sr_games_to_extract,
+                                   ts_task_utc = sr_output_need['TS_TASK_UTC'])
         
     df_game['COMPETITION_SOURCE'] = competition_source
     df_game['COMPETITION_ID'] = sr_output_need['COMPETITION_ID']
@@ -94,8 +135,8 @@ def extract_games_from_need(sr_output_need: pd.Series,df_competition: pd.DataFra
                'GAMEDAY', 'DATE_GAME_UTC', 'TIME_GAME_UTC', 'DATE_GAME_LOCAL', 'TIME_GAME_LOCAL',
                'TEAM_HOME', 'SCORE_HOME', 'TEAM_AWAY', 'SCORE_AWAY', 'GAME_SOURCE_ID']
     
+    #the game file is created with the games to load only, once compared with the games already loaded
     df_game = df_game[columns].reset_index(drop=True)
-    create_csv(os.path.join(var.TMPF,'game.csv'),df_game,var.GAME_ENCAPSULATED) 
 
     logging.info("GAME -> GETTING GAMES [END]")
     return df_game
@@ -3,15 +3,178 @@
 ''' 
 
 import os
-from zoneinfo import ZoneInfo
 import pandas as pd
-import requests
 
 from ...config import config_decorators
+from ...config import config_http_transport
+from ...config.config_variables import config_global_variables as var
+from .. import games_calendar_cache
+
+LNB_API_URL = "https://api-prod.lnb.fr"
+LNB_CALENDAR_FULL_WINDOW = ("2000-01-01", "2999-12-31")
+
+def get_calendar_window_lnb(ts_task_utc: str | None) -> tuple[str, str]:
+
+    """
+        Gets the date window of the calendar covering the games of the gameday of a task
+        The window is widened to whole months, so that the tasks of a month share the same calendar in cache
+        Args:
+            ts_task_utc (str): the time of the task (UTC) - if None, the window covers all dates
+        Returns:
+            The start and end dates of the window (YYYY-MM-DD)
+    """
+    if ts_task_utc is None or pd.isna(ts_task_utc):
+        return LNB_CALENDAR_FULL_WINDOW
+    ts_task_utc = pd.Timestamp(ts_task_utc)
+    start_date = (ts_task_utc - pd.Timedelta(days=var.GAME_CALENDAR_WINDOW_DAYS_BEFORE_TASK)).replace(day=1)
+    end_date = (ts_task_utc + pd.Timedelta(days=var.GAME_CALENDAR_WINDOW_DAYS_AFTER_TASK)) + pd.offsets.MonthEnd(0)
+    return start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d")
+
+def get_calendar_lnb(competition_source_id: int, start_date: str, end_date: str, is_live: bool = False) -> pd.DataFrame:
+
+    """
+        Gets the games of a competition in a date window from LNB website, from the cache if fetched recently
+        Args:
+            competition_source_id (int) : get the id of the competition in source
+            start_date / end_date (str): the date window (YYYY-MM-DD)
+            is_live (bool): if True, the calendar is always asked to LNB and not cached (games results watched)
+        Returns:
+            the dataframe of the games as given by LNB
+        Raises:
+            The error of the request or of the JSON to the caller
+    """
+    calendar = None if is_live else games_calendar_cache.get_calendar("LNB", competition_source_id, start_date, end_date)
+    if calendar is None:
+        url = f"{LNB_API_URL}/match/getCalendar"
+        payload = {
+            "competition_external_id": int(competition_source_id),
+            "start_date": start_date,
+            "end_date": end_date
+        }
+
+        headers = {
+            "Content-Type": "application/json",
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36",
+            "Accept": "application/json, text/plain, */*",
+            "Accept-Language": "en-US,en;q=0.9",
+            "Upgrade-Insecure-Requests": "1",
+            "Sec-Ch-Ua": '"Not(A:Brand";v="99", "Google Chrome";v="123", "Chromium";v="123"',
+            "Sec-Ch-Ua-Mobile": "?0",
+            "Sec-Ch-Ua-Platform": '"Windows"',
+            "Sec-Fetch-Dest": "empty",
+            "Sec-Fetch-Mode": "cors",
+            "Sec-Fetch-Site": "cross-site"
+        }
+        #compression and keep-alive are negotiated by the transport
+        response = config_http_transport.send_request("POST", url, json=payload, headers=headers)
+        calendar = response.json().get("data", [])
+        lst_status = [game.get("match_status") for day in calendar for game in day.get("data", [])]
+        #games in progress are not cached, the calendar is asked again on retry
+        if not is_live and all(status in ('SCHEDULED', 'COMPLETE') for status in lst_status):
+            games_calendar_cache.put_calendar("LNB", competition_source_id, start_date, end_date, calendar,
+                                              is_complete = all(status == 'COMPLETE' for status in lst_status))
+
+    return pd.json_normalize(calendar, record_path="data", errors="ignore")
+
+def get_games_status_lnb(competition_source_id: int, start_date: str, end_date: str) -> pd.DataFrame:
+
+    """
+        Gets the status of the games of a competition in a date window, live from LNB website
+        Args:
+            competition_source_id (int) : get the id of the competition in source
+            start_date / end_date (str): the date window (YYYY-MM-DD)
+        Returns:
+            the dataframe of the games with GAME_SOURCE_ID, GAMEDAY, DATETIME_UTC and IS_FINAL (if the result is final)
+        Raises:
+            The error of the request or of the JSON to the caller
+    """
+    df_game = get_calendar_lnb(competition_source_id, start_date, end_date, is_live=True)
+    if df_game.empty:
+        return pd.DataFrame(columns=['GAME_SOURCE_ID', 'GAMEDAY', 'DATETIME_UTC', 'IS_FINAL'])
+    return pd.DataFrame({
+        'GAME_SOURCE_ID': df_game["match_id"].astype(str),
+        'GAMEDAY': df_game["round_description"],
+        'DATETIME_UTC': pd.to_datetime(df_game["match_time_utc"], utc=True, errors="coerce"),
+        'IS_FINAL': df_game["match_status"] == 'COMPLETE'
+    })
+
+def normalize_games_lnb(df_game: pd.DataFrame, competition_source_id: int) -> pd.DataFrame:
+
+    """
+        Transforms the games given by LNB (flattened by json_normalize) into the game columns of the program, column by column instead of game by game
+        Local times are converted once per distinct timezone
+        Args:
+            df_game (dataframe): the games as given by LNB
+            competition_source_id (int) : the id of the competition in source
+        Returns:
+            the dataframe of the games, with the game columns (without competition ids and season ids)
+        Raises:
+            ValueError if a game has not two teams
+    """
+    sr_nb_teams = df_game["teams"].map(lambda teams: len(teams) if isinstance(teams, list) else 0)
+    if not (sr_nb_teams == 2).all():
+        raise ValueError("There is no two teams for each games ")
+
+    #teams are flattened two by two: home team then away team of each game
+    lst_teams = df_game["teams"].explode().tolist()
+    lst_team_name = [team.get("team_name") for team in lst_teams]
+    lst_score_string = [team.get("score_string") for team in lst_teams]
+
+    # we get datetime of game
+    sr_datetime_utc = pd.to_datetime(df_game["match_time_utc"], utc=True, errors="coerce").reset_index(drop=True)
+    sr_timezone = df_game["timezone"].reset_index(drop=True)
+    sr_date_local = pd.Series("NaT", index=sr_datetime_utc.index, dtype=object)
+    sr_time_local = pd.Series("NaT", index=sr_datetime_utc.index, dtype=object)
+    for timezone, index in sr_timezone.groupby(sr_timezone).groups.items():
+        sr_datetime_local = sr_datetime_utc[index].dt.tz_convert(timezone)
+        sr_date_local[index] = sr_datetime_local.dt.date.astype(str)
+        sr_time_local[index] = sr_datetime_local.dt.time.astype(str)
+
+    return pd.DataFrame({
+        'COMPETITION_SOURCE_ID': competition_source_id,
+        'GAMEDAY': df_game["round_description"].to_numpy(),
+        'DATE_GAME_UTC': sr_datetime_utc.dt.date.astype(str).to_numpy(),
+        'TIME_GAME_UTC': sr_datetime_utc.dt.time.astype(str).to_numpy(),
+        'DATE_GAME_LOCAL': sr_date_local.to_numpy(),
+        'TIME_GAME_LOCAL': sr_time_local.to_numpy(),
+        'TEAM_HOME': lst_team_name[0::2],
+        'SCORE_HOME': lst_score_string[0::2],
+        'TEAM_AWAY': lst_team_name[1::2],
+        'SCORE_AWAY': lst_score_string[1::2],
+        'GAME_SOURCE_ID': df_game["match_id"].to_numpy()
+    })
+
+def get_teams_lnb(df_game: pd.DataFrame) -> set[str]:
+
+    """
+        Gets the teams playing the games given by LNB
+        Args:
+            df_game (dataframe): the games as given by LNB
+        Returns:
+            The names of the teams (set), without the teams not known yet
+    """
+    return {team.get("team_name") for teams in df_game["teams"] if isinstance(teams, list) for team in teams} - {None}
+
+def is_gameday_missing_games_lnb(df_game: pd.DataFrame, gameday: str) -> bool:
+
+    """
+        Tells if some games of a gameday are missing from the games of a calendar window, as moved outside of it
+        Every team of the window plays each gameday (but one, exempted if the number of teams is odd):
+        a game is missing if at least two of them don't play the gameday in the window
+        Args:
+            df_game (dataframe): the games of the window, as given by LNB
+            gameday (str): the gameday
+        Returns:
+            True if the gameday is not in the window or has games missing
+    """
+    df_gameday = df_game[df_game["round_description"].astype(str) == gameday]
+    if df_gameday.empty:
+        return True
+    return len(get_teams_lnb(df_gameday)) < len(get_teams_lnb(df_game)) - 1
 
 @config_decorators.exit_program(log_filter=lambda args: dict(args))
-@config_decorators.retry_function(log_filter=lambda args: dict(args))
-def get_game_details_lnb(competition_source_id: int, gameday: str | None= None, sr_games_to_extract: pd.Series | None = None) -> pd.DataFrame:
+def get_game_details_lnb(competition_source_id: int, gameday: str | None= None, sr_games_to_extract: pd.Series | None = None,
+                         ts_task_utc: str | None = None) -> pd.DataFrame:
 
     """
         Gets all games details from a competition coming from LNB website, managed in JSON, possibly filtered by gameday
@@ -19,37 +182,46 @@ def get_game_details_lnb(competition_source_id: int, gameday: str | None= None,
             competition_source_id (int) : get the id of the competition in source
             gameday (str): if given, filter on this gameday
             sr_games_to_extract (pandas dataframe): if given, filter on these games id
+            ts_task_utc (str): if given, only the games around the time of the task are asked (see get_calendar_window_lnb)
         Returns:
             the dataframe corresponding to all games details extracted from this competition and possibly gamedays
         Raises:
-            Retry 3 times and exits the program if error with extraction or parsing (using retry decorator)
+            Exits the program if error with extraction or parsing, after the retries of fetch_game_details_lnb (using decorator)
     """
+    return fetch_game_details_lnb(competition_source_id, gameday, sr_games_to_extract, ts_task_utc)
 
-    url = "https://api-prod.lnb.fr/match/getCalendar"
-    payload = {
-        "competition_external_id": int(competition_source_id),
-        "start_date": "2000-01-01",
-        "end_date": "2999-12-31"
-    }
-    
-    headers = {
-        "Content-Type": "application/json",
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36",
-        "Accept": "application/json, text/plain, */*",
-        "Accept-Language": "en-US,en;q=0.9",
-        "Accept-Encoding": "gzip, deflate, br",
-        "Connection": "keep-alive",
-        "Upgrade-Insecure-Requests": "1",
-        "Sec-Ch-Ua": '"Not(A:Brand";v="99", "Google Chrome";v="123", "Chromium";v="123"',
-        "Sec-Ch-Ua-Mobile": "?0",
-        "Sec-Ch-Ua-Platform": '"Windows"',
-        "Sec-Fetch-Dest": "empty",
-        "Sec-Fetch-Mode": "cors",
-        "Sec-Fetch-Site": "cross-site"
-    }
-    response = requests.post(url, json=payload, headers=headers)
-    data = response.json().get("data", [])
-    df_game = pd.json_normalize(data, record_path="data", errors="ignore")
+@config_decorators.retry_function(log_filter=lambda args: dict(args))
+def fetch_game_details_lnb(competition_source_id: int, gameday: str | None= None, sr_games_to_extract: pd.Series | None = None,
+                           ts_task_utc: str | None = None) -> pd.DataFrame:
+
+    """
+        Gets all games details from a competition coming from LNB website, as get_game_details_lnb, without exiting the program
+        Args:
+            competition_source_id (int) : get the id of the competition in source
+            gameday (str): if given, filter on this gameday
+            sr_games_to_extract (pandas dataframe): if given, filter on these games id
+            ts_task_utc (str): if given, only the games around the time of the task are asked (see get_calendar_window_lnb)
+        Returns:
+            the dataframe corresponding to all games details extracted from this competition and possibly gamedays
+        Raises:
+            Retry 3 times and raise the issue to the caller if error with extraction or parsing (using retry decorator)
+    """
+
+    start_date, end_date = get_calendar_window_lnb(ts_task_utc)
+    df_game = get_calendar_lnb(competition_source_id, start_date, end_date)
+
+    #if games of the gameday (or games) asked are not in the window, as moved far from the task, we ask for all dates
+    if (start_date, end_date) != LNB_CALENDAR_FULL_WINDOW:
+        if df_game.empty:
+            is_window_missing_games = True
+        elif gameday is not None:
+            is_window_missing_games = is_gameday_missing_games_lnb(df_game, gameday)
+        elif sr_games_to_extract is not None:
+            is_window_missing_games = not sr_games_to_extract.astype(str).isin(df_game["match_id"].astype(str)).all()
+        else:
+            is_window_missing_games = False
+        if is_window_missing_games:
+            df_game = get_calendar_lnb(competition_source_id, *LNB_CALENDAR_FULL_WINDOW)
 
     if gameday is not None:
           df_game = df_game[df_game["round_description"].astype(str) == gameday]
@@ -60,40 +232,7 @@ def get_game_details_lnb(competition_source_id: int, gameday: str | None= None,
     if not game_status.isin(['SCHEDULED','COMPLETE']).all() and os.getenv('OVERWRITE_GAMES_STATUS') == 0:
         raise ValueError("At least one game is in progress or unknow status- retry extraction later")
     
-    df_game['COMPETITION_SOURCE_ID'] = competition_source_id
-    df_game["GAMEDAY"] = df_game["round_description"]
-
-    # we get datetime of game
-    df_game["DATETIME_UTC"] = pd.to_datetime(df_game["match_time_utc"], utc=True, errors="coerce")
-    df_game["DATETIME_LOCAL"] = df_game.apply(
-        lambda r: r["DATETIME_UTC"].astimezone(ZoneInfo(r["timezone"])) if pd.notna(r["DATETIME_UTC"]) else None,
-        axis=1
-    )
-    df_game["DATETIME_LOCAL"] = pd.to_datetime(df_game["DATETIME_LOCAL"], errors="coerce")
-    df_game["DATE_GAME_UTC"] = df_game["DATETIME_UTC"].dt.date.astype(str)
-    df_game["TIME_GAME_UTC"] = df_game["DATETIME_UTC"].dt.time.astype(str)
-    df_game["DATE_GAME_LOCAL"] = df_game["DATETIME_LOCAL"].dt.date.astype(str)
-    df_game["TIME_GAME_LOCAL"] = df_game["DATETIME_LOCAL"].dt.time.astype(str)
-
-    #we extract values from team
-    def extract_team(teams, index, field):
-        if not isinstance(teams, list) or len(teams) != 2:
-            raise ValueError("There is no two teams for each games ")
-        return teams[index].get(field)
-
-    df_game["TEAM_HOME"] = df_game["teams"].apply(lambda t: extract_team(t, 0, "team_name"))
-    df_game["TEAM_AWAY"] = df_game["teams"].apply(lambda t: extract_team(t, 1, "team_name"))
-    df_game["SCORE_HOME"] = df_game["teams"].apply(lambda t: extract_team(t, 0, "score_string"))
-    df_game["SCORE_AWAY"] = df_game["teams"].apply(lambda t: extract_team(t, 1, "score_string"))
-
-    df_game["GAME_SOURCE_ID"] = df_game["match_id"]
-
-    # Final selection
-    columns = ['COMPETITION_SOURCE_ID', 'GAMEDAY',
-            'DATE_GAME_UTC', 'TIME_GAME_UTC', 'DATE_GAME_LOCAL', 'TIME_GAME_LOCAL',
-            'TEAM_HOME', 'SCORE_HOME', 'TEAM_AWAY', 'SCORE_AWAY', 'GAME_SOURCE_ID']
-    df_game = df_game[columns].reset_index(drop=True)
+    df_game = normalize_games_lnb(df_game, competition_source_id)
     # We remove games with teams undefined
     df_game = df_game[(df_game['TEAM_HOME'].notna()) & (df_game['TEAM_AWAY'].notna())]
     return df_game
-    
@@ -0,0 +1,148 @@
+'''
+    The purpose of this module is to compare the games extracted with the games already loaded in the database, by previous runs:
+    - each game is identified by its key (COMPETITION_SOURCE, GAME_SOURCE_ID) and its content by a hash
+    - the games loaded are stored with their hash in the game_loaded_snapshot file
+    - the games are loaded again only if one of them is new or changed, or if the task has an action on their gameday
+    - only the games new or changed are landed, unless the task has an action on their gameday
+'''
+
+import logging
+import os
+from datetime import datetime, timezone
+import pandas as pd
+
+from ..config import config_decorators
+from ..config.config_variables import config_global_variables as var
+from ..files_manipulation.local_files_manipulation.files_manipulation import create_csv
+
+logging.basicConfig(level=logging.INFO)
+game_key_columns = ['COMPETITION_SOURCE', 'GAME_SOURCE_ID']
+game_loaded_snapshot_columns = ['COMPETITION_SOURCE', 'GAME_SOURCE_ID', 'GAME_HASH', 'LOADED_TS_UTC']
+
+def get_games_hash(df_game: pd.DataFrame) -> pd.Series:
+
+    '''
+        Gets the hash of the content of each game, all its columns read as text
+        Args:
+            df_game (dataframe): the games
+        Returns:
+            The hash of each game (series of int64)
+    '''
+    sr_hash = pd.util.hash_pandas_object(df_game.astype(str), index=False)
+    #the hash is stored as a signed integer, like any integer column read from a csv file
+    return pd.Series(sr_hash.to_numpy().view('int64'), index=df_game.index)
+
+def get_games_change(df_game: pd.DataFrame, df_game_loaded_snapshot: pd.DataFrame) -> pd.Series:
+
+    '''
+        Gets the change of each game extracted since its last load, by key and hash
+        Args:
+            df_game (dataframe): the games extracted
+            df_game_loaded_snapshot (dataframe): the games already loaded, with their hash
+        Returns:
+            INSERTED (new), CHANGED or UNCHANGED for each game (series, with the index of df_game)
+    '''
+    df_game_hash = df_game[game_key_columns].astype(str).assign(GAME_HASH=get_games_hash(df_game))
+    df_snapshot = df_game_loaded_snapshot[game_key_columns + ['GAME_HASH']].astype({'COMPETITION_SOURCE': str, 'GAME_SOURCE_ID': str})
+    df_diff = df_game_hash.merge(df_snapshot, on=game_key_columns, how='left', suffixes=('', '_LOADED'))
+
+    is_inserted = df_diff['GAME_HASH_LOADED'].isna()
+    is_changed = ~is_inserted & (df_diff['GAME_HASH'] != df_diff['GAME_HASH_LOADED'])
+    sr_change = pd.Series('UNCHANGED', index=df_diff.index)
+    sr_change[is_inserted] = 'INSERTED'
+    sr_change[is_changed] = 'CHANGED'
+    return sr_change.set_axis(df_game.index)
+
+@config_decorators.exit_program(log_filter=lambda args: {})
+def diff_games(df_game: pd.DataFrame, df_game_loaded_snapshot: pd.DataFrame) -> dict:
+
+    '''
+        Compares the games extracted with the games already loaded, by key and hash
+        Args:
+            df_game (dataframe): the games extracted
+            df_game_loaded_snapshot (dataframe): the games already loaded, with their hash
+        Returns:
+            The number of games INSERTED (new), CHANGED and UNCHANGED (dict)
+        Raises:
+            Exits the program if error running the function (using decorator)
+    '''
+    sr_change = get_games_change(df_game, df_game_loaded_snapshot)
+    dict_game_change = {change: int((sr_change == change).sum()) for change in ('INSERTED', 'CHANGED', 'UNCHANGED')}
+    logging.info(f"GAME -> {dict_game_change['INSERTED']} INSERTED / {dict_game_change['CHANGED']} CHANGED / {dict_game_change['UNCHANGED']} UNCHANGED SINCE LAST LOAD")
+    return dict_game_change
+
+def is_gameday_action(sr_output_need: pd.Series) -> bool:
+
+    '''
+        Tells if the task has an action on its gameday
+        Args:
+            sr_output_need (series - one row): the output_need processed
+        Returns:
+            True if the gameday is to init, calculate, delete or recalculate (bool)
+    '''
+    return bool((sr_output_need['IS_TO_INIT'] + sr_output_need['IS_TO_CALCULATE']
+                 + sr_output_need['IS_TO_DELETE'] + sr_output_need['IS_TO_RECALCULATE']) > 0)
+
+def is_game_load_needed(dict_game_change: dict, sr_output_need: pd.Series) -> bool:
+
+    '''
+        Tells if the games extracted must be loaded in the database
+        Args:
+            dict_game_change (dict): the number of games INSERTED, CHANGED and UNCHANGED since last load
+            sr_output_need (series - one row): the output_need processed - its gameday action is set by loading the games
+        Returns:
+            True if a game is new or changed, or if the task has an action on the gameday (bool)
+    '''
+    return bool(dict_game_change['INSERTED'] + dict_game_change['CHANGED'] > 0 or is_gameday_action(sr_output_need))
+
+@config_decorators.exit_program(log_filter=lambda args: {})
+def filter_games_to_load(df_game: pd.DataFrame, df_game_loaded_snapshot: pd.DataFrame, sr_output_need: pd.Series) -> pd.DataFrame:
+
+    '''
+        Filters the games extracted on the games to land, and creates the game file landed with them:
+        - a task with an action on its gameday lands all its games, as curated_gameday sets the action from them
+        - otherwise only the games new or changed since last load are landed: 
+          the database numbers the games and dates the gameday with the games it already has
+        Args:
+            df_game (dataframe): the games extracted
+            df_game_loaded_snapshot (dataframe): the games already loaded, with their hash
+            sr_output_need (series - one row): the output_need processed
+        Returns:
+            The dataframe of the games to land
+        Raises:
+            Exits the program if error running the function (using decorator)
+    '''
+    if is_gameday_action(sr_output_need):
+        df_game_to_load = df_game
+    else:
+        df_game_to_load = df_game[get_games_change(df_game, df_game_loaded_snapshot) != 'UNCHANGED'].reset_index(drop=True)
+
+    create_csv(os.path.join(var.TMPF, 'game.csv'), df_game_to_load, var.GAME_ENCAPSULATED)
+    logging.info(f"GAME -> {len(df_game_to_load)} GAMES TO LAND / {len(df_game)} EXTRACTED")
+    return df_game_to_load
+
+@config_decorators.exit_program(log_filter=lambda args: {})
+def update_game_loaded_snapshot(df_game: pd.DataFrame, df_game_loaded_snapshot: pd.DataFrame) -> pd.DataFrame:
+
+    '''
+        Stores the games loaded with their hash in the game_loaded_snapshot file, replacing their previous version
+        Args:
+            df_game (dataframe): the games loaded
+            df_game_loaded_snapshot (dataframe): the games loaded by previous runs
+        Returns:
+            The dataframe of the games loaded, previous runs included
+        Raises:
+            Exits the program if error running the function (using decorator)
+    '''
+    loaded_ts_utc = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+    df_game_loaded = df_game[game_key_columns].astype(str).assign(GAME_HASH=get_games_hash(df_game), LOADED_TS_UTC=loaded_ts_utc)
+    df_game_kept = df_game_loaded_snapshot[game_loaded_snapshot_columns].astype({'COMPETITION_SOURCE': str, 'GAME_SOURCE_ID': str})
+    df_game_kept = df_game_kept[~df_game_kept.set_index(game_key_columns).index.isin(df_game_loaded.set_index(game_key_columns).index)]
+    #a snapshot with headers only has no type to concatenate with
+    if df_game_kept.empty:
+        df_game_loaded_snapshot = df_game_loaded.reset_index(drop=True)
+    else:
+        df_game_loaded_snapshot = pd.concat([df_game_kept, df_game_loaded], ignore_index=True)
+
+    create_csv(os.path.join(var.TMPF, 'game_loaded_snapshot.csv'), df_game_loaded_snapshot)
+    return df_game_loaded_snapshot
@@ -0,0 +1,130 @@
+'''
+    The purpose of this module is to watch the results of the games of a gameday, live from the game website:
+    - finding the next task, if it is a CALCULATE task due soon
+    - polling only the games not final yet, more often once they are expected to end
+    - telling as soon as the last result of the gameday is final, so that the task can be run before its time
+'''
+
+import logging
+import time
+import pandas as pd
+
+from ..config import config_decorators
+from ..config.config_variables import config_global_variables as var
+from ..tasks_management import tasks_calendar_management
+from .games_details_extraction_lnb.games_details_extraction_lnb import get_games_status_lnb
+
+logging.basicConfig(level=logging.INFO)
+game_status_functions = {
+    "LNB": get_games_status_lnb
+}
+
+@config_decorators.exit_program(log_filter=lambda args: {})
+def get_task_to_watch(df_calendar: pd.DataFrame, df_task_done: pd.DataFrame, ts_now_utc: pd.Timestamp) -> pd.Series | None:
+
+    """
+        Gets the task whose gameday results must be watched: the next task not run, if it is a CALCULATE task due within GAME_WATCHER_HORIZON_HOURS
+        Args:
+            df_calendar (dataframe): the calendar of run
+            df_task_done (dataframe): the tasks already run
+            ts_now_utc (timestamp): the current time (UTC, without timezone)
+        Returns:
+            The task to watch (series - one row), None if there is not
+        Raises:
+            Exits the program if error running the function (using decorator)
+    """
+    df_notrun = tasks_calendar_management.get_notrun_task(df_calendar, df_task_done)
+    df_notrun = df_notrun[df_notrun['TS_TASK_UTC'].notna() & (df_notrun['TS_TASK_UTC'] > ts_now_utc)]
+    if df_notrun.empty:
+        return None
+
+    #tasks of a same time are run alphabetically, like calculate_output_need_auto does
+    sr_task = df_notrun.sort_values(by=['TS_TASK_UTC','TASK_RUN','SEASON_ID','GAMEDAY']).iloc[0]
+    if sr_task['TASK_RUN'] != var.TASK_RUN_MAP['CALCULATE'] or sr_task['TS_TASK_UTC'] > ts_now_utc + pd.Timedelta(hours=var.GAME_WATCHER_HORIZON_HOURS):
+        return None
+    return sr_task
+
+def get_next_poll_secs(df_game_watched: pd.DataFrame, ts_now_utc: pd.Timestamp) -> float:
+
+    """
+        Gets the time to wait before polling again the results not final: until the first game is expected to end, between GAME_WATCHER_POLL_MIN_SECS and GAME_WATCHER_POLL_MAX_SECS
+        Args:
+            df_game_watched (dataframe): the games watched, with DATETIME_UTC and IS_FINAL
+            ts_now_utc (timestamp): the current time (UTC)
+        Returns:
+            The number of seconds to wait (float)
+    """
+    sr_expected_end = df_game_watched.loc[~df_game_watched['IS_FINAL'], 'DATETIME_UTC'].dropna() + pd.Timedelta(minutes=var.GAME_WATCHER_GAME_DURATION_MINUTES)
+    if sr_expected_end.empty:
+        return var.GAME_WATCHER_POLL_MAX_SECS
+    secs_to_end = (sr_expected_end.min() - ts_now_utc).total_seconds()
+    return min(max(secs_to_end, var.GAME_WATCHER_POLL_MIN_SECS), var.GAME_WATCHER_POLL_MAX_SECS)
+
+def get_poll_window(df_game_watched: pd.DataFrame) -> tuple[str, str]:
+
+    """
+        Gets the date window covering the games not final, one day wider on each side as websites may date games in local time
+        Args:
+            df_game_watched (dataframe): the games watched, with DATETIME_UTC and IS_FINAL
+        Returns:
+            The start and end dates of the window (YYYY-MM-DD)
+    """
+    sr_datetime = df_game_watched.loc[~df_game_watched['IS_FINAL'], 'DATETIME_UTC'].dropna()
+    if sr_datetime.empty:
+        sr_datetime = df_game_watched['DATETIME_UTC'].dropna()
+    return ((sr_datetime.min() - pd.Timedelta(days=1)).strftime("%Y-%m-%d"),
+            (sr_datetime.max() + pd.Timedelta(days=1)).strftime("%Y-%m-%d"))
+
+@config_decorators.exit_program(log_filter=lambda args: {k: args[k] for k in ('competition_source', 'competition_source_id', 'gameday')})
+def watch_gameday_results(competition_source: str, competition_source_id: int, gameday: str, sr_games_to_watch: pd.Series | None,
+                          ts_task_utc: pd.Timestamp, ts_deadline_utc: pd.Timestamp) -> bool:
+
+    """
+        Watches the results of the games of a gameday until they are all final, or until the deadline
+        The first poll finds the games of the gameday, then only the dates of the games not final are polled
+        A failed poll is logged and polled again at the next interval
+        Args:
+            competition_source (str): the game website
+            competition_source_id (int): the id of the competition on the website
+            gameday (str): the gameday of the games (on the website)
+            sr_games_to_watch (series): if given, the ids of the games to watch instead of the games of the gameday (gameday modified)
+            ts_task_utc (timestamp): the time of the CALCULATE task (UTC, without timezone), the games are before
+            ts_deadline_utc (timestamp): the time to stop watching (UTC, without timezone)
+        Returns:
+            True if all results of the gameday are final (bool)
+        Raises:
+            Exits the program if error running the function (using decorator)
+    """
+    logging.info(f"GAME -> WATCHING RESULTS OF {competition_source} - {competition_source_id} / {gameday} [START]")
+    get_games_status = game_status_functions.get(competition_source)
+    start_date = (ts_task_utc - pd.Timedelta(days=var.GAME_CALENDAR_WINDOW_DAYS_BEFORE_TASK)).strftime("%Y-%m-%d")
+    df_game = get_games_status(competition_source_id, start_date, ts_task_utc.strftime("%Y-%m-%d"))
+    if sr_games_to_watch is not None and len(sr_games_to_watch) > 0:
+        df_game_watched = df_game[df_game['GAME_SOURCE_ID'].isin(sr_games_to_watch.astype(str))].reset_index(drop=True)
+    else:
+        df_game_watched = df_game[df_game['GAMEDAY'].astype(str) == gameday].reset_index(drop=True)
+    if df_game_watched.empty:
+        logging.info(f"GAME -> WATCHING RESULTS OF {competition_source} - {competition_source_id} / {gameday} - NO GAME FOUND")
+        return False
+
+    while not df_game_watched['IS_FINAL'].all():
+        ts_now_utc = pd.Timestamp.now(tz="UTC")
+        secs_to_deadline = (ts_deadline_utc.tz_localize("UTC") - ts_now_utc).total_seconds()
+        if secs_to_deadline <= 0:
+            logging.info(f"GAME -> WATCHING RESULTS OF {competition_source} - {competition_source_id} / {gameday} - DEADLINE REACHED")
+            return False
+        secs_to_wait = min(get_next_poll_secs(df_game_watched, ts_now_utc), secs_to_deadline)
+        logging.info(f"GAME -> {(~df_game_watched['IS_FINAL']).sum()} RESULTS NOT FINAL - NEXT POLL IN {secs_to_wait:.0f} SECS")
+        time.sleep(secs_to_wait)
+
+        try:
+            df_game_polled = get_games_status(competition_source_id, *get_poll_window(df_game_watched))
+        except Exception as e:
+            logging.error(f"GAME -> POLL FAILED - RETRYING AT NEXT INTERVAL - {e!r}")
+            continue
+        #only the status of the games not final is updated, final results don't change
+        sr_is_final = df_game_watched['GAME_SOURCE_ID'].map(df_game_polled.drop_duplicates('GAME_SOURCE_ID').set_index('GAME_SOURCE_ID')['IS_FINAL'])
+        df_game_watched['IS_FINAL'] = df_game_watched['IS_FINAL'] | sr_is_final.eq(True)
+
+    logging.info(f"GAME -> WATCHING RESULTS OF {competition_source} - {competition_source_id} / {gameday} - ALL RESULTS FINAL [DONE]")
+    return True
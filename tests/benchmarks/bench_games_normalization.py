@@ -0,0 +1,107 @@
+'''
+This benchmark file concern the normalization of LNB games in the games_details_extraction_lnb module.
+It measures, on synthetic calendars of several seasons copied from the games of the materials, the normalization of games:
+- column by column (normalize_games_lnb)
+- row by row, as done before (reference kept in this file), to check both give the same games
+It is not collected by pytest, and is run with: python -m tests.benchmarks.bench_games_normalization [nb_seasons ...]
+'''
+import copy
+import json
+import sys
+import time
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+from src.predict_core.games_details_extraction.games_details_extraction_lnb import games_details_extraction_lnb
+
+MATERIALS_DIR = Path(__file__).resolve().parent.parent / "materials"
+GAMEDAYS_PER_SEASON = 34
+GAMES_PER_GAMEDAY = 9
+TIMEZONES = ["Europe/Paris", "Europe/Paris", "Europe/Paris", "Indian/Reunion", "America/Guadeloupe"]
+
+def generate_calendar(nb_seasons: int) -> list:
+
+    '''
+        Generates the calendar of a competition over several seasons, copying the games of the materials with new ids, dates and timezones
+        Args:
+            nb_seasons (int): the number of seasons of the calendar
+        Returns:
+            The calendar as given by LNB (list of days)
+    '''
+    lst_games = [game for day in json.loads((MATERIALS_DIR / "lnb_game_response.json").read_text(encoding='utf-8'))["data"] for game in day["data"]]
+    calendar = []
+    for season in range(nb_seasons):
+        for gameday in range(GAMEDAYS_PER_SEASON):
+            ts_gameday = pd.Timestamp(f"{2000 + season}-10-01 18:00:00") + pd.Timedelta(weeks=gameday)
+            lst_gameday_games = []
+            for number in range(GAMES_PER_GAMEDAY):
+                game = copy.deepcopy(lst_games[number % len(lst_games)])
+                game["match_id"] = f"ID{season}_{gameday}_{number}"
+                game["match_time_utc"] = (ts_gameday + pd.Timedelta(hours=number % 3)).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+                game["timezone"] = TIMEZONES[number % len(TIMEZONES)]
+                game["round_description"] = f"{gameday + 1}e journee"
+                lst_gameday_games.append(game)
+            calendar.append({"date": ts_gameday.strftime("%Y-%m-%d"), "data": lst_gameday_games})
+    return calendar
+
+def normalize_games_rowwise(df_game: pd.DataFrame, competition_source_id: int) -> pd.DataFrame:
+
+    '''
+        Normalizes the games row by row, as get_game_details_lnb did before normalize_games_lnb
+        Args:
+            df_game (dataframe): the games as given by LNB
+            competition_source_id (int) : the id of the competition in source
+        Returns:
+            the dataframe of the games, with the game columns
+    '''
+    df_game = df_game.copy()
+    df_game['COMPETITION_SOURCE_ID'] = competition_source_id
+    df_game["GAMEDAY"] = df_game["round_description"]
+    df_game["DATETIME_UTC"] = pd.to_datetime(df_game["match_time_utc"], utc=True, errors="coerce")
+    sr_datetime_local = df_game.apply(lambda r: r["DATETIME_UTC"].astimezone(ZoneInfo(r["timezone"])), axis=1)
+    df_game["DATE_GAME_UTC"] = df_game["DATETIME_UTC"].dt.date.astype(str)
+    df_game["TIME_GAME_UTC"] = df_game["DATETIME_UTC"].dt.time.astype(str)
+    df_game["DATE_GAME_LOCAL"] = sr_datetime_local.map(lambda ts: str(ts.date()))
+    df_game["TIME_GAME_LOCAL"] = sr_datetime_local.map(lambda ts: str(ts.time()))
+    df_game["TEAM_HOME"] = df_game["teams"].apply(lambda t: t[0].get("team_name"))
+    df_game["TEAM_AWAY"] = df_game["teams"].apply(lambda t: t[1].get("team_name"))
+    df_game["SCORE_HOME"] = df_game["teams"].apply(lambda t: t[0].get("score_string"))
+    df_game["SCORE_AWAY"] = df_game["teams"].apply(lambda t: t[1].get("score_string"))
+    df_game["GAME_SOURCE_ID"] = df_game["match_id"]
+    columns = ['COMPETITION_SOURCE_ID', 'GAMEDAY',
+            'DATE_GAME_UTC', 'TIME_GAME_UTC', 'DATE_GAME_LOCAL', 'TIME_GAME_LOCAL',
+            'TEAM_HOME', 'SCORE_HOME', 'TEAM_AWAY', 'SCORE_AWAY', 'GAME_SOURCE_ID']
+    return df_game[columns].reset_index(drop=True)
+
+def bench_normalization(nb_seasons: int) -> dict:
+
+    '''
+        Normalizes the games of a synthetic calendar both ways
+        Args:
+            nb_seasons (int): the number of seasons of the calendar
+        Returns:
+            The measures of the normalization (dict)
+    '''
+    df_game = pd.json_normalize(generate_calendar(nb_seasons), record_path="data")
+
+    time_start = time.perf_counter()
+    df_game_rowwise = normalize_games_rowwise(df_game, 288)
+    duration_rowwise = time.perf_counter() - time_start
+
+    time_start = time.perf_counter()
+    df_game_columnwise = games_details_extraction_lnb.normalize_games_lnb(df_game, 288)
+    duration_columnwise = time.perf_counter() - time_start
+
+    assert_frame_equal(df_game_columnwise.astype(str), df_game_rowwise.astype(str))
+    return {'NB_GAMES': len(df_game), 'ROWWISE_SECS': duration_rowwise, 'COLUMNWISE_SECS': duration_columnwise}
+
+if __name__ == "__main__":
+
+    lst_nb_seasons = [int(arg) for arg in sys.argv[1:]] or [1, 5, 20]
+    for nb_seasons in lst_nb_seasons:
+        measures = bench_normalization(nb_seasons)
+        print(f"{nb_seasons:>3} seasons ({measures['NB_GAMES']:>5} games): row by row {measures['ROWWISE_SECS']:7.3f}s"
+              f" - column by column {measures['COLUMNWISE_SECS']:7.3f}s - speedup x{measures['ROWWISE_SECS'] / measures['COLUMNWISE_SECS']:.1f}")
@@ -0,0 +1,77 @@
+'''
+This benchmark file concern the landing files put on the stage in the snowflake_etl_process module.
+It measures, on synthetic landing_game files copied from the game of the materials, the preparation and the size of the file put:
+- as csv, gzipped by the put (AUTO_COMPRESS, done here with gzip at the same level)
+- as parquet (create_parquet, from the dataframe with the types declared in file_check.json), checking it is read back with the same values
+The put and the copy themselves need Snowflake: their durations per format are in the snowflake_load_report file of the runs.
+It is not collected by pytest, and is run with: python -m tests.benchmarks.bench_landing_file_format [nb_rows ...]
+'''
+import gzip
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+from src.predict_core.database_interaction.snowflake_etl_process import snowflake_etl_process
+
+MATERIALS_DIR = Path(__file__).resolve().parent.parent / "materials"
+
+def generate_landing_game(nb_rows: int) -> pd.DataFrame:
+
+    '''
+        Generates a landing_game table, copying the games of the materials with new ids, and some scores missing
+        Args:
+            nb_rows (int): the number of games of the table
+        Returns:
+            The dataframe of the games, read as text
+    '''
+    df_game = pd.read_csv(MATERIALS_DIR / "game.csv", dtype=str, keep_default_na=False)
+    df_game = df_game.iloc[[number % len(df_game) for number in range(nb_rows)]].reset_index(drop=True)
+    df_game['GAME_SOURCE_ID'] = [f"ID{number:07d}" for number in range(nb_rows)]
+    df_game['GAMEDAY'] = [f"{number // 9 % 34 + 1}e journee" for number in range(nb_rows)]
+    df_game.loc[df_game.index % 10 == 0, ['SCORE_HOME', 'SCORE_AWAY']] = ''
+    return df_game
+
+def bench_file_format(nb_rows: int) -> dict:
+
+    '''
+        Prepares the file put of a synthetic landing_game table in both formats
+        Args:
+            nb_rows (int): the number of rows of the table
+        Returns:
+            The measures of the preparation and size of the files (dict)
+    '''
+    df_game = generate_landing_game(nb_rows)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        local_file_path = os.path.join(tmpdir, "game.csv")
+        df_game.to_csv(local_file_path, index=False, encoding='utf-8', header=True)
+
+        time_start = time.perf_counter()
+        with open(local_file_path, 'rb') as csv_file, gzip.open(os.path.join(tmpdir, "landing_game.csv.gz"), 'wb') as gzip_file:
+            shutil.copyfileobj(csv_file, gzip_file)
+        duration_csv = time.perf_counter() - time_start
+
+        time_start = time.perf_counter()
+        snowflake_etl_process.create_parquet(df_game, os.path.join(tmpdir, "landing_game.parquet"), "game", 0)
+        duration_parquet = time.perf_counter() - time_start
+
+        df_game_parquet = pd.read_parquet(os.path.join(tmpdir, "landing_game.parquet"))
+        assert_frame_equal(df_game_parquet.astype('string').fillna('').astype(object), df_game.astype(object))
+        return {'CSV_BYTES': os.path.getsize(local_file_path),
+                'CSV_GZIP_BYTES': os.path.getsize(os.path.join(tmpdir, "landing_game.csv.gz")),
+                'PARQUET_BYTES': os.path.getsize(os.path.join(tmpdir, "landing_game.parquet")),
+                'CSV_GZIP_SECS': duration_csv, 'PARQUET_SECS': duration_parquet}
+
+if __name__ == "__main__":
+
+    lst_nb_rows = [int(arg) for arg in sys.argv[1:]] or [1_000, 10_000, 100_000]
+    for nb_rows in lst_nb_rows:
+        measures = bench_file_format(nb_rows)
+        print(f"{nb_rows:>7} rows: csv {measures['CSV_BYTES'] / 1024:8.1f}KB"
+              f" - csv gzip {measures['CSV_GZIP_BYTES'] / 1024:7.1f}KB in {measures['CSV_GZIP_SECS']:6.3f}s"
+              f" - parquet {measures['PARQUET_BYTES'] / 1024:7.1f}KB in {measures['PARQUET_SECS']:6.3f}s")
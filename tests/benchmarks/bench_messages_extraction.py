@@ -0,0 +1,94 @@
+'''
+This benchmark file concern the extraction of messages in the messages_details_extraction module, against the local phpBB stand-in.
+It measures, for topics of growing size:
+- the crawl of one topic (extract_messages_from_topic): pages/s and messages/s
+- the end-to-end latency of extract_messages on a first run, then on a second run crawling again all pages, revalidated with the page cache of the first one
+It is not collected by pytest, and is run with: python -m tests.benchmarks.bench_messages_extraction [topic_sizes ...]
+'''
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import patch
+
+import pandas as pd
+
+from src.predict_core.config.config_variables import config_global_variables as var
+from src.predict_core.forums_interaction import messages_details_extraction
+from tests.stand_ins.phpbb_stand_in import generate_forum, run_phpbb_stand_in
+
+FILE_EXEMPLES_DIR = Path(__file__).resolve().parent.parent.parent / "file_exemples"
+TS_MESSAGE_EXTRACT_MIN_UTC = pd.Timestamp('2025-02-04 18:00:00')
+
+def get_topics_scope(topic_numbers: list[int]) -> pd.DataFrame:
+
+    '''
+        Gets the topics to extract, like the topics query does
+        Args:
+            topic_numbers (list): the numbers of the topics
+        Returns:
+            The dataframe of topics
+    '''
+    return pd.DataFrame({'FORUM_SOURCE': 'BI', 'FORUM_COUNTRY': 'FRANCE', 'FORUM_TIMEZONE': 'Europe/Paris', 'TOPIC_NUMBER': topic_numbers,
+                         'MESSAGE_NUMBER_TO_EDIT': None, 'IS_FOR_PREDICT': 0, 'IS_FOR_RESULT': 1})
+
+def bench_topic_crawl(nb_messages: int) -> dict:
+
+    '''
+        Crawls one topic of the stand-in from its first message
+        Args:
+            nb_messages (int): the number of messages of the topic
+        Returns:
+            The measures of the crawl (dict)
+    '''
+    forum = generate_forum({1: nb_messages})
+    topic_row = next(get_topics_scope([1]).itertuples(index=False))
+    with run_phpbb_stand_in(forum) as forum_url, patch.dict(os.environ, {'BI_URL': forum_url}):
+        time_start = time.perf_counter()
+        df, _ = messages_details_extraction.extract_messages_from_topic(topic_row, TS_MESSAGE_EXTRACT_MIN_UTC, pd.Timestamp.utcnow().tz_localize(None))
+        duration = time.perf_counter() - time_start
+    assert len(df) == nb_messages
+    return {'SECONDS': duration, 'PAGES_PER_SEC': forum['nb_requests'] / duration, 'MESSAGES_PER_SEC': nb_messages / duration}
+
+def bench_extract_messages(nb_messages: int, nb_topics: int = 4) -> dict:
+
+    '''
+        Extracts all messages of several topics of the stand-in, twice: the second run revalidates the pages with the page cache of the first one
+        Args:
+            nb_messages (int): the number of messages of each topic
+            nb_topics (int): the number of topics
+        Returns:
+            The measures of both runs (dict)
+    '''
+    forum = generate_forum({topic_number: nb_messages for topic_number in range(1, nb_topics + 1)})
+    sr_output_need = pd.Series({'SEASON_ID': 'S1', 'GAMEDAY': '1ere journée', 'MESSAGE_ACTION': var.MESSAGE_ACTION_MAP['RUN']})
+    df_message_topic_state = pd.read_csv(FILE_EXEMPLES_DIR / "message_topic_state.csv")
+    df_message_page_cache = pd.read_csv(FILE_EXEMPLES_DIR / "message_page_cache.csv")
+    durations = []
+    with run_phpbb_stand_in(forum) as forum_url, tempfile.TemporaryDirectory() as tmp_dir, \
+         patch.dict(os.environ, {'BI_URL': forum_url}), \
+         patch.object(var, 'TMPF', tmp_dir), \
+         patch.object(messages_details_extraction, 'get_list_topics_from_need', return_value=get_topics_scope(list(range(1, nb_topics + 1)))), \
+         patch.object(messages_details_extraction, 'get_extraction_time_range',
+                      return_value=(TS_MESSAGE_EXTRACT_MIN_UTC, pd.Timestamp.utcnow().tz_localize(None).floor('s'))):
+        for _ in range(2):
+            time_start = time.perf_counter()
+            df_messages, _, df_message_topic_state, df_message_page_cache = messages_details_extraction.extract_messages(
+                None, sr_output_need, df_message_topic_state, df_message_page_cache)
+            durations.append(time.perf_counter() - time_start)
+            assert len(df_messages) == nb_messages * nb_topics
+    return {'FIRST_RUN_SECONDS': durations[0], 'SECOND_RUN_SECONDS': durations[1]}
+
+if __name__ == "__main__":
+
+    lst_topic_sizes = [int(size) for size in sys.argv[1:]] or [150, 1500, 15000]
+    #the stand-in is local: the rate limit of the live forum is lifted
+    with patch.object(var, 'HTTP_REQUESTS_PER_SECOND_PER_HOST', 100000), patch.object(var, 'HTTP_REQUESTS_BURST_PER_HOST', 100000):
+        print(f"{'messages per topic':>18} | {'crawl s':>8} | {'pages/s':>8} | {'messages/s':>10} | {'extract 1st run s':>17} | {'extract 2nd run s':>17}")
+        for nb_messages in lst_topic_sizes:
+            crawl = bench_topic_crawl(nb_messages)
+            extraction = bench_extract_messages(nb_messages)
+            print(f"{nb_messages:>18} | {crawl['SECONDS']:>8.2f} | {crawl['PAGES_PER_SEC']:>8.1f} | {crawl['MESSAGES_PER_SEC']:>10.1f} | "
+                  f"{extraction['FIRST_RUN_SECONDS']:>17.2f} | {extraction['SECOND_RUN_SECONDS']:>17.2f}")
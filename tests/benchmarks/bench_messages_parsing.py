@@ -0,0 +1,72 @@
+'''
+This benchmark file concern the parsing of pages in the messages_details_extraction module.
+It measures the parsing of a synthetic topic of 10k messages through the pool of processes, for several numbers of processes.
+It is not collected by pytest, and is run with: python -m tests.benchmarks.bench_messages_parsing [nb_messages]
+'''
+import multiprocessing
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+from src.predict_core.forums_interaction import messages_details_extraction
+
+MATERIALS_DIR = Path(__file__).resolve().parent.parent / "materials"
+MESSAGES_PER_PAGE = 15
+
+def generate_topic_pages(nb_messages: int) -> list[str]:
+
+    '''
+        Generates the HTML pages of a synthetic topic, copying the page of the materials with new message ids
+        Args:
+            nb_messages (int): the number of messages of the topic
+        Returns:
+            The list of HTML pages of the topic
+    '''
+    messagetext = (MATERIALS_DIR / "bi_message_html.txt").read_text(encoding='utf-8')
+    lst_pages = []
+    for start in range(0, nb_messages, MESSAGES_PER_PAGE):
+        lst_pages.append(re.sub(r'id="profile(\d+)"', lambda m: f'id="profile{start + int(m.group(1))}"', messagetext))
+    return lst_pages
+
+def run_parsing(lst_pages: list[str], sr_topic: pd.Series, nb_processes: int) -> float:
+
+    '''
+        Parses all pages of the topic in a pool of processes, as the crawl does
+        Args:
+            lst_pages (list): the HTML pages of the topic
+            sr_topic (series - one row): Contains basic info about the topic
+            nb_processes (int): the number of processes of the pool
+        Returns:
+            The number of seconds to parse all pages (float)
+    '''
+    with ProcessPoolExecutor(max_workers=nb_processes, mp_context=multiprocessing.get_context('spawn')) as parsing_executor:
+        #processes are started before timing
+        list(parsing_executor.map(messages_details_extraction.parse_messages_page_columns, lst_pages[:nb_processes],
+                                  [sr_topic] * nb_processes, [0] * nb_processes))
+        time_start = time.perf_counter()
+        nb_parsed = sum(len(columns['MESSAGE_FORUM_ID']) for columns in parsing_executor.map(
+            messages_details_extraction.parse_messages_page_columns, lst_pages, [sr_topic] * len(lst_pages),
+            range(0, len(lst_pages) * MESSAGES_PER_PAGE, MESSAGES_PER_PAGE), chunksize=4))
+        duration = time.perf_counter() - time_start
+    assert nb_parsed == len(lst_pages) * MESSAGES_PER_PAGE
+    return duration
+
+if __name__ == "__main__":
+
+    nb_messages = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    lst_pages = generate_topic_pages(nb_messages)
+    sr_topic = pd.read_csv(MATERIALS_DIR / "q_topics_query.csv").iloc[0]
+    nb_cores = os.cpu_count() or 1
+
+    print(f"Parsing {len(lst_pages)} pages ({len(lst_pages) * MESSAGES_PER_PAGE} messages) on {nb_cores} cores")
+    duration_reference = None
+    for nb_processes in sorted({1, 2, 4, nb_cores}):
+        duration = run_parsing(lst_pages, sr_topic, nb_processes)
+        duration_reference = duration_reference or duration
+        print(f"{nb_processes:>3} processes: {duration:7.2f}s - {len(lst_pages) / duration:7.1f} pages/s"
+              f" - {len(lst_pages) * MESSAGES_PER_PAGE / duration:8.1f} messages/s - speedup x{duration_reference / duration:.2f}")
@@ -0,0 +1,95 @@
+'''
+This module is a local stand-in of the LNB API, to exercise the games code without the live website.
+It serves the calendar of generated games (POST /match/getCalendar), filtered by competition and dates like LNB does,
+the results of games becoming final after some requests, to play a gameday live.
+It is used by tests with: with run_lnb_stand_in(generate_competition(288, games)) as api_url: ...
+'''
+import contextlib
+import copy
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+MATERIALS_DIR = Path(__file__).resolve().parent.parent / "materials"
+
+def generate_competition(competition_source_id: int, games: list[dict]) -> dict:
+
+    '''
+        Generates the games of a competition, copying the game of the materials
+        Args:
+            competition_source_id (int): the id of the competition on LNB
+            games (list): for each game, a dict with:
+            - match_id, round_description, match_time_utc (like "2025-01-20T18:00:00.000Z")
+            - complete_after_requests: the number of calendar requests after which the game is COMPLETE (0 = already complete)
+        Returns:
+            The data dictionary of the competition, read by the stand-in
+    '''
+    game_model = json.loads((MATERIALS_DIR / "lnb_game_response.json").read_text(encoding='utf-8'))["data"][0]["data"][0]
+    lst_games = []
+    for game in games:
+        lnb_game = copy.deepcopy(game_model)
+        lnb_game.update({k: v for k, v in game.items() if k != 'complete_after_requests'})
+        lnb_game["match_date"] = game["match_time_utc"][:10]
+        lst_games.append((lnb_game, game.get('complete_after_requests', 0)))
+    return {'competition_source_id': competition_source_id, 'games': lst_games, 'requests': [], 'lock': threading.Lock()}
+
+class LnbStandInHandler(BaseHTTPRequestHandler):
+
+    '''
+        Answers the requests of the stand-in, the competition being shared by all requests through the server
+    '''
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        return
+
+    def send_json(self, data: dict, status: int = 200):
+        body = json.dumps(data).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        competition = self.server.competition
+        payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        if self.path != "/match/getCalendar":
+            self.send_json({"status": False, "message": "Not found"}, status=404)
+            return
+
+        with competition['lock']:
+            competition['requests'].append(payload)
+            nb_requests = len(competition['requests'])
+        days = {}
+        if payload.get("competition_external_id") == competition['competition_source_id']:
+            for lnb_game, complete_after_requests in competition['games']:
+                if payload["start_date"] <= lnb_game["match_date"] <= payload["end_date"]:
+                    game = dict(lnb_game, match_status = "COMPLETE" if nb_requests > complete_after_requests else "IN_PROGRESS")
+                    days.setdefault(game["match_date"], []).append(game)
+        self.send_json({"status": True, "message": "Calendar fetched successfully",
+                        "data": [{"date": date, "data": day_games} for date, day_games in sorted(days.items())]})
+
+@contextlib.contextmanager
+def run_lnb_stand_in(competition: dict):
+
+    '''
+        Runs the stand-in on a free local port, in a background thread, until the end of the block
+        Args:
+            competition (dict): the competition served (see generate_competition), its requests recorded
+        Yields:
+            The url of the API (str)
+    '''
+    server = ThreadingHTTPServer(("127.0.0.1", 0), LnbStandInHandler)
+    server.daemon_threads = True
+    server.competition = competition
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
@@ -0,0 +1,405 @@
+'''
+This module is a local stand-in of a phpBB forum (like BI), to exercise the forum code without the live website.
+It serves generated topics with:
+- pages of messages (with edits, blockquotes, pagination), and pages of one message (viewtopic.php?p=)
+- Atom feeds of topics and of active topics
+- login form (with autologin cookie) and posting / editing forms (with flood control)
+It is used by tests and benchmarks with: with run_phpbb_stand_in(generate_forum({1: 100})) as forum_url: ...
+'''
+import contextlib
+import gzip
+import hashlib
+import secrets
+import threading
+import time
+from datetime import datetime, timedelta
+from email.utils import formatdate
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+from zoneinfo import ZoneInfo
+
+FRENCH_DAYS = ["lun.", "mar.", "mer.", "jeu.", "ven.", "sam.", "dim."]
+FRENCH_MONTHS = ["janv.", "févr.", "mars", "avr.", "mai", "juin", "juil.", "août", "sept.", "oct.", "nov.", "déc."]
+FLOOD_ERROR = "Vous ne pouvez pas envoyer un autre message si rapidement après le précédent."
+
+def format_french_time(ts: datetime) -> str:
+
+    '''
+        Formats a time as the forum shows it
+        Args:
+            ts (datetime): the local time
+        Returns:
+            The time like "mar. 04 févr. 2025 9:54" (str)
+    '''
+    return f"{FRENCH_DAYS[ts.weekday()]} {ts.day:02d} {FRENCH_MONTHS[ts.month - 1]} {ts.year} {ts.hour}:{ts.minute:02d}"
+
+def cookie_expiry() -> str:
+
+    '''
+        Gets the expiry of the cookies set by the stand-in: like phpBB, cookies are kept one year by the browser
+        Returns:
+            The expiry like "Tue, 19 Oct 2027 12:00:00 GMT" (str)
+    '''
+    return formatdate(time.time() + 365 * 86400, usegmt=True)
+
+def generate_forum(topics_size: dict[int, int], edit_every: int = 7, quote_every: int = 5, messages_per_page: int = 15,
+                   first_message_time: datetime = datetime(2025, 2, 4, 20, 0), minutes_between_messages: int = 1,
+                   username: str = "x", password: str = "x", flood_interval_secs: float = 0, timezone: str = "Europe/Paris") -> dict:
+
+    '''
+        Generates the content of a forum
+        Args:
+            topics_size (dict): the number of messages of each topic number
+            edit_every (int): one message out of edit_every is edited 30 minutes after its creation (0 = none)
+            quote_every (int): one message out of quote_every quotes the previous message (0 = none)
+            messages_per_page (int): the number of messages per page of topic
+            first_message_time (datetime): the local time of the first message of each topic
+            minutes_between_messages (int): the minutes between two messages of a topic
+            username / password (str): the credentials accepted by the login form
+            flood_interval_secs (float): the minimum time between two new messages of the account, refused with an error before
+            timezone (str): the timezone of the forum local times
+        Returns:
+            The data dictionary of the forum, read and updated by the stand-in
+    '''
+    forum = {'topics': {}, 'posts': {}, 'messages_per_page': messages_per_page, 'username': username, 'password': password,
+             'flood_interval_secs': flood_interval_secs, 'timezone': ZoneInfo(timezone), 'sessions': {}, 'autologin_keys': set(), 'last_post_time': 0,
+             'next_message_id': 1, 'lock': threading.Lock(), 'nb_requests': 0}
+    for topic_number, nb_messages in topics_size.items():
+        forum['topics'][topic_number] = []
+        for i in range(nb_messages):
+            content = f"*****message {i + 1} of topic {topic_number}\nline 2"
+            if quote_every and i > 0 and i % quote_every == 0:
+                content = f"{content}\n[quote]{forum['topics'][topic_number][-1]['CONTENT']}[/quote]\nafter quote"
+            created = first_message_time + timedelta(minutes=i * minutes_between_messages)
+            edited = created + timedelta(minutes=30) if edit_every and i % edit_every == edit_every - 1 else None
+            add_post(forum, topic_number, f"USER{i % 20 + 1}", content, created, edited)
+    return forum
+
+def add_post(forum: dict, topic_number: int, user: str, content: str, created: datetime, edited: datetime | None = None) -> dict:
+
+    '''
+        Adds a message at the end of a topic
+        Args:
+            forum (dict): the forum
+            topic_number (int): the number of the topic
+            user (str): the author of the message
+            content (str): the message, with [quote]...[/quote] for blockquotes
+            created (datetime): the local time of creation
+            edited (datetime): the local time of last edition, if any
+        Returns:
+            The message added (dict)
+    '''
+    post = {'ID': forum['next_message_id'], 'TOPIC_NUMBER': topic_number, 'USER': user, 'CONTENT': content, 'CREATED': created, 'EDITED': edited}
+    forum['next_message_id'] += 1
+    forum['topics'].setdefault(topic_number, []).append(post)
+    forum['posts'][post['ID']] = post
+    return post
+
+def render_content(content: str) -> str:
+
+    '''
+        Renders the content of a message as the forum does (blockquotes)
+        Args:
+            content (str): the message
+        Returns:
+            The HTML of the message (str)
+    '''
+    html = escape(content).replace("[quote]", '<blockquote class="uncited"><div>').replace("[/quote]", "</div></blockquote>")
+    return html
+
+def render_post(post: dict, index: int) -> str:
+
+    '''
+        Renders a message of a page of topic, with the markup of phpBB prosilver
+        Args:
+            post (dict): the message
+            index (int): the position of the message on the page
+        Returns:
+            The HTML of the message (str)
+    '''
+    notice = ""
+    if post['EDITED'] is not None:
+        notice = f'''<div class="notice">Modifié en dernier par <a href="./memberlist.php?mode=viewprofile&amp;u=1" class="username">{post['USER']}</a> le {format_french_time(post['EDITED'])}, modifié 1 fois.</div>'''
+    return f'''
+<div id="p{post['ID']}" class="post has-profile bg{index % 2 + 1}">
+<div class="inner">
+<dl class="postprofile" id="profile{post['ID']}">
+<dt class="has-profile-rank no-avatar"><a href="./memberlist.php?mode=viewprofile&amp;u=1" class="username">{post['USER']}</a></dt>
+<dd class="profile-rank">All Star</dd>
+</dl>
+<div class="postbody">
+<div id="post_content{post['ID']}">
+<h3><a href="./viewtopic.php?p={post['ID']}#p{post['ID']}">Re: Topic {post['TOPIC_NUMBER']}</a></h3>
+<p class="author"><span class="responsive-hide">par <strong><a href="./memberlist.php?mode=viewprofile&amp;u=1" class="username">{post['USER']}</a></strong> &raquo; </span><time datetime="{post['CREATED'].isoformat()}">{format_french_time(post['CREATED'])}</time></p>
+<div class="content">{render_content(post['CONTENT'])}</div>
+{notice}
+</div>
+</div>
+</div>
+</div>'''
+
+def render_page(body: str, is_logged_in: bool) -> str:
+
+    '''
+        Renders a page of the forum around its body
+        Args:
+            body (str): the HTML of the body
+            is_logged_in (bool): if the visitor is logged in, the page shows the logout link
+        Returns:
+            The HTML of the page (str)
+    '''
+    account_link = '<a href="./ucp.php?mode=logout" title="Déconnexion">Déconnexion</a>' if is_logged_in \
+                   else '<a href="./ucp.php?mode=login" title="Connexion">Connexion</a>'
+    return f'''<!DOCTYPE html>
+<html dir="ltr" lang="fr">
+<head><meta charset="utf-8" /><title>Forum stand-in</title></head>
+<body id="phpbb">
+<div id="wrap" class="wrap">
+<div class="navbar">{account_link}</div>
+{body}
+</div>
+</body>
+</html>'''
+
+def render_topic_page(forum: dict, topic_number: int, start: int, is_logged_in: bool) -> str:
+
+    '''
+        Renders a page of a topic, the last one if the offset is after the last message (like phpBB)
+        Args:
+            forum (dict): the forum
+            topic_number (int): the number of the topic
+            start (int): the offset of the first message of the page
+            is_logged_in (bool): if the visitor is logged in
+        Returns:
+            The HTML of the page (str)
+    '''
+    posts = forum['topics'][topic_number]
+    per_page = forum['messages_per_page']
+    start = max(0, min(start, (len(posts) - 1) // per_page * per_page))
+    pagination = f'<div class="pagination">\n{len(posts)} messages\n'
+    if len(posts) > per_page:
+        pagination += f'<input type="number" name="page-number" data-per-page="{per_page}" data-start-name="start" />\n'
+    pagination += '</div>'
+    page_posts = "".join(render_post(post, index) for index, post in enumerate(posts[start:start + per_page]))
+    body = f'''<div class="action-bar bar-top">{pagination}</div>
+{page_posts}
+<div class="action-bar bar-bottom"><a href="./posting.php?mode=reply&amp;t={topic_number}">Répondre</a>{pagination}</div>
+<p class="footer">Nous sommes le {format_french_time(datetime.now())}</p>'''
+    return render_page(body, is_logged_in)
+
+def render_feed(forum: dict, feed_url: str, entries: list[tuple[str, datetime, datetime]]) -> str:
+
+    '''
+        Renders an Atom feed of the forum
+        Args:
+            forum (dict): the forum
+            feed_url (str): the url of the feed
+            entries (list): the url, the local time of creation and of last update of each entry
+        Returns:
+            The XML of the feed (str)
+    '''
+    def iso(ts):
+        return ts.replace(tzinfo=forum['timezone']).isoformat()
+    xml_entries = "".join(f'''
+<entry>
+<updated>{iso(updated)}</updated>
+<published>{iso(published)}</published>
+<id>{escape(url)}</id>
+<link href="{escape(url)}"/>
+<title type="html"><![CDATA[Re: stand-in]]></title>
+</entry>''' for url, published, updated in entries)
+    return f'''<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom" xml:lang="fr-fr">
+<link rel="self" type="application/atom+xml" href="{escape(feed_url)}" />
+<title>Forum stand-in</title>
+<id>{escape(feed_url)}</id>{xml_entries}
+</feed>'''
+
+def render_form(action: str, fields: dict, is_logged_in: bool, error: str | None = None) -> str:
+
+    '''
+        Renders a page with a form of the forum, with its hidden fields
+        Args:
+            action (str): the url the form is posted to
+            fields (dict): the hidden fields of the form and their values
+            is_logged_in (bool): if the visitor is logged in
+            error (str): the error shown above the form, if any
+        Returns:
+            The HTML of the page (str)
+    '''
+    error_html = f'<p class="error">{escape(error)}</p>' if error else ""
+    inputs = "".join(f'<input type="hidden" name="{name}" value="{escape(str(value))}" />' for name, value in fields.items())
+    return render_page(f'{error_html}<form method="post" action="{escape(action)}">{inputs}</form>', is_logged_in)
+
+class PhpbbStandInHandler(BaseHTTPRequestHandler):
+
+    '''
+        Answers the requests of the stand-in, the forum being shared by all requests through the server
+    '''
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        return
+
+    def send_text(self, text: str, status: int = 200, content_type: str = "text/html; charset=UTF-8", headers: list | None = None):
+        body = text.encode('utf-8')
+        headers = list(headers or [])
+        #like the forum, the page is compressed if the client accepts it
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body)
+            headers.append(("Content-Encoding", "gzip"))
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def get_session(self) -> tuple[str | None, list]:
+        #the session is found with its cookie, or created again with the autologin cookie
+        cookies = dict(cookie.strip().split("=", 1) for cookie in self.headers.get("Cookie", "").split(";") if "=" in cookie)
+        forum = self.server.forum
+        sid = cookies.get("phpbb3_sid")
+        if sid in forum['sessions']:
+            return sid, []
+        if cookies.get("phpbb3_k") in forum['autologin_keys']:
+            sid = secrets.token_hex(16)
+            forum['sessions'][sid] = {}
+            return sid, [("Set-Cookie", f"phpbb3_sid={sid}; expires={cookie_expiry()}; path=/")]
+        return None, []
+
+    def do_GET(self):
+        forum = self.server.forum
+        url = urlsplit(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        with forum['lock']:
+            forum['nb_requests'] += 1
+            sid, cookie_headers = self.get_session()
+            is_logged_in = sid is not None
+
+            if url.path == "/viewtopic.php" and "p" in query and int(query['p']) in forum['posts']:
+                post = forum['posts'][int(query['p'])]
+                index = forum['topics'][post['TOPIC_NUMBER']].index(post)
+                page = render_topic_page(forum, post['TOPIC_NUMBER'], index // forum['messages_per_page'] * forum['messages_per_page'], is_logged_in)
+            elif url.path == "/viewtopic.php" and int(query.get('t', 0)) in forum['topics']:
+                page = render_topic_page(forum, int(query['t']), int(query.get('start', 0)), is_logged_in)
+            elif url.path.startswith("/app.php/feed/topic/") and int(url.path.rsplit("/", 1)[1]) in forum['topics']:
+                #the feed lists the last messages created, the most recent first
+                posts = sorted(forum['topics'][int(url.path.rsplit("/", 1)[1])], key=lambda post: post['CREATED'], reverse=True)[:10]
+                entries = [(f"http://{self.headers['Host']}/viewtopic.php?p={post['ID']}#p{post['ID']}", post['CREATED'], post['EDITED'] or post['CREATED'])
+                           for post in posts]
+                self.send_text(render_feed(forum, self.path, entries), content_type="application/atom+xml; charset=UTF-8")
+                return
+            elif url.path == "/app.php/feed/topics_active":
+                last_posts = [max(posts, key=lambda post: post['CREATED']) for posts in forum['topics'].values() if posts]
+                entries = [(f"http://{self.headers['Host']}/viewtopic.php?t={post['TOPIC_NUMBER']}&p={post['ID']}#p{post['ID']}", post['CREATED'], post['CREATED'])
+                           for post in sorted(last_posts, key=lambda post: post['CREATED'], reverse=True)]
+                self.send_text(render_feed(forum, self.path, entries), content_type="application/atom+xml; charset=UTF-8")
+                return
+            elif url.path == "/ucp.php" and query.get('mode') == "login":
+                page = render_form("./ucp.php?mode=login", {'sid': secrets.token_hex(16), 'form_token': secrets.token_hex(8), 
+                                                            'creation_time': int(time.time())}, is_logged_in)
+            elif url.path == "/posting.php" and is_logged_in:
+                page = self.render_posting_form(query)
+            elif url.path == "/posting.php":
+                page = render_page("<p>Vous devez être connecté pour répondre.</p>", False)
+            else:
+                self.send_text(render_page("<p>Sujet inexistant.</p>", is_logged_in), status=404)
+                return
+
+        #the pages are validated with their messages only, as the footer changes on each visit
+        etag = '"' + hashlib.sha256(page.split('<p class="footer">')[0].encode('utf-8')).hexdigest()[:16] + '"'
+        if url.path == "/viewtopic.php" and self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_text(page, headers=cookie_headers + ([("ETag", etag)] if url.path == "/viewtopic.php" else []))
+
+    def render_posting_form(self, query: dict) -> str:
+        forum = self.server.forum
+        fields = {'subject': "Re: stand-in", 'form_token': secrets.token_hex(8), 'creation_time': int(time.time())}
+        if query.get('mode') == "edit" and int(query.get('p', 0)) in forum['posts']:
+            post = forum['posts'][int(query['p'])]
+            fields.update({'edit_post_message_checksum': hashlib.md5(post['CONTENT'].encode('utf-8')).hexdigest(), # NOSONAR # same checksum as phpBB
+                           'edit_post_subject_checksum': hashlib.md5(fields['subject'].encode('utf-8')).hexdigest(), # NOSONAR
+                           'show_panel': "options-panel"})
+        elif query.get('mode') == "reply" and int(query.get('t', 0)) in forum['topics']:
+            fields['topic_cur_post_id'] = forum['topics'][int(query['t'])][-1]['ID']
+        else:
+            return render_page("<p>Sujet inexistant.</p>", True)
+        return render_form(self.path, fields, True)
+
+    def do_POST(self):
+        forum = self.server.forum
+        url = urlsplit(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        length = int(self.headers.get("Content-Length", 0))
+        payload = {key: values[0] for key, values in parse_qs(self.rfile.read(length).decode('utf-8')).items()}
+        with forum['lock']:
+            forum['nb_requests'] += 1
+            sid, cookie_headers = self.get_session()
+
+            if url.path == "/ucp.php" and query.get('mode') == "login":
+                if payload.get('username') != forum['username'] or payload.get('password') != forum['password'] or 'form_token' not in payload:
+                    page = render_form("./ucp.php?mode=login", {'sid': secrets.token_hex(16), 'form_token': secrets.token_hex(8),
+                                       'creation_time': int(time.time())}, False, "Nom d’utilisateur ou mot de passe incorrect.")
+                else:
+                    sid = secrets.token_hex(16)
+                    forum['sessions'][sid] = {}
+                    cookie_headers = [("Set-Cookie", f"phpbb3_sid={sid}; expires={cookie_expiry()}; path=/")]
+                    if payload.get('autologin') == "on":
+                        autologin_key = secrets.token_hex(16)
+                        forum['autologin_keys'].add(autologin_key)
+                        cookie_headers.append(("Set-Cookie", f"phpbb3_k={autologin_key}; expires={cookie_expiry()}; path=/"))
+                    page = render_page("<p>Vous êtes à présent connecté.</p>", True)
+            elif url.path == "/posting.php" and sid is not None:
+                page = self.submit_post(sid, query, payload)
+            else:
+                page = render_page('<p class="error">Vous devez être connecté.</p>', False)
+        self.send_text(page, headers=cookie_headers)
+
+    def submit_post(self, sid: str, query: dict, payload: dict) -> str:
+        forum = self.server.forum
+        if 'form_token' not in payload or 'message' not in payload:
+            return render_page('<p class="error">Le formulaire envoyé est invalide.</p>', True)
+        #like phpBB, only new messages are controlled, on the time of the last message of the account
+        if query.get('mode') == "reply" and time.time() - forum['last_post_time'] < forum['flood_interval_secs']:
+            return render_form(self.path, {'form_token': secrets.token_hex(8)}, True, FLOOD_ERROR)
+        now = datetime.now(forum['timezone']).replace(tzinfo=None, second=0, microsecond=0)
+        if query.get('mode') == "edit" and int(query.get('p', 0)) in forum['posts']:
+            post = forum['posts'][int(query['p'])]
+            post['CONTENT'] = payload['message']
+            post['EDITED'] = now
+        elif query.get('mode') == "reply" and int(query.get('t', 0)) in forum['topics']:
+            post = add_post(forum, int(query['t']), forum['username'], payload['message'], now)
+            forum['last_post_time'] = time.time()
+        else:
+            return render_page('<p class="error">Sujet inexistant.</p>', True)
+        return render_page(f'<p>Ce message a été envoyé avec succès.</p><a href="./viewtopic.php?p={post["ID"]}#p{post["ID"]}">Voir</a>', True)
+
+@contextlib.contextmanager
+def run_phpbb_stand_in(forum: dict):
+
+    '''
+        Runs the stand-in on a free local port, in a background thread, until the end of the block
+        Args:
+            forum (dict): the forum served (see generate_forum), updated by posts
+        Yields:
+            The url of the forum (str)
+    '''
+    server = ThreadingHTTPServer(("127.0.0.1", 0), PhpbbStandInHandler)
+    server.daemon_threads = True
+    server.forum = forum
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
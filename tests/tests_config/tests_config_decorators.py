@@ -3,6 +3,7 @@ This tests file concern all functions in the config_decorators module.
 It units test happy paths for each function
 '''
 
+import asyncio
 import pytest
 from unittest.mock import patch
 
@@ -64,3 +65,18 @@ def test_raise_issue_to_caller():
 
     with pytest.raises(RuntimeError):
         bad()
+
+def test_decorators_on_coroutine():
+
+    # this test decorators retry_function and raise_issue_to_caller on a created coroutine, succeeding at second attempt
+    calls = {"n": 0}
+    @config_decorators.retry_function(max_attempts=3, delay_secs=0)
+    @config_decorators.raise_issue_to_caller()
+    async def error_til_success():
+        calls["n"] += 1
+        if calls["n"] < 2:
+            raise ValueError("fail once")
+        return "ok"
+
+    assert asyncio.run(error_til_success()) == "ok"
+    assert calls["n"] == 2
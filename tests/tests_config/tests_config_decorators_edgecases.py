@@ -2,6 +2,7 @@
 This tests file concern all functions in the config_decorators module.
 It units test unexpected path
 '''
+import asyncio
 import os
 import tempfile
 from unittest.mock import patch
@@ -76,3 +77,23 @@ def test_raise_issue_to_caller_passes_exception():
 
     with pytest.raises(ValueError):
         fail_fn()
+
+def test_exit_program_decorator_on_coroutine(assert_exit):
+
+    # this test the decorator exit_program on a coroutine with exception. It musts exit the program when awaited
+    @config_decorators.exit_program()
+    async def faulty_coroutine():
+        raise ValueError("boom")
+
+    with patch.object(config_decorators,"execute_finally_on_error"):
+        assert_exit(lambda: asyncio.run(faulty_coroutine()))
+
+def test_retry_function_coroutine_exhausts_attempts_and_raises():
+
+    # this test the decorator retry_function on a coroutine with final failure
+    @config_decorators.retry_function(max_attempts=2, delay_secs=0)
+    async def always_fail():
+        raise RuntimeError("fail!")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(always_fail())
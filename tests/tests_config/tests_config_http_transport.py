@@ -0,0 +1,101 @@
+'''
+This tests file concern all functions in the config_http_transport module.
+It units test the happy path for each function
+'''
+
+import asyncio
+import socket
+from unittest.mock import MagicMock, patch
+
+from src.predict_core.config import config_http_transport
+
+def test_resolve_host():
+
+    # this test the function resolve_host. The second resolution must come from the cache
+    addrinfo = [(socket.AF_INET, socket.SOCK_STREAM, 6, '', ('10.0.0.1', 443)),
+                (socket.AF_INET, socket.SOCK_STREAM, 6, '', ('10.0.0.1', 443)),
+                (socket.AF_INET, socket.SOCK_STREAM, 6, '', ('10.0.0.2', 443))]
+
+    with patch.dict(config_http_transport.dns_cache, {}, clear=True), \
+         patch.object(config_http_transport.socket, "getaddrinfo", return_value=addrinfo) as mock_getaddrinfo:
+
+        assert config_http_transport.resolve_host("forum.test", 443) == ['10.0.0.1', '10.0.0.2']
+        assert config_http_transport.resolve_host("forum.test", 443) == ['10.0.0.1', '10.0.0.2']
+        assert mock_getaddrinfo.call_count == 1
+
+def test_create_connection_cached_dns():
+
+    # this test the function create_connection_cached_dns. The socket must be opened on the cached ip address
+    mock_socket = MagicMock()
+    with patch.object(config_http_transport, "resolve_host", return_value=['10.0.0.1']), \
+         patch.object(config_http_transport, "urllib3_create_connection", return_value=mock_socket) as mock_create_connection:
+
+        result = config_http_transport.create_connection_cached_dns(("forum.test", 443), timeout=10)
+        assert result is mock_socket
+        mock_create_connection.assert_called_once_with(('10.0.0.1', 443), timeout=10)
+
+def test_cached_dns_http_adapter():
+
+    # this test the class CachedDnsHTTPAdapter. The connections of its pools must be opened through the DNS cache
+    adapter = config_http_transport.CachedDnsHTTPAdapter()
+    connection_pool = adapter.get_connection_with_tls_context(config_http_transport.requests.Request("GET", "https://forum.test/").prepare(), verify=True)
+    connection = connection_pool._new_conn()
+    assert isinstance(connection, config_http_transport.CachedDnsHTTPSConnection)
+    mock_socket = MagicMock()
+    with patch.object(config_http_transport, "create_connection_cached_dns", return_value=mock_socket) as mock_create_connection:
+
+        assert connection._new_conn() is mock_socket
+        assert mock_create_connection.call_args.args[0] == ("forum.test", 443)
+
+def test_get_host_transport():
+
+    # this test the function get_host_transport. Same host must share its session and semaphore, other host must not
+    with patch.dict(config_http_transport.hosts_sessions, {}, clear=True), \
+         patch.dict(config_http_transport.hosts_semaphores, {}, clear=True):
+
+        session, semaphore = config_http_transport.get_host_transport("forum.test")
+        session_again, semaphore_again = config_http_transport.get_host_transport("forum.test")
+        session_other, _ = config_http_transport.get_host_transport("api.test")
+        assert session is session_again and semaphore is semaphore_again
+        assert session is not session_other
+        assert session.headers["Accept-Encoding"] == config_http_transport.ACCEPT_ENCODING
+
+def test_send_request():
+
+    # this test the function send_request. Default timeouts must be given to the session of the host
+    mock_response = MagicMock()
+    with patch.dict(config_http_transport.hosts_sessions, {}, clear=True), \
+         patch.dict(config_http_transport.hosts_semaphores, {}, clear=True), \
+         patch.object(config_http_transport.requests.Session, "request", return_value=mock_response) as mock_request, \
+         patch.object(config_http_transport.var, "HTTP_CONNECT_TIMEOUT_SECS", 3), \
+         patch.object(config_http_transport.var, "HTTP_READ_TIMEOUT_SECS", 7):
+
+        result = config_http_transport.send_request("POST", "https://api.test/upload", data={"key": "abc"})
+        assert result is mock_response
+        mock_request.assert_called_once_with("POST", "https://api.test/upload", data={"key": "abc"}, timeout=(3, 7))
+        mock_response.raise_for_status.assert_called_once()
+
+def test_reserve_request_slot():
+
+    # this test the function reserve_request_slot. Requests within the burst must not wait, the next one must wait for a token
+    with patch.dict(config_http_transport.hosts_buckets, {}, clear=True), \
+         patch.object(config_http_transport.var, "HTTP_REQUESTS_PER_SECOND_PER_HOST", 2), \
+         patch.object(config_http_transport.var, "HTTP_REQUESTS_BURST_PER_HOST", 2), \
+         patch.object(config_http_transport.time, "monotonic", return_value=100.0):
+
+        assert config_http_transport.reserve_request_slot("forum.test") == 0
+        assert config_http_transport.reserve_request_slot("forum.test") == 0
+        assert config_http_transport.reserve_request_slot("forum.test") == 0.5
+        assert config_http_transport.reserve_request_slot("api.test") == 0
+
+def test_send_request_async():
+
+    # this test the function send_request_async. The request must be sent through send_request, after the wait for a token
+    mock_response = MagicMock()
+    with patch.object(config_http_transport, "reserve_request_slot", return_value=0) as mock_reserve_request_slot, \
+         patch.object(config_http_transport, "send_request", return_value=mock_response) as mock_send_request:
+
+        result = asyncio.run(config_http_transport.send_request_async("GET", "https://forum.test/viewtopic.php?t=1", verify=False))
+        assert result is mock_response
+        mock_reserve_request_slot.assert_called_once_with("forum.test")
+        mock_send_request.assert_called_once_with("GET", "https://forum.test/viewtopic.php?t=1", verify=False)
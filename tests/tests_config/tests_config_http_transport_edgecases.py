@@ -0,0 +1,116 @@
+'''
+This tests file concern all functions in the config_http_transport module.
+It units test unexpected path
+'''
+import asyncio
+import socket
+import threading
+import time
+from unittest.mock import MagicMock, patch
+import pytest
+import requests
+from urllib3.util import connection as urllib3_connection
+
+from src.predict_core.config import config_http_transport
+
+def test_resolve_host_expired_cache():
+
+    # this test the function resolve_host with a cached resolution too old. Must resolve again
+    addrinfo = [(socket.AF_INET, socket.SOCK_STREAM, 6, '', ('10.0.0.2', 443))]
+
+    with patch.dict(config_http_transport.dns_cache, {("forum.test", 443): (0, ['10.0.0.1'])}, clear=True), \
+         patch.object(config_http_transport.socket, "getaddrinfo", return_value=addrinfo) as mock_getaddrinfo:
+
+        assert config_http_transport.resolve_host("forum.test", 443) == ['10.0.0.2']
+        assert mock_getaddrinfo.call_count == 1
+
+def test_create_connection_cached_dns_fallback():
+
+    # this test the function create_connection_cached_dns with a first ip address not answering. Must connect on the next one
+    mock_socket = MagicMock()
+    with patch.object(config_http_transport, "resolve_host", return_value=['10.0.0.1', '10.0.0.2']), \
+         patch.object(config_http_transport, "urllib3_create_connection", side_effect=[OSError("refused"), mock_socket]):
+
+        assert config_http_transport.create_connection_cached_dns(("forum.test", 443)) is mock_socket
+
+def test_create_connection_cached_dns_all_failed():
+
+    # this test the function create_connection_cached_dns with no ip address answering. Must raise and forget the resolution
+    with patch.dict(config_http_transport.dns_cache, {("forum.test", 443): (float('inf'), ['10.0.0.1'])}, clear=True), \
+         patch.object(config_http_transport, "urllib3_create_connection", side_effect=OSError("refused")):
+
+        with pytest.raises(OSError):
+            config_http_transport.create_connection_cached_dns(("forum.test", 443))
+        assert ("forum.test", 443) not in config_http_transport.dns_cache
+
+def test_send_request_error_status():
+
+    # this test the function send_request with an error status. Must raise the requests error
+    mock_response = MagicMock()
+    mock_response.raise_for_status.side_effect = requests.HTTPError("503 Server Error")
+    with patch.dict(config_http_transport.hosts_sessions, {}, clear=True), \
+         patch.dict(config_http_transport.hosts_semaphores, {}, clear=True), \
+         patch.object(config_http_transport.requests.Session, "request", return_value=mock_response):
+
+        with pytest.raises(requests.HTTPError):
+            config_http_transport.send_request("GET", "https://forum.test/viewtopic.php?t=1&start=0", timeout=1)
+
+def test_send_request_timeout_given():
+
+    # this test the function send_request with a timeout given by the caller. Must keep it
+    mock_response = MagicMock()
+    with patch.dict(config_http_transport.hosts_sessions, {}, clear=True), \
+         patch.dict(config_http_transport.hosts_semaphores, {}, clear=True), \
+         patch.object(config_http_transport.requests.Session, "request", return_value=mock_response) as mock_request:
+
+        config_http_transport.send_request("GET", "https://forum.test/", timeout=1)
+        assert mock_request.call_args.kwargs['timeout'] == 1
+
+def test_reserve_request_slot_refilled():
+
+    # this test the function reserve_request_slot with an empty bucket refilled after some time. Must not wait once refilled, and not exceed the burst
+    with patch.dict(config_http_transport.hosts_buckets, {"forum.test": (-1, 100.0)}, clear=True), \
+         patch.object(config_http_transport.var, "HTTP_REQUESTS_PER_SECOND_PER_HOST", 2), \
+         patch.object(config_http_transport.var, "HTTP_REQUESTS_BURST_PER_HOST", 3), \
+         patch.object(config_http_transport.time, "monotonic", return_value=200.0):
+
+        assert config_http_transport.reserve_request_slot("forum.test") == 0
+        assert config_http_transport.hosts_buckets["forum.test"] == (2, 200.0)
+
+def test_send_request_async_concurrency():
+
+    # this test the function send_request_async with more requests than allowed on a host. Must never run more at the same time
+    running = {"now": 0, "max": 0}
+    running_lock = threading.Lock()
+    def mock_send_request(method, url, **kwargs):
+        with running_lock:
+            running["now"] += 1
+            running["max"] = max(running["max"], running["now"])
+        time.sleep(0.01)
+        with running_lock:
+            running["now"] -= 1
+        return MagicMock()
+
+    async def send_all():
+        await asyncio.gather(*(config_http_transport.send_request_async("GET", f"https://forum.test/viewtopic.php?t={i}") for i in range(8)))
+
+    with patch.object(config_http_transport, "reserve_request_slot", return_value=0), \
+         patch.object(config_http_transport, "send_request", side_effect=mock_send_request), \
+         patch.object(config_http_transport.var, "HTTP_MAX_CONCURRENT_REQUESTS_PER_HOST", 2):
+
+        asyncio.run(send_all())
+        assert running["max"] <= 2
+
+def test_cached_dns_scoped_to_shared_sessions():
+
+    # this test the DNS cache scope. Other clients using urllib3 (Snowflake, Dropbox, ...) must keep its own resolution
+    assert urllib3_connection.create_connection is config_http_transport.urllib3_create_connection
+    assert requests.adapters.HTTPAdapter().poolmanager.pool_classes_by_scheme["https"] is not config_http_transport.CachedDnsHTTPSConnectionPool
+
+def test_cached_dns_connection_refused():
+
+    # this test the class CachedDnsHTTPConnection with no ip address answering. Must raise the urllib3 error, so requests handles it as usual
+    connection = config_http_transport.CachedDnsHTTPConnection("forum.test", 80)
+    with patch.object(config_http_transport, "create_connection_cached_dns", side_effect=OSError("refused")):
+        with pytest.raises(config_http_transport.NewConnectionError):
+            connection._new_conn()
@@ -75,3 +75,65 @@ def test_snowflake_execute_script_uses_test_db(read_yml_as_serie):
 
             mock_connect.assert_called_once_with(sr_snowflake_account_connect)
             mock_connection.execute_string.assert_called_once_with(expected_script)
+
+def test_snowflake_execute_multi_statement(read_yml_as_serie):
+    
+    # this test the function snowflake_execute_multi_statement. All queries must be sent in one request and all their results reached
+    sr_snowflake_account_connect = read_yml_as_serie("snowflake_account_connect.yml")
+    query = "BEGIN TRANSACTION; TRUNCATE TABLE #DATABASE#.LANDING.TABLE1; COMMIT;"
+
+    mock_cursor = MagicMock()
+    mock_cursor.__enter__.return_value = mock_cursor
+    mock_cursor.nextset.side_effect = [mock_cursor, mock_cursor, None]
+    
+    mock_conn = MagicMock()
+    mock_conn.cursor.return_value = mock_cursor
+
+    with patch.object(snowflake_connection_execution,'snowflake_connect', return_value=mock_conn), \
+         patch.object(snowflake_connection_execution.os,'getenv', return_value='1'):
+
+        snowflake_connection_execution.snowflake_execute_multi_statement(sr_snowflake_account_connect, query, "#DATABASE#", 3)
+
+        mock_cursor.execute.assert_called_once_with("BEGIN TRANSACTION; TRUNCATE TABLE PREDICT_TEST.LANDING.TABLE1; COMMIT;", num_statements=3)
+        assert mock_cursor.nextset.call_count == 3
+        mock_conn.rollback.assert_not_called()
+
+def test_snowflake_execute_copy(read_yml_as_serie):
+    
+    # this test the function snowflake_execute for copy command. Must return the files copied
+    sr_snowflake_account_connect = read_yml_as_serie("snowflake_account_connect.yml")
+    query = "COPY INTO #DATABASE#.LANDING.LANDING_SEASON FROM '@~/predict_landing/run/' PATTERN = '.*/landing_season[.]csv[.]gz';"
+
+    mock_cursor = MagicMock()
+    mock_cursor.__enter__.return_value = mock_cursor
+    mock_cursor.fetchall.return_value = [("predict_landing/run/landing_season.csv.gz", "LOADED", 2, 2, 1, 0, None, None, None, None)]
+    
+    mock_conn = MagicMock()
+    mock_conn.cursor.return_value = mock_cursor
+
+    with patch.object(snowflake_connection_execution,'snowflake_connect', return_value=mock_conn), \
+         patch.object(snowflake_connection_execution.os,'getenv', return_value='1'):
+
+        result = snowflake_connection_execution.snowflake_execute(sr_snowflake_account_connect, query, "#DATABASE#")
+        assert result == mock_cursor.fetchall.return_value
+
+def test_snowflake_executemany(read_yml_as_serie):
+    
+    # this test the function snowflake_executemany. All rows must be sent with the query personalized, and their number returned
+    sr_snowflake_account_connect = read_yml_as_serie("snowflake_account_connect.yml")
+    query = "INSERT INTO #DATABASE#.LANDING.LANDING_OUTPUT_NEED VALUES (%s, %s);"
+    lst_params = [('CALCULATE', '2024_2025'), ('INIT', None)]
+
+    mock_cursor = MagicMock()
+    mock_cursor.__enter__.return_value = mock_cursor
+    mock_cursor.rowcount = 2
+    
+    mock_conn = MagicMock()
+    mock_conn.cursor.return_value = mock_cursor
+
+    with patch.object(snowflake_connection_execution,'snowflake_connect', return_value=mock_conn), \
+         patch.object(snowflake_connection_execution.os,'getenv', return_value='1'):
+
+        result = snowflake_connection_execution.snowflake_executemany(sr_snowflake_account_connect, query, "#DATABASE#", lst_params)
+        mock_cursor.executemany.assert_called_once_with("INSERT INTO PREDICT_TEST.LANDING.LANDING_OUTPUT_NEED VALUES (%s, %s);", lst_params)
+        assert result == 2
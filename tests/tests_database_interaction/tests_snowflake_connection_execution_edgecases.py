@@ -77,4 +77,40 @@ def test_snowflake_execute_script_empty_script(read_yml_as_serie):
         with patch.object(snowflake_connection_execution,"snowflake_connect") as mock_connect:
             mock_connection = mock_connect.return_value
             snowflake_connection_execution.snowflake_execute_script(sr_snowflake_account_connect, script, "#DATABASE#")
-            mock_connection.execute_string.assert_called_once_with("")
\ No newline at end of file
+            mock_connection.execute_string.assert_called_once_with("")
+def test_snowflake_execute_multi_statement_failure(read_yml_as_serie,assert_exit):
+    
+    # this test the function snowflake_execute_multi_statement with a query failing after the first one. Must rollback and exit the program
+    sr_snowflake_account_connect = read_yml_as_serie("snowflake_account_connect.yml")
+    query = "BEGIN TRANSACTION; TRUNCATE TABLE #DATABASE#.LANDING.UNKNOWN; COMMIT;"
+
+    mock_cursor = MagicMock()
+    mock_cursor.__enter__.return_value = mock_cursor
+    mock_cursor.nextset.side_effect = Exception("Table does not exist")
+    
+    mock_conn = MagicMock()
+    mock_conn.cursor.return_value = mock_cursor
+
+    with patch.object(snowflake_connection_execution,'snowflake_connect', return_value=mock_conn), \
+         patch.object(snowflake_connection_execution.os,'getenv', return_value='1'):
+
+        assert_exit(lambda: snowflake_connection_execution.snowflake_execute_multi_statement(sr_snowflake_account_connect, query, "#DATABASE#", 3))
+        mock_conn.rollback.assert_called()
+
+def test_snowflake_executemany_failure(read_yml_as_serie,assert_exit):
+    
+    # this test the function snowflake_executemany with rows not matching the table. Must exit the program
+    sr_snowflake_account_connect = read_yml_as_serie("snowflake_account_connect.yml")
+    query = "INSERT INTO #DATABASE#.LANDING.LANDING_OUTPUT_NEED VALUES (%s);"
+
+    mock_cursor = MagicMock()
+    mock_cursor.__enter__.return_value = mock_cursor
+    mock_cursor.executemany.side_effect = Exception("Insert value list does not match column list")
+    
+    mock_conn = MagicMock()
+    mock_conn.cursor.return_value = mock_cursor
+
+    with patch.object(snowflake_connection_execution,'snowflake_connect', return_value=mock_conn), \
+         patch.object(snowflake_connection_execution.os,'getenv', return_value='1'):
+
+        assert_exit(lambda: snowflake_connection_execution.snowflake_executemany(sr_snowflake_account_connect, query, "#DATABASE#", [('CALCULATE',)]))
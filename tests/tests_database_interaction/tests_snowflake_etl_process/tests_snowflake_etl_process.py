@@ -3,9 +3,11 @@ This tests file concern all functions in the snowflake_etl_process module.
 It units test the happy path for each function
 '''
 
+import ast
 import os
+import re
 import tempfile
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 import pandas as pd
 
 from src.predict_core.database_interaction.snowflake_etl_process import snowflake_etl_process
@@ -21,44 +23,37 @@ def test_get_list_tables_to_update(read_csv):
     assert result[0] == ['landing_output_need']
     assert result[1] == []
 
-def test_delete_table_data(read_yml_as_serie):
+def test_get_list_tables_to_update_game_not_to_load(read_csv):
     
-    # this test the function delete_table_data
-    sr_snowflake_account_connect = read_yml_as_serie("snowflake_account_connect.yml")
-    schema = "landing"
-    table_metadata = [None, "test_table"]
+    # this test the function get_list_tables_to_update called by main running games and messages, no game changed since last load. landing_game must not be listed
+    df_paths = read_csv("paths.csv")
+    df_paths[['PYTHON_CATEGORY','DBT_CATEGORY']] = df_paths[['PYTHON_CATEGORY','DBT_CATEGORY']].map(ast.literal_eval)
 
-    with patch.object(snowflake_etl_process,'snowflake_execute') as mock_exec:
-        snowflake_etl_process.delete_table_data(sr_snowflake_account_connect, schema, table_metadata)
-        assert mock_exec.call_count == 2
-        args1 = mock_exec.call_args_list[0][0][1]
-        assert "TRUNCATE TABLE" in args1
+    lst_python_tables, lst_dbt_tables = snowflake_etl_process.get_list_tables_to_update("main",df_paths,"RUN","RUN",0,False)
+    assert 'landing_game' not in lst_python_tables
+    assert 'landing_gameday_modification' in lst_python_tables
+    assert 'curated_game' in lst_dbt_tables
+    lst_python_tables, _ = snowflake_etl_process.get_list_tables_to_update("main",df_paths,"RUN","RUN",0,True)
+    assert 'landing_game' in lst_python_tables
 
 def test_delete_tables_data_from_python(read_yml_as_serie):
 
-    # this test the function delete_tables_data_from_python
+    # this test the function delete_tables_data_from_python. Tables are truncated in one transaction then the landing stage path emptied, in one request
     sr_snowflake_account_connect = read_yml_as_serie("snowflake_account_connect.yml")
-    schema = "landing"
+    lst_tables = ["landing_game", "landing_output_need"]
 
-    mock_sql = MagicMock()
-    mock_sql.snowflake_actions_qListTables = "SELECT * FROM #SCHEMA#.tables"
-    mock_sql.SCHEMA = "#SCHEMA#"
-    mock_sql.LIST_TABLES_QUERY.replace.return_value = "SELECT * FROM landing.tables"
+    with patch.object(snowflake_etl_process,"snowflake_execute_multi_statement") as mock_execute_multi_statement:
 
-    with patch.object(snowflake_etl_process,"sql", mock_sql), \
-         patch.object(snowflake_etl_process,"snowflake_execute") as mock_snowflake_execute, \
-         patch.object(snowflake_etl_process,"multithread_run"):
+        snowflake_etl_process.delete_tables_data_from_python(sr_snowflake_account_connect, lst_tables)
 
-        mock_snowflake_execute.return_value = [
-            {"name": "table1"},
-            {"name": "table2"}
-        ]
-
-        snowflake_etl_process.delete_tables_data_from_python(sr_snowflake_account_connect, schema)
-
-        mock_snowflake_execute.assert_called_once_with(
-            sr_snowflake_account_connect, "SELECT * FROM landing.tables", snowflake_etl_process.sql.DATABASE
-        )
+        mock_execute_multi_statement.assert_called_once()
+        query, num_statements = mock_execute_multi_statement.call_args.args[1], mock_execute_multi_statement.call_args.args[3]
+        lst_queries = [q.strip() for q in query.split(";") if q.strip()]
+        assert num_statements == len(lst_queries) == 5
+        assert lst_queries[0] == "BEGIN TRANSACTION"
+        assert lst_queries[1] == "TRUNCATE TABLE #DATABASE#.landing.landing_game"
+        assert lst_queries[3] == "COMMIT"
+        assert lst_queries[4].startswith("REMOVE '@~/predict_landing/' PATTERN")
 
 def test_create_table_file(read_yml_as_serie):
     
@@ -74,28 +69,106 @@ def test_create_table_file(read_yml_as_serie):
         snowflake_etl_process.create_table_file(sr_snowflake_account_connect, table, is_encapsulated)
         mock_create_csv.assert_called_once()
 
-def test_update_snowflake_from_python(read_yml_as_serie, read_csv):
+def test_create_parquet(read_csv):
+
+    # this test the function create_parquet. Declared columns must have their type, the other ones be text, and empty values written as null
+    df_game = read_csv("game.csv")
+    df_game.loc[1, ['SCORE_HOME', 'GAMEDAY']] = [None, '']
+    with tempfile.TemporaryDirectory() as tmpdir:
+
+        snowflake_etl_process.create_parquet(df_game, os.path.join(tmpdir, "landing_game.parquet"), "game", 0)
+
+        df_game_parquet = pd.read_parquet(os.path.join(tmpdir, "landing_game.parquet"))
+        assert df_game_parquet.columns.tolist() == df_game.columns.tolist()
+        assert str(df_game_parquet['SCORE_HOME'].dtype) == 'Int64'
+        assert str(df_game_parquet['COMPETITION_SOURCE_ID'].dtype) == 'Int64'
+        assert str(df_game_parquet['GAMEDAY'].dtype) == 'string'
+        assert df_game_parquet['SCORE_HOME'].tolist()[0] == 85
+        assert df_game_parquet.loc[1, ['SCORE_HOME', 'GAMEDAY']].isna().tolist() == [True, True]
+
+def test_copy_table_from_stage(read_yml_as_serie, read_csv):
 
-    # this test the function update_snowflake_from_python
+    # this test the function copy_table_from_stage. The file of the table must be copied with a pattern, then removed
     called_by = 'main'
     sr_snowflake_account_connect = read_yml_as_serie("snowflake_account_connect.yml")
-    table_name = "landing_season"
-    df_paths = read_csv("paths.csv")
-    local_folder = 'local'
+    stage_path = "@~/predict_landing/20250101180000000000"
+    lst_files_copied = [("predict_landing/20250101180000000000/landing_season.csv.gz", "LOADED", 2, 2, 1, 0, None, None, None, None)]
 
-    exp_schema = "landing"
-    exp_file_name = "season"
+    with patch.object(snowflake_etl_process,"snowflake_execute", return_value=lst_files_copied) as mock_snowflake_execute, \
+         patch.object(snowflake_etl_process,"create_table_file") as mock_create_table_file:
 
-    with patch.object(snowflake_etl_process,"snowflake_execute") as mock_snowflake_execute, \
-         patch.object(snowflake_etl_process,"create_table_file") :
+        report = snowflake_etl_process.copy_table_from_stage(called_by,sr_snowflake_account_connect,"landing_season",read_csv("paths.csv"),stage_path)
 
-        snowflake_etl_process.update_snowflake_from_python(called_by,sr_snowflake_account_connect,table_name,df_paths,local_folder)
+        q_insert_data = mock_snowflake_execute.call_args.args[1]
+        assert "COPY INTO #DATABASE#.landing.landing_season" in q_insert_data
+        assert f"FROM '{stage_path}/'" in q_insert_data
+        assert "PATTERN = '.*/landing_season[.]csv[.]gz'" in q_insert_data
+        assert "PURGE = TRUE" in q_insert_data
+        assert "ON_ERROR = ABORT_STATEMENT" in q_insert_data
+        assert report[0]['LOAD_PATH'] == "STAGE"
+        assert report[0]['FILE_NAME'] == "landing_season.csv.gz"
+        assert report[0]['ROWS_LOADED'] == 2
+        mock_create_table_file.assert_called_once()
 
-        assert mock_snowflake_execute.call_count == 2
-        q_put_call = mock_snowflake_execute.call_args_list[0][0][1]
-        assert str(exp_file_name) in q_put_call
-        assert exp_schema in q_put_call
-        assert table_name in q_put_call
+def test_insert_table_rows(read_yml_as_serie, read_csv):
+
+    # this test the function insert_table_rows. The rows must be inserted with bound parameters, empty fields as null
+    called_by = 'main'
+    sr_snowflake_account_connect = read_yml_as_serie("snowflake_account_connect.yml")
+    df_table = pd.DataFrame({'TASK_RUN': ['CALCULATE', 'INIT'], 'SEASON_ID': ['2024_2025', ''], 'GAMEDAY': ['1ere journee', '2eme journee']})
+
+    with patch.object(snowflake_etl_process,"snowflake_executemany", return_value=2) as mock_snowflake_executemany, \
+         patch.object(snowflake_etl_process,"create_table_file") as mock_create_table_file:
+
+        report = snowflake_etl_process.insert_table_rows(called_by,sr_snowflake_account_connect,"landing_output_need",read_csv("paths.csv"),df_table)
+
+        q_insert_rows, lst_rows = mock_snowflake_executemany.call_args.args[1], mock_snowflake_executemany.call_args.args[3]
+        assert "INSERT INTO #DATABASE#.landing.landing_output_need VALUES (%s, %s, %s)" in q_insert_rows
+        assert lst_rows == [('CALCULATE', '2024_2025', '1ere journee'), ('INIT', None, '2eme journee')]
+        assert report[0]['LOAD_PATH'] == "INSERT"
+        assert report[0]['ROWS_LOADED'] == 2
+        mock_create_table_file.assert_called_once()
+
+def test_update_snowflake_from_python(read_yml_as_serie, read_csv):
+
+    # this test the function update_snowflake_from_python. Tables of few rows must be inserted, the files of the others put at once, named as their table, then copied per table
+    called_by = 'main'
+    sr_snowflake_account_connect = read_yml_as_serie("snowflake_account_connect.yml")
+    lst_tables = ["landing_season", "landing_game", "landing_output_need"]
+    lst_staged_files = []
+
+    def mock_execute(sr_snowflake_account, query, db_placeholder):
+        if query.strip().startswith("PUT"):
+            staging_folder = query.split("'file://")[1].split("/*.csv'")[0]
+            lst_staged_files.extend(sorted(os.listdir(staging_folder)))
+            return [(f, f + ".gz", 10, 8, "NONE", "GZIP", "UPLOADED", "") for f in lst_staged_files]
+        table_name = query.split("landing.")[1].split()[0]
+        return [(f"predict_landing/run/{table_name}.csv.gz", "LOADED", 2, 2, 1, 0, None, None, None, None)]
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        pd.DataFrame({'SEASON_ID': ['2023_2024', '2024_2025']}).to_csv(os.path.join(tmpdir, "season.csv"), index=False)
+        pd.DataFrame({'GAME_SOURCE_ID': ['ID0', 'ID1']}).to_csv(os.path.join(tmpdir, "game.csv"), index=False)
+        pd.DataFrame({'TASK_RUN': ['CALCULATE']}).to_csv(os.path.join(tmpdir, "output_need.csv"), index=False)
+        open(os.path.join(tmpdir, "message.csv"), 'w').close()
+
+        with patch.object(snowflake_etl_process.var,"SNOWFLAKE_INSERT_MAX_ROWS", 1), \
+             patch.object(snowflake_etl_process,"snowflake_execute", side_effect=mock_execute) as mock_snowflake_execute, \
+             patch.object(snowflake_etl_process,"snowflake_executemany", return_value=1) as mock_snowflake_executemany, \
+             patch.object(snowflake_etl_process,"create_table_file"), \
+             patch.object(snowflake_etl_process,"create_csv") as mock_create_csv:
+
+            df_snowflake_load_report = snowflake_etl_process.update_snowflake_from_python(called_by,sr_snowflake_account_connect,lst_tables,read_csv("paths.csv"),tmpdir)
+
+            assert mock_snowflake_execute.call_count == 3
+            assert "PARALLEL = 8" in mock_snowflake_execute.call_args_list[0].args[1]
+            assert lst_staged_files == ["landing_game.csv", "landing_season.csv"]
+            assert mock_snowflake_executemany.call_args.args[3] == [('CALCULATE',)]
+            assert df_snowflake_load_report.columns.tolist() == snowflake_etl_process.snowflake_load_report_columns
+            assert df_snowflake_load_report['TABLE_NAME'].tolist() == ["landing_game", "landing_output_need", "landing_season"]
+            assert df_snowflake_load_report['LOAD_PATH'].tolist() == ["STAGE", "INSERT", "STAGE"]
+            assert df_snowflake_load_report['PUT_STATUS'].tolist()[::2] == ["UPLOADED", "UPLOADED"]
+            assert df_snowflake_load_report['PUT_SECS'].isna().tolist() == [False, True, False]
+            assert mock_create_csv.call_args.args[0].endswith("snowflake_load_report.csv")
 
 def test_update_snowflake_from_dbt(read_csv,read_yml_as_serie):
     
@@ -130,6 +203,7 @@ def test_update_snowflake_main(read_csv,read_yml_as_serie):
     local_folder = "local"
 
     with patch.object(snowflake_etl_process,"get_list_tables_to_update") as mock_get_list, \
+         patch.object(snowflake_etl_process,"delete_tables_data_from_python") as mock_delete, \
          patch.object(snowflake_etl_process,"update_snowflake_from_python"), \
          patch.object(snowflake_etl_process,"update_snowflake_from_dbt") as mock_update_dbt:
 
@@ -137,6 +211,9 @@ def test_update_snowflake_main(read_csv,read_yml_as_serie):
         snowflake_etl_process.update_snowflake(called_by, context_dict, local_folder)
 
         mock_get_list.assert_called_once()
+        lst_landing_tables = [name for name in context_dict['df_paths']['NAME'] if name.startswith('landing_')]
+        assert len(lst_landing_tables) == 12
+        mock_delete.assert_called_once_with(context_dict['sr_snowflake_account_connect'], lst_landing_tables)
         mock_update_dbt.assert_called_once_with(
             called_by,
             context_dict['sr_snowflake_account_connect'],
@@ -144,6 +221,20 @@ def test_update_snowflake_main(read_csv,read_yml_as_serie):
             ["dbt_table_1"]
         )
 
+def test_landing_tables_read_by_incremental_models():
+
+    # this test that the dbt models reading landing tables are incremental (or ephemeral): emptying the landing tables not loaded by the run must not empty them
+    models_dir = os.path.join(snowflake_etl_process.var.DBT_DIRECTORY, "models")
+    lst_models = [os.path.join(root, file) for root, _, files in os.walk(models_dir) for file in files if file.endswith(".sql")]
+    lst_models_reading_landing = []
+    for model_path in lst_models:
+        with open(model_path, encoding="utf-8") as model_file:
+            model = model_file.read()
+        if re.search(r"source\(\s*['\"]LAND['\"]", model):
+            lst_models_reading_landing.append(model_path)
+            assert re.search(r"materialized\s*=\s*['\"](incremental|ephemeral)['\"]", model), model_path
+    assert len(lst_models_reading_landing) > 0
+
 def test_update_snowflake_initsnowflake(read_csv,read_yml_as_serie):
 
     # this test the function update_snowflake_from_dbt called by init_snowflake
@@ -4,46 +4,205 @@ It units test unexpected paths for each function
 '''
 import os
 import tempfile
-from unittest.mock import call, patch, ANY
+from unittest.mock import patch
+import pandas as pd
+from pandas.testing import assert_frame_equal
 
 from src.predict_core.database_interaction.snowflake_etl_process import snowflake_etl_process
 
-def test_delete_table_data_executes_expected_queries(read_yml_as_serie):
+def test_delete_tables_data_from_python_failure(read_yml_as_serie, assert_exit):
     
-    # this test the function delete_table_data truncate and remove queries
+    # this test the function delete_tables_data_from_python with the request failing. Must exit the program
     sr_snowflake_account_connect = read_yml_as_serie( "snowflake_account_connect.yml")
-    schema = "landing"
-    table_metadata = [None, "test_table"]
 
-    with patch.object(snowflake_etl_process,'snowflake_execute') as mock_exec:
-        snowflake_etl_process.delete_table_data(sr_snowflake_account_connect, schema, table_metadata)
-        calls = [call(sr_snowflake_account_connect, ANY,snowflake_etl_process.sql.DATABASE), 
-                 call(sr_snowflake_account_connect, ANY,snowflake_etl_process.sql.DATABASE)]
-        mock_exec.assert_has_calls(calls, any_order=False)
+    with patch.object(snowflake_etl_process,'snowflake_execute_multi_statement', side_effect=Exception("Snowflake request failed")):
+        assert_exit(lambda: snowflake_etl_process.delete_tables_data_from_python(sr_snowflake_account_connect, ["landing_game"]))
 
-def test_update_snowflake_from_python_encapsulated(read_yml_as_serie,read_csv):
+def test_copy_table_from_stage_encapsulated(read_yml_as_serie,read_csv):
     
-    # this test the function update_snowflake_from_python with encapsulated data
+    # this test the function copy_table_from_stage with encapsulated data
     called_by = 'main'
     sr_snowflake_account_connect = read_yml_as_serie( "snowflake_account_connect.yml")
     table_name = "landing_message_check" #this file is encapsulated according to df_paths
-    df_paths = read_csv( "paths.csv")
-    local_folder = 'local'
+    lst_files_copied = [("predict_landing/run/landing_message_check.csv.gz", "LOADED", 2, 2, 1, 0, None, None, None, None)]
+
+    with patch.object(snowflake_etl_process,"snowflake_execute", return_value=lst_files_copied) as mock_snowflake_execute, \
+         patch.object(snowflake_etl_process,"create_table_file") :
 
-    exp_schema = "landing"
-    exp_file_name = "message_check"
+        snowflake_etl_process.copy_table_from_stage(called_by,sr_snowflake_account_connect,table_name,read_csv( "paths.csv"),"@~/predict_landing/run")
+        assert "FIELD_OPTIONALLY_ENCLOSED_BY" in mock_snowflake_execute.call_args.args[1]
 
-    with patch.object(snowflake_etl_process,"snowflake_execute") as mock_snowflake_execute, \
+def test_copy_table_from_stage_parquet(read_yml_as_serie,read_csv):
+    
+    # this test the function copy_table_from_stage with a parquet file. Must be copied by column name, without csv option
+    sr_snowflake_account_connect = read_yml_as_serie( "snowflake_account_connect.yml")
+    table_name = "landing_message_check" #this file is encapsulated according to df_paths
+    lst_files_copied = [("predict_landing/run/landing_message_check.parquet", "LOADED", 2, 2, 1, 0, None, None, None, None)]
+
+    with patch.object(snowflake_etl_process,"snowflake_execute", return_value=lst_files_copied) as mock_snowflake_execute, \
          patch.object(snowflake_etl_process,"create_table_file") :
 
-        snowflake_etl_process.update_snowflake_from_python(called_by,sr_snowflake_account_connect,table_name,df_paths,local_folder)
+        report = snowflake_etl_process.copy_table_from_stage('main',sr_snowflake_account_connect,table_name,read_csv( "paths.csv"),"@~/predict_landing/run","PARQUET")
+        q_insert_data = mock_snowflake_execute.call_args.args[1]
+        assert "PATTERN = '.*/landing_message_check[.]parquet'" in q_insert_data
+        assert "MATCH_BY_COLUMN_NAME = CASE_INSENSITIVE" in q_insert_data
+        assert "FIELD_OPTIONALLY_ENCLOSED_BY" not in q_insert_data
+        assert report[0]['FILE_NAME'] == "landing_message_check.parquet"
+
+def test_copy_table_from_stage_no_file(read_yml_as_serie,read_csv,assert_exit):
+    
+    # this test the function copy_table_from_stage with no file of the table on the stage path. Must exit the program
+    sr_snowflake_account_connect = read_yml_as_serie( "snowflake_account_connect.yml")
+
+    with patch.object(snowflake_etl_process,"snowflake_execute", return_value=[("Copy executed with 0 files processed.",)]), \
+         patch.object(snowflake_etl_process,"create_table_file") as mock_create_table_file:
+
+        assert_exit(lambda: snowflake_etl_process.copy_table_from_stage('main',sr_snowflake_account_connect,"landing_season",read_csv( "paths.csv"),"@~/predict_landing/run"))
+        mock_create_table_file.assert_not_called()
+
+def test_copy_table_from_stage_not_loaded(read_yml_as_serie,read_csv,assert_exit):
+    
+    # this test the function copy_table_from_stage with a file reported with errors. Must exit the program
+    sr_snowflake_account_connect = read_yml_as_serie( "snowflake_account_connect.yml")
+    lst_files_copied = [("predict_landing/run/landing_season.csv.gz", "LOAD_FAILED", 2, 0, 1, 1, "Numeric value 'x' is not recognized", 2, 5, "SEASON_ID")]
+
+    with patch.object(snowflake_etl_process,"snowflake_execute", return_value=lst_files_copied), \
+         patch.object(snowflake_etl_process,"create_table_file"):
+
+        assert_exit(lambda: snowflake_etl_process.copy_table_from_stage('main',sr_snowflake_account_connect,"landing_season",read_csv( "paths.csv"),"@~/predict_landing/run"))
+
+def test_insert_table_rows_encapsulated(read_yml_as_serie,read_csv):
+    
+    # this test the function insert_table_rows with encapsulated data. NULL values must be inserted as null, like the copy does
+    sr_snowflake_account_connect = read_yml_as_serie( "snowflake_account_connect.yml")
+    table_name = "landing_message_check" #this file is encapsulated according to df_paths
+    df_table = pd.DataFrame({'MESSAGE_ID': ['1', '2'], 'MESSAGE_CONTENT': ['NULL', 'a "quoted" message']})
+
+    with patch.object(snowflake_etl_process,"snowflake_executemany", return_value=2) as mock_snowflake_executemany, \
+         patch.object(snowflake_etl_process,"create_table_file") :
+
+        snowflake_etl_process.insert_table_rows('main',sr_snowflake_account_connect,table_name,read_csv( "paths.csv"),df_table)
+        assert mock_snowflake_executemany.call_args.args[3] == [('1', None), ('2', 'a "quoted" message')]
+
+def test_insert_table_rows_empty(read_yml_as_serie,read_csv):
+    
+    # this test the function insert_table_rows with a file of headers only. Nothing must be sent, the table being already empty
+    sr_snowflake_account_connect = read_yml_as_serie( "snowflake_account_connect.yml")
+    df_table = pd.DataFrame(columns=['TASK_RUN', 'SEASON_ID'])
+
+    with patch.object(snowflake_etl_process,"snowflake_executemany") as mock_snowflake_executemany, \
+         patch.object(snowflake_etl_process,"create_table_file") as mock_create_table_file:
+
+        report = snowflake_etl_process.insert_table_rows('main',sr_snowflake_account_connect,"landing_output_need",read_csv( "paths.csv"),df_table)
+        mock_snowflake_executemany.assert_not_called()
+        mock_create_table_file.assert_called_once()
+        assert report[0]['ROWS_LOADED'] == 0
+
+def test_insert_table_rows_not_all_inserted(read_yml_as_serie,read_csv,assert_exit):
+    
+    # this test the function insert_table_rows with less rows inserted than the file has. Must exit the program
+    sr_snowflake_account_connect = read_yml_as_serie( "snowflake_account_connect.yml")
+    df_table = pd.DataFrame({'TASK_RUN': ['CALCULATE', 'INIT']})
+
+    with patch.object(snowflake_etl_process,"snowflake_executemany", return_value=1), \
+         patch.object(snowflake_etl_process,"create_table_file") as mock_create_table_file:
+
+        assert_exit(lambda: snowflake_etl_process.insert_table_rows('main',sr_snowflake_account_connect,"landing_output_need",read_csv( "paths.csv"),df_table))
+        mock_create_table_file.assert_not_called()
+
+def test_update_snowflake_from_python_all_inserted(read_yml_as_serie,read_csv):
+    
+    # this test the function update_snowflake_from_python with tables of few rows only. Nothing must be put on the stage
+    sr_snowflake_account_connect = read_yml_as_serie( "snowflake_account_connect.yml")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        pd.DataFrame({'TASK_RUN': ['CALCULATE']}).to_csv(os.path.join(tmpdir, "output_need.csv"), index=False)
+
+        with patch.object(snowflake_etl_process,"snowflake_execute") as mock_snowflake_execute, \
+             patch.object(snowflake_etl_process,"snowflake_executemany", return_value=1), \
+             patch.object(snowflake_etl_process,"create_table_file"), \
+             patch.object(snowflake_etl_process,"create_csv"):
+
+            df_snowflake_load_report = snowflake_etl_process.update_snowflake_from_python('main',sr_snowflake_account_connect,["landing_output_need"],read_csv( "paths.csv"),tmpdir)
+            mock_snowflake_execute.assert_not_called()
+            assert df_snowflake_load_report['LOAD_PATH'].tolist() == ["INSERT"]
+            assert df_snowflake_load_report['PUT_SECS'].isna().all()
+
+def test_update_snowflake_from_python_missing_file(read_yml_as_serie,read_csv,assert_exit):
+    
+    # this test the function update_snowflake_from_python with the file of a table missing. Must exit the program without putting anything
+    sr_snowflake_account_connect = read_yml_as_serie( "snowflake_account_connect.yml")
+
+    with tempfile.TemporaryDirectory() as tmpdir, \
+         patch.object(snowflake_etl_process,"snowflake_execute") as mock_snowflake_execute:
+
+        assert_exit(lambda: snowflake_etl_process.update_snowflake_from_python('main',sr_snowflake_account_connect,["landing_season"],read_csv( "paths.csv"),tmpdir))
+        mock_snowflake_execute.assert_not_called()
+
+def test_create_parquet_encapsulated():
+    
+    # this test the function create_parquet with a table of an encapsulated file read as text. NULL values must be null, like the copy does
+    df_message_check = pd.DataFrame({'MESSAGE_FORUM_ID': ['1', '2'], 'MESSAGE_CONTENT': ['NULL', 'a "quoted", multiline\nmessage']})
+    with tempfile.TemporaryDirectory() as tmpdir:
+
+        snowflake_etl_process.create_parquet(df_message_check, os.path.join(tmpdir, "landing_message_check.parquet"), "message_check", 1)
+
+        df_message_check = pd.read_parquet(os.path.join(tmpdir, "landing_message_check.parquet"))
+        assert df_message_check['MESSAGE_FORUM_ID'].tolist() == [1, 2]
+        assert df_message_check['MESSAGE_CONTENT'].isna().tolist() == [True, False]
+        assert df_message_check['MESSAGE_CONTENT'].iloc[1] == 'a "quoted", multiline\nmessage'
+
+def test_create_parquet_same_as_csv(read_csv):
+    
+    # this test the function create_parquet with a table and the same table read from its csv file. The parquet files must be the same
+    df_game = read_csv("game.csv")
+    df_game.loc[1, 'SCORE_HOME'] = None
+    with tempfile.TemporaryDirectory() as tmpdir:
+        df_game.to_csv(os.path.join(tmpdir, "game.csv"), index=False)
+
+        snowflake_etl_process.create_parquet(df_game, os.path.join(tmpdir, "game_df.parquet"), "game", 0)
+        snowflake_etl_process.create_parquet(pd.read_csv(os.path.join(tmpdir, "game.csv"), dtype=str, keep_default_na=False), os.path.join(tmpdir, "game_csv.parquet"), "game", 0)
+        assert_frame_equal(pd.read_parquet(os.path.join(tmpdir, "game_df.parquet")), pd.read_parquet(os.path.join(tmpdir, "game_csv.parquet")))
+
+def test_create_parquet_wrong_type(read_csv, assert_exit):
+    
+    # this test the function create_parquet with a value not of its declared type. Must exit the program
+    df_game = read_csv("game.csv").astype({'SCORE_HOME': object})
+    df_game.loc[1, 'SCORE_HOME'] = 'abc'
+    with tempfile.TemporaryDirectory() as tmpdir:
+        assert_exit(lambda: snowflake_etl_process.create_parquet(df_game, os.path.join(tmpdir, "landing_game.parquet"), "game", 0))
+
+def test_update_snowflake_from_python_parquet(read_yml_as_serie,read_csv):
+    
+    # this test the function update_snowflake_from_python with the parquet file format. The files must be written from the dataframes of the run if any, then put and copied as parquet
+    sr_snowflake_account_connect = read_yml_as_serie( "snowflake_account_connect.yml")
+    lst_staged_files = []
+
+    def mock_execute(sr_snowflake_account, query, db_placeholder):
+        if query.strip().startswith("PUT"):
+            staging_folder = query.split("'file://")[1].split("/*.parquet'")[0]
+            lst_staged_files.extend(sorted(os.listdir(staging_folder)))
+            return [(f, f, 10, 10, "PARQUET", "PARQUET", "UPLOADED", "") for f in sorted(os.listdir(staging_folder))]
+        return [("predict_landing/run/landing_season.parquet", "LOADED", 2, 2, 1, 0, None, None, None, None)]
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        pd.DataFrame({'SEASON_ID': ['2023_2024', '2024_2025']}).to_csv(os.path.join(tmpdir, "season.csv"), index=False)
+        files_data_dict = {'df_season': pd.DataFrame({'SEASON_ID': ['2024_2025', '2025_2026']})}
+
+        with patch.object(snowflake_etl_process.var,"SNOWFLAKE_INSERT_MAX_ROWS", 1), \
+             patch.object(snowflake_etl_process.var,"SNOWFLAKE_LANDING_FILE_FORMAT", "PARQUET"), \
+             patch.object(snowflake_etl_process,"snowflake_execute", side_effect=mock_execute) as mock_snowflake_execute, \
+             patch.object(snowflake_etl_process,"create_parquet", wraps=snowflake_etl_process.create_parquet) as mock_create_parquet, \
+             patch.object(snowflake_etl_process,"create_table_file"), \
+             patch.object(snowflake_etl_process,"create_csv"):
 
-        assert mock_snowflake_execute.call_count == 2
-        q_put_call = mock_snowflake_execute.call_args_list[0][0][1]
-        assert str(exp_file_name) in q_put_call
-        assert exp_schema in q_put_call
-        assert table_name in q_put_call
-        assert any("FIELD_OPTIONALLY_ENCLOSED_BY" in c[0][1] for c in mock_snowflake_execute.call_args_list)
+            df_snowflake_load_report = snowflake_etl_process.update_snowflake_from_python('main',sr_snowflake_account_connect,["landing_season"],read_csv( "paths.csv"),tmpdir,files_data_dict)
+            assert mock_create_parquet.call_args.args[0] is files_data_dict['df_season']
+            snowflake_etl_process.update_snowflake_from_python('main',sr_snowflake_account_connect,["landing_season"],read_csv( "paths.csv"),tmpdir)
+            assert mock_create_parquet.call_args.args[0]['SEASON_ID'].tolist() == ['2023_2024', '2024_2025']
+            assert lst_staged_files == ["landing_season.parquet"] * 2
+            assert "MATCH_BY_COLUMN_NAME" in mock_snowflake_execute.call_args_list[1].args[1]
+            assert df_snowflake_load_report['PUT_STATUS'].tolist() == ["UPLOADED"]
 
 def test_update_snowflake_from_dbt_failure(assert_exit,read_yml_as_serie,read_csv):
     
@@ -59,7 +59,6 @@ def test_snowflake_update_failure(read_csv, read_yml_as_serie,assert_exit):
          patch.object(competition_integration.local_environment_manipulation,"initiate_local_environment", return_value=mock_initiate_local_dict), \
          patch.object(competition_integration.games_details_extraction,"extract_games_from_competition", return_value=mock_df_game), \
          patch.object(competition_integration.files_manipulation,"filter_data"), \
-         patch.object(competition_integration.snowflake_etl_process,"delete_tables_data_from_python"), \
          patch.object(competition_integration.snowflake_etl_process,"update_snowflake"):
 
         assert_exit(lambda: competition_integration.competition_integration())
@@ -80,7 +79,6 @@ def test_calendar_update_failure(read_csv, read_yml_as_serie, assert_exit):
          patch.object(competition_integration.local_environment_manipulation,"initiate_local_environment", return_value=mock_initiate_local_dict), \
          patch.object(competition_integration.games_details_extraction,"extract_games_from_competition", return_value=mock_df_game), \
          patch.object(competition_integration.files_manipulation,"filter_data"), \
-         patch.object(competition_integration.snowflake_etl_process,"delete_tables_data_from_python"), \
          patch.object(competition_integration.snowflake_etl_process,"update_snowflake"), \
          patch.object(competition_integration,"update_calendar_related_files", side_effect=Exception("Calendar error")):
     
@@ -103,7 +101,6 @@ def test_terminate_local_environment_failure(read_csv, read_yml_as_serie, assert
          patch.object(competition_integration.local_environment_manipulation,"initiate_local_environment", return_value=mock_initiate_local_dict), \
          patch.object(competition_integration.games_details_extraction,"extract_games_from_competition", return_value=mock_df_game), \
          patch.object(competition_integration.files_manipulation,"filter_data"), \
-         patch.object(competition_integration.snowflake_etl_process,"delete_tables_data_from_python"), \
          patch.object(competition_integration.snowflake_etl_process,"update_snowflake"), \
          patch.object(competition_integration,"update_calendar_related_files", return_value=mock_str_next_run_time_utc), \
          patch.object(competition_integration.local_environment_manipulation,"terminate_local_environment", side_effect=Exception("Terminate failed")):
@@ -0,0 +1,36 @@
+'''
+This tests file concern all functions in the game_results_watcher module.
+It units test the happy path for each function
+'''
+
+from unittest.mock import patch
+import pandas as pd
+
+from src.predict_core.entry_point import game_results_watcher
+
+def test_game_results_watcher(read_yml_as_serie, read_csv):
+
+    # this test the function game_results_watcher mocking all dependencies. Main must run the task watched, at the time of the task
+    mock_files_dict = {
+        "sr_snowflake_account_connect": read_yml_as_serie("snowflake_account_connect.yml"),
+        "df_task_done": read_csv("task_done.csv"),
+        "df_competition": read_csv("competition_unique.csv"),
+        "df_gameday_modification": read_csv("gameday_modification.csv")
+    }
+    sr_task = read_csv("calendar.csv").iloc[0].copy()
+    sr_task['TASK_RUN'] = "CALCULATE"
+    sr_task['TS_TASK_UTC'] = pd.Timestamp(sr_task['TS_TASK_UTC'])
+
+    with patch.object(game_results_watcher.env,"check_environment_variable"), \
+         patch.object(game_results_watcher.local_environment_manipulation,"create_local_folder"), \
+         patch.object(game_results_watcher.local_environment_manipulation,"destroy_local_folder"), \
+         patch.object(game_results_watcher.specific_files_operations,"get_paths_file_details", return_value={"df_paths": read_csv("paths.csv")}), \
+         patch.object(game_results_watcher,"multithread_run", return_value=[mock_files_dict]), \
+         patch.object(game_results_watcher.tasks_calendar_management,"get_calendar", return_value=read_csv("calendar.csv")), \
+         patch.object(game_results_watcher.games_results_watcher,"get_task_to_watch", return_value=sr_task), \
+         patch.object(game_results_watcher.games_results_watcher,"watch_gameday_results", return_value=True) as mock_watch, \
+         patch.object(game_results_watcher.main,"main") as mock_main:
+
+        game_results_watcher.game_results_watcher()
+        assert mock_watch.call_args.args[:3] == ("LNB", sr_task['COMPETITION_SOURCE_ID'], sr_task['GAMEDAY'])
+        mock_main.assert_called_once_with(str_current_run_time_utc = sr_task['TS_TASK_UTC'].strftime("%Y-%m-%d %H:%M:%S.000"))
@@ -0,0 +1,69 @@
+'''
+This tests file concern all functions in the game_results_watcher module.
+It units test edge cases for functions
+'''
+
+from unittest.mock import patch
+import pandas as pd
+
+from src.predict_core.entry_point import game_results_watcher
+
+def get_mock_files_dict(read_yml_as_serie, read_csv) -> dict:
+
+    # the files downloaded by the watcher
+    return {
+        "sr_snowflake_account_connect": read_yml_as_serie("snowflake_account_connect.yml"),
+        "df_task_done": read_csv("task_done.csv"),
+        "df_competition": read_csv("competition_unique.csv"),
+        "df_gameday_modification": read_csv("gameday_modification.csv")
+    }
+
+def test_game_results_watcher_no_task(read_yml_as_serie, read_csv):
+
+    # this test the function game_results_watcher when there is no CALCULATE task to watch. Must not watch nor run main
+    with patch.object(game_results_watcher.env,"check_environment_variable"), \
+         patch.object(game_results_watcher.local_environment_manipulation,"create_local_folder"), \
+         patch.object(game_results_watcher.local_environment_manipulation,"destroy_local_folder"), \
+         patch.object(game_results_watcher.specific_files_operations,"get_paths_file_details", return_value={"df_paths": read_csv("paths.csv")}), \
+         patch.object(game_results_watcher,"multithread_run", return_value=[get_mock_files_dict(read_yml_as_serie, read_csv)]), \
+         patch.object(game_results_watcher.tasks_calendar_management,"get_calendar", return_value=read_csv("calendar.csv")), \
+         patch.object(game_results_watcher.games_results_watcher,"get_task_to_watch", return_value=None), \
+         patch.object(game_results_watcher.games_results_watcher,"watch_gameday_results") as mock_watch, \
+         patch.object(game_results_watcher.main,"main") as mock_main:
+
+        game_results_watcher.game_results_watcher()
+        mock_watch.assert_not_called()
+        mock_main.assert_not_called()
+
+def test_game_results_watcher_not_final(read_yml_as_serie, read_csv):
+
+    # this test the function game_results_watcher when results are not final at the deadline. Must not run main
+    sr_task = read_csv("calendar.csv").iloc[0].copy()
+    sr_task['TASK_RUN'] = "CALCULATE"
+    sr_task['TS_TASK_UTC'] = pd.Timestamp(sr_task['TS_TASK_UTC'])
+
+    with patch.object(game_results_watcher.env,"check_environment_variable"), \
+         patch.object(game_results_watcher.local_environment_manipulation,"create_local_folder"), \
+         patch.object(game_results_watcher.local_environment_manipulation,"destroy_local_folder"), \
+         patch.object(game_results_watcher.specific_files_operations,"get_paths_file_details", return_value={"df_paths": read_csv("paths.csv")}), \
+         patch.object(game_results_watcher,"multithread_run", return_value=[get_mock_files_dict(read_yml_as_serie, read_csv)]), \
+         patch.object(game_results_watcher.tasks_calendar_management,"get_calendar", return_value=read_csv("calendar.csv")), \
+         patch.object(game_results_watcher.games_results_watcher,"get_task_to_watch", return_value=sr_task), \
+         patch.object(game_results_watcher.games_results_watcher,"watch_gameday_results", return_value=False), \
+         patch.object(game_results_watcher.main,"main") as mock_main:
+
+        game_results_watcher.game_results_watcher()
+        mock_main.assert_not_called()
+
+def test_game_results_watcher_calendar_failure(read_yml_as_serie, read_csv, assert_exit):
+
+    # this test the function game_results_watcher when the calendar can't be read. Must exit the program
+    with patch.object(game_results_watcher.env,"check_environment_variable"), \
+         patch.object(game_results_watcher.local_environment_manipulation,"create_local_folder"), \
+         patch.object(game_results_watcher.specific_files_operations,"get_paths_file_details", return_value={"df_paths": read_csv("paths.csv")}), \
+         patch.object(game_results_watcher,"multithread_run", return_value=[get_mock_files_dict(read_yml_as_serie, read_csv)]), \
+         patch.object(game_results_watcher.tasks_calendar_management,"get_calendar", side_effect=RuntimeError("boom")), \
+         patch.object(game_results_watcher.main,"main") as mock_main:
+
+        assert_exit(lambda: game_results_watcher.game_results_watcher())
+        mock_main.assert_not_called()
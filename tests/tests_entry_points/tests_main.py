@@ -15,16 +15,80 @@ def test_process_games(read_csv):
         'sr_output_need': read_csv("output_need_calculate.csv").iloc[0],
         'df_competition': read_csv("competition_unique.csv"),
         "df_paths" : read_csv("paths.csv"),
-        "df_gameday_modification":pd.DataFrame()
+        "df_gameday_modification":pd.DataFrame(),
+        "df_game_calendar_cache": read_csv("game_calendar_cache.csv"),
+        "df_game_loaded_snapshot": read_csv("game_loaded_snapshot.csv")
     }
 
     mock_df_game = read_csv("game.csv")
 
     with patch.object(main.games_details_extraction,"extract_games_from_need",return_value=mock_df_game), \
+         patch.object(main.games_calendar_cache,"open_games_calendar_cache") as mock_open, \
+         patch.object(main.games_calendar_cache,"close_games_calendar_cache",return_value=pd.DataFrame()), \
+         patch.object(main.games_loading_diff,"create_csv"), \
          patch.object(main.files_manipulation,"filter_data"):
 
         result = main.process_games(context)
         assert "df_game" in result
+        assert "df_game_calendar_cache" in result
+        assert result['dict_game_change'] == {'INSERTED': 0, 'CHANGED': 1, 'UNCHANGED': 1}
+        assert result['is_game_to_load']
+        assert result['df_game']['GAME_SOURCE_ID'].tolist() == ['ID1', 'ID2']
+        assert result['df_game_loaded_snapshot']['GAME_SOURCE_ID'].tolist() == ['ID0', 'ID1', 'ID2']
+        mock_open.assert_called_once()
+
+def test_process_games_changed_only(read_csv):
+
+    # this test the process_games function for a task updating games, one changed since last load. Only this game must be landed
+    sr_output_need = read_csv("output_need_calculate.csv").iloc[0]
+    sr_output_need[['IS_TO_INIT','IS_TO_CALCULATE','IS_TO_DELETE','IS_TO_RECALCULATE']] = 0
+    context = {
+        'sr_output_need': sr_output_need,
+        'df_competition': read_csv("competition_unique.csv"),
+        "df_paths" : read_csv("paths.csv"),
+        "df_gameday_modification":pd.DataFrame(),
+        "df_game_calendar_cache": read_csv("game_calendar_cache.csv"),
+        "df_game_loaded_snapshot": read_csv("game_loaded_snapshot.csv")
+    }
+
+    with patch.object(main.games_details_extraction,"extract_games_from_need",return_value=read_csv("game.csv")), \
+         patch.object(main.games_calendar_cache,"open_games_calendar_cache"), \
+         patch.object(main.games_calendar_cache,"close_games_calendar_cache",return_value=pd.DataFrame()), \
+         patch.object(main.games_loading_diff,"create_csv") as mock_create_csv, \
+         patch.object(main.files_manipulation,"filter_data"):
+
+        result = main.process_games(context)
+        assert result['is_game_to_load']
+        assert result['df_game']['GAME_SOURCE_ID'].tolist() == ['ID2']
+        assert mock_create_csv.call_args_list[0].args[0].endswith('game.csv')
+        assert mock_create_csv.call_args_list[0].args[1]['GAME_SOURCE_ID'].tolist() == ['ID2']
+        assert result['df_game_loaded_snapshot']['GAME_SOURCE_ID'].tolist() == ['ID0', 'ID1', 'ID2']
+
+def test_process_games_unchanged(read_csv):
+
+    # this test the process_games function for a task updating games, none changed since last load. Games must not be loaded
+    sr_output_need = read_csv("output_need_calculate.csv").iloc[0]
+    sr_output_need[['IS_TO_INIT','IS_TO_CALCULATE','IS_TO_DELETE','IS_TO_RECALCULATE']] = 0
+    mock_df_game = read_csv("game.csv").iloc[[0]]
+    context = {
+        'sr_output_need': sr_output_need,
+        'df_competition': read_csv("competition_unique.csv"),
+        "df_paths" : read_csv("paths.csv"),
+        "df_gameday_modification":pd.DataFrame(),
+        "df_game_calendar_cache": read_csv("game_calendar_cache.csv"),
+        "df_game_loaded_snapshot": read_csv("game_loaded_snapshot.csv")
+    }
+
+    with patch.object(main.games_details_extraction,"extract_games_from_need",return_value=mock_df_game), \
+         patch.object(main.games_calendar_cache,"open_games_calendar_cache"), \
+         patch.object(main.games_calendar_cache,"close_games_calendar_cache",return_value=pd.DataFrame()), \
+         patch.object(main.games_loading_diff,"update_game_loaded_snapshot") as mock_update_snapshot, \
+         patch.object(main.files_manipulation,"filter_data"):
+
+        result = main.process_games(context)
+        assert result['dict_game_change'] == {'INSERTED': 0, 'CHANGED': 0, 'UNCHANGED': 1}
+        assert not result['is_game_to_load']
+        mock_update_snapshot.assert_not_called()
 
 def test_process_messages_autoprocess(read_yml_as_serie, read_csv):
     
@@ -35,11 +99,13 @@ def test_process_messages_autoprocess(read_yml_as_serie, read_csv):
         "df_paths" : read_csv("paths.csv"),
         "df_boolean_check_message_manually" : read_csv("boolean_check_message_manually_0.csv"),
         "df_message_check_ts" : read_csv("message_check_ts.csv"),      
+        "df_message_topic_state" : read_csv("message_topic_state.csv"),
+        "df_message_page_cache" : read_csv("message_page_cache.csv"),
     }
     df_message_check = read_csv("message_check.csv")
     extraction_time_utc = '2025-01-01 18:00:00'
 
-    with patch.object(main.messages_details_extraction,"extract_messages",return_value=(df_message_check,extraction_time_utc)), \
+    with patch.object(main.messages_details_extraction,"extract_messages",return_value=(df_message_check,extraction_time_utc,read_csv("message_topic_state.csv"),read_csv("message_page_cache.csv"))), \
          patch.object(main.files_manipulation,"filter_data", return_value={}), \
          patch.object(main.output_need_calculation,"set_output_need_to_check_status"), \
          patch.object(main.files_manipulation,"create_csv"), \
@@ -60,11 +126,13 @@ def test_process_messages_manualprocess(read_yml_as_serie, read_csv):
         "df_paths" : read_csv("paths.csv"),
         "df_boolean_check_message_manually" : read_csv("boolean_check_message_manually_1.csv"),
         "df_message_check_ts" : read_csv("message_check_ts.csv"),      
+        "df_message_topic_state" : read_csv("message_topic_state.csv"),
+        "df_message_page_cache" : read_csv("message_page_cache.csv"),
     }
     df_message_check = read_csv("message_check.csv")
     extraction_time_utc = '2025-01-01 18:00:00'
 
-    with patch.object(main.messages_details_extraction,"extract_messages",return_value=(df_message_check,extraction_time_utc)), \
+    with patch.object(main.messages_details_extraction,"extract_messages",return_value=(df_message_check,extraction_time_utc,read_csv("message_topic_state.csv"),read_csv("message_page_cache.csv"))), \
          patch.object(main.files_manipulation,"filter_data", return_value={}), \
          patch.object(main.output_need_calculation,"set_output_need_to_check_status"), \
          patch.object(main.files_manipulation,"create_csv"), \
@@ -130,7 +198,10 @@ def test_main(read_csv, read_yml_as_serie):
          "sr_output_need" : read_csv("output_need_calculate.csv").iloc[0],
          "sr_snowflake_account_connect":  read_yml_as_serie("snowflake_account_connect.yml"),
          'df_task_done' : read_csv("task_done.csv"),
-         "df_boolean_check_message_manually" : read_csv("boolean_check_message_manually_0.csv")
+         "df_boolean_check_message_manually" : read_csv("boolean_check_message_manually_0.csv"),
+         "df_forum_session" : read_csv("forum_session.csv"),
+         "df_message_posting_ledger" : read_csv("message_posting_ledger.csv"),
+         "is_game_to_load": True
     }
     mock_sr_output_need = read_csv("output_need_calculate.csv").iloc[0]
     mock_extraction_time_utc = '2025-01-01 18:00:00'
@@ -142,12 +213,43 @@ def test_main(read_csv, read_yml_as_serie):
          patch.object(main.dropbox,"download_needed_files",return_value = {}),\
          patch.object(main,"process_games",return_value = mock_initiate_local_dict), \
          patch.object(main,"process_messages",return_value = mock_initiate_local_dict), \
-         patch.object(main.snowflake_etl_process,"delete_tables_data_from_python"), \
          patch.object(main.snowflake_etl_process,"update_snowflake"), \
          patch.object(main.tasks_calendar_management,"update_calendar_related_files",return_value = mock_extraction_time_utc), \
          patch.object(main.output_message_generation,"generate_output_message", return_value=({"key": "value"},MagicMock())), \
          patch.object(main.messages_posting_process,"post_message"), \
+         patch.object(main.forums_sessions_management,"open_forums_sessions"), \
+         patch.object(main.forums_sessions_management,"close_forums_sessions"), \
+         patch.object(main.messages_posting_ledger,"open_posting_ledger"), \
+         patch.object(main.messages_posting_ledger,"close_posting_ledger"), \
          patch.object(main.local_environment_manipulation,"terminate_local_environment"), \
          patch.object(main,"create_json_file_email"):
 
         main.main()
+
+def test_main_current_run_time(read_csv, read_yml_as_serie):
+
+    # this test the main function called by the game results watcher, with the time of the task to run
+    mock_initiate_local_dict = {
+         "df_paths": read_csv("paths.csv"),
+         "sr_snowflake_account_connect":  read_yml_as_serie("snowflake_account_connect.yml"),
+         'df_task_done' : read_csv("task_done.csv"),
+         'str_current_run_time_utc': "2024-01-02 10:00:00.000"
+    }
+    mock_sr_output_need = read_csv("output_need_check_with_message_check_ts.csv").iloc[0]
+    mock_sr_output_need['TASK_RUN'] = "CHECK"
+    mock_sr_output_need['GAME_ACTION'] = "AVOID"
+    mock_sr_output_need['MESSAGE_ACTION'] = "AVOID"
+
+    with patch.object(main.env,"check_environment_variable"),\
+         patch.object(main.dropbox,"initiate_folder"), \
+         patch.object(main.local_environment_manipulation,"initiate_local_environment", return_value=mock_initiate_local_dict) as mock_initiate_local_environment, \
+         patch.object(main.output_need_calculation,"generate_output_need", return_value=mock_sr_output_need) as mock_generate_output_need, \
+         patch.object(main.dropbox,"download_needed_files",return_value = {}),\
+         patch.object(main.tasks_calendar_management,"update_calendar_related_files",return_value = "NONE"), \
+         patch.object(main.local_environment_manipulation,"terminate_local_environment"), \
+         patch.object(main,"display_check_string", return_value=""), \
+         patch.object(main,"create_json_file_email"):
+
+        main.main(str_current_run_time_utc = "2024-01-02 10:00:00.000")
+        mock_initiate_local_environment.assert_called_once_with("main", "2024-01-02 10:00:00.000")
+        assert mock_generate_output_need.call_args.args[0]['str_current_run_time_utc'] == "2024-01-02 10:00:00.000"
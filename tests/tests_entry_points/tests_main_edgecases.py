@@ -3,6 +3,7 @@ This tests file concern all functions in the main module.
 It units test edge cases for functions
 '''
 from unittest.mock import patch
+from pandas.testing import assert_frame_equal
 import pandas as pd
 
 from src.predict_core.entry_point import main
@@ -20,10 +21,12 @@ def test_process_games_failure(read_csv,assert_exit):
         'sr_output_need': read_csv("output_need_calculate.csv").iloc[0],
         'df_competition': read_csv("competition_unique.csv"),
         "df_paths" : read_csv("paths.csv"),
-        "df_gameday_modification":pd.DataFrame()
+        "df_gameday_modification":pd.DataFrame(),
+        "df_game_calendar_cache": read_csv("game_calendar_cache.csv")
     }
 
     with patch.object(main.games_details_extraction,"extract_games_from_need", side_effect=RuntimeError("boom")), \
+         patch.object(main.games_calendar_cache,"open_games_calendar_cache"), \
          patch.object(main.files_manipulation,"filter_data"):
 
         assert_exit(lambda: main.process_games(context))
@@ -37,6 +40,8 @@ def test_process_messages_extract_messages_failure(read_csv, read_yml_as_serie,
         "df_paths" : read_csv("paths.csv"),
         "df_boolean_check_message_manually" : read_csv("boolean_check_message_manually_0.csv"),
         "df_message_check_ts" : read_csv("message_check_ts.csv"),      
+        "df_message_topic_state" : read_csv("message_topic_state.csv"),
+        "df_message_page_cache" : read_csv("message_page_cache.csv"),
     }
 
     with patch.object(main.messages_details_extraction,"extract_messages", side_effect=ValueError("bad")):
@@ -52,17 +57,42 @@ def test_process_messages_invalid_message_dataframe(read_yml_as_serie, read_csv,
         "df_paths" : read_csv("paths.csv"),
         "df_boolean_check_message_manually" : read_csv("boolean_check_message_manually_0.csv"),
         "df_message_check_ts" : read_csv("message_check_ts.csv"),      
+        "df_message_topic_state" : read_csv("message_topic_state.csv"),
+        "df_message_page_cache" : read_csv("message_page_cache.csv"),
     }
     df_message_check = pd.DataFrame({"WRONG_COL": ["a", "b"]})
     extraction_time_utc = '2025-01-01 18:00:00'
 
-    with patch.object(main.messages_details_extraction,"extract_messages",return_value=(df_message_check,extraction_time_utc)), \
+    with patch.object(main.messages_details_extraction,"extract_messages",return_value=(df_message_check,extraction_time_utc,read_csv("message_topic_state.csv"),read_csv("message_page_cache.csv"))), \
          patch.object(main.files_manipulation,"filter_data", return_value={}), \
          patch.object(main.output_need_calculation,"set_output_need_to_check_status"), \
          patch.object(main.files_manipulation,"create_csv"):
 
             assert_exit(lambda: main.process_messages(context))
 
+def test_process_messages_topics_skipped(read_yml_as_serie, read_csv):
+    
+    # this test the process_messages with topics skipped on a check. The check time must not be modified, edits in skipped topics being missed
+    context = {
+        "sr_snowflake_account_connect":  read_yml_as_serie("snowflake_account_connect.yml"),
+        'sr_output_need': read_csv("output_need_check_with_message_check_ts.csv").iloc[0],
+        "df_paths" : read_csv("paths.csv"),
+        "df_boolean_check_message_manually" : read_csv("boolean_check_message_manually_0.csv"),
+        "df_message_check_ts" : read_csv("message_check_ts.csv"),      
+        "df_message_topic_state" : read_csv("message_topic_state.csv"),
+        "df_message_page_cache" : read_csv("message_page_cache.csv"),
+    }
+    df_message_check = read_csv("message_check.csv")
+    extraction_time_utc = '2025-01-01 18:00:00'
+
+    with patch.object(main.messages_details_extraction,"extract_messages",return_value=(df_message_check,extraction_time_utc,read_csv("message_topic_state.csv"),read_csv("message_page_cache.csv"))), \
+         patch.object(main.messages_details_extraction.var,"IS_TOPIC_SKIP_ON_CHECK", 1), \
+         patch.object(main.files_manipulation,"filter_data", return_value={}), \
+         patch.object(main.files_manipulation,"create_csv"):
+
+            result = main.process_messages(context)
+            assert_frame_equal(result['df_message_check_ts'].reset_index(drop=True), read_csv("message_check_ts.csv"))
+
 def test_display_check_string_missing_key(read_yml_as_serie, read_csv,assert_exit):
     
     # this test the display_check_string with missing columns in sr_output_need. Must exit the program.
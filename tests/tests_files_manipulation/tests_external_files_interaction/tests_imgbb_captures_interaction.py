@@ -16,7 +16,7 @@ def test_push_capture_online():
     mock_response = type("MockResponse", (), {"json": lambda self: {'data': {'url': expected_url}}})()
 
     with patch("builtins.open", mock_open(read_data=b"fake image data")), \
-         patch("requests.post", return_value=mock_response), \
+         patch.object(imgbb_captures_interaction.config_http_transport, "send_request", return_value=mock_response), \
          patch("os.getenv", return_value="fake_api_key"):
             
             result = imgbb_captures_interaction.push_capture_online(image_path)
@@ -27,7 +27,7 @@ def test_push_capture_invalid_json_response(assert_exit):
     mock_response = type("MockResponse", (), {"json": lambda self: {'data': {"unexpected": "structure"}}})()
 
     with patch("builtins.open", mock_open(read_data=b"fake image data")), \
-         patch("requests.post", return_value=mock_response), \
+         patch.object(imgbb_captures_interaction.config_http_transport, "send_request", return_value=mock_response), \
          patch("os.getenv", return_value="fake_api_key"):
             
             assert_exit(lambda: imgbb_captures_interaction.push_capture_online(image_path))
@@ -38,7 +38,7 @@ def test_response_not_json(assert_exit):
     image_path = "image.png" 
     
     with patch("builtins.open", mock_open(read_data=b"fake image data")), \
-         patch("requests.post", side_effect = ValueError("Invalid JSON")), \
+         patch.object(imgbb_captures_interaction.config_http_transport, "send_request", side_effect = ValueError("Invalid JSON")), \
          patch("os.getenv", return_value="fake_api_key"):
             
             assert_exit(lambda: imgbb_captures_interaction.push_capture_online(image_path))  
\ No newline at end of file
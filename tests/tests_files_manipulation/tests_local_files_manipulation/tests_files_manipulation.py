@@ -9,9 +9,25 @@ from unittest.mock import patch, MagicMock, mock_open
 from pandas.testing import assert_frame_equal
 import matplotlib.pyplot as plt
 import pandas as pd
+from PIL import Image
 
 from src.predict_core.files_manipulation.local_files_manipulation import files_manipulation
 
+def test_read_and_check_csv_headers_only(read_json):
+    
+    # this test the function read_and_check_csv with a file having headers only. The empty dataframe must be returned with the declared types
+    mock_schema = read_json("read_csv_schema.json")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        local_file_path = os.path.join(tmpdir, "read_csv.csv")
+        with open(local_file_path, "w", encoding="utf-8") as file:
+            file.write("col1,col2\n")
+
+        with patch.object(files_manipulation, "read_json", return_value=mock_schema):
+            df = files_manipulation.read_and_check_csv(local_file_path)
+            assert df.empty
+            assert df.columns.tolist() == ["col1", "col2"]
+            assert df.dtypes.astype(str).tolist() == ["int64", "object"]
+
 def test_create_csv(read_csv):
     
     # this test the function create_csv
@@ -50,6 +66,21 @@ def test_create_jpg():
 
         plt.close(fig)
 
+def test_create_composite_jpg():
+    
+    # this test the function create_composite_jpg stacking two jpg files of different sizes
+    with tempfile.TemporaryDirectory() as tmpdir:
+
+        lst_local_file_paths = [tmpdir+"/part1.jpg", tmpdir+"/part2.jpg"]
+        Image.new('RGB', (100, 50), 'blue').save(lst_local_file_paths[0], format='JPEG')
+        Image.new('RGB', (60, 30), 'red').save(lst_local_file_paths[1], format='JPEG')
+        local_file_path = tmpdir+"/composite.jpg"
+
+        files_manipulation.create_composite_jpg(local_file_path, lst_local_file_paths, 10)
+        assert os.path.exists(local_file_path), "Expected JPG file was not created."
+        with Image.open(local_file_path) as composite:
+            assert composite.size == (100, 90)
+
 def test_filter_data():
     
     # this test the function filter_data with two dependant files
@@ -76,3 +107,11 @@ def test_filter_data():
     
     assert_frame_equal(result["df_df1"].reset_index(drop=True), expected["df_df1"].reset_index(drop=True))
     assert_frame_equal(result["df_df2"].reset_index(drop=True), expected["df_df2"].reset_index(drop=True))
+
+def test_compress_text():
+
+    # this test the functions compress_text and decompress_text
+    text = "<div>blabla é</div>" * 100
+    compressed_text = files_manipulation.compress_text(text)
+    assert len(compressed_text) < len(text)
+    assert files_manipulation.decompress_text(compressed_text) == text
@@ -91,3 +91,17 @@ def test_create_jpg_save_failure(assert_exit):
         fake_fig = MagicMock()
         fake_fig.savefig.side_effect = Exception("save error")
         assert_exit(lambda: files_manipulation.create_jpg(local_file_path, fake_fig))
+
+def test_create_composite_jpg_no_file(assert_exit):
+    
+    # this test the function create_composite_jpg without any file to stack. Must exit the program.
+    with tempfile.TemporaryDirectory() as tmpdir:
+        local_file_path = tmpdir+"/composite.jpg"
+        assert_exit(lambda: files_manipulation.create_composite_jpg(local_file_path, []))
+
+def test_create_composite_jpg_file_not_found(assert_exit):
+    
+    # this test the function create_composite_jpg with a file to stack non existant. Must exit the program.
+    with tempfile.TemporaryDirectory() as tmpdir:
+        local_file_path = tmpdir+"/composite.jpg"
+        assert_exit(lambda: files_manipulation.create_composite_jpg(local_file_path, [tmpdir+"/does_not_exist.jpg"]))
@@ -44,6 +44,29 @@ def test_initiate_local_environment(read_csv,read_yml_as_serie):
         
         local_environment_manipulation.initiate_local_environment(called_by)
 
+def test_initiate_local_environment_current_run_time(read_csv,read_yml_as_serie):
+    
+    # this test the function initiate_local_environment given the run time to run (game results watcher). It must be logged in the run type file
+    called_by = "main"
+    mock_df_paths_dict = {"df_paths" : read_csv("paths.csv")}
+    mock_df_run_type = read_csv("RUN_TYPE_after_initiate.csv")
+    mock_data_dict = {
+        "sr_snowflake_account_connect": read_yml_as_serie("snowflake_account_connect.yml"),
+        "str_next_run_time_utc": "2024-01-01 08:01:00.000",
+        "df_run_type": mock_df_run_type,
+    }
+
+    with patch.object(local_environment_manipulation,"create_local_folder"), \
+         patch.object(local_environment_manipulation.specific_files_operations,"get_paths_file_details", return_value=mock_df_paths_dict), \
+         patch.object(local_environment_manipulation,"multithread_run", return_value=[mock_data_dict]), \
+         patch.object(local_environment_manipulation.specific_files_operations,"modify_run_type_file", return_value=mock_df_run_type) as mock_modify_run_type_file, \
+         patch.object(local_environment_manipulation.dropbox,"upload_file"), \
+         patch.object(local_environment_manipulation.specific_files_operations,"personalize_yml_dbt_file"):
+        
+        context_dict = local_environment_manipulation.initiate_local_environment(called_by, "2024-01-01 10:05:00.000")
+        assert context_dict['str_current_run_time_utc'] == "2024-01-01 10:05:00.000"
+        assert mock_modify_run_type_file.call_args.kwargs['planned_run_time_utc'] == "2024-01-01 10:05:00.000"
+
 def test_terminate_local_environment(read_csv):
     
     # this test the function terminate_local_environment
@@ -269,6 +269,35 @@ def test_get_parameters_df_management(read_csv, read_json):
         assert result["RANK_PREDICTCHAMP_DF_URL_FRANCE_BI"] == "url4"
         assert mock_manage_df.call_count == 4
 
+def test_get_parameters_df_management_composite(read_csv, read_json):
+    
+    # this test the function get_parameters_df_management with composite captures, without rank
+    sr_gameday_output_calculate = read_csv("sr_gameday_output_calculate.csv").iloc[0]
+    country = "FRANCE"
+    forum = "BI"
+    translations = read_json("output_gameday_template_translations.json")
+
+    param_dict = {
+        "SCORES_DETAILED_DF": read_csv("output_message_calculated_scores_details.csv", header=[0, 1],keep_default_na=False,na_filter=False),
+        "SCORES_GLOBAL_DF": read_csv("output_message_calculated_scores_global.csv"),
+        "SCORES_GAMEDAY_DF": read_csv("output_message_calculated_scores_gameday.csv"),
+        "RANK_PREDICTCHAMP_DF": read_csv("output_message_calculated_predictchamp_rank.csv"),
+        "IS_FOR_RANK": 0,
+    }
+    with patch.object(output_message_calculated_generation.var,"IS_CAPTURE_COMPOSITE", 1), \
+         patch.object(output_message_calculated_generation.output,"manage_df") as mock_manage_df, \
+         patch.object(output_message_calculated_generation.output,"manage_df_composite", return_value="url_composite") as mock_manage_df_composite:
+         
+        result = output_message_calculated_generation.get_parameters_df_management(param_dict,sr_gameday_output_calculate,country,forum, translations)
+
+        assert result["SCORES_DETAILED_DF_URL_FRANCE_BI"] == "url_composite"
+        assert result["SCORES_GLOBAL_DF_URL_FRANCE_BI"] == ""
+        assert result["SCORES_GAMEDAY_DF_URL_FRANCE_BI"] == ""
+        assert result["RANK_PREDICTCHAMP_DF_URL_FRANCE_BI"] is None
+        mock_manage_df.assert_not_called()
+        assert mock_manage_df_composite.call_count == 1
+        assert len(mock_manage_df_composite.call_args.args[0]) == 3
+
 def test_create_message(read_txt, read_json, read_csv):
     
     # this test the function create_messages_for_country with all parameters
@@ -291,6 +291,25 @@ def test_get_parameters_missing_key(read_yml_as_serie, read_csv,read_txt, assert
 
         assert_exit(lambda: output_message_calculated_generation.get_parameters(sr_snowflake_account_connect, sr_gameday_output_calculate))
 
+def test_get_parameters_df_management_composite_with_rank(read_csv, read_json):
+
+    # this test the function get_parameters_df_management with composite captures and rank. The rank image must be blanked as the gameday and season ones
+    sr_gameday_output_calculate = read_csv("sr_gameday_output_calculate.csv").iloc[0]
+    param_dict = {
+        "SCORES_DETAILED_DF": read_csv("output_message_calculated_scores_details.csv", header=[0, 1],keep_default_na=False,na_filter=False),
+        "SCORES_GLOBAL_DF": read_csv("output_message_calculated_scores_global.csv"),
+        "SCORES_GAMEDAY_DF": read_csv("output_message_calculated_scores_gameday.csv"),
+        "RANK_PREDICTCHAMP_DF": read_csv("output_message_calculated_predictchamp_rank.csv"),
+        "IS_FOR_RANK": 1,
+    }
+    with patch.object(output_message_calculated_generation.var,"IS_CAPTURE_COMPOSITE", 1),          patch.object(output_message_calculated_generation.output,"manage_df_composite", return_value="url_composite") as mock_manage_df_composite:
+
+        result = output_message_calculated_generation.get_parameters_df_management(param_dict,sr_gameday_output_calculate,"FRANCE","BI", read_json("output_gameday_template_translations.json"))
+
+        assert result["SCORES_DETAILED_DF_URL_FRANCE_BI"] == "url_composite"
+        assert result["RANK_PREDICTCHAMP_DF_URL_FRANCE_BI"] == ""
+        assert len(mock_manage_df_composite.call_args.args[0]) == 4
+
 def test_create_message_conditional_blocks(read_csv,read_txt,read_json):
     
     # this test the function create_messages_for_country with a template without parameters. Must return the same result than the template
@@ -184,6 +184,50 @@ def test_manage_df(read_json, read_csv):
             expected_path = os.path.join(tmp, full_capture_name)
             mock_push.assert_called_once_with(expected_path)
 
+def test_manage_df_composite(read_json, read_csv):
+    
+    # this test the function manage_df_composite with a one-header and a two-level header dataframes
+    df_oneheader = pd.DataFrame({"a": [1], "b": [2]})
+    df_twoheaders = pd.DataFrame([[1, 2]], columns=pd.MultiIndex.from_tuples([("x", "a"), ("x", "b")]))
+    country = "FRANCE"
+    forum = "BI"
+    capture_name = "capture"
+    sr_gameday_output_calculate = read_csv("sr_gameday_output_calculate.csv").iloc[0]
+    translations = read_json("output_gameday_template_translations.json")
+    expected_url = "https://example.com/capture.jpg"
+
+    with patch.object(output_message_generation,"translate_df_headers", side_effect=lambda df, *args: df), \
+         patch.object(output_message_generation,"define_filename", side_effect=["part1.jpg", "part2.jpg", "capture.jpg"]) as mock_define_filename, \
+         patch.object(output_message_generation,"capture_df_oneheader") as mock_capture_oneheader, \
+         patch.object(output_message_generation,"capture_scores_detailed") as mock_capture_detailed, \
+         patch.object(output_message_generation.files_manipulation,"create_composite_jpg") as mock_composite, \
+         patch.object(output_message_generation,"push_capture_online", return_value=expected_url) as mock_push:
+
+        with tempfile.TemporaryDirectory() as tmp:
+            var.TMPF = tmp
+
+            result = output_message_generation.manage_df_composite(
+                lst_df=[df_oneheader, df_twoheaders],
+                country=country,
+                forum=forum,
+                capture_name=capture_name,
+                sr_gameday_output=sr_gameday_output_calculate,
+                translations_dict=translations
+            )
+
+            # Assert
+            assert result == expected_url
+            assert mock_define_filename.call_args_list[0].args[0] == "capture_part1"
+            assert mock_define_filename.call_args_list[2].args[0] == "capture"
+            mock_capture_oneheader.assert_called_once_with(df_oneheader, "part1.jpg")
+            mock_capture_detailed.assert_called_once_with(df_twoheaders, "part2.jpg")
+            mock_composite.assert_called_once_with(
+                os.path.join(tmp, "capture.jpg"),
+                [os.path.join(tmp, "part1.jpg"), os.path.join(tmp, "part2.jpg")],
+                var.CAPTURE_COMPOSITE_MARGIN
+            )
+            mock_push.assert_called_once_with(os.path.join(tmp, "capture.jpg"))
+
 def test_generate_output_message_init(read_csv, read_yml_as_serie):
     
     # this test the function generate_output_message - with INIT task
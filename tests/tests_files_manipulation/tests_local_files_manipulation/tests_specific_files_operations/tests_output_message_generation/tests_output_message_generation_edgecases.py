@@ -188,3 +188,31 @@ def test_manage_df_upload_failure_propagates(read_json, read_csv, assert_exit):
                 sr_gameday_output=sr_gameday_output_calculate,
                 translations_dict=translations
             ))
+
+def test_manage_df_composite_upload_failure_propagates(read_json, read_csv, assert_exit):
+    
+    # this test the function manage_df_composite with a forced error when uploading. Must exit the program.
+    df = pd.DataFrame({"a": [1], "b": [2]})
+    country = "FRANCE"
+    forum = "BI"
+    capture_name = "capture"
+    translations = read_json("output_gameday_template_translations.json")
+    sr_gameday_output_calculate = read_csv("sr_gameday_output_calculate.csv").iloc[0]
+
+    with patch.object(output_message_generation,"translate_df_headers", return_value=df), \
+         patch.object(output_message_generation,"define_filename", return_value="capture.jpg"), \
+         patch.object(output_message_generation,"capture_df_oneheader"), \
+         patch.object(output_message_generation.files_manipulation,"create_composite_jpg"), \
+         patch.object(output_message_generation,"push_capture_online", side_effect=RuntimeError("upload failed")):
+
+        with tempfile.TemporaryDirectory() as tmp:
+            var.TMPF = tmp
+
+            assert_exit(lambda: output_message_generation.manage_df_composite(
+                lst_df=[df, df],
+                country=country,
+                forum=forum,
+                capture_name=capture_name,
+                sr_gameday_output=sr_gameday_output_calculate,
+                translations_dict=translations
+            ))
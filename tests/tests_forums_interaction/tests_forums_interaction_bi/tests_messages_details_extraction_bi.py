@@ -5,8 +5,7 @@ It units test the happy path for each function
 
 import ast
 from datetime import datetime
-from unittest.mock import patch
-from bs4 import BeautifulSoup as bs
+from lxml import html as lxml_html
 from pandas.testing import assert_frame_equal
 import pandas as pd
 
@@ -20,62 +19,77 @@ def test_translate_french_special_date_to_english():
     result = messages_details_extraction_bi.translate_french_special_date_to_english(date_string)
     assert result == expected
 
-def test_transform_forum_time_to_datetime():
+def test_transform_forum_times_to_datetime():
     
-    # this test the function transform_forum_time_to_datetime
-    date_string = "Mon 01 Jan 2025 9:08"
-    result = messages_details_extraction_bi.transform_forum_time_to_datetime(date_string)
-    assert isinstance(result, datetime)
-    assert result.year == 2025 and result.month == 1 and result.day == 1
-    assert result.hour == 9 and result.minute == 8
+    # this test the function transform_forum_times_to_datetime with repeated dates and missing ones
+    date_strings = ["mar. 07 janv. 2025 9:54", None, "mar. 07 janv. 2025 9:54", "sam. 01 mars 2025 18:05"]
+    expected = [datetime(2025, 1, 7, 9, 54), None, datetime(2025, 1, 7, 9, 54), datetime(2025, 3, 1, 18, 5)]
+    result = messages_details_extraction_bi.transform_forum_times_to_datetime(date_strings)
+    assert result == expected
+    assert all(type(date) is datetime for date in result if date is not None)
 
-def test_get_users_bi(read_txt):
+def test_get_pagination_bi(read_txt):
     
-    # this test the function get_users_bi
-    message = read_txt("bi_message_html.txt")
-    soup = bs(message, "html.parser")
-    expected = ast.literal_eval('[' + read_txt("bi_get_users.txt") + ']')
-    users = messages_details_extraction_bi.get_users_bi(soup)
-    assert users == expected
+    # this test the function get_pagination_bi
+    messagetext = read_txt("bi_message_html.txt")
+    total_messages, messages_per_page = messages_details_extraction_bi.get_pagination_bi(messagetext)
+    assert total_messages == 285
+    assert messages_per_page == 15
 
-def test_get_ids_bi(read_txt):
-    
-    # this test the function get_ids_bi
-    message = read_txt("bi_message_html.txt")
-    soup = bs(message, "html.parser")
-    expected = ast.literal_eval('[' + read_txt("bi_get_ids.txt") + ']')
+def test_get_posts_fragment_bi(read_txt):
     
-    ids = messages_details_extraction_bi.get_ids_bi(soup)
-    assert ids == expected
+    # this test the function get_posts_fragment_bi. The fragment must begin with the first message, and change only with the messages
+    messagetext = read_txt("bi_message_html.txt")
+    posts_fragment = messages_details_extraction_bi.get_posts_fragment_bi(messagetext)
+    assert posts_fragment.startswith('<div id="p1" class="post')
+    assert "blabla15" in posts_fragment
+    messagetext_other_visit = messagetext.replace('<div id="p1" class="post', '<span>other visit</span>\n<div id="p1" class="post', 1)
+    assert messages_details_extraction_bi.get_posts_fragment_bi(messagetext_other_visit) == posts_fragment
 
-def test_get_creationtimes_bi(read_txt):
+def test_get_feed_posts_bi(materials_dir):
     
-    # this test the function get_creationtimes_bi
-    message = read_txt("bi_message_html.txt")
-    soup = bs(message, "html.parser")
-    expected = eval('[' + read_txt("bi_get_creation_times.txt") + ']', {"datetime": datetime})
+    # this test the function get_feed_posts_bi. Times must be converted in UTC
+    with open(materials_dir / "bi_topic_feed.xml", 'rb') as file:
+        df_feed = messages_details_extraction_bi.get_feed_posts_bi(file.read())
+    assert df_feed['MESSAGE_FORUM_ID'].tolist() == [38620, 38619, 38618]
+    assert df_feed['PUBLISHED_UTC'].tolist() == [pd.Timestamp('2025-02-04 21:40:00'), pd.Timestamp('2025-02-04 21:04:00'), pd.Timestamp('2025-02-03 19:00:00')]
+    assert df_feed['UPDATED_UTC'].tolist() == [pd.Timestamp('2025-02-04 21:50:00'), pd.Timestamp('2025-02-04 21:04:00'), pd.Timestamp('2025-02-04 20:30:00')]
 
-    creation_times = messages_details_extraction_bi.get_creationtimes_bi(soup)
-    assert creation_times == expected
+def test_get_topic_feed_url_bi():
+    
+    # this test the function get_topic_feed_url_bi
+    assert messages_details_extraction_bi.get_topic_feed_url_bi('https://forum.test', 108506) == 'https://forum.test/app.php/feed/topic/108506'
 
-def test_get_contents_outerblockquote_bi(read_txt):
+def test_get_feed_topics_bi(materials_dir):
     
-    # this test the function get_contents_outerblockquote_bi
-    message = read_txt("bi_message_html.txt")
-    soup = bs(message, "html.parser")
-    content = messages_details_extraction_bi.get_contents_outerblockquote_bi(soup)
-    expected_content = ast.literal_eval('[' + read_txt("bi_get_content.txt") + ']')
-    assert expected_content == content
+    # this test the function get_feed_topics_bi. Last post times must be converted in UTC
+    with open(materials_dir / "bi_topics_active_feed.xml", 'rb') as file:
+        df_feed = messages_details_extraction_bi.get_feed_topics_bi(file.read())
+    assert df_feed['TOPIC_NUMBER'].tolist() == [108506, 1]
+    assert df_feed['LAST_POST_UTC'].tolist() == [pd.Timestamp('2025-02-04 21:40:00'), pd.Timestamp('2025-02-04 20:30:00')]
 
-def test_get_editiontimes_bi(read_txt):
+def test_get_active_topics_feed_url_bi():
+    
+    # this test the function get_active_topics_feed_url_bi
+    assert messages_details_extraction_bi.get_active_topics_feed_url_bi('https://forum.test') == 'https://forum.test/app.php/feed/topics_active'
 
-    # this test the function get_editiontimes_bi
-    message = read_txt("bi_message_html.txt")
-    soup = bs(message, "html.parser")
-    expected = eval('[' + read_txt("bi_get_edition_times.txt") + ']', {"datetime": datetime})
+def test_get_text_outerblockquote_bi():
+    
+    # this test the function get_text_outerblockquote_bi with a quote inside a message
+    element = lxml_html.fromstring("<div class='content'>Before<br/><blockquote><div>Quoted<!-- comment --></div></blockquote>After</div>")
+    result = messages_details_extraction_bi.get_text_outerblockquote_bi(element)
+    assert result == "Before<blockquote>Quoted</blockquote>After"
 
-    edition_times =  messages_details_extraction_bi.get_editiontimes_bi(soup)
-    assert edition_times == expected
+def test_get_posts_bi(read_txt):
+    
+    # this test the function get_posts_bi: users, ids, creation times, contents (with outer blockquotes) and edition times of the page
+    messagetext = read_txt("bi_message_html.txt")
+    posts = messages_details_extraction_bi.get_posts_bi(messagetext)
+    assert [post['USER'] for post in posts] == ast.literal_eval('[' + read_txt("bi_get_users.txt") + ']')
+    assert [post['MESSAGE_FORUM_ID'] for post in posts] == ast.literal_eval('[' + read_txt("bi_get_ids.txt") + ']')
+    assert [post['CREATION_TIME_LOCAL'] for post in posts] == eval('[' + read_txt("bi_get_creation_times.txt") + ']', {"datetime": datetime})
+    assert [post['MESSAGE_CONTENT'] for post in posts] == ast.literal_eval('[' + read_txt("bi_get_content.txt") + ']')
+    assert [post['EDITION_TIME_LOCAL'] for post in posts] == eval('[' + read_txt("bi_get_edition_times.txt") + ']', {"datetime": datetime})
 
 def test_get_messages_details_bi(read_txt, read_csv):
 
@@ -83,27 +97,16 @@ def test_get_messages_details_bi(read_txt, read_csv):
     messagetext = read_txt("bi_message_html.txt")
     topic_row = next(read_csv("q_topics_query.csv").itertuples(index=False))
     start = 0
-    mock_users = ast.literal_eval('[' + read_txt("bi_get_users.txt") + ']')
-    mock_ids = ast.literal_eval('[' + read_txt("bi_get_ids.txt") + ']')
-    mock_creation_times = eval('[' + read_txt("bi_get_creation_times.txt") + ']', {"datetime": datetime})
-    mock_contents = ast.literal_eval('[' + read_txt("bi_get_content.txt") + ']')
-    mock_edition_times = eval('[' + read_txt("bi_get_edition_times.txt") + ']', {"datetime": datetime})
     expected = read_csv("bi_get_messages_details.csv",quotechar='"')
 
-    with patch.object(messages_details_extraction_bi,"get_users_bi", return_value = mock_users), \
-         patch.object(messages_details_extraction_bi,"get_ids_bi", return_value = mock_ids), \
-         patch.object(messages_details_extraction_bi,"get_creationtimes_bi", return_value = mock_creation_times), \
-         patch.object(messages_details_extraction_bi,"get_contents_outerblockquote_bi", return_value = mock_contents), \
-         patch.object(messages_details_extraction_bi,"get_editiontimes_bi", return_value = mock_edition_times):
+    df_messages_infos = messages_details_extraction_bi.get_messages_details_bi(messagetext, topic_row, start)
+    df_messages_infos['CREATION_TIME_LOCAL'] = pd.to_datetime(df_messages_infos['CREATION_TIME_LOCAL'])
+    df_messages_infos['CREATION_TIME_LOCAL'] = df_messages_infos['CREATION_TIME_LOCAL'].dt.tz_localize(None)
+    df_messages_infos['EDITION_TIME_LOCAL'] = pd.to_datetime(df_messages_infos['EDITION_TIME_LOCAL'])
+    df_messages_infos['EDITION_TIME_LOCAL'] = df_messages_infos['EDITION_TIME_LOCAL'].dt.tz_localize(None)
+    expected['CREATION_TIME_LOCAL'] = pd.to_datetime(expected['CREATION_TIME_LOCAL'])
+    expected['CREATION_TIME_LOCAL'] = expected['CREATION_TIME_LOCAL'].dt.tz_localize(None)
+    expected['EDITION_TIME_LOCAL'] = pd.to_datetime(expected['EDITION_TIME_LOCAL'])
+    expected['EDITION_TIME_LOCAL'] = expected['EDITION_TIME_LOCAL'].dt.tz_localize(None)
     
-        df_messages_infos = messages_details_extraction_bi.get_messages_details_bi(messagetext, topic_row, start)
-        df_messages_infos['CREATION_TIME_LOCAL'] = pd.to_datetime(df_messages_infos['CREATION_TIME_LOCAL'])
-        df_messages_infos['CREATION_TIME_LOCAL'] = df_messages_infos['CREATION_TIME_LOCAL'].dt.tz_localize(None)
-        df_messages_infos['EDITION_TIME_LOCAL'] = pd.to_datetime(df_messages_infos['EDITION_TIME_LOCAL'])
-        df_messages_infos['EDITION_TIME_LOCAL'] = df_messages_infos['EDITION_TIME_LOCAL'].dt.tz_localize(None)
-        expected['CREATION_TIME_LOCAL'] = pd.to_datetime(expected['CREATION_TIME_LOCAL'])
-        expected['CREATION_TIME_LOCAL'] = expected['CREATION_TIME_LOCAL'].dt.tz_localize(None)
-        expected['EDITION_TIME_LOCAL'] = pd.to_datetime(expected['EDITION_TIME_LOCAL'])
-        expected['EDITION_TIME_LOCAL'] = expected['EDITION_TIME_LOCAL'].dt.tz_localize(None)
-        
-        assert_frame_equal(df_messages_infos.reset_index(drop=True), expected.reset_index(drop=True),check_dtype=False)
\ No newline at end of file
+    assert_frame_equal(df_messages_infos.reset_index(drop=True), expected.reset_index(drop=True),check_dtype=False)
@@ -3,109 +3,140 @@ This tests file concern all functions in the messages_details_extraction_bi.
 It units test the unexpected path
 '''
 import pytest
-import ast
 from datetime import datetime
-from unittest.mock import patch
-from bs4 import BeautifulSoup as bs
 import pandas as pd
 
 from src.predict_core.forums_interaction.forums_interaction_bi import messages_details_extraction_bi
-def test_get_users_empty_html():
+def test_get_posts_empty_html():
     
-    # this test the function get_users_bi without users. Must return empty user
-    message = ""
-    soup = bs(message, "html.parser")
-    users = messages_details_extraction_bi.get_users_bi(soup)
-    assert users == []
+    # this test the function get_posts_bi without messages. Must return an empty list
+    assert messages_details_extraction_bi.get_posts_bi("") == []
+    assert messages_details_extraction_bi.get_posts_bi("<html><body>No message</body></html>") == []
 
-def test_get_users_malformed_html():
+def test_get_posts_user_without_class():
     
-    # this test the function get_users_bi without tags. Must return empty user
-    message = "<span class='responsive-hide'><a>Missing class</a></span>"
-    soup = bs(message, "html.parser")
-    users = messages_details_extraction_bi.get_users_bi(soup)
-    assert users == []
+    # this test the function get_posts_bi with a user link without the username class. Must raise the issue (to the caller)
+    message = """<div id="p1" class="post"><dl class="postprofile" id="profile1"></dl>
+                 <div class="postbody"><span class="responsive-hide"><a>Missing class</a></span><time>mar. 07 janv. 2025 9:54</time>
+                 <div class="content">blabla</div></div></div>"""
+    with pytest.raises(ValueError):
+        messages_details_extraction_bi.get_posts_bi(message)
 
-def test_get_ids_malformed_ids():
+def test_get_posts_malformed_id():
     
-    # this test the function get_ids_bi with id not int. Must raise the value (to the caller)
-    message = "<dl class='postprofile' id='badprefix123'></dl>"
-    soup = bs(message, "html.parser")
+    # this test the function get_posts_bi with a profile id not int. Must raise the issue (to the caller)
+    message = """<div id="p1" class="post"><dl class="postprofile" id="badprefix123"></dl>
+                 <div class="postbody"><span class="responsive-hide"><a class="username">USER1</a></span><time>mar. 07 janv. 2025 9:54</time>
+                 <div class="content">blabla</div></div></div>"""
     with pytest.raises(ValueError):
-        messages_details_extraction_bi.get_ids_bi(soup)
+        messages_details_extraction_bi.get_posts_bi(message)
 
-def test_get_ids_empty():
+def test_get_posts_invalid_date():
     
-    # this test the function get_ids_bi with empty id. Must return an empty list
-    message = ""
-    soup = bs(message, "html.parser")    
-    ids = messages_details_extraction_bi.get_ids_bi(soup)
-    assert ids == []
+    # this test the function get_posts_bi with an invalid creation date. Must raise the issue (to the caller)
+    message = """<div id="p1" class="post"><dl class="postprofile" id="profile1"></dl>
+                 <div class="postbody"><span class="responsive-hide"><a class="username">USER1</a></span><time>Invalid Date</time>
+                 <div class="content">blabla</div></div></div>"""
+    with pytest.raises(ValueError):
+        messages_details_extraction_bi.get_posts_bi(message)
 
-def test_get_creationtimes_invalid_date():
+def test_transform_forum_times_to_datetime_invalid_date():
     
-    # this test the function get_creationtimes_bi with invalid date. Must raise the issue (to the caller)
-    message = "<time>Invalid Date</time>"
-    soup = bs(message, "html.parser")
+    # this test the function transform_forum_times_to_datetime with an invalid date. Must raise the issue (to the caller)
     with pytest.raises(ValueError):
-        messages_details_extraction_bi.get_creationtimes_bi(soup)
-    
-def test_content_outer_blockquote_nested():
-    
-    # this test the function get_contents_outerblockquote_bi with a lot of nested blocks. Must return the inside quote
-    message = "<div class='content'><blockquote><blockquote>Nested</blockquote>Outer</blockquote></div>"
-    soup = bs(message, "html.parser")
-    expected = "<blockquote>NestedOuter</blockquote>"
-    content = messages_details_extraction_bi.get_contents_outerblockquote_bi(soup)
-    assert content[0] == expected
+        messages_details_extraction_bi.transform_forum_times_to_datetime(["mar. 07 janv. 2025 9:54", "Invalid Date"])
 
-def test_content_empty_div():
+def test_transform_forum_times_to_datetime_no_date():
     
-    # this test the function get_contents_outerblockquote_bi with an empty content. Must return an empty list
-    message = ""
-    soup = bs(message, "html.parser")
-    content = messages_details_extraction_bi.get_contents_outerblockquote_bi(soup)
-    assert content == []
+    # this test the function transform_forum_times_to_datetime without any date. Must return None for each
+    assert messages_details_extraction_bi.transform_forum_times_to_datetime([None, None]) == [None, None]
+    assert messages_details_extraction_bi.transform_forum_times_to_datetime([]) == []
 
-def test_editiontime_malformed_notice():
+def test_get_posts_malformed_edition_notice():
     
-    # this test the function get_editiontimes_bi with a malformed date. Must return None
-    message = "<div class='postbody'><div class='notice'>Modifié en dernier par Someone but missing date</div></div>"
-    soup = bs(message, "html.parser")
-    assert messages_details_extraction_bi.get_editiontimes_bi(soup)[0] is None
+    # this test the function get_posts_bi with an edition notice without date. Must return no edition time
+    message = """<div id="p1" class="post"><dl class="postprofile" id="profile1"></dl>
+                 <div class="postbody"><span class="responsive-hide"><a class="username">USER1</a></span><time>mar. 07 janv. 2025 9:54</time>
+                 <div class="content">blabla</div><div class="notice">Modifié en dernier par Someone but missing date</div></div></div>"""
+    assert messages_details_extraction_bi.get_posts_bi(message)[0]['EDITION_TIME_LOCAL'] is None
 
-def test_editiontime_no_notice(read_txt):
+def test_get_posts_no_edition(read_txt):
     
-    # this test the function get_editiontimes_bi with no edition
+    # this test the function get_posts_bi with no edition
     message = read_txt("edgecases/bi_message_html_noedition.txt")
-    soup = bs(message, "html.parser")
     expected = eval('[' + read_txt("edgecases/bi_get_edition_times_noedition.txt") + ']', {"datetime": datetime})
 
-    edition_times =  messages_details_extraction_bi.get_editiontimes_bi(soup)
-    assert edition_times == expected
+    posts = messages_details_extraction_bi.get_posts_bi(message)
+    assert [post['EDITION_TIME_LOCAL'] for post in posts] == expected
+
+def test_get_pagination_no_pagination():
+    
+    # this test the function get_pagination_bi on a page without pagination block (one page topic). Must return None for both
+    total_messages, messages_per_page = messages_details_extraction_bi.get_pagination_bi("<html><body><div class='post'></div></body></html>")
+    assert total_messages is None
+    assert messages_per_page is None
+
+def test_get_posts_fragment_no_message():
+    
+    # this test the function get_posts_fragment_bi on a page without message. Must return the whole page
+    messagetext = "<html><body>No message</body></html>"
+    assert messages_details_extraction_bi.get_posts_fragment_bi(messagetext) == messagetext
+
+def test_get_posts_fragment_action_bar():
+    
+    # this test the function get_posts_fragment_bi on a page with a bottom action bar. Must stop before it
+    messagetext = '<html><div id="p1" class="post">blabla</div><div class="action-bar bar-bottom">Nous sommes le ...</div></html>'
+    assert messages_details_extraction_bi.get_posts_fragment_bi(messagetext) == '<div id="p1" class="post">blabla</div>'
+
+def test_get_feed_posts_not_a_feed():
+    
+    # this test the function get_feed_posts_bi with an HTML page (feed disabled). Must raise the issue (to the caller)
+    with pytest.raises(ValueError):
+        messages_details_extraction_bi.get_feed_posts_bi(b"<html><body>Feed disabled</body></html>")
+
+def test_get_feed_posts_empty_feed():
+    
+    # this test the function get_feed_posts_bi with a feed without message. Must return an empty dataframe
+    df_feed = messages_details_extraction_bi.get_feed_posts_bi(b'<feed xmlns="http://www.w3.org/2005/Atom"><title>Forum BI</title></feed>')
+    assert df_feed.empty
+    assert df_feed.columns.tolist() == ['MESSAGE_FORUM_ID','PUBLISHED_UTC','UPDATED_UTC']
+
+def test_get_feed_entries_without_id():
+    
+    # this test the function get_feed_entries_bi with an entry url without the id searched. Must raise the issue (to the caller)
+    feedtext = b"""<feed xmlns="http://www.w3.org/2005/Atom"><entry><updated>2025-02-04T21:30:00+01:00</updated>
+                   <published>2025-02-04T21:30:00+01:00</published><id>https://forum.test/index.php</id></entry></feed>"""
+    with pytest.raises(ValueError):
+        messages_details_extraction_bi.get_feed_entries_bi(feedtext, r"[?&]t=(\d+)")
+
+def test_get_posts_missing_detail():
+    
+    # this test the function get_posts_bi with a message without creation time. Must raise the issue (to the caller)
+    message = """<div id="p1" class="post"><dl class="postprofile" id="profile1"></dl>
+                 <div class="postbody"><span class="responsive-hide"><a class="username">USER1</a></span>
+                 <div class="content">blabla</div></div></div>"""
+    with pytest.raises(ValueError):
+        messages_details_extraction_bi.get_posts_bi(message)
+
+def test_get_posts_nested_blockquotes():
+    
+    # this test the function get_posts_bi with a lot of nested blocks. Must keep the outer quote only
+    message = """<div id="p1" class="post"><dl class="postprofile" id="profile1"></dl>
+                 <div class="postbody"><span class="responsive-hide"><a class="username">USER1</a></span><time>mar. 07 janv. 2025 9:54</time>
+                 <div class="content"><blockquote><blockquote>Nested</blockquote>Outer</blockquote></div></div></div>"""
+    posts = messages_details_extraction_bi.get_posts_bi(message)
+    assert posts[0]['MESSAGE_CONTENT'] == "<blockquote>NestedOuter</blockquote>"
+    assert posts[0]['EDITION_TIME_LOCAL'] is None
 
-def test_get_messages_details_inconsistent_lengths(read_txt, read_csv):
+def test_get_messages_details_missing_detail(read_csv):
     
-    # this test the function get_messages_details_bi with inconsistent length between lists. Must raise an issue
-    messagetext = read_txt("bi_message_html.txt")
+    # this test the function get_messages_details_bi with a message without creation time. Must raise an issue
+    messagetext = """<div id="p1" class="post"><dl class="postprofile" id="profile1"></dl>
+                 <div class="postbody"><span class="responsive-hide"><a class="username">USER1</a></span>
+                 <div class="content">blabla</div></div></div>"""
     topic_row = next(read_csv("q_topics_query.csv").itertuples(index=False))
-    start = 0
-    mock_users = ast.literal_eval('[' + read_txt("bi_get_users.txt") + ']')
-    mock_ids = ast.literal_eval('[' + read_txt("bi_get_ids.txt") + ']')
-    mock_creation_times = eval('[' + read_txt("bi_get_creation_times.txt") + ']', {"datetime": datetime})
-    mock_contents = ast.literal_eval('[' + read_txt("bi_get_content.txt") + ']')
-    mock_edition_times = eval('[' + read_txt("bi_get_edition_times.txt") + ']', {"datetime": datetime})
-
-    mock_creation_times = mock_creation_times[:-1] # we remove the last element from creation times so that the length is inconsistent with others
-
-    with patch.object(messages_details_extraction_bi,"get_users_bi", return_value = mock_users), \
-         patch.object(messages_details_extraction_bi,"get_ids_bi", return_value = mock_ids), \
-         patch.object(messages_details_extraction_bi,"get_creationtimes_bi", return_value = mock_creation_times), \
-         patch.object(messages_details_extraction_bi,"get_contents_outerblockquote_bi", return_value = mock_contents), \
-         patch.object(messages_details_extraction_bi,"get_editiontimes_bi", return_value = mock_edition_times):
-      
-        with pytest.raises(ValueError):
-            messages_details_extraction_bi.get_messages_details_bi(messagetext, topic_row, start)
+    with pytest.raises(ValueError):
+        messages_details_extraction_bi.get_messages_details_bi(messagetext, topic_row, 0)
 
 def test_get_messages_details_empty_html(read_csv):
     
@@ -4,8 +4,13 @@ It units test the happy path for each function
 '''
 
 from unittest.mock import MagicMock, patch
+import os
 
+from src.predict_core.config.config_multithread import multithread_run
+from src.predict_core.forums_interaction import forums_sessions_management
+from src.predict_core.forums_interaction import messages_posting_ledger
 from src.predict_core.forums_interaction.forums_interaction_bi import messages_posting_process_bi
+from tests.stand_ins.phpbb_stand_in import generate_forum, run_phpbb_stand_in
 
 def test_post_edit_message_bi(read_csv):
 
@@ -85,7 +90,14 @@ def test_post_to_bi():
         mock_sess_instance.post.return_value.text = mock_post_post
 
         # Should not raise SystemExit
-        messages_posting_process_bi.post_to_bi(message_content, mock_session, post_url, sid, is_to_edit)
+        forum_session = forums_sessions_management.create_forum_session() | {'SESSION': mock_sess_instance, 'SID': sid, 'IS_LOGGED_IN': True}
+        messages_posting_process_bi.post_to_bi(message_content, forum_session, post_url, is_to_edit)
+
+def test_get_posted_message_id_bi():
+
+    # this test the function get_posted_message_id_bi with the page of success of phpBB
+    page_text = '<p>Ce message a été envoyé avec succès.</p><a href="./viewtopic.php?f=2&amp;t=10851&amp;p=38650#p38650">Voir</a>'
+    assert messages_posting_process_bi.get_posted_message_id_bi(page_text) == 38650
 
 def test_login_and_post_message_bi(read_csv):
     # this test the function login_and_post_message_bi
@@ -104,9 +116,88 @@ def test_login_and_post_message_bi(read_csv):
             "BI_URL": "https://fakeforum.com"
         },
     ), \
-    patch.object(messages_posting_process_bi,"login_to_bi", return_value=(mock_login_successful, mock_sid)), \
-    patch.object(messages_posting_process_bi,"post_to_bi", return_value=mock_post_successful):
+    patch.dict(forums_sessions_management.forums_sessions, clear=True), \
+    patch.dict(messages_posting_ledger.posting_ledger, clear=True), \
+    patch.object(messages_posting_process_bi,"login_to_bi", return_value=(mock_login_successful, mock_sid)) as mock_login, \
+    patch.object(messages_posting_process_bi,"post_to_bi", return_value=(mock_post_successful, None)):
 
         # Should not raise SystemExit
         messages_posting_process_bi.login_and_post_message_bi(topic_row, message_content, is_to_edit)
-
+        # the session of the forum is logged in once for all posts
+        messages_posting_process_bi.login_and_post_message_bi(topic_row, message_content, is_to_edit = 0)
+        assert mock_login.call_count == 1
+
+def test_login_and_post_message_bi_stand_in(read_csv):
+
+    # this test the function login_and_post_message_bi against the local phpBB stand-in. The message must be posted, then the other one edited
+    topic_row = read_csv("q_topics_query.csv").iloc[0].copy()
+    topic_row['MESSAGE_NUMBER_TO_EDIT'] = 2
+    forum = generate_forum({topic_row['TOPIC_NUMBER']: 3}, username="bot", password="secret")
+
+    with run_phpbb_stand_in(forum) as forum_url, \
+         patch.dict(os.environ, {'BI_URL': forum_url, 'BI_USERNAME': 'bot', 'BI_PASSWORD': 'secret'}), \
+         patch.dict(forums_sessions_management.forums_sessions, clear=True), \
+         patch.dict(messages_posting_ledger.posting_ledger, clear=True):
+
+        messages_posting_process_bi.login_and_post_message_bi(topic_row, "*****new message", is_to_edit = 0)
+        #the new message is in the ledger with the id given by the page of success
+        new_message_id = forum['topics'][topic_row['TOPIC_NUMBER']][-1]['ID']
+        assert (topic_row['FORUM_SOURCE'], topic_row['TOPIC_NUMBER'], new_message_id) in messages_posting_ledger.posting_ledger
+        messages_posting_process_bi.login_and_post_message_bi(topic_row, "*****edited message", is_to_edit = 1)
+        assert len(forum['sessions']) == 1
+        #the same edit again is not sent
+        nb_requests = forum['nb_requests']
+        messages_posting_process_bi.login_and_post_message_bi(topic_row, "*****edited message", is_to_edit = 1)
+        assert forum['nb_requests'] == nb_requests
+        assert forum['topics'][topic_row['TOPIC_NUMBER']][-1]['CONTENT'] == "*****new message"
+        assert forum['topics'][topic_row['TOPIC_NUMBER']][-1]['USER'] == "bot"
+        assert forum['posts'][2]['CONTENT'] == "*****edited message"
+        assert forum['posts'][2]['EDITED'] is not None
+
+def test_login_and_post_message_bi_stand_in_cookies_restored(read_csv, read_txt):
+
+    # this test the function login_and_post_message_bi against the local phpBB stand-in, on a run after the one having logged in.
+    # The session must be restored with the autologin cookie stored encrypted, without logging in, and get a new session id from the forum
+    topic_row = read_csv("q_topics_query.csv").iloc[0]
+    forum = generate_forum({topic_row['TOPIC_NUMBER']: 3}, username="bot", password="secret")
+
+    with run_phpbb_stand_in(forum) as forum_url, \
+         patch.dict(os.environ, {'BI_URL': forum_url, 'BI_USERNAME': 'bot', 'BI_PASSWORD': 'secret', 'FORUM_SESSION_KEY': read_txt("forum_session_key.txt")}), \
+         patch.dict(forums_sessions_management.forums_sessions, clear=True), \
+         patch.object(forums_sessions_management, "create_csv"):
+
+        messages_posting_process_bi.login_and_post_message_bi(topic_row, "*****first run", is_to_edit = 0)
+        df_forum_session = forums_sessions_management.close_forums_sessions()
+        assert df_forum_session['COOKIE_NAME'].tolist() == ['phpbb3_k']
+        assert not set(df_forum_session['COOKIE_VALUE_ENCRYPTED']) & forum['autologin_keys']
+
+        #the session of the first run is over on the forum, the autologin key is still valid
+        forum['sessions'].clear()
+        forums_sessions_management.open_forums_sessions(df_forum_session)
+        with patch.object(messages_posting_process_bi, "login_to_bi") as mock_login:
+            messages_posting_process_bi.login_and_post_message_bi(topic_row, "*****second run", is_to_edit = 0)
+            mock_login.assert_not_called()
+        assert forum['topics'][topic_row['TOPIC_NUMBER']][-1]['CONTENT'] == "*****second run"
+        assert forums_sessions_management.forums_sessions['BI']['SID'] in forum['sessions']
+
+def test_login_and_post_message_bi_stand_in_flood_control(read_csv):
+
+    # this test the function login_and_post_message_bi against the local phpBB stand-in with flood control, for several topics posting at the same time.
+    # The posts must be sent one at a time, and all posted once the flood interval learned
+    df_topics = read_csv("q_topics_query.csv").head(1)
+    df_topics = df_topics.loc[df_topics.index.repeat(3)].reset_index(drop=True)
+    forum = generate_forum({df_topics['TOPIC_NUMBER'].iloc[0]: 1}, username="bot", password="secret", flood_interval_secs=2)
+
+    with run_phpbb_stand_in(forum) as forum_url, \
+         patch.dict(os.environ, {'BI_URL': forum_url, 'BI_USERNAME': 'bot', 'BI_PASSWORD': 'secret'}), \
+         patch.dict(forums_sessions_management.forums_sessions, clear=True), \
+         patch.object(forums_sessions_management.var, "FORUM_FLOOD_INTERVAL_SECS", 0), \
+         patch.object(forums_sessions_management.var, "FORUM_FLOOD_INTERVAL_STEP_SECS", 1), \
+         patch.object(forums_sessions_management.var, "FORUM_FLOOD_MARGIN_SECS", 0.2):
+
+        posting_args = [(df_topics.iloc[i], f"*****message {i}", 0) for i in range(len(df_topics))]
+        multithread_run(messages_posting_process_bi.login_and_post_message_bi, posting_args)
+
+        posts = forum['topics'][df_topics['TOPIC_NUMBER'].iloc[0]][1:]
+        assert sorted(post['CONTENT'] for post in posts) == ["*****message 0", "*****message 1", "*****message 2"]
+        assert forums_sessions_management.get_forum_session('BI')['FLOOD_INTERVAL_SECS'] >= 2
@@ -3,8 +3,13 @@ This tests file concern all functions in the messages_posting_process_bi.
 It units test unexpected path
 '''
 from unittest.mock import MagicMock, patch
+import os
+import requests
 
+from src.predict_core.forums_interaction import forums_sessions_management
+from src.predict_core.forums_interaction import messages_posting_ledger
 from src.predict_core.forums_interaction.forums_interaction_bi import messages_posting_process_bi
+from tests.stand_ins.phpbb_stand_in import generate_forum, run_phpbb_stand_in
 
 def test_login_to_bi_fails():
 
@@ -58,13 +63,35 @@ def test_login_and_post_message_bi_timesout(read_csv, assert_exit):
             "BI_URL": "https://fakeforum.com"
         },
     ), \
+    patch.dict(forums_sessions_management.forums_sessions, clear=True), \
     patch.object(messages_posting_process_bi,"login_to_bi", return_value=(mock_login_successful, mock_sid)), \
-    patch.object(messages_posting_process_bi,"post_to_bi", return_value=mock_post_successful), \
+    patch.object(messages_posting_process_bi,"post_to_bi", return_value=(mock_post_successful, None)), \
     patch.object(messages_posting_process_bi.var, "TIME_MESSAGE_WAIT", 1):
 
         # Should raise SystemExit
         assert_exit(lambda: messages_posting_process_bi.login_and_post_message_bi(topic_row, message_content, is_to_edit))
 
+def test_login_and_post_message_bi_flood_wait_longer_than_period(read_csv):
+
+    # this test the function login_and_post_message_bi waiting the flood interval longer than the period to try, then failing once. The wait must not be taken from the period
+    topic_row = read_csv("q_topics_query.csv").iloc[0]
+    clock = [0.0]
+    def wait_flood_interval(forum_session):
+        clock[0] += 100
+
+    with patch.dict(os.environ, {"BI_URL": "https://fakeforum.com"}), \
+         patch.dict(forums_sessions_management.forums_sessions, clear=True), \
+         patch.object(messages_posting_process_bi, "time", MagicMock(time=lambda: clock[0], sleep=lambda secs: clock.__setitem__(0, clock[0] + secs))), \
+         patch.object(messages_posting_process_bi.forums_sessions_management, "wait_flood_interval", side_effect=wait_flood_interval), \
+         patch.object(messages_posting_process_bi, "login_to_bi", return_value=(True, "sid123")), \
+         patch.object(messages_posting_process_bi, "post_to_bi", side_effect=[(False, None), (True, None)]) as mock_post_to_bi, \
+         patch.object(messages_posting_process_bi.var, "TIME_MESSAGE_WAIT", 90):
+
+        messages_posting_process_bi.login_and_post_message_bi(topic_row, "Test message", is_to_edit = 0)
+        assert mock_post_to_bi.call_count == 2
+        # the post lock is only held to wait and post
+        assert not forums_sessions_management.get_forum_session(topic_row['FORUM_SOURCE'])['POST_LOCK'].locked()
+
 def test_post_message_bi_times_out(read_csv, assert_exit):
     # this test the function post_message_bi with timesout
     topic_row = read_csv("q_topics_query.csv").iloc[0]
@@ -80,12 +107,114 @@ def test_post_message_bi_times_out(read_csv, assert_exit):
     mock_session.get.return_value.text = fake_login_html
     mock_session.post.return_value.text = "login failed"  # This causes login failure
 
-    session_ctx = MagicMock()
-    session_ctx.__enter__.return_value = mock_session
-    session_ctx.__exit__.return_value = None
-
-    with patch("requests.Session", return_value=session_ctx), \
+    with patch("requests.Session", return_value=mock_session), \
+         patch.dict(forums_sessions_management.forums_sessions, clear=True), \
          patch("os.getenv", return_value="http://fake-forum"), \
          patch.object(messages_posting_process_bi.var, "TIME_MESSAGE_WAIT", 1):
         
         assert_exit(lambda: messages_posting_process_bi.post_edit_message_bi(topic_row, "timeout test"))
+
+def test_login_to_bi_wrong_credentials_stand_in():
+
+    # this test the function login_to_bi against the local phpBB stand-in with wrong credentials. Must return False
+    forum = generate_forum({1: 1}, username="bot", password="secret")
+
+    with run_phpbb_stand_in(forum) as forum_url, \
+         patch.dict(os.environ, {'BI_USERNAME': 'bot', 'BI_PASSWORD': 'wrong'}), \
+         requests.Session() as session:
+
+        login_successful, _ = messages_posting_process_bi.login_to_bi(session, forum_url + '/ucp.php?mode=login')
+        assert not login_successful
+
+def test_post_to_bi_flood_stand_in():
+
+    # this test the function post_to_bi against the local phpBB stand-in, posting twice within the flood interval. The second post must fail
+    forum = generate_forum({1: 1}, username="bot", password="secret", flood_interval_secs=60)
+
+    with run_phpbb_stand_in(forum) as forum_url, \
+         patch.dict(os.environ, {'BI_USERNAME': 'bot', 'BI_PASSWORD': 'secret'}), \
+         requests.Session() as session:
+
+        login_successful, sid = messages_posting_process_bi.login_to_bi(session, forum_url + '/ucp.php?mode=login')
+        assert login_successful
+        post_url = forum_url + '/posting.php?mode=reply&t=1'
+        forum_session = forums_sessions_management.create_forum_session() | {'SESSION': session, 'SID': sid, 'IS_LOGGED_IN': True}
+        assert messages_posting_process_bi.post_to_bi("*****first", forum_session, post_url, is_to_edit = 0)[0]
+        assert not messages_posting_process_bi.post_to_bi("*****second", forum_session, post_url, is_to_edit = 0)[0]
+        assert forum_session['IS_LOGGED_IN']
+        #the flood interval learned is longer than the time between the two posts
+        assert forum_session['FLOOD_INTERVAL_SECS'] > messages_posting_process_bi.var.FORUM_FLOOD_INTERVAL_SECS
+        assert [post['CONTENT'] for post in forum['topics'][1]][1:] == ["*****first"]
+
+def test_post_to_bi_session_expired():
+
+    # this test the function post_to_bi with a page showing the session expired. Must return False and mark the session to log in again
+    mock_session = MagicMock()
+    mock_session.get.return_value.text = "<form><input name=\"form_token\" value=\"token123\"></form> Connexion"
+    forum_session = forums_sessions_management.create_forum_session() | {'SESSION': mock_session, 'SID': "sid123", 'IS_LOGGED_IN': True}
+
+    assert messages_posting_process_bi.post_to_bi("fake message", forum_session, "fakeposturl", is_to_edit = 0) == (False, None)
+    assert not forum_session['IS_LOGGED_IN']
+    mock_session.post.assert_not_called()
+
+def test_post_to_bi_session_expired_already_logged_in_again():
+
+    # this test the function post_to_bi with a session expired, while another task already logged in again. The session must stay logged in
+    mock_session = MagicMock()
+    forum_session = forums_sessions_management.create_forum_session() | {'SESSION': mock_session, 'SID': "sid123", 'IS_LOGGED_IN': True}
+    def get_while_logging_in_again(*args, **kwargs):
+        forum_session['SID'] = "sid456"
+        return MagicMock(text="Connexion")
+    mock_session.get.side_effect = get_while_logging_in_again
+
+    assert messages_posting_process_bi.post_to_bi("fake message", forum_session, "fakeposturl", is_to_edit = 0) == (False, None)
+    assert forum_session['IS_LOGGED_IN']
+
+def test_login_and_post_message_bi_stand_in_session_expired(read_csv):
+
+    # this test the function login_and_post_message_bi against the local phpBB stand-in, with the session expired between two posts. Must log in again
+    topic_row = read_csv("q_topics_query.csv").iloc[0]
+    forum = generate_forum({topic_row['TOPIC_NUMBER']: 3}, username="bot", password="secret")
+
+    with run_phpbb_stand_in(forum) as forum_url, \
+         patch.dict(os.environ, {'BI_URL': forum_url, 'BI_USERNAME': 'bot', 'BI_PASSWORD': 'secret'}), \
+         patch.dict(forums_sessions_management.forums_sessions, clear=True), \
+         patch.object(forums_sessions_management.var, "FORUM_FLOOD_INTERVAL_SECS", 0):
+
+        messages_posting_process_bi.login_and_post_message_bi(topic_row, "*****first", is_to_edit = 0)
+        forum['sessions'].clear()
+        forum['autologin_keys'].clear()
+        with patch.object(messages_posting_process_bi, "login_to_bi", wraps=messages_posting_process_bi.login_to_bi) as mock_login:
+            messages_posting_process_bi.login_and_post_message_bi(topic_row, "*****second", is_to_edit = 0)
+            assert mock_login.call_count == 1
+        assert [post['CONTENT'] for post in forum['topics'][topic_row['TOPIC_NUMBER']]][-2:] == ["*****first", "*****second"]
+
+def test_login_and_post_message_bi_edit_already_online(read_csv):
+
+    # this test the function login_and_post_message_bi editing a message with the content stored in the ledger. Must not log in nor post
+    topic_row = read_csv("q_topics_query.csv").iloc[0]
+
+    with patch.dict(messages_posting_ledger.posting_ledger, clear=True), \
+         patch.object(messages_posting_process_bi,"login_to_bi") as mock_login, \
+         patch.object(messages_posting_process_bi,"post_to_bi") as mock_post:
+
+        messages_posting_ledger.open_posting_ledger(read_csv("message_posting_ledger.csv"))
+        messages_posting_process_bi.login_and_post_message_bi(topic_row, "Test message", is_to_edit = 1)
+        mock_login.assert_not_called()
+        mock_post.assert_not_called()
+
+def test_login_and_post_message_bi_dry_run(read_csv):
+
+    # this test the function login_and_post_message_bi on a dry run. Must not log in nor post
+    topic_row = read_csv("q_topics_query.csv").iloc[0]
+
+    with patch.dict(messages_posting_ledger.posting_ledger, clear=True), \
+         patch.dict(messages_posting_ledger.posting_report, clear=True), \
+         patch.object(messages_posting_ledger.var, "IS_POSTING_DRY_RUN", 1), \
+         patch.object(messages_posting_process_bi,"login_to_bi") as mock_login, \
+         patch.object(messages_posting_process_bi,"post_to_bi") as mock_post:
+
+        messages_posting_process_bi.login_and_post_message_bi(topic_row, "Test message", is_to_edit = 0)
+        mock_login.assert_not_called()
+        mock_post.assert_not_called()
+        assert list(messages_posting_ledger.posting_report.values())[0][3] == "POST"
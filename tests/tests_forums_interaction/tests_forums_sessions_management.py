@@ -0,0 +1,92 @@
+'''
+This tests file concern all functions in the forums_sessions_management module.
+It units test the happy path for each function
+'''
+
+from unittest.mock import patch
+import os
+import pandas as pd
+
+from src.predict_core.forums_interaction import forums_sessions_management
+
+def test_create_forum_session(read_csv, read_txt):
+
+    # this test the function create_forum_session with cookies stored. The expired one and the session id must not be restored
+    with patch.dict(os.environ, {'FORUM_SESSION_KEY': read_txt("forum_session_key.txt")}):
+        forum_session = forums_sessions_management.create_forum_session(read_csv("forum_session.csv"))
+
+    assert [cookie.name for cookie in forum_session['SESSION'].cookies] == ['phpbb3_k']
+    assert forum_session['SESSION'].cookies.get('phpbb3_k') == "autologinkey123"
+    assert forum_session['SID'] == ""
+    assert forum_session['IS_LOGGED_IN']
+
+def test_get_session_sid():
+
+    # this test the function get_session_sid. Must return the value of the session id cookie given by the forum
+    session = forums_sessions_management.requests.Session()
+    session.cookies.set('phpbb3_k', 'autologinkey123', domain='fakeforum.com', path='/')
+    session.cookies.set('phpbb3_sid', 'sid456', domain='fakeforum.com', path='/')
+
+    assert forums_sessions_management.get_session_sid(session) == "sid456"
+
+def test_open_forums_sessions(read_csv, read_txt):
+
+    # this test the function open_forums_sessions
+    with patch.dict(forums_sessions_management.forums_sessions, clear=True), \
+         patch.dict(os.environ, {'FORUM_SESSION_KEY': read_txt("forum_session_key.txt")}):
+
+        forums_sessions_management.open_forums_sessions(read_csv("forum_session.csv"))
+        assert list(forums_sessions_management.forums_sessions) == ['BI']
+        assert forums_sessions_management.forums_sessions['BI']['SESSION'].cookies.get('phpbb3_k') == "autologinkey123"
+
+def test_get_forum_session():
+
+    # this test the function get_forum_session. The session must be shared by all calls
+    with patch.dict(forums_sessions_management.forums_sessions, clear=True):
+
+        forum_session = forums_sessions_management.get_forum_session('BI')
+        assert forums_sessions_management.get_forum_session('BI') is forum_session
+        assert not forum_session['IS_LOGGED_IN']
+
+def test_close_forums_sessions(read_csv, read_txt):
+
+    # this test the function close_forums_sessions. Only the cookies not expired are stored, encrypted, without the session id
+    key = read_txt("forum_session_key.txt")
+    with patch.dict(forums_sessions_management.forums_sessions, clear=True), \
+         patch.dict(os.environ, {'FORUM_SESSION_KEY': key}), \
+         patch.object(forums_sessions_management, "create_csv") as mock_create_csv:
+
+        forums_sessions_management.open_forums_sessions(read_csv("forum_session.csv"))
+        session = forums_sessions_management.get_forum_session('BI')['SESSION']
+        session.cookies.set('phpbb3_tmp', 'x', domain='fakeforum.com', path='/')
+        session.cookies.set('phpbb3_sid', 'sid456', domain='fakeforum.com', path='/', expires=4102444800)
+        df_forum_session = forums_sessions_management.close_forums_sessions()
+
+        assert df_forum_session['COOKIE_NAME'].tolist() == ['phpbb3_k']
+        assert df_forum_session.loc[0, 'COOKIE_VALUE_ENCRYPTED'] != "autologinkey123"
+        assert forums_sessions_management.Fernet(key).decrypt(df_forum_session.loc[0, 'COOKIE_VALUE_ENCRYPTED'].encode()) == b"autologinkey123"
+        assert df_forum_session.columns.tolist() == read_csv("forum_session.csv").columns.tolist()
+        assert forums_sessions_management.forums_sessions == {}
+        mock_create_csv.assert_called_once()
+        assert mock_create_csv.call_args.args[0].endswith('forum_session.csv')
+
+def test_wait_flood_interval():
+
+    # this test the function wait_flood_interval, a message having just been posted. Must wait just past the flood interval
+    forum_session = forums_sessions_management.create_forum_session()
+    forums_sessions_management.record_post(forum_session)
+
+    with patch.object(forums_sessions_management.time, "sleep") as mock_sleep:
+        forums_sessions_management.wait_flood_interval(forum_session)
+        time_waited = mock_sleep.call_args.args[0]
+        flood_interval = forums_sessions_management.var.FORUM_FLOOD_INTERVAL_SECS
+        assert flood_interval < time_waited <= flood_interval + forums_sessions_management.var.FORUM_FLOOD_MARGIN_SECS
+
+def test_record_flood_error():
+
+    # this test the function record_flood_error, a message being rejected 20 seconds after the last one. The flood interval must be longer than 20 seconds
+    forum_session = forums_sessions_management.create_forum_session()
+    forum_session['LAST_POST_TIME'] = forums_sessions_management.time.time() - 20
+
+    forums_sessions_management.record_flood_error(forum_session)
+    assert forum_session['FLOOD_INTERVAL_SECS'] >= 20 + forums_sessions_management.var.FORUM_FLOOD_INTERVAL_STEP_SECS
@@ -0,0 +1,105 @@
+'''
+This tests file concern all functions in the forums_sessions_management module.
+It units test unexpected path
+'''
+
+from unittest.mock import patch
+import os
+import pandas as pd
+
+from src.predict_core.forums_interaction import forums_sessions_management
+
+def test_create_forum_session_without_cookies():
+
+    # this test the function create_forum_session without cookies stored. The session must log in
+    forum_session = forums_sessions_management.create_forum_session(pd.DataFrame(columns=forums_sessions_management.forum_session_columns))
+
+    assert len(forum_session['SESSION'].cookies) == 0
+    assert forum_session['SID'] == ""
+    assert not forum_session['IS_LOGGED_IN']
+
+def test_create_forum_session_cookies_expired(read_csv, read_txt):
+
+    # this test the function create_forum_session with all cookies expired. The session must log in
+    df_forum_cookies = read_csv("forum_session.csv")
+    df_forum_cookies['COOKIE_EXPIRES'] = 946684800
+
+    with patch.dict(os.environ, {'FORUM_SESSION_KEY': read_txt("forum_session_key.txt")}):
+        forum_session = forums_sessions_management.create_forum_session(df_forum_cookies)
+    assert not forum_session['IS_LOGGED_IN']
+
+def test_create_forum_session_without_key(read_csv):
+
+    # this test the function create_forum_session with cookies stored, without key to decrypt them. The session must log in
+    with patch.dict(os.environ):
+        os.environ.pop('FORUM_SESSION_KEY', None)
+        forum_session = forums_sessions_management.create_forum_session(read_csv("forum_session.csv"))
+    assert len(forum_session['SESSION'].cookies) == 0
+    assert not forum_session['IS_LOGGED_IN']
+
+def test_create_forum_session_other_key(read_csv):
+
+    # this test the function create_forum_session with cookies encrypted with another key. They must not be restored, the session must log in
+    with patch.dict(os.environ, {'FORUM_SESSION_KEY': forums_sessions_management.Fernet.generate_key().decode()}):
+        forum_session = forums_sessions_management.create_forum_session(read_csv("forum_session.csv"))
+    assert len(forum_session['SESSION'].cookies) == 0
+    assert not forum_session['IS_LOGGED_IN']
+
+def test_open_forums_sessions_wrong_file(assert_exit):
+
+    # this test the function open_forums_sessions with a file without FORUM_SOURCE. Must exit
+    with patch.dict(forums_sessions_management.forums_sessions, clear=True):
+        assert_exit(lambda: forums_sessions_management.open_forums_sessions(pd.DataFrame({'COOKIE_NAME': ['phpbb3_k']})))
+
+def test_close_forums_sessions_without_session():
+
+    # this test the function close_forums_sessions without any session used. The file must be created with headers only
+    with patch.dict(forums_sessions_management.forums_sessions, clear=True), \
+         patch.object(forums_sessions_management, "create_csv") as mock_create_csv:
+
+        df_forum_session = forums_sessions_management.close_forums_sessions()
+        assert df_forum_session.empty
+        assert df_forum_session.columns.tolist() == forums_sessions_management.forum_session_columns
+        mock_create_csv.assert_called_once()
+
+def test_close_forums_sessions_without_key():
+
+    # this test the function close_forums_sessions without key to encrypt the cookies. No cookie must be stored
+    with patch.dict(forums_sessions_management.forums_sessions, clear=True), \
+         patch.dict(os.environ), \
+         patch.object(forums_sessions_management, "create_csv") as mock_create_csv:
+
+        os.environ.pop('FORUM_SESSION_KEY', None)
+        forums_sessions_management.get_forum_session('BI')['SESSION'].cookies.set('phpbb3_k', 'autologinkey123', domain='fakeforum.com', path='/', expires=4102444800)
+        df_forum_session = forums_sessions_management.close_forums_sessions()
+        assert df_forum_session.empty
+        mock_create_csv.assert_called_once()
+
+def test_wait_flood_interval_without_post():
+
+    # this test the function wait_flood_interval without message posted during the run. Must not wait
+    forum_session = forums_sessions_management.create_forum_session()
+
+    with patch.object(forums_sessions_management.time, "sleep") as mock_sleep:
+        forums_sessions_management.wait_flood_interval(forum_session)
+        mock_sleep.assert_not_called()
+
+def test_record_flood_error_without_post():
+
+    # this test the function record_flood_error without message posted during the run. The interval is kept, and waited from now
+    forum_session = forums_sessions_management.create_forum_session()
+
+    forums_sessions_management.record_flood_error(forum_session)
+    assert forum_session['FLOOD_INTERVAL_SECS'] == forums_sessions_management.var.FORUM_FLOOD_INTERVAL_SECS
+    assert forum_session['LAST_POST_TIME'] > 0
+
+def test_forums_sessions_post_locks():
+
+    # this test the function get_forum_session for two forums. The posts must be serialized per forum only
+    with patch.dict(forums_sessions_management.forums_sessions, clear=True):
+
+        forum_session_bi = forums_sessions_management.get_forum_session('BI')
+        forum_session_other = forums_sessions_management.get_forum_session('OTHER')
+        with forum_session_bi['POST_LOCK']:
+            assert forum_session_other['POST_LOCK'].acquire(blocking=False)
+            forum_session_other['POST_LOCK'].release()
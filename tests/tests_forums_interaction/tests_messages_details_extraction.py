@@ -3,11 +3,17 @@ This tests file concern all functions in the messages_details_extraction module.
 It units test the happy path for each function
 '''
 
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
 from unittest.mock import MagicMock, patch
 from pandas.testing import assert_frame_equal
+import asyncio
+import os
 import pandas as pd
 
+from src.predict_core.files_manipulation.local_files_manipulation import files_manipulation
 from src.predict_core.forums_interaction import messages_details_extraction
+from tests.stand_ins.phpbb_stand_in import generate_forum, run_phpbb_stand_in
 
 def test_extract_messages_from_topic(read_csv):
     
@@ -17,37 +23,284 @@ def test_extract_messages_from_topic(read_csv):
     ts_message_extract_max_utc = pd.Timestamp('2025-02-04 22:30:00')
 
     mock_response = MagicMock()
-    mock_response.read.return_value = b"<html></html>"
+    mock_response.content = b"<html></html>"
     mock_df = read_csv("message_check.csv")
-    with patch.object(messages_details_extraction.urllib,'urlopen') as mock_urlopen, \
+    with patch.object(messages_details_extraction.config_http_transport,'send_request') as mock_send_request, \
          patch.dict(messages_details_extraction.messages_info_functions, {'BI': MagicMock()}):
         
-        mock_urlopen.return_value = mock_response
+        mock_send_request.return_value = mock_response
         messages_details_extraction.messages_info_functions['BI'].return_value = mock_df
 
-        result = messages_details_extraction.extract_messages_from_topic(topic_row,ts_message_extract_min_utc,ts_message_extract_max_utc)
-        assert_frame_equal(result.reset_index(drop=True), mock_df.iloc[[1]].reset_index(drop=True))
+        result, topic_state = messages_details_extraction.extract_messages_from_topic(topic_row,ts_message_extract_min_utc,ts_message_extract_max_utc)
+        assert_frame_equal(result, mock_df.iloc[[1]].reset_index(drop=True).astype(messages_details_extraction.messages_dtypes))
+        assert "start=0" in mock_send_request.call_args_list[0].args[1]
+        assert topic_state['WINDOW_MIN_TS_UTC'] == ts_message_extract_min_utc
+        assert topic_state['WINDOW_PAGE_START'] == 0
+        assert topic_state['WINDOW_MESSAGE_FORUM_ID'] == 38618
+        assert topic_state['LAST_PAGE_START'] == 0
+        assert topic_state['LAST_MESSAGE_FORUM_ID'] == 38618
+
+def test_extract_messages_from_topic_resumed(read_csv):
+    
+    # this test the function extract_messages_from_topic resuming from the state of a previous crawl, minus the look-back window
+    topic_row = next(read_csv("q_topics_query.csv").itertuples(index=False))
+    sr_topic_state = read_csv("message_topic_state.csv").iloc[0]
+    ts_message_extract_min_utc = pd.Timestamp('2025-02-04 21:00:00')
+    ts_message_extract_max_utc = pd.Timestamp('2025-02-04 22:30:00')
+
+    mock_response = MagicMock()
+    mock_response.content = b"<html></html>"
+    mock_df = read_csv("message_check.csv")
+    with patch.object(messages_details_extraction.config_http_transport,'send_request') as mock_send_request, \
+         patch.object(messages_details_extraction.var,'MESSAGE_CRAWL_LOOKBACK_MESSAGES', 30), \
+         patch.object(messages_details_extraction.var,'IS_MESSAGE_FEED_DETECTION', 0), \
+         patch.dict(messages_details_extraction.messages_info_functions, {'BI': MagicMock()}):
+        
+        mock_send_request.return_value = mock_response
+        messages_details_extraction.messages_info_functions['BI'].return_value = mock_df
+
+        result, topic_state = messages_details_extraction.extract_messages_from_topic(topic_row,ts_message_extract_min_utc,ts_message_extract_max_utc,sr_topic_state)
+        assert_frame_equal(result, mock_df.iloc[[1]].reset_index(drop=True).astype(messages_details_extraction.messages_dtypes))
+        assert "start=15" in mock_send_request.call_args_list[0].args[1]
+        assert topic_state['WINDOW_PAGE_START'] == 15
+        assert topic_state['LAST_PAGE_START'] == 15
+
+def test_extract_messages_from_topic_feed(read_csv):
+    
+    # this test the function extract_messages_from_topic with a topic state and a feed covering the time range. Must extract only the pages of changed messages
+    topic_row = next(read_csv("q_topics_query.csv").itertuples(index=False))
+    sr_topic_state = read_csv("message_topic_state.csv").iloc[0]
+    ts_message_extract_min_utc = pd.Timestamp('2025-02-04 21:00:00')
+    ts_message_extract_max_utc = pd.Timestamp('2025-02-04 22:30:00')
+
+    mock_response = MagicMock(content=b"<html></html>")
+    mock_df = read_csv("message_check.csv")
+    mock_df['MESSAGE_FORUM_ID'] = range(38618, 38618 + len(mock_df))
+    with patch.dict(messages_details_extraction.os.environ, {'BI_URL': 'https://forum.test'}), \
+         patch.object(messages_details_extraction,'get_changed_message_ids_from_feed', return_value=[38618, 38619]), \
+         patch.object(messages_details_extraction.config_http_transport,'send_request', return_value=mock_response) as mock_send_request, \
+         patch.object(messages_details_extraction.var,'IS_MESSAGE_FEED_DETECTION', 1), \
+         patch.dict(messages_details_extraction.messages_info_functions, {'BI': MagicMock(return_value=mock_df)}):
+
+        result, topic_state = messages_details_extraction.extract_messages_from_topic(topic_row,ts_message_extract_min_utc,ts_message_extract_max_utc,sr_topic_state)
+        # the page of the message 38618 has the message 38619 too
+        assert [call.args[1] for call in mock_send_request.call_args_list] == ["https://forum.test/viewtopic.php?p=38618"]
+        # the page is asked from a message, its offset is not known
+        assert messages_details_extraction.messages_info_functions['BI'].call_args.args[2] is None
+        assert_frame_equal(result, mock_df.iloc[[1]].reset_index(drop=True).astype(messages_details_extraction.messages_dtypes))
+        assert topic_state['WINDOW_PAGE_START'] == 45
+        assert topic_state['LAST_MESSAGE_FORUM_ID'] == 38650
+
+def test_get_changed_message_ids_from_feed(read_csv, materials_dir):
+
+    # this test the function get_changed_message_ids_from_feed. Must return the messages created or edited since the min of the time range
+    topic_row = next(read_csv("q_topics_query.csv").itertuples(index=False))
+    with open(materials_dir / "bi_topic_feed.xml", 'rb') as file:
+        mock_response = MagicMock(content=file.read())
+
+    with patch.object(messages_details_extraction.config_http_transport,'send_request', return_value=mock_response) as mock_send_request:
+
+        lst_changed_ids = asyncio.run(messages_details_extraction.get_changed_message_ids_from_feed(topic_row, 'https://forum.test', pd.Timestamp('2025-02-04 21:00:00')))
+        assert mock_send_request.call_args.args[1] == 'https://forum.test/app.php/feed/topic/1'
+        assert lst_changed_ids == [38619, 38620]
+
+def test_extract_messages_from_topic_prefetched(read_csv):
+    
+    # this test the function extract_messages_from_topic on a topic of 3 pages: next pages are prefetched, then processed in order
+    topic_row = next(read_csv("q_topics_query.csv").itertuples(index=False))
+    ts_message_extract_min_utc = pd.Timestamp('2025-02-04 21:00:00')
+    ts_message_extract_max_utc = pd.Timestamp('2025-02-04 22:30:00')
+
+    # the forum shows the last page when the offset is after the last message
+    def mock_get_messages_infos(messagetext, topic_row, start):
+        page_start = min(start, 30)
+        return pd.DataFrame({
+            'FORUM_SOURCE': 'BI', 'TOPIC_NUMBER': 1, 'USER': 'user',
+            'MESSAGE_FORUM_ID': range(page_start, page_start + 15),
+            'CREATION_TIME_LOCAL': '2025-02-04 22:04:00', 'EDITION_TIME_LOCAL': None, 'MESSAGE_CONTENT': 'abc'
+        })
+
+    mock_response = MagicMock()
+    mock_response.content = b"<html></html>"
+    with patch.object(messages_details_extraction.config_http_transport,'send_request', return_value=mock_response) as mock_send_request, \
+         patch.dict(messages_details_extraction.messages_info_functions, {'BI': mock_get_messages_infos}), \
+         patch.dict(messages_details_extraction.pagination_info_functions, {'BI': MagicMock(return_value=(45, 15))}):
+
+        result, topic_state = messages_details_extraction.extract_messages_from_topic(topic_row,ts_message_extract_min_utc,ts_message_extract_max_utc)
+        urls = [call.args[1] for call in mock_send_request.call_args_list]
+        assert "start=0" in urls[0]
+        assert sorted(url.split("start=")[1] for url in urls[1:3]) == ["15", "30"]
+        assert "start=45" in urls[3]
+        assert len(urls) == 4
+        assert result['MESSAGE_FORUM_ID'].tolist() == list(range(45))
+        assert topic_state['LAST_PAGE_START'] == 30
+
+def test_extract_messages_from_topic_page_cache(read_csv):
+
+    # this test the function extract_messages_from_topic with a page cache. The messages parsed must be stored with the page
+    topic_row = next(read_csv("q_topics_query.csv").itertuples(index=False))
+    ts_message_extract_min_utc = pd.Timestamp('2025-02-04 21:00:00')
+    ts_message_extract_max_utc = pd.Timestamp('2025-02-04 22:30:00')
+    page_cache = {}
+
+    mock_response = MagicMock(status_code=200, headers={'ETag': '"def"'}, content=b"<html></html>")
+    mock_df = read_csv("message_check.csv")
+    with patch.dict(messages_details_extraction.os.environ, {'BI_URL': 'https://forum.test'}), \
+         patch.object(messages_details_extraction.config_http_transport,'send_request', return_value=mock_response), \
+         patch.dict(messages_details_extraction.messages_info_functions, {'BI': MagicMock(return_value=mock_df)}):
+
+        messages_details_extraction.extract_messages_from_topic(topic_row,ts_message_extract_min_utc,ts_message_extract_max_utc,None,page_cache)
+        cached_page = page_cache['https://forum.test/viewtopic.php?t=1&start=0']
+        assert cached_page['ETAG'] == '"def"'
+        assert files_manipulation.decompress_text(cached_page['PAGE_HTML_GZIP']) == "<html></html>"
+        df_records = pd.read_json(StringIO(files_manipulation.decompress_text(cached_page['PAGE_RECORDS_GZIP'])), orient='table')
+        assert_frame_equal(df_records, mock_df)
+
+def test_fetch_topic_page_not_modified(read_csv):
+
+    # this test the function fetch_topic_page with a page not modified since cached. The messages parsed last time must be reused
+    topic_row = next(read_csv("q_topics_query.csv").itertuples(index=False))
+    page_cache = {row['URL']: row.to_dict() for _, row in read_csv("message_page_cache.csv").iterrows()}
+    mock_response = MagicMock(status_code=304, headers={}, content=b"")
+
+    with patch.object(messages_details_extraction.config_http_transport,'send_request', return_value=mock_response) as mock_send_request:
+
+        messagetext, df = asyncio.run(messages_details_extraction.fetch_topic_page(topic_row, 'https://forum.test', 0, page_cache))
+        assert mock_send_request.call_args.kwargs['headers'] == {'If-None-Match': '"abc"'}
+        assert messagetext == "<html></html>"
+        assert_frame_equal(df, read_csv("message_check.csv"))
+        assert page_cache['https://forum.test/viewtopic.php?t=1&start=0']['ETAG'] == '"abc"'
+
+def test_fetch_topic_page_same_messages(read_csv):
+
+    # this test the function fetch_topic_page with a page downloaded again having the same messages. The messages parsed last time must be reused
+    topic_row = next(read_csv("q_topics_query.csv").itertuples(index=False))
+    page_cache = {row['URL']: row.to_dict() for _, row in read_csv("message_page_cache.csv").iterrows()}
+    mock_response = MagicMock(status_code=200, headers={'ETag': '"new"'}, content=b"<html></html>")
+
+    with patch.object(messages_details_extraction.config_http_transport,'send_request', return_value=mock_response):
+
+        messagetext, df = asyncio.run(messages_details_extraction.fetch_topic_page(topic_row, 'https://forum.test', 0, page_cache))
+        assert messagetext == "<html></html>"
+        assert_frame_equal(df, read_csv("message_check.csv"))
+        assert page_cache['https://forum.test/viewtopic.php?t=1&start=0']['ETAG'] == '"new"'
 
 def test_extract_messages(read_yml_as_serie, read_csv):
 
-    # this test the function extract_messages
+    # this test the function extract_messages on a check, resuming the crawls from the state of the topics
     sr_snowflake_account_connect = read_yml_as_serie("snowflake_account_connect.yml")
-    sr_output_need = read_csv("output_need_calculate.csv").iloc[0]
+    sr_output_need = read_csv("output_need_check.csv").iloc[0]
 
     mock_topics_scope_id = read_csv("q_topics_query.csv")
     mock_ts_message_extract_min_utc = pd.Timestamp('2025-02-04 21:00:00')
     mock_ts_message_extract_max_utc = pd.Timestamp('2025-02-04 22:30:00')
     mock_results = read_csv("message_check.csv")
+    df_message_topic_state = read_csv("message_topic_state.csv")
+    df_message_page_cache = read_csv("message_page_cache.csv")
+    mock_topic_state = {'FORUM_SOURCE': 'BI', 'TOPIC_NUMBER': 1, 'WINDOW_MIN_TS_UTC': mock_ts_message_extract_min_utc,
+                        'WINDOW_PAGE_START': 60, 'WINDOW_MESSAGE_FORUM_ID': 38650, 'LAST_PAGE_START': 75, 'LAST_MESSAGE_FORUM_ID': 38700}
+
+    # the crawl uses the first page of the topic 1 only
+    def mock_crawl(messages_args):
+        page_cache = messages_args[0][4]
+        page_cache['https://forum.test/viewtopic.php?t=1&start=0']['LAST_USED_TS_UTC'] = pd.Timestamp.utcnow().tz_localize(None).strftime("%Y-%m-%d %H:%M:%S")
+        messages_columns = messages_details_extraction.create_messages_columns()
+        messages_details_extraction.append_messages_columns(messages_columns, mock_results)
+        return [(messages_columns, mock_topic_state)]
 
     with patch.object(messages_details_extraction,'get_list_topics_from_need', return_value=mock_topics_scope_id), \
          patch.object(messages_details_extraction,'get_extraction_time_range', return_value=(mock_ts_message_extract_min_utc,mock_ts_message_extract_max_utc)), \
-         patch.object(messages_details_extraction,'multithread_run', return_value=[mock_results]), \
-         patch.object(messages_details_extraction,'create_csv'):
+         patch.object(messages_details_extraction,'crawl_topics', side_effect=mock_crawl) as mock_crawl_topics, \
+         patch.object(messages_details_extraction,'create_csv'), \
+         patch.object(messages_details_extraction.var,'IS_TOPIC_SKIP_ON_CHECK', 0):
 
-        df_messages, ts_message_extract_max_utc = messages_details_extraction.extract_messages(sr_snowflake_account_connect, sr_output_need)
-        assert_frame_equal(df_messages.reset_index(drop=True), mock_results.reset_index(drop=True))
+        df_messages, ts_message_extract_max_utc, df_message_topic_state_updated, df_message_page_cache_updated = \
+            messages_details_extraction.extract_messages(sr_snowflake_account_connect, sr_output_need, df_message_topic_state, df_message_page_cache)
+        assert_frame_equal(df_messages, mock_results.astype(messages_details_extraction.messages_dtypes))
         assert ts_message_extract_max_utc == mock_ts_message_extract_max_utc
 
+        # the state of the first topic is sent to its crawl, the second topic has no state
+        messages_args = mock_crawl_topics.call_args.args[0]
+        assert messages_args[0][3]['WINDOW_PAGE_START'] == 45
+        assert messages_args[1][3] is None
+
+        # the state of the crawled topic is replaced, the other one is kept
+        assert len(df_message_topic_state_updated) == 2
+        assert df_message_topic_state_updated.loc[df_message_topic_state_updated['TOPIC_NUMBER'] == 1, 'WINDOW_PAGE_START'].iloc[0] == 60
+        assert df_message_topic_state_updated.loc[df_message_topic_state_updated['TOPIC_NUMBER'] == 2, 'WINDOW_PAGE_START'].iloc[0] == 0
+
+        # the page cache is shared by all topics, and pages not used for a long time are removed
+        assert messages_args[0][4] is messages_args[1][4]
+        assert df_message_page_cache_updated['URL'].tolist() == ['https://forum.test/viewtopic.php?t=1&start=0']
+
+def test_extract_messages_run_full_crawl(read_yml_as_serie, read_csv):
+
+    # this test the function extract_messages on a run, against the local phpBB stand-in. 
+    # All topics must be crawled from their first message: a message edited before the page resumed by checks must be extracted
+    topics_scope_id = read_csv("q_topics_query.csv").iloc[[0]]
+    topic_row = next(topics_scope_id.itertuples(index=False))
+    forum = generate_forum({topic_row.TOPIC_NUMBER: 100}, edit_every=0)
+    df_message_page_cache = read_csv("message_page_cache.csv").iloc[0:0]
+
+    with run_phpbb_stand_in(forum) as forum_url, patch.dict(os.environ, {'BI_URL': forum_url}), \
+         patch.object(messages_details_extraction,'get_list_topics_from_need', return_value=topics_scope_id), \
+         patch.object(messages_details_extraction,'create_csv'), \
+         patch.object(messages_details_extraction.var,'IS_TOPIC_SKIP_ON_CHECK', 0), \
+         patch.object(messages_details_extraction.var,'IS_MESSAGE_FEED_DETECTION', 0):
+
+        # a first crawl stores the page of the messages created after 20:30 UTC (21:30 local time)
+        _, topic_state = messages_details_extraction.extract_messages_from_topic(topic_row, pd.Timestamp('2025-02-04 20:30:00'), pd.Timestamp('2025-02-04 21:00:00'))
+        df_message_topic_state = pd.DataFrame([topic_state])
+        assert topic_state['WINDOW_PAGE_START'] == 90
+
+        # the second message is edited later
+        forum['posts'][2]['EDITED'] = pd.Timestamp('2025-02-05 10:00:00').to_pydatetime()
+        ts_time_range = (pd.Timestamp('2025-02-05 08:00:00'), pd.Timestamp('2025-02-05 12:00:00'))
+
+        with patch.object(messages_details_extraction,'get_extraction_time_range', return_value=ts_time_range):
+            df_messages_check, _, _, _ = messages_details_extraction.extract_messages(None, read_csv("output_need_check.csv").iloc[0], 
+                                                                                     df_message_topic_state, df_message_page_cache)
+            df_messages_run, _, df_message_topic_state_updated, _ = messages_details_extraction.extract_messages(None, read_csv("output_need_calculate.csv").iloc[0], 
+                                                                                                                 df_message_topic_state, df_message_page_cache)
+        assert df_messages_check.empty
+        assert df_messages_run['MESSAGE_FORUM_ID'].tolist() == [2]
+        assert df_message_topic_state_updated['LAST_MESSAGE_FORUM_ID'].tolist() == [100]
+
+def test_extract_messages_check_skipped_topics(read_yml_as_serie, read_csv):
+
+    # this test the function extract_messages on a check. Topics without new message must not be crawled
+    sr_snowflake_account_connect = read_yml_as_serie("snowflake_account_connect.yml")
+    sr_output_need = read_csv("output_need_check.csv").iloc[0]
+    mock_topics_scope_id = read_csv("q_topics_query.csv")
+
+    with patch.object(messages_details_extraction,'get_list_topics_from_need', return_value=mock_topics_scope_id), \
+         patch.object(messages_details_extraction,'get_extraction_time_range', return_value=(pd.Timestamp('2025-02-04 21:00:00'),pd.Timestamp('2025-02-04 22:30:00'))), \
+         patch.object(messages_details_extraction,'filter_active_topics', return_value=mock_topics_scope_id.iloc[[1]]) as mock_filter_active_topics, \
+         patch.object(messages_details_extraction,'crawl_topics', return_value=[]) as mock_crawl_topics, \
+         patch.object(messages_details_extraction,'create_csv'), \
+         patch.object(messages_details_extraction.var,'IS_TOPIC_SKIP_ON_CHECK', 1):
+
+        df_messages, _, df_message_topic_state_updated, _ = messages_details_extraction.extract_messages(sr_snowflake_account_connect, sr_output_need, 
+                                                                    read_csv("message_topic_state.csv"), read_csv("message_page_cache.csv"))
+        mock_filter_active_topics.assert_called_once()
+        assert [args[0].FORUM_SOURCE for args in mock_crawl_topics.call_args.args[0]] == ['II']
+        assert df_messages.empty
+        assert_frame_equal(df_message_topic_state_updated, read_csv("message_topic_state.csv"))
+
+def test_filter_active_topics(read_csv, materials_dir):
+
+    # this test the function filter_active_topics. Topic listed without new message must be removed, forum without feed function kept
+    topics_scope_id = read_csv("q_topics_query.csv")
+    with open(materials_dir / "bi_topics_active_feed.xml", 'rb') as file:
+        mock_response = MagicMock(content=file.read())
+
+    with patch.dict(messages_details_extraction.os.environ, {'BI_URL': 'https://forum.test'}), \
+         patch.object(messages_details_extraction.config_http_transport,'send_request', return_value=mock_response) as mock_send_request:
+
+        result = messages_details_extraction.filter_active_topics(topics_scope_id, pd.Timestamp('2025-02-04 21:00:00'))
+        assert mock_send_request.call_args.args[1] == 'https://forum.test/app.php/feed/topics_active'
+        assert result['FORUM_SOURCE'].tolist() == ['II']
+
 def test_get_list_topics_from_need(read_yml_as_serie, read_csv):
     
     # this test the function get_list_topics_from_need
@@ -60,6 +313,17 @@ def test_get_list_topics_from_need(read_yml_as_serie, read_csv):
         df_topics = messages_details_extraction.get_list_topics_from_need(sr_snowflake_account_connect, sr_output_need)
         assert_frame_equal(df_topics.reset_index(drop=True), mock_topics_scope_list.reset_index(drop=True))
 
+def test_is_topic_skip_applied(read_csv):
+    
+    # this test the function is_topic_skip_applied. Topics must be skipped on checks only, if asked
+    sr_output_need_check = read_csv("output_need_check.csv").iloc[0]
+    sr_output_need_run = read_csv("output_need_calculate.csv").iloc[0]
+    with patch.object(messages_details_extraction.var,'IS_TOPIC_SKIP_ON_CHECK', 1):
+        assert messages_details_extraction.is_topic_skip_applied(sr_output_need_check)
+        assert not messages_details_extraction.is_topic_skip_applied(sr_output_need_run)
+    with patch.object(messages_details_extraction.var,'IS_TOPIC_SKIP_ON_CHECK', 0):
+        assert not messages_details_extraction.is_topic_skip_applied(sr_output_need_check)
+
 def test_get_extraction_time_range(read_yml_as_serie, read_csv):
     
     # this test the function get_extraction_time_range
@@ -70,4 +334,73 @@ def test_get_extraction_time_range(read_yml_as_serie, read_csv):
     with patch.object(messages_details_extraction,'snowflake_execute', return_value = mock_df_time_max):
         min_ts, max_ts = messages_details_extraction.get_extraction_time_range(sr_snowflake_account_connect, sr_output_need)
         assert min_ts == pd.Timestamp('2025-06-14 15:00:00')
-        assert max_ts == pd.Timestamp('2025-10-31 18:30:00')
\ No newline at end of file
+        assert max_ts == pd.Timestamp('2025-10-31 18:30:00')
+def test_crawl_topics(read_csv):
+
+    # this test the function crawl_topics. The crawls of all topics must run on the same event loop, results in the order of topics
+    topics = list(read_csv("q_topics_query.csv").itertuples(index=False))
+    loops = []
+    async def mock_crawl_topic(topic_row, *args, parsing_executor=None):
+        loops.append((asyncio.get_running_loop(), parsing_executor))
+        #the first topic finishes last
+        await asyncio.sleep(0.01 if topic_row is topics[0] else 0)
+        return None, {'TOPIC_NUMBER': topic_row.TOPIC_NUMBER}
+
+    with patch.object(messages_details_extraction,'crawl_topic', side_effect=mock_crawl_topic), \
+         patch.object(messages_details_extraction.os,'cpu_count', return_value=4):
+
+        results = asyncio.run(messages_details_extraction.crawl_topics([(topic_row, None, None, None, None) for topic_row in topics]))
+        assert [topic_state['TOPIC_NUMBER'] for _, topic_state in results] == [topic_row.TOPIC_NUMBER for topic_row in topics]
+        # the crawls share the event loop and the pool parsing the pages
+        assert len(loops) == len(topics) and len(set(loops)) == 1
+        assert loops[0][1] is not None
+
+def test_parse_messages_page(read_csv, read_txt):
+
+    # this test the function parse_messages_page with a parsing pool. The messages parsed as columns must give the same dataframe as the forum function
+    topic_row = next(read_csv("q_topics_query.csv").itertuples(index=False))
+    messagetext = read_txt("bi_message_html.txt")
+    expected_df = messages_details_extraction.messages_info_functions['BI'](messagetext, topic_row, 0)
+
+    # a pool of threads stands for the pool of processes, it is used the same way
+    with ThreadPoolExecutor(max_workers=1) as parsing_executor:
+        df = asyncio.run(messages_details_extraction.parse_messages_page(messagetext, topic_row, 0, parsing_executor))
+    assert_frame_equal(df, expected_df)
+
+def test_parse_messages_page_columns(read_csv, read_txt):
+
+    # this test the function parse_messages_page_columns. Each column of messages must be an array
+    sr_topic = read_csv("q_topics_query.csv").iloc[0]
+    columns = messages_details_extraction.parse_messages_page_columns(read_txt("bi_message_html.txt"), sr_topic, 0)
+    assert list(columns) == ['FORUM_SOURCE','TOPIC_NUMBER','USER','MESSAGE_FORUM_ID','CREATION_TIME_LOCAL','EDITION_TIME_LOCAL','MESSAGE_CONTENT']
+    assert len(columns['MESSAGE_FORUM_ID']) == 15
+    assert columns['MESSAGE_FORUM_ID'].dtype == 'int64'
+
+def test_build_messages_dataframe(read_csv):
+
+    # this test the functions create_messages_columns, append_messages_columns and build_messages_dataframe on messages of two pages
+    df_page = read_csv("message_check.csv")
+    messages_columns = messages_details_extraction.create_messages_columns()
+    messages_details_extraction.append_messages_columns(messages_columns, df_page.iloc[:2])
+    messages_details_extraction.append_messages_columns(messages_columns, df_page.iloc[2:])
+
+    df_messages = messages_details_extraction.build_messages_dataframe(messages_columns)
+    assert_frame_equal(df_messages, df_page.astype(messages_details_extraction.messages_dtypes))
+    assert df_messages['USER'].dtype == 'category'
+    assert df_messages['MESSAGE_FORUM_ID'].dtype == 'int64'
+    assert df_messages['CREATION_TIME_LOCAL'].dtype == 'datetime64[ns]'
+
+def test_extract_messages_from_topic_stand_in(read_csv):
+
+    # this test the function extract_messages_from_topic against the local phpBB stand-in, on a topic of 100 messages with edits, quotes and 7 pages
+    topic_row = next(read_csv("q_topics_query.csv").itertuples(index=False))
+    forum = generate_forum({topic_row.TOPIC_NUMBER: 100}, edit_every=10, quote_every=5)
+
+    with run_phpbb_stand_in(forum) as forum_url, patch.dict(os.environ, {'BI_URL': forum_url}):
+
+        result, topic_state = messages_details_extraction.extract_messages_from_topic(topic_row, pd.Timestamp('2025-02-04 19:00:00'), pd.Timestamp('2025-02-05 12:00:00'))
+        assert result['MESSAGE_FORUM_ID'].tolist() == list(range(1, 101))
+        assert result['EDITION_TIME_LOCAL'].notna().sum() == 10
+        assert result.loc[5, 'MESSAGE_CONTENT'].count('<blockquote>') == 1
+        assert topic_state['LAST_PAGE_START'] == 90
+        assert topic_state['LAST_MESSAGE_FORUM_ID'] == 100
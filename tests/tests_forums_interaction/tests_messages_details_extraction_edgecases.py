@@ -2,9 +2,14 @@
 This tests file concern all functions in the messages_details_extraction module.
 It units test unhappy paths
 '''
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
+import pytest
 from unittest.mock import MagicMock, patch
+from pandas.testing import assert_frame_equal
 
+from src.predict_core.files_manipulation.local_files_manipulation import files_manipulation
 from src.predict_core.forums_interaction import messages_details_extraction
 
 def test_extract_messages_from_topic_invalid_timezone(read_csv,assert_exit):
@@ -15,12 +20,12 @@ def test_extract_messages_from_topic_invalid_timezone(read_csv,assert_exit):
     ts_message_extract_max_utc = pd.Timestamp('2025-02-04 22:30:00')
 
     mock_response = MagicMock()
-    mock_response.read.return_value = b"<html></html>"
+    mock_response.content = b"<html></html>"
     mock_df = read_csv("message_check.csv")
-    with patch.object(messages_details_extraction.urllib,'urlopen') as mock_urlopen, \
+    with patch.object(messages_details_extraction.config_http_transport,'send_request') as mock_send_request, \
          patch.dict(messages_details_extraction.messages_info_functions, {'BI': MagicMock()}):
         
-        mock_urlopen.return_value = mock_response
+        mock_send_request.return_value = mock_response
         messages_details_extraction.messages_info_functions['BI'].return_value = mock_df
 
         assert_exit(lambda: messages_details_extraction.extract_messages_from_topic(topic_row,ts_message_extract_min_utc,ts_message_extract_max_utc))
@@ -33,17 +38,176 @@ def test_extract_messages_from_topic_with_unmatching_timestamp(read_csv):
     ts_message_extract_max_utc = pd.Timestamp('3025-02-04 22:30:00')
 
     mock_response = MagicMock()
-    mock_response.read.return_value = b"<html></html>"
+    mock_response.content = b"<html></html>"
     mock_df = read_csv("message_check.csv")
-    with patch.object(messages_details_extraction.urllib,'urlopen') as mock_urlopen, \
+    with patch.object(messages_details_extraction.config_http_transport,'send_request') as mock_send_request, \
          patch.dict(messages_details_extraction.messages_info_functions, {'BI': MagicMock()}):
         
-        mock_urlopen.return_value = mock_response
+        mock_send_request.return_value = mock_response
         messages_details_extraction.messages_info_functions['BI'].return_value = mock_df
 
-        result = messages_details_extraction.extract_messages_from_topic(topic_row,ts_message_extract_min_utc,ts_message_extract_max_utc)
+        result, _ = messages_details_extraction.extract_messages_from_topic(topic_row,ts_message_extract_min_utc,ts_message_extract_max_utc)
         assert result is None
 
+def test_extract_messages_from_topic_state_newer_than_range(read_csv):
+    
+    # this test the function extract_messages_from_topic with a topic state looking for messages after the time range. Must crawl from the beginning
+    topic_row = next(read_csv("q_topics_query.csv").itertuples(index=False))
+    sr_topic_state = read_csv("message_topic_state.csv").iloc[0]
+    ts_message_extract_min_utc = pd.Timestamp('2025-02-04 20:00:00')
+    ts_message_extract_max_utc = pd.Timestamp('2025-02-04 22:30:00')
+
+    mock_response = MagicMock()
+    mock_response.content = b"<html></html>"
+    mock_df = read_csv("message_check.csv")
+    with patch.object(messages_details_extraction.config_http_transport,'send_request') as mock_send_request, \
+         patch.dict(messages_details_extraction.messages_info_functions, {'BI': MagicMock()}):
+        
+        mock_send_request.return_value = mock_response
+        messages_details_extraction.messages_info_functions['BI'].return_value = mock_df
+
+        _, topic_state = messages_details_extraction.extract_messages_from_topic(topic_row,ts_message_extract_min_utc,ts_message_extract_max_utc,sr_topic_state)
+        assert "start=0" in mock_send_request.call_args_list[0].args[1]
+        assert topic_state['WINDOW_MIN_TS_UTC'] == ts_message_extract_min_utc
+
+def test_extract_messages_from_topic_resumed_too_far(read_csv):
+    
+    # this test the function extract_messages_from_topic resuming after the page stored (messages deleted). Must restart from the beginning
+    topic_row = next(read_csv("q_topics_query.csv").itertuples(index=False))
+    sr_topic_state = read_csv("message_topic_state.csv").iloc[0].copy()
+    sr_topic_state['WINDOW_MESSAGE_FORUM_ID'] = 100
+    ts_message_extract_min_utc = pd.Timestamp('2025-02-04 21:00:00')
+    ts_message_extract_max_utc = pd.Timestamp('2025-02-04 22:30:00')
+
+    mock_response = MagicMock()
+    mock_response.content = b"<html></html>"
+    mock_df = read_csv("message_check.csv")
+    with patch.object(messages_details_extraction.config_http_transport,'send_request') as mock_send_request, \
+         patch.object(messages_details_extraction.var,'MESSAGE_CRAWL_LOOKBACK_MESSAGES', 30), \
+         patch.object(messages_details_extraction.var,'IS_MESSAGE_FEED_DETECTION', 0), \
+         patch.dict(messages_details_extraction.messages_info_functions, {'BI': MagicMock()}):
+        
+        mock_send_request.return_value = mock_response
+        messages_details_extraction.messages_info_functions['BI'].return_value = mock_df
+
+        result, topic_state = messages_details_extraction.extract_messages_from_topic(topic_row,ts_message_extract_min_utc,ts_message_extract_max_utc,sr_topic_state)
+        assert "start=15" in mock_send_request.call_args_list[0].args[1]
+        assert "start=0" in mock_send_request.call_args_list[1].args[1]
+        assert len(result) == 1
+        assert topic_state['WINDOW_PAGE_START'] == 0
+
+def test_extract_messages_from_topic_feed_unavailable(read_csv):
+    
+    # this test the function extract_messages_from_topic with a topic state and no feed available. Must crawl the topic from its first message
+    topic_row = next(read_csv("q_topics_query.csv").itertuples(index=False))
+    sr_topic_state = read_csv("message_topic_state.csv").iloc[0]
+    ts_message_extract_min_utc = pd.Timestamp('2025-02-04 21:00:00')
+    ts_message_extract_max_utc = pd.Timestamp('2025-02-04 22:30:00')
+
+    mock_response = MagicMock(content=b"<html></html>")
+    mock_df = read_csv("message_check.csv")
+    with patch.object(messages_details_extraction.config_http_transport,'send_request', return_value=mock_response) as mock_send_request, \
+         patch.object(messages_details_extraction.var,'IS_MESSAGE_FEED_DETECTION', 1), \
+         patch.object(messages_details_extraction.var,'MESSAGE_CRAWL_LOOKBACK_MESSAGES', 30), \
+         patch.dict(messages_details_extraction.messages_info_functions, {'BI': MagicMock(return_value=mock_df)}):
+
+        result, topic_state = messages_details_extraction.extract_messages_from_topic(topic_row,ts_message_extract_min_utc,ts_message_extract_max_utc,sr_topic_state)
+        assert "/app.php/feed/topic/1" in mock_send_request.call_args_list[0].args[1]
+        assert "start=0" in mock_send_request.call_args_list[1].args[1]
+        assert len(result) == 1
+        assert topic_state['WINDOW_PAGE_START'] == 0
+
+def test_get_changed_message_ids_from_feed_too_short(read_csv, materials_dir):
+
+    # this test the function get_changed_message_ids_from_feed with a feed beginning after the min of the time range. Must return None
+    topic_row = next(read_csv("q_topics_query.csv").itertuples(index=False))
+    with open(materials_dir / "bi_topic_feed.xml", 'rb') as file:
+        mock_response = MagicMock(content=file.read())
+
+    with patch.object(messages_details_extraction.config_http_transport,'send_request', return_value=mock_response):
+
+        assert asyncio.run(messages_details_extraction.get_changed_message_ids_from_feed(topic_row, 'https://forum.test', pd.Timestamp('2025-02-03 18:00:00'))) is None
+
+def test_get_changed_message_ids_from_feed_no_feed(read_csv):
+
+    # this test the function get_changed_message_ids_from_feed on a forum without feed. Must return None without request
+    topic_row = next(read_csv("q_topics_query.csv").itertuples(index=False))._replace(FORUM_SOURCE='II')
+
+    with patch.object(messages_details_extraction.config_http_transport,'send_request') as mock_send_request:
+
+        assert asyncio.run(messages_details_extraction.get_changed_message_ids_from_feed(topic_row, 'https://forum.test', pd.Timestamp('2025-02-04 21:00:00'))) is None
+        mock_send_request.assert_not_called()
+
+def test_filter_active_topics_feed_unavailable(read_csv):
+
+    # this test the function filter_active_topics with the feed unavailable. Must keep all topics
+    topics_scope_id = read_csv("q_topics_query.csv")
+
+    with patch.object(messages_details_extraction.config_http_transport,'send_request', side_effect=Exception("404 Client Error")):
+
+        result = messages_details_extraction.filter_active_topics(topics_scope_id, pd.Timestamp('2025-02-04 21:00:00'))
+        assert_frame_equal(result, topics_scope_id)
+
+def test_filter_active_topics_feed_too_short(read_csv, materials_dir):
+
+    # this test the function filter_active_topics with a feed not going back to the time. Topics not listed must be kept, the ones listed without new message removed
+    topics_scope_id = pd.concat([read_csv("q_topics_query.csv").iloc[[0]]] * 2, ignore_index=True)
+    topics_scope_id.loc[1, 'TOPIC_NUMBER'] = 2
+    with open(materials_dir / "bi_topics_active_feed.xml", 'rb') as file:
+        mock_response = MagicMock(content=file.read())
+
+    with patch.object(messages_details_extraction.config_http_transport,'send_request', return_value=mock_response):
+
+        result = messages_details_extraction.filter_active_topics(topics_scope_id, pd.Timestamp('2025-02-04 20:00:00'))
+        assert result['TOPIC_NUMBER'].tolist() == [1, 2]
+        result = messages_details_extraction.filter_active_topics(topics_scope_id, pd.Timestamp('2025-02-04 21:00:00'))
+        assert result['TOPIC_NUMBER'].tolist() == []
+
+def test_fetch_topic_page_modified(read_csv):
+
+    # this test the function fetch_topic_page with a page having new messages since cached. Must not reuse the messages parsed last time
+    topic_row = next(read_csv("q_topics_query.csv").itertuples(index=False))
+    page_cache = {row['URL']: row.to_dict() for _, row in read_csv("message_page_cache.csv").iterrows()}
+    html = '<html><div id="p1" class="post">new message</div></html>'
+    mock_response = MagicMock(status_code=200, headers={}, content=html.encode('utf-8'))
+
+    with patch.object(messages_details_extraction.config_http_transport,'send_request', return_value=mock_response):
+
+        messagetext, df = asyncio.run(messages_details_extraction.fetch_topic_page(topic_row, 'https://forum.test', 0, page_cache))
+        assert messagetext == html
+        assert df is None
+        cached_page = page_cache['https://forum.test/viewtopic.php?t=1&start=0']
+        assert cached_page['PAGE_RECORDS_GZIP'] is None
+        assert cached_page['ETAG'] is None
+        assert files_manipulation.decompress_text(cached_page['PAGE_HTML_GZIP']) == html
+
+def test_fetch_topic_page_parser_changed(read_csv):
+
+    # this test the function fetch_topic_page with a page not modified but parsing rules changed. Must not reuse the messages parsed last time
+    topic_row = next(read_csv("q_topics_query.csv").itertuples(index=False))
+    page_cache = {row['URL']: row.to_dict() for _, row in read_csv("message_page_cache.csv").iterrows()}
+    mock_response = MagicMock(status_code=304, headers={}, content=b"")
+
+    with patch.object(messages_details_extraction.config_http_transport,'send_request', return_value=mock_response), \
+         patch.object(messages_details_extraction.var,'MESSAGE_PAGE_CACHE_PARSER_VERSION', 2):
+
+        messagetext, df = asyncio.run(messages_details_extraction.fetch_topic_page(topic_row, 'https://forum.test', 0, page_cache))
+        assert messagetext == "<html></html>"
+        assert df is None
+
+def test_fetch_topic_page_last_modified_only(read_csv):
+
+    # this test the function fetch_topic_page with a cached page having no records and a Last-Modified validator only. Must send it and parse again
+    topic_row = next(read_csv("q_topics_query.csv").itertuples(index=False))._replace(TOPIC_NUMBER=2)
+    page_cache = {row['URL']: row.to_dict() for _, row in read_csv("message_page_cache.csv").iterrows()}
+    mock_response = MagicMock(status_code=304, headers={}, content=b"")
+
+    with patch.object(messages_details_extraction.config_http_transport,'send_request', return_value=mock_response) as mock_send_request:
+
+        _, df = asyncio.run(messages_details_extraction.fetch_topic_page(topic_row, 'https://forum.test', 0, page_cache))
+        assert mock_send_request.call_args.kwargs['headers'] == {'If-Modified-Since': 'Tue, 04 Feb 2025 21:00:00 GMT'}
+        assert df is None
+
 def test_extract_messages_min_ge_max(read_yml_as_serie, read_csv):
     
     # this test the function extract_messages with a time range with min > max. The result must be an empty dataframe
@@ -54,14 +218,19 @@ def test_extract_messages_min_ge_max(read_yml_as_serie, read_csv):
     mock_ts_message_extract_min_utc = pd.Timestamp('2025-02-04 21:00:00')
     mock_ts_message_extract_max_utc = pd.Timestamp('1025-02-04 22:30:00')
     mock_results = read_csv("message_check.csv")
+    df_message_topic_state = read_csv("message_topic_state.csv")
+    df_message_page_cache = read_csv("message_page_cache.csv")
 
     with patch.object(messages_details_extraction,'get_list_topics_from_need', return_value=mock_topics_scope_list), \
          patch.object(messages_details_extraction,'get_extraction_time_range', return_value=(mock_ts_message_extract_min_utc,mock_ts_message_extract_max_utc)), \
-         patch.object(messages_details_extraction,'multithread_run', return_value=[mock_results]), \
+         patch.object(messages_details_extraction,'crawl_topics', return_value=[mock_results]), \
          patch.object(messages_details_extraction,'create_csv'):
 
-        df_messages, _ = messages_details_extraction.extract_messages(sr_snowflake_account_connect, sr_output_need)
+        df_messages, _, df_message_topic_state_updated, df_message_page_cache_updated = \
+            messages_details_extraction.extract_messages(sr_snowflake_account_connect, sr_output_need, df_message_topic_state, df_message_page_cache)
         assert df_messages.empty
+        assert_frame_equal(df_message_topic_state_updated, df_message_topic_state)
+        assert_frame_equal(df_message_page_cache_updated, df_message_page_cache)
 
 def test_get_extraction_time_range_invalid_date(read_yml_as_serie, read_csv):
     
@@ -74,3 +243,56 @@ def test_get_extraction_time_range_invalid_date(read_yml_as_serie, read_csv):
         min_ts, max_ts = messages_details_extraction.get_extraction_time_range(sr_snowflake_account_connect, sr_output_need)
         assert pd.isna(min_ts) 
         assert isinstance(max_ts, pd.Timestamp)
+
+def test_crawl_topics_without_parsing_pool(read_csv):
+
+    # this test the function crawl_topics with no process to parse the pages. The crawls must parse the pages in worker threads
+    topic_row = next(read_csv("q_topics_query.csv").itertuples(index=False))
+    with patch.object(messages_details_extraction,'crawl_topic', return_value=(None, {})) as mock_crawl_topic, \
+         patch.object(messages_details_extraction.var,'MESSAGE_PARSING_PROCESSES', 0):
+
+        assert asyncio.run(messages_details_extraction.crawl_topics([(topic_row, None, None, None, None)])) == [(None, {})]
+        assert 'parsing_executor' not in mock_crawl_topic.call_args.kwargs
+
+def test_parse_messages_page_error(read_csv):
+
+    # this test the function parse_messages_page with a page failing to be parsed in the pool. Must raise the issue to the caller
+    topic_row = next(read_csv("q_topics_query.csv").itertuples(index=False))
+    with patch.dict(messages_details_extraction.messages_info_functions, {'BI': MagicMock(side_effect=ValueError("missing detail"))}), \
+         ThreadPoolExecutor(max_workers=1) as parsing_executor:
+
+        with pytest.raises(ValueError):
+            asyncio.run(messages_details_extraction.parse_messages_page("<html></html>", topic_row, 0, parsing_executor))
+
+def test_build_messages_dataframe_no_messages():
+
+    # this test the function build_messages_dataframe without any message. Must return an empty dataframe with the types of messages
+    df_messages = messages_details_extraction.build_messages_dataframe(messages_details_extraction.create_messages_columns())
+    assert df_messages.empty
+    assert df_messages.dtypes.astype(str).to_dict() == messages_details_extraction.messages_dtypes
+
+def test_build_messages_dataframe_pages_without_edition(read_csv):
+
+    # this test the function build_messages_dataframe with a page without any edited message. Must keep timestamps type
+    df_page = read_csv("message_check.csv")
+    df_page_without_edition = df_page.iloc[:1].copy()
+    df_page_without_edition['EDITION_TIME_LOCAL'] = None
+    messages_columns = messages_details_extraction.create_messages_columns()
+    messages_details_extraction.append_messages_columns(messages_columns, df_page_without_edition)
+    messages_details_extraction.append_messages_columns(messages_columns, df_page.iloc[1:])
+
+    df_messages = messages_details_extraction.build_messages_dataframe(messages_columns)
+    assert df_messages['EDITION_TIME_LOCAL'].dtype == 'datetime64[ns]'
+    assert pd.isna(df_messages.loc[0, 'EDITION_TIME_LOCAL'])
+    assert len(df_messages) == len(df_page)
+
+def test_crawl_topics_one_core(read_csv):
+
+    # this test the function crawl_topics on a machine with one core. The crawls must parse the pages in worker threads
+    topic_row = next(read_csv("q_topics_query.csv").itertuples(index=False))
+    with patch.object(messages_details_extraction,'crawl_topic', return_value=(None, {})) as mock_crawl_topic, \
+         patch.object(messages_details_extraction.os,'cpu_count', return_value=1), \
+         patch.object(messages_details_extraction.var,'MESSAGE_PARSING_PROCESSES', 4):
+
+        asyncio.run(messages_details_extraction.crawl_topics([(topic_row, None, None, None, None)]))
+        assert 'parsing_executor' not in mock_crawl_topic.call_args.kwargs
@@ -0,0 +1,67 @@
+'''
+This tests file concern all functions in the messages_posting_ledger module.
+It units test the happy path for each function
+'''
+
+from unittest.mock import patch
+
+from src.predict_core.forums_interaction import messages_posting_ledger
+
+def test_hash_message_content():
+
+    # this test the function hash_message_content
+    assert messages_posting_ledger.hash_message_content("Test message") == "c0719e9a8d5d838d861dc6f675c899d2b309a3a65bb9fe6b11e5afcbf9a2c0b1"
+
+def test_open_posting_ledger(read_csv):
+
+    # this test the function open_posting_ledger
+    with patch.dict(messages_posting_ledger.posting_ledger, clear=True):
+
+        messages_posting_ledger.open_posting_ledger(read_csv("message_posting_ledger.csv"))
+        assert list(messages_posting_ledger.posting_ledger) == [('BI', 1, 123)]
+
+def test_is_to_post(read_csv):
+
+    # this test the function is_to_post: new messages and edits of another content must be sent, not edits of the same content
+    with patch.dict(messages_posting_ledger.posting_ledger, clear=True), \
+         patch.dict(messages_posting_ledger.posting_report, clear=True):
+
+        messages_posting_ledger.open_posting_ledger(read_csv("message_posting_ledger.csv"))
+        assert messages_posting_ledger.is_to_post('BI', 1, None, "Test message")
+        assert messages_posting_ledger.is_to_post('BI', 1, 123, "Test message changed")
+        assert not messages_posting_ledger.is_to_post('BI', 1, 123, "Test message")
+        assert [row[3] for row in messages_posting_ledger.posting_report.values()] == ["POST", "EDIT", "SKIP"]
+
+def test_record_posted_content():
+
+    # this test the function record_posted_content. The same edit must then be skipped
+    with patch.dict(messages_posting_ledger.posting_ledger, clear=True), \
+         patch.dict(messages_posting_ledger.posting_report, clear=True):
+
+        messages_posting_ledger.record_posted_content('BI', 1, 456, "Edited message")
+        assert not messages_posting_ledger.is_to_post('BI', 1, 456, "Edited message")
+
+def test_record_posted_content_id_unknown():
+
+    # this test the function record_posted_content for a message posted without its id known. The first edit of the topic must get its content
+    with patch.dict(messages_posting_ledger.posting_ledger, clear=True), \
+         patch.dict(messages_posting_ledger.posting_report, clear=True):
+
+        messages_posting_ledger.record_posted_content('BI', 1, None, "Posted message")
+        assert not messages_posting_ledger.is_to_post('BI', 1, 456, "Posted message")
+        assert list(messages_posting_ledger.posting_ledger) == [('BI', 1, 456)]
+
+def test_close_posting_ledger(read_csv):
+
+    # this test the function close_posting_ledger
+    with patch.dict(messages_posting_ledger.posting_ledger, clear=True), \
+         patch.object(messages_posting_ledger, "create_csv") as mock_create_csv:
+
+        messages_posting_ledger.open_posting_ledger(read_csv("message_posting_ledger.csv"))
+        messages_posting_ledger.record_posted_content('BI', 2, 456, "Edited message")
+        df_message_posting_ledger = messages_posting_ledger.close_posting_ledger()
+
+        assert df_message_posting_ledger.columns.tolist() == read_csv("message_posting_ledger.csv").columns.tolist()
+        assert df_message_posting_ledger['MESSAGE_FORUM_ID'].tolist() == [123, 456]
+        mock_create_csv.assert_called_once()
+        assert mock_create_csv.call_args.args[0].endswith('message_posting_ledger.csv')
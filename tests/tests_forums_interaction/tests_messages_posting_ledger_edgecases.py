@@ -0,0 +1,53 @@
+'''
+This tests file concern all functions in the messages_posting_ledger module.
+It units test unexpected path
+'''
+
+from unittest.mock import patch
+import pandas as pd
+
+from src.predict_core.forums_interaction import messages_posting_ledger
+
+def test_open_posting_ledger_wrong_file(assert_exit):
+
+    # this test the function open_posting_ledger with a file without MESSAGE_FORUM_ID. Must exit
+    with patch.dict(messages_posting_ledger.posting_ledger, clear=True):
+        assert_exit(lambda: messages_posting_ledger.open_posting_ledger(pd.DataFrame({'FORUM_SOURCE': ['BI'], 'TOPIC_NUMBER': [1]})))
+
+def test_is_to_post_dry_run(read_csv):
+
+    # this test the function is_to_post on a dry run. Nothing must be sent, but reported
+    with patch.dict(messages_posting_ledger.posting_ledger, clear=True), \
+         patch.dict(messages_posting_ledger.posting_report, clear=True), \
+         patch.object(messages_posting_ledger.var, "IS_POSTING_DRY_RUN", 1):
+
+        messages_posting_ledger.open_posting_ledger(read_csv("message_posting_ledger.csv"))
+        assert not messages_posting_ledger.is_to_post('BI', 1, None, "Test message")
+        assert not messages_posting_ledger.is_to_post('BI', 1, 123, "Test message changed")
+        assert [row[3] for row in messages_posting_ledger.posting_report.values()] == ["POST", "EDIT"]
+
+def test_is_to_post_retried(read_csv):
+
+    # this test the function is_to_post asked again for the same messages, as when the post is retried. Must be reported once
+    with patch.dict(messages_posting_ledger.posting_ledger, clear=True), \
+         patch.dict(messages_posting_ledger.posting_report, clear=True), \
+         patch.object(messages_posting_ledger.var, "IS_POSTING_DRY_RUN", 1):
+
+        messages_posting_ledger.open_posting_ledger(read_csv("message_posting_ledger.csv"))
+        for _ in range(3):
+            messages_posting_ledger.is_to_post('BI', 1, None, "Test message")
+            messages_posting_ledger.is_to_post('BI', 1, 123, "Test message changed")
+        assert [row[3] for row in messages_posting_ledger.posting_report.values()] == ["POST", "EDIT"]
+
+def test_close_posting_ledger_dry_run():
+
+    # this test the function close_posting_ledger on a dry run. The report must be created with the ledger
+    with patch.dict(messages_posting_ledger.posting_ledger, clear=True), \
+         patch.dict(messages_posting_ledger.posting_report, {('BI', 1, "", "hash"): ('BI', 1, "", "POST", "hash")}, clear=True), \
+         patch.object(messages_posting_ledger.var, "IS_POSTING_DRY_RUN", 1), \
+         patch.object(messages_posting_ledger, "create_csv") as mock_create_csv:
+
+        df_message_posting_ledger = messages_posting_ledger.close_posting_ledger()
+        assert df_message_posting_ledger.empty
+        assert [call.args[0].rsplit('/', 1)[-1] for call in mock_create_csv.call_args_list] == ['message_posting_ledger.csv', 'message_posting_report.csv']
+        assert mock_create_csv.call_args.args[1]['ACTION'].tolist() == ["POST"]
@@ -0,0 +1,51 @@
+'''
+This tests file concern all functions in the games_calendar_cache module.
+It units test the happy path for each function
+'''
+
+from unittest.mock import patch
+
+from src.predict_core.games_details_extraction import games_calendar_cache
+
+def test_open_games_calendar_cache(read_csv):
+
+    # this test the function open_games_calendar_cache. Expired calendars must not be loaded
+    with patch.dict(games_calendar_cache.games_calendar_cache, clear=True):
+
+        games_calendar_cache.open_games_calendar_cache(read_csv("game_calendar_cache.csv"))
+        assert list(games_calendar_cache.games_calendar_cache) == [('LNB', '288', '2024-11-01', '2025-03-31')]
+
+def test_get_calendar(read_csv, read_json):
+
+    # this test the function get_calendar on a calendar cached by a previous run
+    with patch.dict(games_calendar_cache.games_calendar_cache, clear=True):
+
+        games_calendar_cache.open_games_calendar_cache(read_csv("game_calendar_cache.csv"))
+        assert games_calendar_cache.get_calendar('LNB', 288, '2024-11-01', '2025-03-31') == read_json("lnb_game_response.json")['data']
+
+def test_put_calendar(read_json):
+
+    # this test the function put_calendar. The calendar must be given back by get_calendar
+    calendar = read_json("lnb_game_response.json")['data']
+    with patch.dict(games_calendar_cache.games_calendar_cache, clear=True):
+
+        games_calendar_cache.put_calendar('LNB', 288, '2025-01-01', '2025-01-31', calendar, is_complete=False)
+        assert games_calendar_cache.get_calendar('LNB', 288, '2025-01-01', '2025-01-31') == calendar
+
+def test_close_games_calendar_cache(read_csv, read_json):
+
+    # this test the function close_games_calendar_cache. Only calendars valid after the run must be stored
+    with patch.dict(games_calendar_cache.games_calendar_cache, clear=True), \
+         patch.object(games_calendar_cache, "create_csv") as mock_create_csv:
+
+        games_calendar_cache.open_games_calendar_cache(read_csv("game_calendar_cache.csv"))
+        games_calendar_cache.put_calendar('LNB', 288, '2025-01-01', '2025-01-31', read_json("lnb_game_response.json")['data'], is_complete=False)
+        games_calendar_cache.put_calendar('LNB', 289, '2025-01-01', '2025-01-31', [], is_complete=True)
+        df_game_calendar_cache = games_calendar_cache.close_games_calendar_cache()
+
+        assert df_game_calendar_cache.columns.tolist() == read_csv("game_calendar_cache.csv").columns.tolist()
+        assert df_game_calendar_cache['COMPETITION_SOURCE_ID'].astype(int).tolist() == [288, 289]
+        assert df_game_calendar_cache['START_DATE'].tolist() == ['2024-11-01', '2025-01-01']
+        assert games_calendar_cache.games_calendar_cache == {}
+        mock_create_csv.assert_called_once()
+        assert mock_create_csv.call_args.args[0].endswith('game_calendar_cache.csv')
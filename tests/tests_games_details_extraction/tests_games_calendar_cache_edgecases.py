@@ -0,0 +1,30 @@
+'''
+This tests file concern all functions in the games_calendar_cache module.
+It units test unexpected path
+'''
+
+from unittest.mock import patch
+import pandas as pd
+
+from src.predict_core.games_details_extraction import games_calendar_cache
+
+def test_open_games_calendar_cache_wrong_file(assert_exit):
+
+    # this test the function open_games_calendar_cache with a file without EXPIRY_TS_UTC. Must exit
+    with patch.dict(games_calendar_cache.games_calendar_cache, clear=True):
+        assert_exit(lambda: games_calendar_cache.open_games_calendar_cache(pd.DataFrame({'COMPETITION_SOURCE': ['LNB']})))
+
+def test_get_calendar_not_cached():
+
+    # this test the function get_calendar on a calendar not cached. Must return None
+    with patch.dict(games_calendar_cache.games_calendar_cache, clear=True):
+        assert games_calendar_cache.get_calendar('LNB', 288, '2025-01-01', '2025-01-31') is None
+
+def test_get_calendar_expired():
+
+    # this test the function get_calendar on a calendar expired during the run. Must return None
+    with patch.dict(games_calendar_cache.games_calendar_cache, clear=True), \
+         patch.object(games_calendar_cache.var, "GAME_CALENDAR_CACHE_TTL_MINUTES", -1):
+
+        games_calendar_cache.put_calendar('LNB', 288, '2025-01-01', '2025-01-31', [], is_complete=False)
+        assert games_calendar_cache.get_calendar('LNB', 288, '2025-01-01', '2025-01-31') is None
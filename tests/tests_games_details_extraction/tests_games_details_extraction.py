@@ -3,6 +3,7 @@ This tests file concern all functions in the games_details_extraction.
 It units test the happy path for each function
 '''
 
+import time
 from unittest.mock import patch
 from pandas.testing import assert_frame_equal
 import pandas as pd
@@ -14,12 +15,30 @@ def test_extract_games_from_competition(read_csv):
     # this test the function extract_games_from_competition
     df_competition = read_csv("competition_unique.csv")
     mock_df_game = read_csv("game.csv")
-    with patch.dict(games_details_extraction.game_info_functions, {"LNB": lambda competition_source_id: mock_df_game}), \
+    with patch.dict(games_details_extraction.game_fetch_functions, {"LNB": lambda competition_source_id: mock_df_game}), \
          patch.object(games_details_extraction, "create_csv"):
 
         result = games_details_extraction.extract_games_from_competition(df_competition)
         assert_frame_equal(result.reset_index(drop=True), mock_df_game.reset_index(drop=True),check_dtype=False)
 
+def test_extract_games_from_competition_several(read_csv):
+
+    # this test the function extract_games_from_competition with several competitions, the first one being the slowest. Games must be in the order of competitions
+    df_competition = pd.concat([read_csv("competition_unique.csv")] * 4, ignore_index=True).assign(COMPETITION_SOURCE_ID = [288, 296, 295, 303])
+    mock_df_game = read_csv("game.csv")
+
+    def get_game_details(competition_source_id):
+        time.sleep(0.2 if competition_source_id == 288 else 0)
+        return mock_df_game.assign(COMPETITION_SOURCE_ID = competition_source_id)
+
+    with patch.dict(games_details_extraction.game_fetch_functions, {"LNB": get_game_details}), \
+         patch.object(games_details_extraction, "create_csv") as mock_create_csv:
+
+        result = games_details_extraction.extract_games_from_competition(df_competition)
+        assert result['COMPETITION_SOURCE_ID'].drop_duplicates().tolist() == df_competition['COMPETITION_SOURCE_ID'].tolist()
+        assert len(result) == len(mock_df_game) * len(df_competition)
+        mock_create_csv.assert_called_once()
+
 def test_extract_games_from_need(read_csv):
     
     # this test the function extract_games_from_need
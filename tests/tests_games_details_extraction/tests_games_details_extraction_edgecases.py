@@ -14,7 +14,7 @@ def test_extract_games_from_competition_empty_df(read_csv):
     # this test the function extract_games_from_competition with an empty df_competition. Must return an empty result
     df_competition_empty = read_csv("edgecases/competition_empty.csv")
     mock_df_game = read_csv("edgecases/game_empty.csv")
-    with patch.dict(games_details_extraction.game_info_functions, {"LNB": lambda competition_source_id: mock_df_game}), \
+    with patch.dict(games_details_extraction.game_fetch_functions, {"LNB": lambda competition_source_id: mock_df_game}), \
          patch.object(games_details_extraction, "create_csv"):
 
         result = games_details_extraction.extract_games_from_competition(df_competition_empty)
@@ -22,14 +22,34 @@ def test_extract_games_from_competition_empty_df(read_csv):
 
 def test_extract_games_from_competition_unknown_source(read_csv, assert_exit):
     
-    # this test the function extract_games_from_competition when competition source is not in game_info_functions. Must exit the program.
+    # this test the function extract_games_from_competition when competition source is not in game_fetch_functions. Must exit the program.
     df_competition = read_csv("edgecases/competition_unknown_source.csv")
     mock_df_game = read_csv("game.csv")
-    with patch.dict(games_details_extraction.game_info_functions, {"LNB": lambda competition_source_id: mock_df_game}), \
+    with patch.dict(games_details_extraction.game_fetch_functions, {"LNB": lambda competition_source_id: mock_df_game}), \
          patch.object(games_details_extraction, "create_csv"):
 
         assert_exit(lambda: games_details_extraction.extract_games_from_competition(df_competition))
 
+def test_extract_games_from_competition_one_failed(read_csv, assert_exit):
+
+    # this test the function extract_games_from_competition when one competition fails. Others must be extracted, then the program must exit
+    df_competition = pd.concat([read_csv("competition_unique.csv")] * 4, ignore_index=True).assign(COMPETITION_SOURCE_ID = [288, 296, 295, 303])
+    mock_df_game = read_csv("game.csv")
+    lst_extracted = []
+
+    def get_game_details(competition_source_id):
+        if competition_source_id == 296:
+            raise ValueError("LNB unavailable")
+        lst_extracted.append(competition_source_id)
+        return mock_df_game.copy()
+
+    with patch.dict(games_details_extraction.game_fetch_functions, {"LNB": get_game_details}), \
+         patch.object(games_details_extraction, "create_csv") as mock_create_csv:
+
+        assert_exit(lambda: games_details_extraction.extract_games_from_competition(df_competition))
+        assert sorted(lst_extracted) == [288, 295, 303]
+        mock_create_csv.assert_not_called()
+
 def test_extract_games_from_need_no_matching_competition(read_csv, assert_exit):
     
     # this test the function extract_games_from_need when no competition match need. Must exit the program.
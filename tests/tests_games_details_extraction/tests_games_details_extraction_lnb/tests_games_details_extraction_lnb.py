@@ -5,6 +5,7 @@ It units test the happy path for each function
 
 from unittest.mock import MagicMock, patch
 from pandas.testing import assert_frame_equal
+import pandas as pd
 
 from src.predict_core.games_details_extraction.games_details_extraction_lnb import games_details_extraction_lnb
 
@@ -19,7 +20,8 @@ def test_get_game_details_lnb_with_gameday_without_modification(read_csv, read_j
     mock_lnb_response.json.return_value = fake_json
     expected_df = read_csv("game.csv").drop(columns=['COMPETITION_SOURCE', 'COMPETITION_ID', 'SEASON_ID'])
 
-    with patch.object(games_details_extraction_lnb.requests, "post", return_value = mock_lnb_response):
+    with patch.dict(games_details_extraction_lnb.games_calendar_cache.games_calendar_cache, clear=True), \
+         patch.object(games_details_extraction_lnb.config_http_transport, "send_request", return_value = mock_lnb_response):
         result_df = games_details_extraction_lnb.get_game_details_lnb(competition_source_id,gameday,sr_games_to_extract)
         assert_frame_equal(result_df[1:].astype(str).reset_index(drop=True), expected_df[1:].astype(str).reset_index(drop=True),check_dtype=False)
 
@@ -34,6 +36,66 @@ def test_get_game_details_lnb_without_gameday(read_csv, read_json):
     expected_df = read_csv("game.csv").drop(columns=['COMPETITION_SOURCE', 'COMPETITION_ID', 'SEASON_ID'])
     
 
-    with patch.object(games_details_extraction_lnb.requests, "post", return_value = mock_lnb_response):
+    with patch.dict(games_details_extraction_lnb.games_calendar_cache.games_calendar_cache, clear=True), \
+         patch.object(games_details_extraction_lnb.config_http_transport, "send_request", return_value = mock_lnb_response):
         result_df = games_details_extraction_lnb.get_game_details_lnb(competition_source_id)
         assert_frame_equal(result_df[1:].astype(str).reset_index(drop=True), expected_df[1:].astype(str).reset_index(drop=True),check_dtype=False)
+
+def test_get_calendar_window_lnb():
+
+    # this test the get_calendar_window_lnb function. The window must be widened to whole months
+    with patch.object(games_details_extraction_lnb.var, "GAME_CALENDAR_WINDOW_DAYS_BEFORE_TASK", 45), \
+         patch.object(games_details_extraction_lnb.var, "GAME_CALENDAR_WINDOW_DAYS_AFTER_TASK", 80):
+        assert games_details_extraction_lnb.get_calendar_window_lnb("2025-01-20 18:00:00") == ("2024-12-01", "2025-04-30")
+        assert games_details_extraction_lnb.get_calendar_window_lnb(None) == games_details_extraction_lnb.LNB_CALENDAR_FULL_WINDOW
+
+def test_is_gameday_missing_games_lnb(read_json):
+
+    # this test the is_gameday_missing_games_lnb function. All teams of the window playing the gameday, no game must be missing
+    df_game = pd.json_normalize(read_json("lnb_game_response.json")["data"], record_path="data")
+    assert not games_details_extraction_lnb.is_gameday_missing_games_lnb(df_game, '1ere journee')
+    assert games_details_extraction_lnb.is_gameday_missing_games_lnb(df_game, '2eme journee')
+
+def test_get_game_details_lnb_with_ts_task_cached(read_json):
+
+    # this test the get_game_details_lnb function with the time of the task. The calendar must be asked once for the window, then read from the cache
+    fake_json = read_json("lnb_game_response.json")
+    mock_lnb_response = MagicMock()
+    mock_lnb_response.json.return_value = fake_json
+
+    with patch.dict(games_details_extraction_lnb.games_calendar_cache.games_calendar_cache, clear=True), \
+         patch.object(games_details_extraction_lnb.config_http_transport, "send_request", return_value = mock_lnb_response) as mock_send_request:
+        result_df_1 = games_details_extraction_lnb.get_game_details_lnb(288, '1ere journee', ts_task_utc="2025-01-20 18:00:00")
+        result_df_2 = games_details_extraction_lnb.get_game_details_lnb(288, '1ere journee', ts_task_utc="2025-01-21 18:00:00")
+
+        mock_send_request.assert_called_once()
+        payload = mock_send_request.call_args.kwargs['json']
+        assert (payload['start_date'], payload['end_date']) == games_details_extraction_lnb.get_calendar_window_lnb("2025-01-20 18:00:00")
+        assert_frame_equal(result_df_1, result_df_2)
+
+def test_normalize_games_lnb(read_csv, read_json):
+
+    # this test the normalize_games_lnb function with games in several timezones. Local times must be converted per timezone
+    df_game = pd.json_normalize(read_json("lnb_game_response.json")["data"], record_path="data")
+    expected_df = read_csv("game.csv").drop(columns=['COMPETITION_SOURCE', 'COMPETITION_ID', 'SEASON_ID'])
+    df_game.loc[1, "timezone"] = "Indian/Reunion"
+    expected_df.loc[1, "TIME_GAME_LOCAL"] = "23:00:00"
+
+    result_df = games_details_extraction_lnb.normalize_games_lnb(df_game, 288)
+    assert_frame_equal(result_df.astype(str), expected_df.astype(str), check_dtype=False)
+
+def test_get_games_status_lnb(read_json):
+
+    # this test the get_games_status_lnb function. The calendar must be asked live, not from the cache
+    mock_lnb_response = MagicMock()
+    mock_lnb_response.json.return_value = read_json("lnb_game_response.json")
+
+    with patch.dict(games_details_extraction_lnb.games_calendar_cache.games_calendar_cache, clear=True), \
+         patch.object(games_details_extraction_lnb.config_http_transport, "send_request", return_value = mock_lnb_response) as mock_send_request:
+        games_details_extraction_lnb.get_games_status_lnb(288, "2024-01-01", "2025-12-31")
+        df_game_status = games_details_extraction_lnb.get_games_status_lnb(288, "2024-01-01", "2025-12-31")
+
+        assert mock_send_request.call_count == 2
+        assert df_game_status['GAME_SOURCE_ID'].tolist() == ["ID1", "ID2"]
+        assert df_game_status['IS_FINAL'].tolist() == [True, False]
+        assert games_details_extraction_lnb.games_calendar_cache.games_calendar_cache == {}
@@ -3,6 +3,8 @@ This tests file concern all functions in the games_details_extraction_lnb.
 It units test the enexpected path for each function, which return exception
 '''
 from unittest.mock import MagicMock, patch
+import pandas as pd
+import pytest
 
 from src.predict_core.games_details_extraction.games_details_extraction_lnb import games_details_extraction_lnb
 
@@ -16,7 +18,8 @@ def test_get_game_details_lnb_network_failure(read_csv,read_json, assert_exit):
     mock_lnb_response = MagicMock()
     mock_lnb_response.json.return_value = fake_json
 
-    with patch.object(games_details_extraction_lnb.requests,"post", side_effect = Exception("Network error")):
+    with patch.dict(games_details_extraction_lnb.games_calendar_cache.games_calendar_cache, clear=True), \
+         patch.object(games_details_extraction_lnb.config_http_transport, "send_request", side_effect = Exception("Network error")):
         assert_exit(lambda: games_details_extraction_lnb.get_game_details_lnb(competition_source_id,gameday,sr_games_to_extract))
 
 def test_get_game_details_lnb_invalid_json_response(read_csv, read_json, assert_exit):
@@ -27,7 +30,8 @@ def test_get_game_details_lnb_invalid_json_response(read_csv, read_json, assert_
     mock_lnb_response = MagicMock()
     mock_lnb_response.json.return_value = fake_json
 
-    with patch.object(games_details_extraction_lnb.requests, "post", side_effect = ValueError("Invalid JSON")):
+    with patch.dict(games_details_extraction_lnb.games_calendar_cache.games_calendar_cache, clear=True), \
+         patch.object(games_details_extraction_lnb.config_http_transport, "send_request", side_effect = ValueError("Invalid JSON")):
         assert_exit(lambda: games_details_extraction_lnb.get_game_details_lnb(competition_source_id))
 
 def test_missing_data_key(read_csv, assert_exit):
@@ -39,6 +43,62 @@ def test_missing_data_key(read_csv, assert_exit):
     mock_lnb_response = MagicMock()
     mock_lnb_response.json.return_value = {"wrong_key": []}
     
-    with patch.object(games_details_extraction_lnb.requests,"post", return_value = mock_lnb_response):
+    with patch.dict(games_details_extraction_lnb.games_calendar_cache.games_calendar_cache, clear=True), \
+         patch.object(games_details_extraction_lnb.config_http_transport, "send_request", return_value = mock_lnb_response):
         assert_exit(lambda: games_details_extraction_lnb.get_game_details_lnb(competition_source_id,gameday,sr_games_to_extract))
 
+
+def test_get_game_details_lnb_gameday_out_of_window(read_json):
+
+    # this test the get_game_details_lnb function with a gameday not in the window of the task. All dates must then be asked
+    mock_empty_response = MagicMock()
+    mock_empty_response.json.return_value = {"data": []}
+    mock_lnb_response = MagicMock()
+    mock_lnb_response.json.return_value = read_json("lnb_game_response.json")
+
+    with patch.dict(games_details_extraction_lnb.games_calendar_cache.games_calendar_cache, clear=True), \
+         patch.object(games_details_extraction_lnb.config_http_transport, "send_request", side_effect = [mock_empty_response, mock_lnb_response]) as mock_send_request:
+        result_df = games_details_extraction_lnb.get_game_details_lnb(288, '1ere journee', ts_task_utc="2025-01-20 18:00:00")
+
+        assert mock_send_request.call_count == 2
+        payload = mock_send_request.call_args.kwargs['json']
+        assert (payload['start_date'], payload['end_date']) == games_details_extraction_lnb.LNB_CALENDAR_FULL_WINDOW
+        assert not result_df.empty
+
+def test_get_game_details_lnb_gameday_partly_out_of_window(read_json):
+
+    # this test the get_game_details_lnb function with a game of the gameday postponed out of the window of the task. All dates must then be asked
+    window_json = read_json("lnb_game_response.json")
+    games = window_json["data"][0]["data"]
+    games[1]["round_description"] = "2eme journee"
+    games.append(dict(games[0], match_id="ID3", round_description="2eme journee", teams=[games[0]["teams"][0], games[1]["teams"][1]]))
+    mock_window_response = MagicMock()
+    mock_window_response.json.return_value = window_json
+    mock_lnb_response = MagicMock()
+    mock_lnb_response.json.return_value = read_json("lnb_game_response.json")
+
+    with patch.dict(games_details_extraction_lnb.games_calendar_cache.games_calendar_cache, clear=True), \
+         patch.object(games_details_extraction_lnb.config_http_transport, "send_request", side_effect = [mock_window_response, mock_lnb_response]) as mock_send_request:
+        result_df = games_details_extraction_lnb.get_game_details_lnb(288, '1ere journee', ts_task_utc="2025-01-20 18:00:00")
+
+        assert mock_send_request.call_count == 2
+        assert result_df['GAME_SOURCE_ID'].tolist() == ['ID1', 'ID2']
+
+def test_normalize_games_lnb_one_team(read_json):
+
+    # this test the normalize_games_lnb function with a game having only one team. Must raise an error
+    df_game = pd.json_normalize(read_json("lnb_game_response.json")["data"], record_path="data")
+    df_game.at[1, "teams"] = df_game.at[1, "teams"][:1]
+
+    with pytest.raises(ValueError):
+        games_details_extraction_lnb.normalize_games_lnb(df_game, 288)
+
+def test_normalize_games_lnb_no_time(read_json):
+
+    # this test the normalize_games_lnb function with a game without time. Its dates and times must be NaT, other games converted
+    df_game = pd.json_normalize(read_json("lnb_game_response.json")["data"], record_path="data")
+    df_game.loc[0, "match_time_utc"] = None
+
+    result_df = games_details_extraction_lnb.normalize_games_lnb(df_game, 288)
+    assert result_df.loc[0, ["DATE_GAME_UTC", "TIME_GAME_UTC", "DATE_GAME_LOCAL", "TIME_GAME_LOCAL"]].tolist() == ["NaT"] * 4
+    assert result_df.loc[1, ["DATE_GAME_LOCAL", "TIME_GAME_LOCAL"]].tolist() == ["2025-11-21", "20:00:00"]
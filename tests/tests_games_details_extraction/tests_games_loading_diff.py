@@ -0,0 +1,88 @@
+'''
+This tests file concern all functions in the games_loading_diff module.
+It units test the happy path for each function
+'''
+
+from unittest.mock import patch
+
+from src.predict_core.games_details_extraction import games_loading_diff
+
+def test_get_games_hash(read_csv):
+
+    # this test the function get_games_hash. The hash must change with the content of the game only
+    df_game = read_csv("game.csv")
+    df_game_changed = df_game.copy()
+    df_game_changed.loc[1, 'SCORE_HOME'] = 99
+
+    sr_hash = games_loading_diff.get_games_hash(df_game)
+    assert sr_hash.dtype == 'int64'
+    assert sr_hash.tolist() == games_loading_diff.get_games_hash(df_game.astype(str)).tolist()
+    sr_hash_changed = games_loading_diff.get_games_hash(df_game_changed)
+    assert sr_hash_changed[0] == sr_hash[0]
+    assert sr_hash_changed[1] != sr_hash[1]
+
+def test_diff_games(read_csv):
+
+    # this test the function diff_games. ID1 is loaded as is, ID2 has changed since its load, ID3 is new
+    df_game = read_csv("game.csv")
+    df_game_new = df_game.iloc[[1]].assign(GAME_SOURCE_ID='ID3')
+    df_game = df_game._append(df_game_new, ignore_index=True)
+
+    dict_game_change = games_loading_diff.diff_games(df_game, read_csv("game_loaded_snapshot.csv"))
+    assert dict_game_change == {'INSERTED': 1, 'CHANGED': 1, 'UNCHANGED': 1}
+
+def test_get_games_change(read_csv):
+
+    # this test the function get_games_change. ID1 is loaded as is, ID2 has changed since its load, ID3 is new
+    df_game = read_csv("game.csv")
+    df_game = df_game._append(df_game.iloc[[1]].assign(GAME_SOURCE_ID='ID3'), ignore_index=True)
+
+    sr_change = games_loading_diff.get_games_change(df_game, read_csv("game_loaded_snapshot.csv"))
+    assert sr_change.tolist() == ['UNCHANGED', 'CHANGED', 'INSERTED']
+    assert sr_change.index.equals(df_game.index)
+
+def test_is_game_load_needed(read_csv):
+
+    # this test the function is_game_load_needed. Games unchanged are loaded only for a task with an action on the gameday
+    sr_output_need = read_csv("output_need_calculate.csv").iloc[0]
+    sr_output_need_update = sr_output_need.copy()
+    sr_output_need_update[['IS_TO_INIT','IS_TO_CALCULATE','IS_TO_DELETE','IS_TO_RECALCULATE']] = 0
+
+    assert games_loading_diff.is_game_load_needed({'INSERTED': 0, 'CHANGED': 1, 'UNCHANGED': 1}, sr_output_need_update)
+    assert games_loading_diff.is_game_load_needed({'INSERTED': 0, 'CHANGED': 0, 'UNCHANGED': 2}, sr_output_need)
+    assert not games_loading_diff.is_game_load_needed({'INSERTED': 0, 'CHANGED': 0, 'UNCHANGED': 2}, sr_output_need_update)
+
+def test_filter_games_to_load(read_csv):
+
+    # this test the function filter_games_to_load. A task updating games lands the games changed only, a task with an action on the gameday all its games
+    df_game = read_csv("game.csv")
+    sr_output_need = read_csv("output_need_calculate.csv").iloc[0]
+    sr_output_need_update = sr_output_need.copy()
+    sr_output_need_update[['IS_TO_INIT','IS_TO_CALCULATE','IS_TO_DELETE','IS_TO_RECALCULATE']] = 0
+
+    with patch.object(games_loading_diff, "create_csv") as mock_create_csv:
+
+        df_game_to_load = games_loading_diff.filter_games_to_load(df_game, read_csv("game_loaded_snapshot.csv"), sr_output_need_update)
+        assert df_game_to_load['GAME_SOURCE_ID'].tolist() == ['ID2']
+        assert df_game_to_load.index.tolist() == [0]
+        assert mock_create_csv.call_args.args[0].endswith('game.csv')
+        assert mock_create_csv.call_args.args[1] is df_game_to_load
+
+        df_game_to_load = games_loading_diff.filter_games_to_load(df_game, read_csv("game_loaded_snapshot.csv"), sr_output_need)
+        assert df_game_to_load['GAME_SOURCE_ID'].tolist() == ['ID1', 'ID2']
+
+def test_update_game_loaded_snapshot(read_csv):
+
+    # this test the function update_game_loaded_snapshot. Games loaded replace their previous version, other games are kept
+    df_game = read_csv("game.csv")
+    with patch.object(games_loading_diff, "create_csv") as mock_create_csv:
+
+        df_game_loaded_snapshot = games_loading_diff.update_game_loaded_snapshot(df_game, read_csv("game_loaded_snapshot.csv"))
+
+        assert df_game_loaded_snapshot.columns.tolist() == read_csv("game_loaded_snapshot.csv").columns.tolist()
+        assert df_game_loaded_snapshot['GAME_SOURCE_ID'].tolist() == ['ID0', 'ID1', 'ID2']
+        assert df_game_loaded_snapshot['GAME_HASH'].tolist()[1:] == games_loading_diff.get_games_hash(df_game).tolist()
+        assert df_game_loaded_snapshot['LOADED_TS_UTC'][0] == '2023-12-01 08:00:00'
+        assert games_loading_diff.diff_games(df_game, df_game_loaded_snapshot) == {'INSERTED': 0, 'CHANGED': 0, 'UNCHANGED': 2}
+        mock_create_csv.assert_called_once()
+        assert mock_create_csv.call_args.args[0].endswith('game_loaded_snapshot.csv')
@@ -0,0 +1,39 @@
+'''
+This tests file concern all functions in the games_loading_diff module.
+It units test unexpected path
+'''
+
+from unittest.mock import patch
+import pandas as pd
+
+from src.predict_core.games_details_extraction import games_loading_diff
+
+def test_diff_games_empty_snapshot(read_csv):
+
+    # this test the function diff_games with a snapshot with headers only (first run). All games must be inserted
+    df_game_loaded_snapshot = read_csv("game_loaded_snapshot.csv").iloc[0:0]
+    assert games_loading_diff.diff_games(read_csv("game.csv"), df_game_loaded_snapshot) == {'INSERTED': 2, 'CHANGED': 0, 'UNCHANGED': 0}
+
+def test_diff_games_wrong_snapshot(read_csv, assert_exit):
+
+    # this test the function diff_games with a snapshot without GAME_HASH. Must exit
+    assert_exit(lambda: games_loading_diff.diff_games(read_csv("game.csv"), pd.DataFrame({'COMPETITION_SOURCE': ['LNB'], 'GAME_SOURCE_ID': ['ID1']})))
+
+def test_filter_games_to_load_empty_snapshot(read_csv):
+
+    # this test the function filter_games_to_load with a snapshot with headers only (first run) for a task updating games. All games must be landed
+    sr_output_need = read_csv("output_need_calculate.csv").iloc[0]
+    sr_output_need[['IS_TO_INIT','IS_TO_CALCULATE','IS_TO_DELETE','IS_TO_RECALCULATE']] = 0
+    with patch.object(games_loading_diff, "create_csv"):
+
+        df_game_to_load = games_loading_diff.filter_games_to_load(read_csv("game.csv"), read_csv("game_loaded_snapshot.csv").iloc[0:0], sr_output_need)
+        assert df_game_to_load['GAME_SOURCE_ID'].tolist() == ['ID1', 'ID2']
+
+def test_update_game_loaded_snapshot_empty_snapshot(read_csv):
+
+    # this test the function update_game_loaded_snapshot with a snapshot with headers only. Must store the games loaded
+    df_game_loaded_snapshot = read_csv("game_loaded_snapshot.csv").iloc[0:0]
+    with patch.object(games_loading_diff, "create_csv"):
+
+        df_game_loaded_snapshot = games_loading_diff.update_game_loaded_snapshot(read_csv("game.csv"), df_game_loaded_snapshot)
+        assert df_game_loaded_snapshot['GAME_SOURCE_ID'].tolist() == ['ID1', 'ID2']
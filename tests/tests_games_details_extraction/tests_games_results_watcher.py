@@ -0,0 +1,61 @@
+'''
+This tests file concern all functions in the games_results_watcher module.
+It units test the happy path for each function
+'''
+
+from unittest.mock import patch
+import pandas as pd
+
+from src.predict_core.games_details_extraction import games_results_watcher
+from src.predict_core.games_details_extraction.games_details_extraction_lnb import games_details_extraction_lnb
+from tests.stand_ins.lnb_stand_in import generate_competition, run_lnb_stand_in
+
+def test_get_task_to_watch(read_csv):
+
+    # this test the function get_task_to_watch with a CALCULATE task as next task, due soon. Must return it
+    df_calendar = read_csv("calendar.csv")
+    df_calendar['TS_TASK_UTC'] = pd.to_datetime(df_calendar['TS_TASK_UTC'])
+    df_calendar.loc[0, 'TASK_RUN'] = "CALCULATE"
+    ts_now_utc = df_calendar.loc[0, 'TS_TASK_UTC'] - pd.Timedelta(hours=2)
+
+    sr_task = games_results_watcher.get_task_to_watch(df_calendar, read_csv("task_done.csv").iloc[0:0], ts_now_utc)
+    assert (sr_task['TASK_RUN'], sr_task['GAMEDAY']) == ("CALCULATE", df_calendar.loc[0, 'GAMEDAY'])
+
+def test_get_next_poll_secs():
+
+    # this test the function get_next_poll_secs: until the first game not final is expected to end, between min and max
+    ts_now_utc = pd.Timestamp("2025-01-20 18:00:00", tz="UTC")
+    df_game_watched = pd.DataFrame({'DATETIME_UTC': [ts_now_utc - pd.Timedelta(hours=3), ts_now_utc - pd.Timedelta(minutes=100), ts_now_utc],
+                                    'IS_FINAL': [True, False, False]})
+    with patch.object(games_results_watcher.var, "GAME_WATCHER_GAME_DURATION_MINUTES", 120), \
+         patch.object(games_results_watcher.var, "GAME_WATCHER_POLL_MIN_SECS", 60), \
+         patch.object(games_results_watcher.var, "GAME_WATCHER_POLL_MAX_SECS", 900):
+        assert games_results_watcher.get_next_poll_secs(df_game_watched, ts_now_utc) == 900
+        assert games_results_watcher.get_next_poll_secs(df_game_watched, ts_now_utc + pd.Timedelta(minutes=15)) == 300
+        assert games_results_watcher.get_next_poll_secs(df_game_watched, ts_now_utc + pd.Timedelta(hours=1)) == 60
+
+def test_get_poll_window():
+
+    # this test the function get_poll_window: only the dates of games not final, one day wider
+    df_game_watched = pd.DataFrame({'DATETIME_UTC': pd.to_datetime(["2025-01-10 18:00:00", "2025-01-20 18:00:00"], utc=True),
+                                    'IS_FINAL': [True, False]})
+    assert games_results_watcher.get_poll_window(df_game_watched) == ("2025-01-19", "2025-01-21")
+
+def test_watch_gameday_results_stand_in():
+
+    # this test the function watch_gameday_results against the LNB stand-in: the last game of the gameday gets final after 3 requests
+    competition = generate_competition(288, [
+        {'match_id': "ID1", 'round_description': "1ere journee", 'match_time_utc': "2025-01-10T18:00:00.000Z"},
+        {'match_id': "ID2", 'round_description': "1ere journee", 'match_time_utc': "2025-01-20T18:00:00.000Z", 'complete_after_requests': 2},
+        {'match_id': "ID3", 'round_description': "2eme journee", 'match_time_utc': "2025-01-20T20:00:00.000Z", 'complete_after_requests': 99}])
+
+    with run_lnb_stand_in(competition) as api_url, \
+         patch.object(games_details_extraction_lnb, "LNB_API_URL", api_url), \
+         patch.object(games_results_watcher.var, "GAME_WATCHER_POLL_MIN_SECS", 0), \
+         patch.object(games_results_watcher.var, "GAME_WATCHER_POLL_MAX_SECS", 0):
+
+        is_final = games_results_watcher.watch_gameday_results("LNB", 288, "1ere journee", None, pd.Timestamp("2025-01-21 10:00:00"),
+                                                               pd.Timestamp.now(tz="UTC").tz_localize(None) + pd.Timedelta(minutes=1))
+        assert is_final
+        assert len(competition['requests']) == 3
+        assert [(request['start_date'], request['end_date']) for request in competition['requests'][1:]] == [("2025-01-19", "2025-01-21")] * 2
@@ -0,0 +1,63 @@
+'''
+This tests file concern all functions in the games_results_watcher module.
+It units test unexpected path
+'''
+
+from unittest.mock import patch
+import pandas as pd
+
+from src.predict_core.games_details_extraction import games_results_watcher
+
+def get_df_game_status(is_final: bool) -> pd.DataFrame:
+
+    # the status of the games of a gameday, as given by get_games_status_lnb
+    return pd.DataFrame({'GAME_SOURCE_ID': ["ID1", "ID2"], 'GAMEDAY': ["1ere journee"] * 2,
+                         'DATETIME_UTC': pd.to_datetime(["2025-01-20 18:00:00", "2025-01-20 20:00:00"], utc=True), 'IS_FINAL': [True, is_final]})
+
+def test_get_task_to_watch_not_calculate(read_csv):
+
+    # this test the function get_task_to_watch with a task other than CALCULATE as next task. Must return None
+    df_calendar = read_csv("calendar.csv")
+    df_calendar['TS_TASK_UTC'] = pd.to_datetime(df_calendar['TS_TASK_UTC'])
+    ts_now_utc = df_calendar['TS_TASK_UTC'].min() - pd.Timedelta(hours=2)
+    assert games_results_watcher.get_task_to_watch(df_calendar, read_csv("task_done.csv").iloc[0:0], ts_now_utc) is None
+
+def test_get_task_to_watch_too_far(read_csv):
+
+    # this test the function get_task_to_watch with a CALCULATE task due after the horizon. Must return None
+    df_calendar = read_csv("calendar.csv")
+    df_calendar['TS_TASK_UTC'] = pd.to_datetime(df_calendar['TS_TASK_UTC'])
+    df_calendar.loc[0, 'TASK_RUN'] = "CALCULATE"
+    ts_now_utc = df_calendar.loc[0, 'TS_TASK_UTC'] - pd.Timedelta(hours=games_results_watcher.var.GAME_WATCHER_HORIZON_HOURS + 1)
+    assert games_results_watcher.get_task_to_watch(df_calendar, read_csv("task_done.csv").iloc[0:0], ts_now_utc) is None
+
+def test_watch_gameday_results_no_game():
+
+    # this test the function watch_gameday_results when no game of the gameday is found. Must return False
+    with patch.dict(games_results_watcher.game_status_functions, {"LNB": lambda *args: get_df_game_status(False)}):
+        assert not games_results_watcher.watch_gameday_results("LNB", 288, "2eme journee", None, pd.Timestamp("2025-01-21 10:00:00"),
+                                                               pd.Timestamp.now(tz="UTC").tz_localize(None) + pd.Timedelta(minutes=1))
+
+def test_watch_gameday_results_deadline():
+
+    # this test the function watch_gameday_results when results are not final at the deadline. Must return False
+    with patch.dict(games_results_watcher.game_status_functions, {"LNB": lambda *args: get_df_game_status(False)}):
+        assert not games_results_watcher.watch_gameday_results("LNB", 288, "1ere journee", None, pd.Timestamp("2025-01-21 10:00:00"),
+                                                               pd.Timestamp.now(tz="UTC").tz_localize(None) - pd.Timedelta(minutes=1))
+
+def test_watch_gameday_results_poll_failed():
+
+    # this test the function watch_gameday_results when a poll fails. Must poll again, and only watch the games given (gameday modified)
+    lst_status = [get_df_game_status(False), ConnectionError("LNB down"), get_df_game_status(True)]
+    def get_games_status(*args):
+        status = lst_status.pop(0)
+        if isinstance(status, Exception):
+            raise status
+        return status
+
+    with patch.dict(games_results_watcher.game_status_functions, {"LNB": get_games_status}), \
+         patch.object(games_results_watcher.var, "GAME_WATCHER_POLL_MIN_SECS", 0), \
+         patch.object(games_results_watcher.var, "GAME_WATCHER_POLL_MAX_SECS", 0):
+        assert games_results_watcher.watch_gameday_results("LNB", 288, "2eme journee", pd.Series(["ID2"]), pd.Timestamp("2025-01-21 10:00:00"),
+                                                           pd.Timestamp.now(tz="UTC").tz_localize(None) + pd.Timedelta(minutes=1))
+        assert lst_status == []